@@ -82,13 +82,32 @@ class Settings(BaseSettings):
         ),
     )
 
+    # Bearer token for /metrics (shared with the backend). Without it the
+    # endpoint is only served in debug mode, since port 8001 is published.
+    metrics_auth_token: str = ""
+
     # MCP tool source
     qjudge_mcp_url: str = "http://qjudge-mcp:9000/mcp"
     mcp_initialize_timeout_seconds: float = 10.0
     mcp_list_tools_timeout_seconds: float = 10.0
     mcp_call_tool_timeout_seconds: float = 30.0
+    # Reuse initialized MCP sessions per user and cache list_tools() results.
+    mcp_session_pool_enabled: bool = True
+    mcp_session_pool_max_size: int = 100
+    mcp_session_idle_ttl_seconds: float = 300.0
+    mcp_tool_cache_ttl_seconds: float = 300.0
     deepagent_skills_paths: list[str] = ["/app/.deepagents/skills/"]
     deepagent_memory_paths: list[str] = ["/app/.deepagents/AGENTS.md"]
+    # Per-model-call prompt trimming (see services/prompt_context_middleware.py).
+    deepagent_context_dedup_min_chars: int = 2000
+    deepagent_prompt_cache_enabled: bool = True
+
+    # LangGraph checkpoint retention (see services/runtime/checkpoint_retention.py)
+    checkpoint_retention_enabled: bool = True
+    checkpoint_keep_last: int = 20
+    checkpoint_compaction_interval_seconds: float = 600.0
+    checkpoint_compaction_idle_seconds: float = 900.0
+    checkpoint_compaction_batch_size: int = 200
 
     # Backend (Django) base URL for internal artifact tool callbacks
     qjudge_backend_url: str = Field(
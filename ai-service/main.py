@@ -1,16 +1,18 @@
 """AI Service — FastAPI application entry point (v2: DeepAgent)."""
 
 import asyncio
+import hmac
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import get_settings
 from models.schemas import HealthResponse, ModelsResponse
 from routers import chat_router
 from services.deepagent_runner import DeepAgentRunner
+from services.metrics import render_metrics
 from services.model_factory import MODEL_INFO
 
 logging.basicConfig(
@@ -94,6 +96,26 @@ async def health_check() -> HealthResponse:
     )
 
 
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics(request: Request) -> Response:
+    """Prometheus scrape endpoint (TPM gate, stream slots, tokens).
+
+    Guarded by ``METRICS_AUTH_TOKEN``; without a token it is only served in
+    debug mode.
+    """
+    settings = get_settings()
+    expected = settings.metrics_auth_token.strip()
+    if not expected and not settings.debug:
+        logger.warning("/metrics refused: METRICS_AUTH_TOKEN is not set")
+        return Response(status_code=403)
+    if expected:
+        provided = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not provided or not hmac.compare_digest(provided, expected):
+            return Response(status_code=403)
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 @app.get("/api/models", response_model=ModelsResponse, tags=["models"])
 async def list_models() -> ModelsResponse:
     """Return available model options."""
@@ -4,6 +4,7 @@ import asyncio
 import hmac
 import json
 import logging
+import time
 from typing import AsyncGenerator
 
 from fastapi import APIRouter, HTTPException, Request
@@ -11,6 +12,7 @@ from sse_starlette.sse import EventSourceResponse
 
 from config import get_settings
 from models.schemas import AnswerRequest, ChatRequest, RequestContext, ResumeRequest
+from services.metrics import STREAM_SLOT_WAIT, STREAMS_ACTIVE, STREAMS_REJECTED
 
 logger = logging.getLogger(__name__)
 
@@ -32,19 +34,29 @@ async def acquire_stream_slot(app_request: Request) -> asyncio.Semaphore:
     """Acquire a bounded stream slot to protect AI service from overload."""
     settings = get_settings()
     semaphore = app_request.app.state.stream_semaphore
+    started = time.monotonic()
     try:
         await asyncio.wait_for(
             semaphore.acquire(),
             timeout=max(0.1, settings.stream_acquire_timeout_seconds),
         )
     except TimeoutError as exc:
+        STREAMS_REJECTED.inc()
         raise HTTPException(
             status_code=503,
             detail="AI service is busy. Please retry shortly.",
         ) from exc
+    STREAM_SLOT_WAIT.observe(time.monotonic() - started)
+    STREAMS_ACTIVE.inc()
     return semaphore
 
 
+def release_stream_slot(semaphore: asyncio.Semaphore) -> None:
+    """Return a slot taken by :func:`acquire_stream_slot`."""
+    STREAMS_ACTIVE.dec()
+    semaphore.release()
+
+
 async def generate_sse_events(
     request: ChatRequest,
     app_request: Request,
@@ -88,7 +100,7 @@ async def generate_sse_events(
             )
         }
     finally:
-        semaphore.release()
+        release_stream_slot(semaphore)
 
 
 @router.post("/stream")
@@ -139,7 +151,7 @@ async def generate_resume_events(
             )
         }
     finally:
-        semaphore.release()
+        release_stream_slot(semaphore)
 
 
 @router.post("/repair/{thread_id}")
@@ -178,6 +190,34 @@ async def delete_thread(thread_id: str, app_request: Request) -> dict:
         return {"deleted": False, "thread_id": thread_id, "error": str(e)}
 
 
+@router.get("/checkpoints/stats")
+async def checkpoint_stats(
+    app_request: Request,
+    thread_id: str | None = None,
+    limit: int = 20,
+) -> dict:
+    """Checkpoint storage per thread (largest first) for capacity monitoring."""
+    validate_internal_auth(app_request)
+    runner = app_request.app.state.deepagent_runner
+    try:
+        stats = await runner.checkpoint_stats(thread_id=thread_id, limit=min(max(limit, 1), 200))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    return {
+        "threads": [
+            {
+                "thread_id": item.thread_id,
+                "checkpoints": item.checkpoints,
+                "checkpoint_bytes": item.checkpoint_bytes,
+                "blob_bytes": item.blob_bytes,
+                "write_bytes": item.write_bytes,
+                "total_bytes": item.total_bytes,
+            }
+            for item in stats
+        ]
+    }
+
+
 @router.post("/resume")
 async def chat_resume(request: ResumeRequest, app_request: Request) -> EventSourceResponse:
     """Resume an interrupted agent with a user decision (approve/reject).
@@ -224,7 +264,7 @@ async def generate_answer_events(
             )
         }
     finally:
-        semaphore.release()
+        release_stream_slot(semaphore)
 
 
 @router.post("/answer")
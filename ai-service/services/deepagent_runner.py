@@ -44,7 +44,9 @@ from services.adapters.interrupt_state_adapter import (
     extract_question_payload,
 )
 from services.hitl_middleware import ActionAwareHITLMiddleware
+from services.mcp_session_pool import close_shared_pool
 from services.mcp_tool_provider import MCPToolProvider
+from services.prompt_context_middleware import PromptContextMiddleware
 from services.model_factory import (
     ModelFactory,
     SUMMARIZATION_TRIGGER_FRACTION,
@@ -52,6 +54,11 @@ from services.model_factory import (
 )
 from services.policies.approval_policy import WRITE_ACTIONS
 from services.runtime.checkpoint_recovery_manager import CheckpointRecoveryManager
+from services.runtime.checkpoint_retention import (
+    CheckpointPruner,
+    CheckpointRetentionPolicy,
+    ThreadCheckpointStats,
+)
 from services.runtime.recursion_failure_handler import RecursionFailureHandler
 from services.runtime.usage_accumulator import UsageAccumulator
 
@@ -168,6 +175,19 @@ class _SafeSummarizationMiddleware(SummarizationMiddleware):
             safe_trigger = 1
         return ("tokens", safe_trigger)
 
+    @staticmethod
+    def _trigger_tokens(trigger: Any, max_input_tokens: int | None) -> int | None:
+        if not isinstance(trigger, tuple) or len(trigger) != 2:
+            return None
+        kind, value = trigger
+        if not isinstance(value, (int, float)):
+            return None
+        if kind == "tokens":
+            return int(value)
+        if kind == "fraction" and max_input_tokens is not None:
+            return int(max_input_tokens * value)
+        return None
+
     @classmethod
     def _normalize_summarization_config(cls, args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
         model = kwargs.get("model")
@@ -199,6 +219,20 @@ class _SafeSummarizationMiddleware(SummarizationMiddleware):
                 )
                 kwargs["trigger"] = safe_trigger
 
+        # TPM-bound models compact at a fixed prompt budget well below their
+        # context window: every extra token is re-sent on each model turn.
+        budget_tokens = getattr(model, "_qjudge_summarization_trigger_tokens", None)
+        if isinstance(budget_tokens, int) and budget_tokens > 0:
+            trigger = kwargs.get("trigger")
+            trigger_tokens = cls._trigger_tokens(trigger, max_input_tokens)
+            if trigger is None or (trigger_tokens is not None and trigger_tokens > budget_tokens):
+                logger.info(
+                    "SummarizationMiddleware trigger lowered from %s to %d tokens (prompt budget)",
+                    trigger,
+                    budget_tokens,
+                )
+                kwargs["trigger"] = ("tokens", budget_tokens)
+
         # Avoid oversized summarization requests; without trimming, the
         # summarization model call can fail before compaction is applied.
         if kwargs.get("trim_tokens_to_summarize") is None:
@@ -302,6 +336,8 @@ class DeepAgentRunner:
         self._memory_paths = memory_paths or ["/app/.deepagents/AGENTS.md"]
         self._checkpointer: AsyncPostgresSaver | None = None
         self._pool: AsyncConnectionPool | None = None
+        self._pruner: CheckpointPruner | None = None
+        self._compaction_task: asyncio.Task | None = None
         self._recursion_handler = RecursionFailureHandler()
 
     async def setup(self) -> None:
@@ -324,8 +360,32 @@ class DeepAgentRunner:
         await self._checkpointer.setup()
         logger.info("DeepAgent checkpointer initialized with connection pool.")
 
+        settings = get_settings()
+        self._pruner = CheckpointPruner(
+            pool=self._pool,
+            policy=CheckpointRetentionPolicy(
+                keep_last=settings.checkpoint_keep_last,
+                min_idle_seconds=settings.checkpoint_compaction_idle_seconds,
+                batch_size=settings.checkpoint_compaction_batch_size,
+            ),
+        )
+        if settings.checkpoint_retention_enabled:
+            self._compaction_task = asyncio.create_task(
+                self._pruner.run_forever(
+                    interval_seconds=settings.checkpoint_compaction_interval_seconds,
+                )
+            )
+
     async def shutdown(self) -> None:
         """Clean up resources."""
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            try:
+                await self._compaction_task
+            except asyncio.CancelledError:
+                pass
+            self._compaction_task = None
+        await close_shared_pool()
         if self._pool:
             await self._pool.close()
         logger.info("DeepAgent runner shut down.")
@@ -337,6 +397,17 @@ class DeepAgentRunner:
         await self._checkpointer.adelete_thread(thread_id)
         logger.info("Deleted LangGraph checkpoint for thread %s", thread_id)
 
+    async def checkpoint_stats(
+        self,
+        *,
+        thread_id: str | None = None,
+        limit: int = 20,
+    ) -> list[ThreadCheckpointStats]:
+        """Checkpoint storage per thread, largest first."""
+        if self._pruner is None:
+            raise RuntimeError("Checkpointer not initialized")
+        return await self._pruner.thread_stats(thread_id=thread_id, limit=limit)
+
     async def repair_thread(self, thread_id: str) -> bool:
         """Proactively repair dangling tool_calls after a run is cancelled.
 
@@ -368,6 +439,7 @@ class DeepAgentRunner:
         custom middleware that is not already included.
         """
         model = ModelFactory.create_model(model_id=model_id)
+        settings = get_settings()
         prompt = system_prompt or _DEFAULT_SYSTEM_PROMPT
         skills = [p for p in self._skills_paths if p]
         memory = [p for p in self._memory_paths if p]
@@ -384,6 +456,10 @@ class DeepAgentRunner:
             "skills": skills,
             "memory": memory,
             "middleware": [
+                PromptContextMiddleware(
+                    dedup_min_chars=settings.deepagent_context_dedup_min_chars,
+                    prompt_cache=settings.deepagent_prompt_cache_enabled,
+                ),
                 # Must be the last middleware: inspects the final tool_calls produced by
                 # the model turn and pauses execution for human approval on write actions.
                 ActionAwareHITLMiddleware(
@@ -419,7 +495,7 @@ class DeepAgentRunner:
         agent_input: dict[str, Any] | Command,
         event_queue: asyncio.Queue,
     ) -> AsyncGenerator[dict[str, Any], None]:
-        async with MCPToolProvider(
+        async with MCPToolProvider.shared(
             server_url=self._mcp_server_url,
             authorization_header=(
                 request_context.user_authorization if request_context else None
@@ -686,7 +762,7 @@ class DeepAgentRunner:
         """
         yield to_sse_dict(RunStarted(run_id=run_id, thread_id=thread_id))
 
-        usage_accumulator = UsageAccumulator()
+        usage_accumulator = UsageAccumulator(model_id=model_id)
         recovery_manager = CheckpointRecoveryManager(
             checkpointer=self._checkpointer,
             repair_dangling_tool_calls=self._repair_dangling_tool_calls,
@@ -0,0 +1,367 @@
+"""Per-process MCP session pool and tool-definition cache.
+
+Every chat run used to open a fresh streamable-HTTP MCP session, run
+``initialize()`` and page through ``list_tools()`` before the first model
+call. Both are pure overhead for back-to-back runs of the same teacher:
+
+- tool definitions only change when the MCP server is redeployed, so they
+  are cached per ``(server_url, tool_policy)`` and tagged with the server
+  version reported by ``initialize()`` plus a TTL;
+- sessions are pooled per ``(server_url, user)``. The backend mints a new
+  access token for every run, so the user is taken from the JWT ``user_id``
+  claim (ai-service only accepts headers from the trusted backend). A pooled
+  session keeps the token it was opened with and is retired before that
+  token expires.
+
+anyio task groups inside ``streamablehttp_client`` must be entered and
+exited from the same task, so each pooled session is owned by a dedicated
+background task; runs only borrow the ``ClientSession`` handle, which is
+safe for concurrent requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.types import Tool
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Retire a pooled session this long before its access token expires so an
+# in-flight run never outlives the credential it is using.
+_TOKEN_EXPIRY_MARGIN_SECONDS = 15 * 60
+
+
+def _decode_jwt_claims(authorization_header: str | None) -> dict[str, Any]:
+    """Best-effort, *unverified* decode of a ``Bearer <jwt>`` payload.
+
+    Only used to derive pool keys and expiry; the MCP server still verifies
+    the token on every request.
+    """
+    if not authorization_header:
+        return {}
+    _, _, token = authorization_header.partition(" ")
+    parts = (token or authorization_header).split(".")
+    if len(parts) != 3:
+        return {}
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload.encode("ascii")))
+    except (ValueError, UnicodeError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def _principal_key(authorization_header: str | None) -> str:
+    claims = _decode_jwt_claims(authorization_header)
+    user_id = claims.get("user_id")
+    if user_id is not None:
+        return f"user:{user_id}"
+    if not authorization_header:
+        return "anonymous"
+    # Opaque (e.g. OAuth) tokens: only reuse for the exact same credential.
+    digest = hashlib.sha256(authorization_header.encode("utf-8")).hexdigest()
+    return f"token:{digest[:32]}"
+
+
+def tool_policy_fingerprint(tool_policy: dict[str, Any] | None) -> str:
+    """Stable hash of a run's tool policy for cache keys."""
+    if not tool_policy:
+        return ""
+    encoded = json.dumps(tool_policy, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class PooledMCPSession:
+    """One initialized MCP session owned by a background task."""
+
+    def __init__(
+        self,
+        *,
+        key: tuple[str, str],
+        server_url: str,
+        authorization_header: str | None,
+    ) -> None:
+        self.key = key
+        self._server_url = server_url
+        self._authorization_header = authorization_header
+        self.session: ClientSession | None = None
+        self.server_version: str | None = None
+        self.in_use = 0
+        self.broken = False
+        self.last_used = time.monotonic()
+        exp = _decode_jwt_claims(authorization_header).get("exp")
+        self.expires_at: float | None = float(exp) if isinstance(exp, (int, float)) else None
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error: BaseException | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self.session is not None
+            and not self.broken
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    def is_reusable(self) -> bool:
+        """Whether a run may borrow this session (token not near expiry)."""
+        if not self.alive:
+            return False
+        if self.expires_at is not None:
+            if self.expires_at - time.time() < _TOKEN_EXPIRY_MARGIN_SECONDS:
+                return False
+        return True
+
+    async def start(self, *, initialize_timeout: float) -> None:
+        self._task = asyncio.create_task(self._own_session())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=initialize_timeout)
+        except TimeoutError:
+            await self.close()
+            raise
+        if self._error is not None:
+            raise self._error
+        if self.session is None:
+            raise RuntimeError("MCP session closed during initialize")
+
+    async def _own_session(self) -> None:
+        headers: dict[str, str] = {}
+        if self._authorization_header:
+            headers["Authorization"] = self._authorization_header
+        try:
+            async with streamablehttp_client(
+                self._server_url,
+                headers=headers or None,
+            ) as (read_stream, write_stream, _):
+                async with ClientSession(read_stream, write_stream) as session:
+                    init_result = await session.initialize()
+                    server_info = getattr(init_result, "serverInfo", None)
+                    self.server_version = getattr(server_info, "version", None)
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:
+            if not self._ready.is_set():
+                self._error = exc
+            else:
+                # MCP client may send a cleanup request during close; ignore
+                # errors (e.g. 401 on the teardown POST).
+                logger.debug("Pooled MCP session closed with error (ignored): %s", exc)
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def close(self) -> None:
+        self._closing.set()
+        task = self._task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=5.0)
+        except TimeoutError:
+            task.cancel()
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        except Exception as exc:
+            logger.debug("Pooled MCP session close error (ignored): %s", exc)
+
+
+class MCPSessionPool:
+    """Reuse authenticated MCP sessions across runs of the same user."""
+
+    def __init__(self, *, idle_ttl_seconds: float, max_sessions: int) -> None:
+        self._idle_ttl_seconds = idle_ttl_seconds
+        self._max_sessions = max(1, max_sessions)
+        self._sessions: dict[tuple[str, str], PooledMCPSession] = {}
+        self._key_locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self._retiring: set[PooledMCPSession] = set()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def acquire(
+        self,
+        *,
+        server_url: str,
+        authorization_header: str | None,
+        initialize_timeout: float,
+    ) -> PooledMCPSession:
+        key = (server_url, _principal_key(authorization_header))
+        await self._evict_stale()
+        lock = self._key_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._sessions.get(key)
+            if entry is not None and not entry.is_reusable():
+                self._retire(entry)
+                entry = None
+            if entry is None:
+                entry = PooledMCPSession(
+                    key=key,
+                    server_url=server_url,
+                    authorization_header=authorization_header,
+                )
+                await entry.start(initialize_timeout=initialize_timeout)
+                self._sessions[key] = entry
+                logger.info(
+                    "mcp_pool opened session key=%s pool_size=%d",
+                    key[1],
+                    len(self._sessions),
+                )
+            entry.in_use += 1
+            entry.last_used = time.monotonic()
+            return entry
+
+    async def release(self, entry: PooledMCPSession) -> None:
+        entry.in_use = max(0, entry.in_use - 1)
+        entry.last_used = time.monotonic()
+        if entry.broken and self._sessions.get(entry.key) is entry:
+            self._retire(entry)
+        if entry in self._retiring and entry.in_use == 0:
+            self._retiring.discard(entry)
+            await entry.close()
+
+    def _retire(self, entry: PooledMCPSession) -> None:
+        if self._sessions.get(entry.key) is entry:
+            del self._sessions[entry.key]
+        self._retiring.add(entry)
+
+    async def _evict_stale(self) -> None:
+        now = time.monotonic()
+        idle = [
+            entry
+            for entry in self._sessions.values()
+            if entry.in_use == 0
+            and (not entry.alive or now - entry.last_used > self._idle_ttl_seconds)
+        ]
+        overflow = len(self._sessions) - len(idle) - self._max_sessions + 1
+        if overflow > 0:
+            unused = sorted(
+                (
+                    e
+                    for e in self._sessions.values()
+                    if e.in_use == 0 and e not in idle
+                ),
+                key=lambda e: e.last_used,
+            )
+            idle.extend(unused[:overflow])
+        for entry in idle:
+            self._retire(entry)
+        closable = [e for e in self._retiring if e.in_use == 0]
+        for entry in closable:
+            self._retiring.discard(entry)
+            await entry.close()
+
+    async def close(self) -> None:
+        entries = list(self._sessions.values()) + list(self._retiring)
+        self._sessions.clear()
+        self._retiring.clear()
+        self._key_locks.clear()
+        for entry in entries:
+            await entry.close()
+
+
+@dataclass
+class _CachedToolset:
+    tools: list[Tool]
+    server_version: str | None
+    fetched_at: float = field(default_factory=time.monotonic)
+
+
+class MCPToolDefinitionCache:
+    """TTL + server-version cache of ``list_tools()`` results."""
+
+    def __init__(self, *, ttl_seconds: float) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._entries: dict[tuple[str, str], _CachedToolset] = {}
+
+    def get(
+        self,
+        *,
+        server_url: str,
+        tool_policy: dict[str, Any] | None,
+        server_version: str | None,
+    ) -> list[Tool] | None:
+        key = (server_url, tool_policy_fingerprint(tool_policy))
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        expired = time.monotonic() - cached.fetched_at > self._ttl_seconds
+        if expired or cached.server_version != server_version:
+            self._entries.pop(key, None)
+            return None
+        return list(cached.tools)
+
+    def put(
+        self,
+        *,
+        server_url: str,
+        tool_policy: dict[str, Any] | None,
+        server_version: str | None,
+        tools: list[Tool],
+    ) -> None:
+        key = (server_url, tool_policy_fingerprint(tool_policy))
+        self._entries[key] = _CachedToolset(
+            tools=list(tools),
+            server_version=server_version,
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_SESSION_POOL: MCPSessionPool | None = None
+_TOOL_CACHE: MCPToolDefinitionCache | None = None
+
+
+def get_session_pool() -> MCPSessionPool:
+    """Return the process-wide MCP session pool."""
+    global _SESSION_POOL
+    if _SESSION_POOL is None:
+        settings = get_settings()
+        _SESSION_POOL = MCPSessionPool(
+            idle_ttl_seconds=settings.mcp_session_idle_ttl_seconds,
+            max_sessions=settings.mcp_session_pool_max_size,
+        )
+    return _SESSION_POOL
+
+
+def get_tool_cache() -> MCPToolDefinitionCache:
+    """Return the process-wide MCP tool-definition cache."""
+    global _TOOL_CACHE
+    if _TOOL_CACHE is None:
+        _TOOL_CACHE = MCPToolDefinitionCache(
+            ttl_seconds=get_settings().mcp_tool_cache_ttl_seconds,
+        )
+    return _TOOL_CACHE
+
+
+async def close_shared_pool() -> None:
+    """Close every pooled session (called on ai-service shutdown)."""
+    global _SESSION_POOL
+    pool, _SESSION_POOL = _SESSION_POOL, None
+    if pool is not None:
+        await pool.close()
+
+
+def reset_pool_for_tests() -> None:
+    """Test helper: drop the shared pool and tool cache without closing."""
+    global _SESSION_POOL, _TOOL_CACHE
+    _SESSION_POOL = None
+    _TOOL_CACHE = None
@@ -13,6 +13,13 @@ from mcp.client.streamable_http import streamablehttp_client
 from mcp.types import CallToolResult, Tool
 
 from config import get_settings
+from services.mcp_session_pool import (
+    MCPSessionPool,
+    MCPToolDefinitionCache,
+    PooledMCPSession,
+    get_session_pool,
+    get_tool_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +36,12 @@ def _preview_for_log(value: Any, *, limit: int = 500) -> str:
 
 
 class MCPToolProvider:
-    """Connect to QJudge MCP and expose tools as LangChain tools."""
+    """Connect to QJudge MCP and expose tools as LangChain tools.
+
+    With a ``pool`` the session is borrowed from an :class:`MCPSessionPool`
+    instead of being opened per run, and ``tool_cache`` skips ``list_tools()``
+    when the server version and TTL still match. See :meth:`shared`.
+    """
 
     def __init__(
         self,
@@ -37,15 +49,56 @@ class MCPToolProvider:
         server_url: str,
         authorization_header: str | None = None,
         tool_policy: dict[str, Any] | None = None,
+        pool: MCPSessionPool | None = None,
+        tool_cache: MCPToolDefinitionCache | None = None,
     ) -> None:
         self._server_url = server_url
         self._authorization_header = authorization_header
         self._tool_policy = tool_policy or {}
+        self._pool = pool
+        self._tool_cache = tool_cache
         self._stack: AsyncExitStack | None = None
         self._session: ClientSession | None = None
+        self._lease: PooledMCPSession | None = None
+        self._server_version: str | None = None
+
+    @classmethod
+    def shared(
+        cls,
+        *,
+        server_url: str,
+        authorization_header: str | None = None,
+        tool_policy: dict[str, Any] | None = None,
+    ) -> "MCPToolProvider":
+        """Build a provider wired to the process-wide pool and tool cache."""
+        settings = get_settings()
+        if not settings.mcp_session_pool_enabled:
+            return cls(
+                server_url=server_url,
+                authorization_header=authorization_header,
+                tool_policy=tool_policy,
+            )
+        return cls(
+            server_url=server_url,
+            authorization_header=authorization_header,
+            tool_policy=tool_policy,
+            pool=get_session_pool(),
+            tool_cache=get_tool_cache(),
+        )
 
     async def __aenter__(self) -> "MCPToolProvider":
         settings = get_settings()
+        if self._pool is not None:
+            lease = await self._pool.acquire(
+                server_url=self._server_url,
+                authorization_header=self._authorization_header,
+                initialize_timeout=max(0.5, settings.mcp_initialize_timeout_seconds),
+            )
+            self._lease = lease
+            self._session = lease.session
+            self._server_version = lease.server_version
+            return self
+
         stack = AsyncExitStack()
         headers: dict[str, str] = {}
         if self._authorization_header:
@@ -59,16 +112,25 @@ class MCPToolProvider:
         )
         session = ClientSession(read_stream, write_stream)
         await stack.enter_async_context(session)
-        await asyncio.wait_for(
+        init_result = await asyncio.wait_for(
             session.initialize(),
             timeout=max(0.5, settings.mcp_initialize_timeout_seconds),
         )
 
         self._stack = stack
         self._session = session
+        self._server_version = getattr(
+            getattr(init_result, "serverInfo", None), "version", None
+        )
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._lease is not None:
+            lease, self._lease = self._lease, None
+            self._session = None
+            if self._pool is not None:
+                await self._pool.release(lease)
+            return
         if self._stack is not None:
             try:
                 await self._stack.aclose()
@@ -81,6 +143,15 @@ class MCPToolProvider:
 
     async def load_tools(self) -> list[BaseTool]:
         """Load all MCP tool definitions and wrap them for LangChain."""
+        if self._tool_cache is not None:
+            cached = self._tool_cache.get(
+                server_url=self._server_url,
+                tool_policy=self._tool_policy,
+                server_version=self._server_version,
+            )
+            if cached is not None:
+                return [self._build_langchain_tool(tool) for tool in cached]
+
         settings = get_settings()
         session = self._require_session()
         tools: list[Tool] = []
@@ -96,6 +167,13 @@ class MCPToolProvider:
             if not cursor:
                 break
 
+        if self._tool_cache is not None:
+            self._tool_cache.put(
+                server_url=self._server_url,
+                tool_policy=self._tool_policy,
+                server_version=self._server_version,
+                tools=tools,
+            )
         return [self._build_langchain_tool(tool) for tool in tools]
 
     def _build_langchain_tool(self, tool_def: Tool) -> BaseTool:
@@ -115,6 +193,9 @@ class MCPToolProvider:
             try:
                 result = await self._call_tool(tool_def.name, kwargs or None)
             except Exception as exc:
+                if self._lease is not None and not isinstance(exc, TimeoutError):
+                    # Don't hand a possibly-dead transport to the next run.
+                    self._lease.broken = True
                 detail = f"{type(exc).__name__}: {exc!r}"
                 logger.exception(
                     "mcp_tool %s transport exception args=%s detail=%s",
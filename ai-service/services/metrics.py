@@ -0,0 +1,59 @@
+"""Prometheus metrics for the AI service.
+
+Exposed on ``GET /metrics``. ``uvicorn --workers N`` runs one registry per
+worker process; setting ``PROMETHEUS_MULTIPROC_DIR`` (see docker-compose)
+makes every worker write to a shared directory that :func:`render_metrics`
+aggregates, so a scrape sees the whole service regardless of which worker
+answers it.
+"""
+
+from __future__ import annotations
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+_WAIT_BUCKETS = (0.0, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+TPM_GATE_WAIT = Histogram(
+    "qjudge_ai_tpm_gate_wait_seconds",
+    "Time a model call spent waiting for the TPM budget gate.",
+    ["model"],
+    buckets=_WAIT_BUCKETS,
+)
+STREAMS_ACTIVE = Gauge(
+    "qjudge_ai_streams_active",
+    "SSE streams currently holding a concurrency slot.",
+    multiprocess_mode="livesum",
+)
+STREAM_SLOT_WAIT = Histogram(
+    "qjudge_ai_stream_slot_wait_seconds",
+    "Time spent acquiring a stream concurrency slot.",
+    buckets=_WAIT_BUCKETS,
+)
+STREAMS_REJECTED = Counter(
+    "qjudge_ai_streams_rejected_total",
+    "Streams rejected with 503 because no concurrency slot freed up in time.",
+)
+TOKENS = Counter(
+    "qjudge_ai_tokens_total",
+    "Model tokens reported by on_chat_model_end events.",
+    ["model", "kind"],
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the exposition payload and its content type."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
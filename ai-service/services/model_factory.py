@@ -159,6 +159,14 @@ MODEL_MAX_INPUT_TOKENS: dict[str, int] = {
 
 # Summarization controls derived from model table.
 SUMMARIZATION_TRIGGER_FRACTION = 0.70
+# Canonical model ID -> prompt budget (tokens) at which to compact, for
+# models whose throughput is bounded by TPM rather than context size. Each
+# model turn re-sends the whole prompt, so compacting at ~80K instead of
+# 70% of a 272K window keeps several grading calls per minute within quota.
+MODEL_SUMMARIZATION_TRIGGER_TOKENS: dict[str, int] = {
+    "openai-mini": 80_000,
+    "openai-mini-medium": 80_000,
+}
 MODEL_SUMMARY_TRIM_TOKENS: dict[str, int] = {
     "openai-nano": 12_000,
     "openai-mini": 12_000,
@@ -350,6 +358,11 @@ class ModelFactory:
             ModelFactory.get_summary_trim_tokens(model_id),
         )
         setattr(model, "_qjudge_summarization_trigger_fraction", SUMMARIZATION_TRIGGER_FRACTION)
+        setattr(
+            model,
+            "_qjudge_summarization_trigger_tokens",
+            MODEL_SUMMARIZATION_TRIGGER_TOKENS.get(model_id),
+        )
         return model
 
     @staticmethod
@@ -0,0 +1,220 @@
+"""Prompt-size-aware context handling for DeepAgent model calls.
+
+Grading runs routinely send 50–80K prompt tokens per model call, and the
+OpenAI side is bounded by a 200K TPM quota (see ``tpm_gate``). This
+middleware trims what is actually sent on every model turn without
+touching the checkpointed conversation:
+
+- repeated large tool results (e.g. the same ``artifact_read`` or
+  ``list_answers`` output fetched twice in one thread) are replaced by a
+  short reference to the first copy. The first copy is kept so the
+  request prefix stays byte-identical across turns;
+- the stable prefix (system prompt + tool schemas) is fingerprinted and
+  sent as ``prompt_cache_key`` for OpenAI models so consecutive calls are
+  routed to the same prompt cache. DeepSeek caches repeated prefixes
+  automatically, so it only benefits from the prefix staying stable;
+- the estimated prompt footprint is tracked per thread for logging and
+  so callers can see how much each optimisation saves.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain.agents.middleware.types import AgentMiddleware, ContextT, StateT
+from langchain_core.messages import ToolMessage
+
+from services.tpm_gate import estimate_input_tokens
+
+logger = logging.getLogger(__name__)
+
+# Tool results shorter than this are cheaper to resend than to reference.
+DEFAULT_DEDUP_MIN_CHARS = 2_000
+_MAX_TRACKED_THREADS = 1_024
+
+
+@dataclass
+class ContextFootprint:
+    """Last observed prompt size for a thread (char/4 estimates)."""
+
+    prompt_tokens: int = 0
+    prefix_tokens: int = 0
+    deduplicated_tokens: int = 0
+    model_calls: int = 0
+    updated_at: float = field(default_factory=time.monotonic)
+
+
+_FOOTPRINTS: OrderedDict[str, ContextFootprint] = OrderedDict()
+
+
+def get_thread_footprint(thread_id: str) -> ContextFootprint | None:
+    """Return the tracked footprint for a thread, if any."""
+    return _FOOTPRINTS.get(thread_id)
+
+
+def _record_footprint(
+    thread_id: str,
+    *,
+    prompt_tokens: int,
+    prefix_tokens: int,
+    deduplicated_tokens: int,
+) -> ContextFootprint:
+    footprint = _FOOTPRINTS.pop(thread_id, None) or ContextFootprint()
+    footprint.prompt_tokens = prompt_tokens
+    footprint.prefix_tokens = prefix_tokens
+    footprint.deduplicated_tokens = deduplicated_tokens
+    footprint.model_calls += 1
+    footprint.updated_at = time.monotonic()
+    _FOOTPRINTS[thread_id] = footprint
+    while len(_FOOTPRINTS) > _MAX_TRACKED_THREADS:
+        _FOOTPRINTS.popitem(last=False)
+    return footprint
+
+
+def reset_footprints_for_tests() -> None:
+    """Test helper: clear the per-thread footprint registry."""
+    _FOOTPRINTS.clear()
+
+
+def _tool_schema(tool: Any) -> Any:
+    if isinstance(tool, dict):
+        return tool
+    schema = getattr(tool, "tool_call_schema", None) or getattr(tool, "args_schema", None)
+    if hasattr(schema, "model_json_schema"):
+        try:
+            schema = schema.model_json_schema()
+        except Exception:
+            schema = None
+    elif not isinstance(schema, dict):
+        schema = None
+    return {
+        "name": getattr(tool, "name", ""),
+        "description": getattr(tool, "description", ""),
+        "schema": schema,
+    }
+
+
+def stable_prefix_fingerprint(system_text: str, tools: list[Any]) -> str:
+    """Hash of the parts of a request that do not change between turns."""
+    payload = json.dumps(
+        {"system": system_text, "tools": [_tool_schema(t) for t in tools]},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def deduplicate_tool_results(
+    messages: list[Any],
+    *,
+    min_chars: int = DEFAULT_DEDUP_MIN_CHARS,
+) -> tuple[list[Any], int]:
+    """Replace repeated large ``ToolMessage`` bodies with a reference.
+
+    Returns the (possibly) rewritten message list and the estimated number
+    of tokens removed. The original list is never mutated.
+    """
+    first_seen: dict[str, ToolMessage] = {}
+    rewritten: list[Any] | None = None
+    saved_tokens = 0
+    for index, message in enumerate(messages):
+        if not isinstance(message, ToolMessage):
+            continue
+        content = message.content
+        if not isinstance(content, str) or len(content) < min_chars:
+            continue
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        original = first_seen.get(digest)
+        if original is None:
+            first_seen[digest] = message
+            continue
+        reference = (
+            f"[Identical to the earlier {original.name or 'tool'} result "
+            f"(tool_call_id={original.tool_call_id}); omitted to save context.]"
+        )
+        if rewritten is None:
+            rewritten = list(messages)
+        rewritten[index] = message.model_copy(update={"content": reference})
+        saved_tokens += estimate_input_tokens(content) - estimate_input_tokens(reference)
+    return (rewritten if rewritten is not None else messages), saved_tokens
+
+
+def _current_thread_id() -> str | None:
+    try:
+        from langgraph.config import get_config
+
+        configurable = get_config().get("configurable") or {}
+    except Exception:
+        return None
+    thread_id = configurable.get("thread_id")
+    return str(thread_id) if thread_id else None
+
+
+class PromptContextMiddleware(AgentMiddleware[StateT, ContextT]):
+    """Trim and tag each model request before it reaches the provider."""
+
+    def __init__(
+        self,
+        *,
+        dedup_min_chars: int = DEFAULT_DEDUP_MIN_CHARS,
+        prompt_cache: bool = True,
+    ) -> None:
+        super().__init__()
+        self.dedup_min_chars = dedup_min_chars
+        self.prompt_cache = prompt_cache
+
+    def _prepare(self, request: Any) -> Any:
+        messages, saved_tokens = deduplicate_tool_results(
+            list(request.messages),
+            min_chars=self.dedup_min_chars,
+        )
+        system_text = ""
+        if request.system_message is not None:
+            system_text = request.system_message.text
+        overrides: dict[str, Any] = {}
+        if saved_tokens > 0:
+            overrides["messages"] = messages
+
+        model_id = getattr(request.model, "_qjudge_model_id", "") or ""
+        if self.prompt_cache and model_id.startswith("openai-"):
+            cache_key = "qjudge-" + stable_prefix_fingerprint(system_text, list(request.tools))
+            if request.model_settings.get("prompt_cache_key") != cache_key:
+                overrides["model_settings"] = {
+                    **request.model_settings,
+                    "prompt_cache_key": cache_key,
+                }
+
+        thread_id = _current_thread_id()
+        if thread_id is not None:
+            prefix_tokens = estimate_input_tokens(system_text) + estimate_input_tokens(
+                json.dumps([_tool_schema(t) for t in request.tools], default=str)
+            )
+            footprint = _record_footprint(
+                thread_id,
+                prompt_tokens=prefix_tokens + estimate_input_tokens(messages),
+                prefix_tokens=prefix_tokens,
+                deduplicated_tokens=saved_tokens,
+            )
+            logger.debug(
+                "prompt_context thread=%s prompt_tokens~%d prefix_tokens~%d deduplicated~%d",
+                thread_id,
+                footprint.prompt_tokens,
+                footprint.prefix_tokens,
+                saved_tokens,
+            )
+        if saved_tokens > 0:
+            logger.info("prompt_context deduplicated ~%d tokens of repeated tool output", saved_tokens)
+
+        return request.override(**overrides) if overrides else request
+
+    def wrap_model_call(self, request: Any, handler: Any) -> Any:
+        return handler(self._prepare(request))
+
+    async def awrap_model_call(self, request: Any, handler: Any) -> Any:
+        return await handler(self._prepare(request))
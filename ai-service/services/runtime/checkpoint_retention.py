@@ -0,0 +1,297 @@
+"""Retention policy and background compaction for LangGraph checkpoints.
+
+``AsyncPostgresSaver`` writes a full checkpoint for every super-step of
+every thread and never deletes anything, so the ``checkpoints`` /
+``checkpoint_writes`` / ``checkpoint_blobs`` tables grow without bound.
+Runs only ever resume from the latest checkpoint (or a pending HITL
+interrupt), so older history is dead weight.
+
+Per ``(thread_id, checkpoint_ns)`` the pruner keeps:
+
+- the newest ``keep_last`` checkpoints;
+- every checkpoint that carries a pending ``__interrupt__`` write, so an
+  approval / ask-user pause can always be resumed.
+
+Blobs no longer referenced by a surviving checkpoint's
+``channel_versions`` are removed afterwards. Only threads idle for at
+least ``min_idle_seconds`` are compacted in the background, so a run
+that is writing checkpoints is never pruned underneath itself.
+
+Every worker process starts the background loop; a Postgres advisory lock
+lets only one of them compact per cycle. Each cycle inspects the next
+``batch_size`` threads in thread-id order and wraps around at the end.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_INTERRUPT_CHANNEL = "__interrupt__"
+
+_PRUNE_CHECKPOINTS_SQL = """
+WITH ranked AS (
+    SELECT checkpoint_ns, checkpoint_id,
+           row_number() OVER (
+               PARTITION BY checkpoint_ns ORDER BY checkpoint_id DESC
+           ) AS rn
+    FROM checkpoints
+    WHERE thread_id = %(thread_id)s
+), doomed AS (
+    SELECT r.checkpoint_ns, r.checkpoint_id
+    FROM ranked r
+    WHERE r.rn > %(keep_last)s
+      AND NOT EXISTS (
+          SELECT 1 FROM checkpoint_writes w
+          WHERE w.thread_id = %(thread_id)s
+            AND w.checkpoint_ns = r.checkpoint_ns
+            AND w.checkpoint_id = r.checkpoint_id
+            AND w.channel = %(interrupt_channel)s
+      )
+), deleted_writes AS (
+    DELETE FROM checkpoint_writes w
+    USING doomed d
+    WHERE w.thread_id = %(thread_id)s
+      AND w.checkpoint_ns = d.checkpoint_ns
+      AND w.checkpoint_id = d.checkpoint_id
+)
+DELETE FROM checkpoints c
+USING doomed d
+WHERE c.thread_id = %(thread_id)s
+  AND c.checkpoint_ns = d.checkpoint_ns
+  AND c.checkpoint_id = d.checkpoint_id
+"""
+
+_PRUNE_BLOBS_SQL = """
+DELETE FROM checkpoint_blobs b
+WHERE b.thread_id = %(thread_id)s
+  AND NOT EXISTS (
+      SELECT 1
+      FROM checkpoints c,
+           jsonb_each_text(c.checkpoint -> 'channel_versions') AS v(channel, version)
+      WHERE c.thread_id = b.thread_id
+        AND c.checkpoint_ns = b.checkpoint_ns
+        AND v.channel = b.channel
+        AND v.version = b.version
+  )
+"""
+
+# Walks the primary-key index one window of threads at a time, so a cycle
+# only counts (index-only) and reads the newest checkpoint of at most
+# ``limit`` threads instead of aggregating the whole table.
+_CANDIDATE_THREADS_SQL = """
+WITH scan AS (
+    SELECT DISTINCT thread_id
+    FROM checkpoints
+    WHERE thread_id > %(after)s
+    ORDER BY thread_id
+    LIMIT %(limit)s
+)
+SELECT s.thread_id,
+       (
+           SELECT count(*) FROM checkpoints c WHERE c.thread_id = s.thread_id
+       ) > %(keep_last)s
+       AND (
+           SELECT c.checkpoint ->> 'ts'
+           FROM checkpoints c
+           WHERE c.thread_id = s.thread_id
+           ORDER BY c.checkpoint_id DESC
+           LIMIT 1
+       ) < %(idle_before)s AS prunable
+FROM scan s
+ORDER BY s.thread_id
+"""
+
+_TRY_LOCK_SQL = "SELECT pg_try_advisory_lock(hashtext(%(key)s))"
+_UNLOCK_SQL = "SELECT pg_advisory_unlock(hashtext(%(key)s))"
+_COMPACTION_LOCK_KEY = "ai_service.checkpoint_compaction"
+
+_THREAD_STATS_SQL = """
+SELECT c.thread_id,
+       c.checkpoints,
+       c.checkpoint_bytes,
+       coalesce(b.blob_bytes, 0) AS blob_bytes,
+       coalesce(w.write_bytes, 0) AS write_bytes
+FROM (
+    SELECT thread_id,
+           count(*) AS checkpoints,
+           sum(pg_column_size(checkpoint) + pg_column_size(metadata)) AS checkpoint_bytes
+    FROM checkpoints
+    {where}
+    GROUP BY thread_id
+) c
+LEFT JOIN (
+    SELECT thread_id, sum(coalesce(octet_length(blob), 0)) AS blob_bytes
+    FROM checkpoint_blobs
+    {where}
+    GROUP BY thread_id
+) b ON b.thread_id = c.thread_id
+LEFT JOIN (
+    SELECT thread_id, sum(octet_length(blob)) AS write_bytes
+    FROM checkpoint_writes
+    {where}
+    GROUP BY thread_id
+) w ON w.thread_id = c.thread_id
+ORDER BY c.checkpoint_bytes + coalesce(b.blob_bytes, 0) + coalesce(w.write_bytes, 0) DESC
+LIMIT %(limit)s
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class CheckpointRetentionPolicy:
+    keep_last: int = 20
+    min_idle_seconds: float = 900.0
+    batch_size: int = 200
+
+
+@dataclass(frozen=True, slots=True)
+class PruneResult:
+    thread_id: str
+    checkpoints_deleted: int
+    blobs_deleted: int
+
+
+@dataclass(frozen=True, slots=True)
+class ThreadCheckpointStats:
+    thread_id: str
+    checkpoints: int
+    checkpoint_bytes: int
+    blob_bytes: int
+    write_bytes: int
+
+    @property
+    def total_bytes(self) -> int:
+        return self.checkpoint_bytes + self.blob_bytes + self.write_bytes
+
+
+class CheckpointPruner:
+    """Apply :class:`CheckpointRetentionPolicy` to the checkpoint tables."""
+
+    def __init__(self, *, pool: Any, policy: CheckpointRetentionPolicy) -> None:
+        if pool is None:
+            raise RuntimeError("CheckpointPruner requires an open connection pool")
+        self._pool = pool
+        self._policy = policy
+        self._scan_after = ""
+
+    @property
+    def policy(self) -> CheckpointRetentionPolicy:
+        return self._policy
+
+    async def prune_thread(self, thread_id: str) -> PruneResult:
+        params = {
+            "thread_id": thread_id,
+            "keep_last": max(1, self._policy.keep_last),
+            "interrupt_channel": _INTERRUPT_CHANNEL,
+        }
+        async with self._pool.connection() as conn:
+            async with conn.transaction():
+                cur = await conn.execute(_PRUNE_CHECKPOINTS_SQL, params)
+                checkpoints_deleted = max(0, cur.rowcount or 0)
+                blobs_deleted = 0
+                if checkpoints_deleted:
+                    cur = await conn.execute(_PRUNE_BLOBS_SQL, {"thread_id": thread_id})
+                    blobs_deleted = max(0, cur.rowcount or 0)
+        return PruneResult(
+            thread_id=thread_id,
+            checkpoints_deleted=checkpoints_deleted,
+            blobs_deleted=blobs_deleted,
+        )
+
+    async def candidate_threads(self) -> list[str]:
+        """Prunable threads in the next scan window (advances the window)."""
+        idle_before = datetime.now(timezone.utc) - timedelta(
+            seconds=self._policy.min_idle_seconds
+        )
+        limit = max(1, self._policy.batch_size)
+        params = {
+            "after": self._scan_after,
+            "keep_last": max(1, self._policy.keep_last),
+            "idle_before": idle_before.isoformat(),
+            "limit": limit,
+        }
+        async with self._pool.connection() as conn:
+            cur = await conn.execute(_CANDIDATE_THREADS_SQL, params)
+            rows = await cur.fetchall()
+        # A short window means the end of the table; start over next cycle.
+        self._scan_after = _row_value(rows[-1], "thread_id", 0) if len(rows) == limit else ""
+        return [_row_value(row, "thread_id", 0) for row in rows if _row_value(row, "prunable", 1)]
+
+    async def compact_once(self) -> list[PruneResult]:
+        """Prune one batch of idle threads that exceed the retention limit."""
+        results: list[PruneResult] = []
+        for thread_id in await self.candidate_threads():
+            try:
+                results.append(await self.prune_thread(thread_id))
+            except Exception as exc:
+                logger.warning("Checkpoint prune failed for thread %s: %s", thread_id, exc)
+        if results:
+            logger.info(
+                "checkpoint compaction pruned threads=%d checkpoints=%d blobs=%d",
+                len(results),
+                sum(r.checkpoints_deleted for r in results),
+                sum(r.blobs_deleted for r in results),
+            )
+        return results
+
+    async def compact_exclusive(self) -> list[PruneResult] | None:
+        """Run :meth:`compact_once` unless another process is compacting.
+
+        Returns ``None`` when the advisory lock is held elsewhere.
+        """
+        params = {"key": _COMPACTION_LOCK_KEY}
+        async with self._pool.connection() as conn:
+            cur = await conn.execute(_TRY_LOCK_SQL, params)
+            row = await cur.fetchone()
+            if not row or not _row_value(row, "pg_try_advisory_lock", 0):
+                return None
+            try:
+                return await self.compact_once()
+            finally:
+                await conn.execute(_UNLOCK_SQL, params)
+
+    async def thread_stats(
+        self,
+        *,
+        thread_id: str | None = None,
+        limit: int = 20,
+    ) -> list[ThreadCheckpointStats]:
+        """Per-thread checkpoint footprint, largest first."""
+        where = "WHERE thread_id = %(thread_id)s" if thread_id else ""
+        sql = _THREAD_STATS_SQL.format(where=where)
+        params = {"thread_id": thread_id, "limit": max(1, limit)}
+        async with self._pool.connection() as conn:
+            cur = await conn.execute(sql, params)
+            rows = await cur.fetchall()
+        return [
+            ThreadCheckpointStats(
+                thread_id=_row_value(row, "thread_id", 0),
+                checkpoints=int(_row_value(row, "checkpoints", 1) or 0),
+                checkpoint_bytes=int(_row_value(row, "checkpoint_bytes", 2) or 0),
+                blob_bytes=int(_row_value(row, "blob_bytes", 3) or 0),
+                write_bytes=int(_row_value(row, "write_bytes", 4) or 0),
+            )
+            for row in rows
+        ]
+
+    async def run_forever(self, *, interval_seconds: float) -> None:
+        """Background loop: compact a batch, then sleep ``interval_seconds``."""
+        while True:
+            try:
+                await self.compact_exclusive()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Checkpoint compaction cycle failed: %s", exc)
+            await asyncio.sleep(interval_seconds)
+
+
+def _row_value(row: Any, key: str, index: int) -> Any:
+    if isinstance(row, dict):
+        return row[key]
+    return row[index]
@@ -6,12 +6,14 @@ from collections.abc import Mapping
 from typing import Any, Callable
 
 from services.event_adapter import UsageReport
+from services.metrics import TOKENS
 
 
 class UsageAccumulator:
     """Collect model token usage from LangGraph `on_chat_model_end` events."""
 
-    def __init__(self) -> None:
+    def __init__(self, model_id: str = "") -> None:
+        self._model_id = model_id
         self._total_input_tokens = 0
         self._total_output_tokens = 0
 
@@ -35,8 +37,12 @@ class UsageAccumulator:
         if not isinstance(usage_metadata, Mapping):
             return
 
-        self._total_input_tokens += int(usage_metadata.get("input_tokens", 0) or 0)
-        self._total_output_tokens += int(usage_metadata.get("output_tokens", 0) or 0)
+        input_tokens = int(usage_metadata.get("input_tokens", 0) or 0)
+        output_tokens = int(usage_metadata.get("output_tokens", 0) or 0)
+        self._total_input_tokens += input_tokens
+        self._total_output_tokens += output_tokens
+        TOKENS.labels(self._model_id, "input").inc(input_tokens)
+        TOKENS.labels(self._model_id, "output").inc(output_tokens)
 
     def build_usage_report(
         self,
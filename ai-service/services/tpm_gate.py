@@ -31,6 +31,8 @@ from collections import deque
 from dataclasses import dataclass, field
 from typing import Any, Deque, Iterable
 
+from services.metrics import TPM_GATE_WAIT
+
 logger = logging.getLogger(__name__)
 
 _WINDOW_SECONDS = 60.0
@@ -97,6 +99,8 @@ class TpmBudget:
 
     tpm_limit: int
     safety_fraction: float = 0.85
+    # Metrics label; the provider model string the budget is keyed by.
+    model: str = ""
     _usage: Deque[tuple[float, int]] = field(default_factory=deque, init=False)
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
 
@@ -110,6 +114,7 @@ class TpmBudget:
 
     async def wait(self, estimated_tokens: int) -> None:
         estimated = max(1, int(estimated_tokens))
+        started = time.monotonic()
         async with self._lock:
             while True:
                 now = time.monotonic()
@@ -117,6 +122,7 @@ class TpmBudget:
                 current = sum(t for _, t in self._usage)
                 if current + estimated <= self.safety_budget:
                     self._usage.append((now, estimated))
+                    TPM_GATE_WAIT.labels(self.model).observe(now - started)
                     return
                 # Sleep until the oldest entry expires, then re-evaluate.
                 oldest_age = now - self._usage[0][0]
@@ -142,7 +148,7 @@ def get_or_create_budget(provider_model_string: str, tpm_limit: int) -> TpmBudge
     """Return the shared TpmBudget for a provider model string."""
     budget = _BUDGETS.get(provider_model_string)
     if budget is None:
-        budget = TpmBudget(tpm_limit=tpm_limit)
+        budget = TpmBudget(tpm_limit=tpm_limit, model=provider_model_string)
         _BUDGETS[provider_model_string] = budget
         logger.info(
             "tpm_gate initialized for %s (limit=%d, safety=%d)",
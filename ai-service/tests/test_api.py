@@ -53,6 +53,11 @@ class _FakeRunner:
         yield {"type": "run_started", "run_id": "r2", "thread_id": kwargs["thread_id"]}
         yield {"type": "run_completed", "run_id": "r2"}
 
+    async def checkpoint_stats(self, **kwargs):
+        from services.runtime.checkpoint_retention import ThreadCheckpointStats
+
+        return [ThreadCheckpointStats("t1", 12, 1000, 5000, 200)]
+
 
 class _ErrorRunner:
     """Runner that raises deterministic errors for leak-safety tests."""
@@ -106,6 +111,37 @@ class TestHealthEndpoint:
         assert data["checkpoint_db"] in ["connected", "not_configured"]
 
 
+class TestMetricsEndpoint:
+    @pytest.fixture(autouse=True)
+    def _metrics_token(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "metrics_auth_token", "scrape-secret")
+        monkeypatch.setattr(get_settings(), "debug", False)
+
+    def test_metrics_reports_stream_slots(self, client):
+        client.post(
+            "/api/chat/stream",
+            headers=AUTH_HEADERS,
+            json={"content": "Hello", "conversation": []},
+        )
+        response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert "qjudge_ai_stream_slot_wait_seconds_count" in body
+        assert "qjudge_ai_streams_active 0.0" in body
+
+    def test_metrics_requires_the_token(self, client):
+        assert client.get("/metrics").status_code == 403
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 403
+
+    def test_metrics_fail_closed_without_a_token(self, client, monkeypatch):
+        monkeypatch.setattr(get_settings(), "metrics_auth_token", "")
+        assert client.get("/metrics").status_code == 403
+
+        monkeypatch.setattr(get_settings(), "debug", True)
+        assert client.get("/metrics").status_code == 200
+
+
 class TestRootEndpoint:
     def test_root(self, client):
         response = client.get("/")
@@ -236,3 +272,23 @@ class TestChatStreamEndpoint:
         assert response.status_code == 200
         assert "Resume failed" in response.text
         assert "sensitive-resume-error" not in response.text
+
+
+class TestCheckpointStatsEndpoint:
+    def test_requires_internal_auth(self, client):
+        response = client.get("/api/chat/checkpoints/stats")
+        assert response.status_code == 401
+
+    def test_returns_per_thread_sizes(self, client):
+        response = client.get("/api/chat/checkpoints/stats", headers=AUTH_HEADERS)
+        assert response.status_code == 200
+        assert response.json()["threads"] == [
+            {
+                "thread_id": "t1",
+                "checkpoints": 12,
+                "checkpoint_bytes": 1000,
+                "blob_bytes": 5000,
+                "write_bytes": 200,
+                "total_bytes": 6200,
+            }
+        ]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from services.runtime.checkpoint_retention import (
+    CheckpointPruner,
+    CheckpointRetentionPolicy,
+)
+
+
+class _Cursor:
+    def __init__(self, rows=None, rowcount: int = 0) -> None:
+        self._rows = rows or []
+        self.rowcount = rowcount
+
+    async def fetchall(self):
+        return self._rows
+
+    async def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+
+class _Connection:
+    def __init__(self, pool: "_Pool") -> None:
+        self._pool = pool
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, sql: str, params: dict):
+        self._pool.executed.append((sql, params))
+        if "WITH scan AS" in sql:
+            return _Cursor(rows=self._pool.window)
+        if "pg_try_advisory_lock" in sql:
+            return _Cursor(rows=[(self._pool.lock_free,)])
+        if "DELETE FROM checkpoints c" in sql:
+            return _Cursor(rowcount=self._pool.deleted.get(params["thread_id"], 0))
+        if "DELETE FROM checkpoint_blobs" in sql:
+            return _Cursor(rowcount=3)
+        return _Cursor()
+
+
+class _Pool:
+    def __init__(self, deleted: dict[str, int]) -> None:
+        self.executed: list[tuple[str, dict]] = []
+        self.deleted = deleted
+        self.window = [("t-big", True), ("t-idle-small", False), ("t-small", True)]
+        self.lock_free = True
+
+    @asynccontextmanager
+    async def connection(self):
+        yield _Connection(self)
+
+
+def test_compact_once_prunes_candidates_and_skips_blob_sweep_when_nothing_deleted():
+    pool = _Pool(deleted={"t-big": 40, "t-small": 0})
+    pruner = CheckpointPruner(
+        pool=pool,
+        policy=CheckpointRetentionPolicy(keep_last=5, min_idle_seconds=60),
+    )
+
+    results = asyncio.run(pruner.compact_once())
+
+    assert [(r.thread_id, r.checkpoints_deleted, r.blobs_deleted) for r in results] == [
+        ("t-big", 40, 3),
+        ("t-small", 0, 0),
+    ]
+    blob_sweeps = [p for sql, p in pool.executed if "checkpoint_blobs" in sql and "DELETE" in sql]
+    assert blob_sweeps == [{"thread_id": "t-big"}]
+    prune_params = [p for sql, p in pool.executed if "DELETE FROM checkpoints c" in sql]
+    assert all(p["keep_last"] == 5 for p in prune_params)
+    assert all(p["interrupt_channel"] == "__interrupt__" for p in prune_params)
+
+
+def test_thread_stats_reports_total_bytes():
+    class _StatsConnection(_Connection):
+        async def execute(self, sql, params):
+            self._pool.executed.append((sql, params))
+            return _Cursor(rows=[("t1", 12, 1000, 5000, 200)])
+
+    class _StatsPool(_Pool):
+        @asynccontextmanager
+        async def connection(self):
+            yield _StatsConnection(self)
+
+    pool = _StatsPool(deleted={})
+    pruner = CheckpointPruner(pool=pool, policy=CheckpointRetentionPolicy())
+
+    stats = asyncio.run(pruner.thread_stats(thread_id="t1", limit=5))
+
+    assert stats[0].checkpoints == 12
+    assert stats[0].total_bytes == 6200
+    sql, params = pool.executed[0]
+    assert "WHERE thread_id = %(thread_id)s" in sql
+    assert params == {"thread_id": "t1", "limit": 5}
+
+
+def test_candidate_window_advances_and_wraps_around():
+    pool = _Pool(deleted={})
+    pruner = CheckpointPruner(pool=pool, policy=CheckpointRetentionPolicy(batch_size=3))
+
+    assert asyncio.run(pruner.candidate_threads()) == ["t-big", "t-small"]
+    pool.window = [("t-tail", True)]
+    assert asyncio.run(pruner.candidate_threads()) == ["t-tail"]
+    asyncio.run(pruner.candidate_threads())
+
+    windows = [p for sql, p in pool.executed if "WITH scan AS" in sql]
+    assert [p["after"] for p in windows] == ["", "t-small", ""]
+    assert all(p["limit"] == 3 for p in windows)
+
+
+def test_compaction_is_skipped_while_another_process_holds_the_lock():
+    pool = _Pool(deleted={"t-big": 4, "t-small": 0})
+    pruner = CheckpointPruner(pool=pool, policy=CheckpointRetentionPolicy())
+
+    pool.lock_free = False
+    assert asyncio.run(pruner.compact_exclusive()) is None
+    assert not any("WITH scan AS" in sql for sql, _ in pool.executed)
+
+    pool.lock_free = True
+    results = asyncio.run(pruner.compact_exclusive())
+    assert [r.thread_id for r in results] == ["t-big", "t-small"]
+    assert "pg_advisory_unlock" in pool.executed[-1][0]
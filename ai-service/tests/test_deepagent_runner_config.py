@@ -80,6 +80,26 @@ def test_safe_summarization_config_keeps_custom_safe_trigger():
     assert kwargs["trim_tokens_to_summarize"] == 2000
 
 
+def test_safe_summarization_config_lowers_trigger_to_prompt_budget():
+    class _FakeModel:
+        model_name = "gpt-5.4-mini"
+        profile = {"max_input_tokens": 272000}
+        _qjudge_summarization_trigger_tokens = 80000
+
+    kwargs = {
+        "model": _FakeModel(),
+        "trigger": ("fraction", 0.85),
+        "trim_tokens_to_summarize": 2000,
+    }
+
+    runner_mod._SafeSummarizationMiddleware._normalize_summarization_config(
+        args=(),
+        kwargs=kwargs,
+    )
+
+    assert kwargs["trigger"] == ("tokens", 80000)
+
+
 class _CaptureCreateDeepAgent:
     def __init__(self):
         self.kwargs = None
@@ -0,0 +1,184 @@
+"""Tests for the MCP session pool and tool-definition cache."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+import types
+from types import SimpleNamespace
+
+os.environ.setdefault("AI_INTERNAL_TOKEN", "test-ai-internal-token")
+
+_deepseek_stub = types.ModuleType("langchain_deepseek")
+_openai_stub = types.ModuleType("langchain_openai")
+_deepseek_stub.ChatDeepSeek = type("ChatDeepSeek", (), {})
+_openai_stub.ChatOpenAI = type("ChatOpenAI", (), {})
+sys.modules.setdefault("langchain_deepseek", _deepseek_stub)
+sys.modules.setdefault("langchain_openai", _openai_stub)
+
+from services import mcp_session_pool as pool_mod  # noqa: E402
+from services.mcp_session_pool import (  # noqa: E402
+    MCPSessionPool,
+    MCPToolDefinitionCache,
+    PooledMCPSession,
+)
+from services.mcp_tool_provider import MCPToolProvider  # noqa: E402
+
+
+def _bearer(user_id: int, *, exp: float | None = None) -> str:
+    claims = {"user_id": user_id, "exp": exp or time.time() + 8 * 3600}
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"Bearer header.{payload}.signature"
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.list_calls = 0
+
+    async def list_tools(self, cursor=None):
+        self.list_calls += 1
+        return SimpleNamespace(
+            tools=[
+                SimpleNamespace(
+                    name="qjudge_browse",
+                    description="browse",
+                    inputSchema={"type": "object", "properties": {}},
+                )
+            ],
+            nextCursor=None,
+        )
+
+
+def _patch_start(monkeypatch, opened: list[PooledMCPSession]):
+    async def _fake_start(self, *, initialize_timeout):
+        self._task = asyncio.create_task(self._closing.wait())
+        self.session = _FakeSession()
+        self.server_version = "1.0"
+        opened.append(self)
+
+    monkeypatch.setattr(PooledMCPSession, "start", _fake_start)
+
+
+def test_pool_reuses_session_for_same_user_with_new_token(monkeypatch):
+    opened: list[PooledMCPSession] = []
+    _patch_start(monkeypatch, opened)
+
+    async def _run():
+        pool = MCPSessionPool(idle_ttl_seconds=60, max_sessions=10)
+        first = await pool.acquire(
+            server_url="http://mcp", authorization_header=_bearer(7), initialize_timeout=1
+        )
+        await pool.release(first)
+        second = await pool.acquire(
+            server_url="http://mcp", authorization_header=_bearer(7), initialize_timeout=1
+        )
+        other = await pool.acquire(
+            server_url="http://mcp", authorization_header=_bearer(8), initialize_timeout=1
+        )
+        assert second is first
+        assert other is not first
+        await pool.close()
+
+    asyncio.run(_run())
+    assert len(opened) == 2
+
+
+def test_pool_retires_session_near_token_expiry(monkeypatch):
+    opened: list[PooledMCPSession] = []
+    _patch_start(monkeypatch, opened)
+
+    async def _run():
+        pool = MCPSessionPool(idle_ttl_seconds=60, max_sessions=10)
+        expiring = await pool.acquire(
+            server_url="http://mcp",
+            authorization_header=_bearer(7, exp=time.time() + 60),
+            initialize_timeout=1,
+        )
+        await pool.release(expiring)
+        fresh = await pool.acquire(
+            server_url="http://mcp", authorization_header=_bearer(7), initialize_timeout=1
+        )
+        assert fresh is not expiring
+        await pool.close()
+
+    asyncio.run(_run())
+    assert len(opened) == 2
+
+
+def test_broken_session_is_not_reused(monkeypatch):
+    opened: list[PooledMCPSession] = []
+    _patch_start(monkeypatch, opened)
+
+    async def _run():
+        pool = MCPSessionPool(idle_ttl_seconds=60, max_sessions=10)
+        first = await pool.acquire(
+            server_url="http://mcp", authorization_header=_bearer(7), initialize_timeout=1
+        )
+        first.broken = True
+        await pool.release(first)
+        second = await pool.acquire(
+            server_url="http://mcp", authorization_header=_bearer(7), initialize_timeout=1
+        )
+        assert second is not first
+        await pool.close()
+
+    asyncio.run(_run())
+
+
+def test_provider_serves_tool_definitions_from_cache(monkeypatch):
+    opened: list[PooledMCPSession] = []
+    _patch_start(monkeypatch, opened)
+
+    async def _run():
+        pool = MCPSessionPool(idle_ttl_seconds=60, max_sessions=10)
+        cache = MCPToolDefinitionCache(ttl_seconds=60)
+        names = []
+        for user_id in (7, 8):
+            async with MCPToolProvider(
+                server_url="http://mcp",
+                authorization_header=_bearer(user_id),
+                pool=pool,
+                tool_cache=cache,
+            ) as provider:
+                tools = await provider.load_tools()
+                names.append([tool.name for tool in tools])
+        list_calls = [entry.session.list_calls for entry in opened]
+        await pool.close()
+        return names, list_calls
+
+    names, list_calls = asyncio.run(_run())
+    assert names == [["qjudge_browse"], ["qjudge_browse"]]
+    # Second user gets a new session but no second list_tools() round trip.
+    assert list_calls == [1, 0]
+
+
+def test_tool_cache_invalidates_on_server_version_change():
+    cache = MCPToolDefinitionCache(ttl_seconds=60)
+    tools = [SimpleNamespace(name="qjudge_browse")]
+    cache.put(server_url="http://mcp", tool_policy=None, server_version="1.0", tools=tools)
+
+    assert cache.get(server_url="http://mcp", tool_policy=None, server_version="1.0") == tools
+    assert cache.get(server_url="http://mcp", tool_policy=None, server_version="2.0") is None
+    assert cache.get(server_url="http://mcp", tool_policy=None, server_version="1.0") is None
+
+
+def test_tool_cache_is_keyed_by_tool_policy():
+    cache = MCPToolDefinitionCache(ttl_seconds=60)
+    cache.put(
+        server_url="http://mcp",
+        tool_policy={"qjudge_grading": {"deny_actions": ["dashboard"]}},
+        server_version=None,
+        tools=[SimpleNamespace(name="qjudge_grading")],
+    )
+
+    assert cache.get(server_url="http://mcp", tool_policy=None, server_version=None) is None
+
+
+def test_principal_key_falls_back_to_token_hash_for_opaque_tokens():
+    assert pool_mod._principal_key(_bearer(3)) == "user:3"
+    assert pool_mod._principal_key("Bearer opaque").startswith("token:")
+    assert pool_mod._principal_key(None) == "anonymous"
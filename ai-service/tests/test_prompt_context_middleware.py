@@ -0,0 +1,81 @@
+"""Tests for per-call prompt trimming and prompt-cache tagging."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from langchain.agents.middleware.types import ModelRequest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from services import prompt_context_middleware as ctx_mod
+from services.prompt_context_middleware import (
+    PromptContextMiddleware,
+    deduplicate_tool_results,
+)
+
+_BIG = "answer row\n" * 500
+
+
+def _conversation() -> list:
+    return [
+        HumanMessage(content="grade these"),
+        AIMessage(content="", tool_calls=[{"id": "c1", "name": "artifact_read", "args": {}}]),
+        ToolMessage(content=_BIG, tool_call_id="c1", name="artifact_read"),
+        AIMessage(content="", tool_calls=[{"id": "c2", "name": "artifact_read", "args": {}}]),
+        ToolMessage(content=_BIG, tool_call_id="c2", name="artifact_read"),
+    ]
+
+
+def _request(model_id: str, messages: list) -> ModelRequest:
+    model = SimpleNamespace(_qjudge_model_id=model_id)
+    return ModelRequest(
+        model=model,
+        messages=messages,
+        system_message=SystemMessage(content="system prompt"),
+        tools=[{"name": "qjudge_browse", "description": "browse", "parameters": {}}],
+    )
+
+
+def test_repeated_tool_results_keep_first_copy_and_reference_it():
+    messages = _conversation()
+
+    deduped, saved = deduplicate_tool_results(messages, min_chars=100)
+
+    assert deduped[2].content == _BIG
+    assert "tool_call_id=c1" in deduped[4].content
+    assert deduped[4].tool_call_id == "c2"
+    assert saved > 1000
+    # Checkpointed messages are left untouched.
+    assert messages[4].content == _BIG
+
+
+def test_small_tool_results_are_not_deduplicated():
+    messages = _conversation()
+
+    deduped, saved = deduplicate_tool_results(messages, min_chars=len(_BIG) + 1)
+
+    assert deduped is messages
+    assert saved == 0
+
+
+def test_middleware_tags_openai_requests_with_stable_prompt_cache_key():
+    ctx_mod.reset_footprints_for_tests()
+    middleware = PromptContextMiddleware(dedup_min_chars=100)
+    seen: list[ModelRequest] = []
+
+    with patch.object(ctx_mod, "_current_thread_id", return_value="thread-1"):
+        for model_id in ("openai-mini", "openai-mini", "deepseek-v4"):
+            middleware.wrap_model_call(_request(model_id, _conversation()), seen.append)
+
+    first, second, deepseek = seen
+    assert first.model_settings["prompt_cache_key"].startswith("qjudge-")
+    assert first.model_settings == second.model_settings
+    assert "prompt_cache_key" not in deepseek.model_settings
+    assert "omitted to save context" in first.messages[4].content
+
+    footprint = ctx_mod.get_thread_footprint("thread-1")
+    assert footprint is not None
+    assert footprint.model_calls == 3
+    assert footprint.deduplicated_tokens > 0
+    assert footprint.prompt_tokens > footprint.prefix_tokens > 0
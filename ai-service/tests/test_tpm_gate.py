@@ -77,6 +77,28 @@ async def test_budget_blocks_when_over_safety(monkeypatch):
     assert slept, "budget.wait did not sleep when over the safety budget"
 
 
+@pytest.mark.asyncio
+async def test_budget_wait_is_recorded_per_model(monkeypatch):
+    from prometheus_client import REGISTRY
+
+    def observed() -> float:
+        value = REGISTRY.get_sample_value(
+            "qjudge_ai_tpm_gate_wait_seconds_count", {"model": "gpt-test"}
+        )
+        return value or 0
+
+    budget = get_or_create_budget("gpt-test", tpm_limit=200_000)
+    before = observed()
+    await budget.wait(160_000)
+
+    async def fake_sleep(s):
+        budget._usage.clear()
+
+    monkeypatch.setattr("services.tpm_gate.asyncio.sleep", fake_sleep)
+    await budget.wait(50_000)
+    assert observed() == before + 2
+
+
 @pytest.mark.asyncio
 async def test_budget_prunes_old_entries():
     budget = TpmBudget(tpm_limit=200_000, safety_fraction=0.85)
@@ -1,9 +1,11 @@
 """JWT Authentication middleware for WebSocket connections."""
 
+from http.cookies import SimpleCookie
 from urllib.parse import parse_qs
 
 from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import AccessToken
@@ -12,18 +14,28 @@ from rest_framework_simplejwt.tokens import AccessToken
 class JWTAuthMiddleware(BaseMiddleware):
     """
     Custom middleware that authenticates WebSocket connections using JWT token
-    from query string: ws://host/ws/path/?token=<jwt_token>
+    from query string: ws://host/ws/path/?token=<jwt_token>, falling back to
+    the HttpOnly access-token cookie that browsers send with the handshake.
     """
 
     async def __call__(self, scope, receive, send):
         # Extract token from query string
         query_string = scope.get("query_string", b"").decode()
         query_params = parse_qs(query_string)
-        token = query_params.get("token", [None])[0]
+        token = query_params.get("token", [None])[0] or self.get_cookie_token(scope)
 
         scope["user"] = await self.get_user(token)
         return await super().__call__(scope, receive, send)
 
+    @staticmethod
+    def get_cookie_token(scope):
+        cookie_name = getattr(settings, "JWT_AUTH_COOKIE", "access_token")
+        for name, value in scope.get("headers", []):
+            if name == b"cookie":
+                morsel = SimpleCookie(value.decode("latin-1")).get(cookie_name)
+                return morsel.value if morsel else None
+        return None
+
     @database_sync_to_async
     def get_user(self, token):
         if not token:
@@ -35,6 +47,13 @@ class JWTAuthMiddleware(BaseMiddleware):
 
             from django.contrib.auth import get_user_model
 
+            from apps.contests.services.anti_cheat_session import is_access_token_allowed
+
+            # Same exam JTI pinning as CookieJWTAuthentication.
+            jti = str(access_token.get("jti", ""))
+            if jti and not is_access_token_allowed(user_id, jti):
+                return AnonymousUser()
+
             User = get_user_model()
             return User.objects.get(id=user_id)
         except (InvalidToken, TokenError, Exception):
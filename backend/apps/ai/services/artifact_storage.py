@@ -3,18 +3,15 @@ from __future__ import annotations
 
 import hashlib
 from dataclasses import dataclass
-from typing import Any
 
 from botocore.exceptions import ClientError
 from django.conf import settings
 
-
-_BUCKET_READY = False
+from apps.core.services import object_storage
 
 
 def reset_bucket_ready_cache() -> None:
-    global _BUCKET_READY
-    _BUCKET_READY = False
+    object_storage.reset_bucket_ready_cache()
 
 
 class AIArtifactStorageError(Exception):
@@ -46,77 +43,17 @@ def compute_checksum(content: bytes) -> str:
     return hashlib.sha256(content).hexdigest()
 
 
-def _get_boto3():
-    import boto3  # type: ignore
-
-    return boto3
-
-
-def _build_client(endpoint_url: str | None = None):
-    boto3 = _get_boto3()
-    kwargs: dict[str, Any] = {
-        "aws_access_key_id": settings.OBJECT_STORAGE_ACCESS_KEY,
-        "aws_secret_access_key": settings.OBJECT_STORAGE_SECRET_KEY,
-        "region_name": settings.OBJECT_STORAGE_REGION,
-    }
-    endpoint = endpoint_url or settings.OBJECT_STORAGE_ENDPOINT_URL
-    if endpoint:
-        kwargs["endpoint_url"] = endpoint
-    return boto3.client("s3", **kwargs)
-
-
 def get_artifact_s3_client():
-    return _build_client()
+    return object_storage.get_client()
 
 
 def get_artifact_s3_public_client():
     """Client whose presigned URLs point at the browser-facing endpoint."""
-    public = settings.OBJECT_STORAGE_PUBLIC_ENDPOINT_URL
-    return _build_client(endpoint_url=public or None)
+    return object_storage.get_public_client()
 
 
 def _ensure_bucket_exists(client) -> None:
-    global _BUCKET_READY
-    if _BUCKET_READY:
-        return
-
-    bucket = settings.AI_ARTIFACT_S3_BUCKET
-    auto_create = getattr(settings, "OBJECT_STORAGE_AUTO_CREATE_BUCKETS", True)
-    try:
-        client.head_bucket(Bucket=bucket)
-        _BUCKET_READY = True
-        return
-    except ClientError as exc:
-        code = str(exc.response.get("Error", {}).get("Code", "")).strip()
-        if not auto_create:
-            # R2 / managed buckets: the token may not have account-wide
-            # HeadBucket permission. Trust the configured bucket and surface a
-            # clearer error if it really is missing on first put_object.
-            if code in {"403", "AccessDenied", "Forbidden"}:
-                _BUCKET_READY = True
-                return
-            if code in {"404", "NoSuchBucket", "NotFound"}:
-                raise AIArtifactStorageError(
-                    f"Artifact bucket '{bucket}' not found on object storage; "
-                    "create it in the provider dashboard before retrying."
-                ) from exc
-            raise AIArtifactStorageError("Failed to access artifact bucket") from exc
-        if code not in {"404", "NoSuchBucket", "NotFound"}:
-            raise AIArtifactStorageError("Failed to access artifact bucket") from exc
-
-    create_params: dict[str, Any] = {"Bucket": bucket}
-    region = (settings.OBJECT_STORAGE_REGION or "").strip()
-    if region and region != "us-east-1":
-        create_params["CreateBucketConfiguration"] = {"LocationConstraint": region}
-
-    try:
-        client.create_bucket(**create_params)
-    except ClientError as exc:
-        code = str(exc.response.get("Error", {}).get("Code", "")).strip()
-        if code != "BucketAlreadyOwnedByYou":
-            raise AIArtifactStorageError("Failed to create artifact bucket") from exc
-
-    _BUCKET_READY = True
+    object_storage.ensure_bucket(client, settings.AI_ARTIFACT_S3_BUCKET, error_cls=AIArtifactStorageError)
 
 
 def store_artifact(content: bytes, object_key: str, content_type: str) -> None:
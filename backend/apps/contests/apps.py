@@ -5,3 +5,6 @@ class ContestsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.contests'
     verbose_name = '考試系統'
+
+    def ready(self):
+        import apps.contests.signals  # noqa: F401
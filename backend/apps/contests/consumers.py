@@ -0,0 +1,86 @@
+"""WebSocket consumer streaming live proctoring batches to contest staff."""
+
+import asyncio
+import logging
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .services import proctoring_stream
+
+logger = logging.getLogger(__name__)
+
+
+class ProctoringConsumer(AsyncJsonWebsocketConsumer):
+    """
+    ``ws/contests/<contest_id>/proctoring/`` for users who can manage the contest.
+
+    On connect the proctor gets one ``proctoring.snapshot`` with the current
+    online summary, then ``proctoring.batch`` messages aggregated server side
+    (see ``services.proctoring_stream``). Clients send ``{"type": "ping"}`` as a
+    keepalive and get ``pong`` back.
+    """
+
+    group_name = None
+    contest_id = None
+    _ticker = None
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close()
+            return
+
+        self.contest_id = self.scope["url_route"]["kwargs"]["contest_id"]
+        if not await self._can_manage_contest(user, self.contest_id):
+            await self.close()
+            return
+
+        self.group_name = proctoring_stream.contest_group(self.contest_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        await database_sync_to_async(proctoring_stream.watch)(self.contest_id)
+        await self.send_json({
+            "type": "proctoring.snapshot",
+            "contest_id": str(self.contest_id),
+            "online": await database_sync_to_async(proctoring_stream.online_summary)(self.contest_id),
+        })
+        self._ticker = asyncio.ensure_future(self._tick())
+
+    async def disconnect(self, code):
+        if self._ticker is not None:
+            self._ticker.cancel()
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        if isinstance(content, dict) and content.get("type") == "ping":
+            await self.send_json({"type": "pong"})
+
+    async def proctoring_batch(self, event):
+        await self.send_json(event["payload"])
+
+    async def _tick(self):
+        interval = proctoring_stream.flush_seconds()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await database_sync_to_async(proctoring_stream.watch)(self.contest_id)
+                payload = await database_sync_to_async(proctoring_stream.drain)(self.contest_id)
+                if payload is not None:
+                    await self.channel_layer.group_send(
+                        self.group_name,
+                        {"type": proctoring_stream.BATCH_MESSAGE_TYPE, "payload": payload},
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Proctoring flush failed for contest_id=%s", self.contest_id, exc_info=True)
+
+    @database_sync_to_async
+    def _can_manage_contest(self, user, contest_id) -> bool:
+        from .models import Contest
+        from .permissions import can_manage_contest
+
+        contest = Contest.objects.filter(id=contest_id).first()
+        return contest is not None and can_manage_contest(user, contest)
@@ -21,6 +21,8 @@ from .dto import (
     ProblemStatsDTO,
     DifficultyStatsDTO,
 )
+from .tabular import TABULAR_FORMATS, iter_csv, iter_tabular, iter_xlsx
+from .render_cache import RenderCache, get_render_cache, render_cache_stats
 from .locales import get_labels, validate_labels, is_chinese, REQUIRED_KEYS
 from .utils import (
     sanitize_filename,
@@ -54,6 +56,13 @@ __all__ = [
     "UserStandingDTO",
     "ProblemStatsDTO",
     "DifficultyStatsDTO",
+    "TABULAR_FORMATS",
+    "iter_csv",
+    "iter_tabular",
+    "iter_xlsx",
+    "RenderCache",
+    "get_render_cache",
+    "render_cache_stats",
     "get_labels",
     "validate_labels",
     "is_chinese",
@@ -1,12 +1,20 @@
 """
 Data service for contest exporters.
 Provides a clean interface for querying contest data and calculating statistics.
+
+Submissions are read through chunked server-side cursors as narrow value rows:
+standings never materialize submission objects, and source code is only
+fetched for the submissions a report actually shows. Everything loaded is
+memoized on the instance, so renderers that share one service (see
+``BaseRenderer`` / ``report_archive``) query each piece of contest data once.
 """
-from typing import List, Optional, Dict
+from dataclasses import replace
+from typing import Dict, Iterator, List, Optional
 
+from django.db.models import Prefetch
 
 from ..models import Contest, ContestParticipant
-from apps.problems.models import CodingProblem
+from apps.problems.models import CodingProblem, TestCase
 from apps.question_bank.models import ContestQuestionBinding, QuestionAsset
 from apps.submissions.models import Submission
 
@@ -23,6 +31,10 @@ from .dto import (
     DifficultyStatsDTO,
 )
 
+# Rows fetched per server-side cursor round trip.
+SUBMISSION_CHUNK_SIZE = 2000
+_SUBMISSION_FIELDS = ('id', 'user_id', 'problem_id', 'status', 'score', 'language', 'created_at', 'is_test')
+
 
 class ContestDataService:
     """
@@ -35,6 +47,41 @@ class ContestDataService:
         self.language = language
         self._problems_cache: Optional[List[ContestProblemDTO]] = None
         self._participants_cache: Optional[List[ParticipantDTO]] = None
+        self._submissions_cache: Optional[List[SubmissionDTO]] = None
+        self._user_submissions_cache: Dict[int, List[SubmissionDTO]] = {}
+        self._code_cache: Dict[int, str] = {}
+        self._standings_cache: Optional[List[UserStandingDTO]] = None
+        self._exam_questions_cache: Optional[list] = None
+        self._exam_participants_cache: Optional[Dict[int, ContestParticipant]] = None
+        self._exam_answers_cache: Optional[Dict[int, dict]] = None
+        self._exam_scoring_service = None
+
+    def preload(self) -> 'ContestDataService':
+        """
+        Load everything per-student reports need in a fixed number of queries.
+
+        Used when rendering many reports from one service instance (bulk
+        export); afterwards per-user lookups are served from memory.
+        """
+        self.get_contest_problems()
+        self.get_participants()
+        self.get_submissions()
+        self.calculate_standings()
+        if self.contest.contest_type == 'paper_exam':
+            from ..models import ExamAnswer
+
+            self.get_exam_questions()
+            self._exam_participants_cache = {
+                p.user_id: p
+                for p in ContestParticipant.objects.filter(contest=self.contest).select_related('user')
+            }
+            answers: Dict[int, dict] = {}
+            for answer in ExamAnswer.objects.filter(
+                participant__contest=self.contest
+            ).select_related('question'):
+                answers.setdefault(answer.participant_id, {})[answer.question_id] = answer
+            self._exam_answers_cache = answers
+        return self
 
     def get_contest_dto(self) -> ContestDTO:
         """Get contest data as DTO."""
@@ -67,7 +114,12 @@ class ContestDataService:
             )
             .select_related('coding_problem', 'coding_problem__question_asset')
             .prefetch_related(
-                'coding_problem__test_cases',
+                # Only samples are exported; hidden test data can be large.
+                Prefetch(
+                    'coding_problem__test_cases',
+                    queryset=TestCase.objects.filter(is_sample=True).order_by('id'),
+                    to_attr='export_sample_cases',
+                ),
                 'coding_problem__tags',
             )
             .order_by('order')
@@ -100,7 +152,7 @@ class ContestDataService:
 
         participants = ContestParticipant.objects.filter(
             contest=self.contest
-        ).select_related('user')
+        ).select_related('user', 'user__profile')
 
         result = []
         for p in participants:
@@ -118,37 +170,75 @@ class ContestDataService:
         self._participants_cache = result
         return result
 
-    def get_submissions(self, user_id: Optional[int] = None) -> List[SubmissionDTO]:
+    def iter_submissions(self, user_id: Optional[int] = None) -> Iterator[SubmissionDTO]:
         """
-        Get submissions for the contest.
+        Yield submissions for the contest in submission order without
+        materializing them. ``code`` is left empty; see ``get_submission_code``.
 
         Args:
             user_id: If provided, filter to this user's submissions only
         """
+        if self._submissions_cache is not None:
+            if user_id is None:
+                yield from self._submissions_cache
+            else:
+                yield from self._user_submissions_cache.get(user_id, [])
+            return
+        if user_id is not None and user_id in self._user_submissions_cache:
+            yield from self._user_submissions_cache[user_id]
+            return
+
         queryset = Submission.objects.filter(
             contest=self.contest,
             source_type='contest',
             is_test=False
-        ).select_related('problem', 'user').order_by('created_at')
+        ).order_by('created_at', 'id')
 
         if user_id is not None:
             queryset = queryset.filter(user_id=user_id)
 
-        result = []
-        for sub in queryset:
-            result.append(SubmissionDTO(
-                id=sub.id,
-                user_id=sub.user.id,
-                problem_id=str(sub.problem.id),
-                status=sub.status,
-                score=sub.score or 0,
-                language=sub.language or '',
-                code=sub.code or '',
-                created_at=sub.created_at,
-                is_test=sub.is_test,
-            ))
+        rows = queryset.values_list(*_SUBMISSION_FIELDS).iterator(chunk_size=SUBMISSION_CHUNK_SIZE)
+        for sub_id, sub_user_id, problem_id, status, score, language, created_at, is_test in rows:
+            yield SubmissionDTO(
+                id=sub_id,
+                user_id=sub_user_id,
+                problem_id=str(problem_id),
+                status=status,
+                score=score or 0,
+                language=language or '',
+                created_at=created_at,
+                is_test=is_test,
+            )
 
-        return result
+    def get_submissions(self, user_id: Optional[int] = None) -> List[SubmissionDTO]:
+        """
+        Get submissions for the contest (memoized, ``code`` left empty).
+
+        Args:
+            user_id: If provided, filter to this user's submissions only
+        """
+        if user_id is None:
+            if self._submissions_cache is None:
+                submissions = list(self.iter_submissions())
+                by_user: Dict[int, List[SubmissionDTO]] = {}
+                for sub in submissions:
+                    by_user.setdefault(sub.user_id, []).append(sub)
+                self._submissions_cache = submissions
+                self._user_submissions_cache = by_user
+            return self._submissions_cache
+
+        if self._submissions_cache is None and user_id not in self._user_submissions_cache:
+            self._user_submissions_cache[user_id] = list(self.iter_submissions(user_id))
+        return self._user_submissions_cache.get(user_id, [])
+
+    def get_submission_code(self, submission: SubmissionDTO) -> str:
+        """Source code of one submission, fetched on first use."""
+        if submission.code:
+            return submission.code
+        if submission.id not in self._code_cache:
+            code = Submission.objects.filter(id=submission.id).values_list('code', flat=True).first()
+            self._code_cache[submission.id] = code or ''
+        return self._code_cache[submission.id]
 
     def calculate_standings(self, user_id: Optional[int] = None) -> StandingsDTO:
         """
@@ -160,77 +250,9 @@ class ContestDataService:
         Returns:
             StandingsDTO with full standings and optional user-specific stats
         """
-        contest_problems = self.get_contest_problems()
-        participants = self.get_participants()
-        all_submissions = self.get_submissions()
-
-        # Build stats for each participant
-        stats: Dict[int, UserStandingDTO] = {}
-
-        for p in participants:
-            problem_stats = {}
-            for cp in contest_problems:
-                problem_stats[cp.problem_id] = ProblemStatsDTO(
-                    problem_id=cp.problem_id,
-                    max_score=cp.max_score,
-                )
-
-            stats[p.user_id] = UserStandingDTO(
-                user_id=p.user_id,
-                username=p.username,
-                display_name=p.display_name or p.username,
-                problems=problem_stats,
-            )
-
-        # Process submissions
-        start_time = self.contest.start_time or self.contest.created_at
-
-        for sub in all_submissions:
-            uid = sub.user_id
-            pid = sub.problem_id
-
-            if uid not in stats or pid not in stats[uid].problems:
-                continue
-
-            p_stat = stats[uid].problems[pid]
-
-            # Skip if already AC
-            if p_stat.status == 'AC':
-                continue
-
-            if sub.status in ['pending', 'judging']:
-                continue
-
-            p_stat.tries += 1
-            max_score = p_stat.max_score
-
-            if sub.status == 'AC':
-                p_stat.status = 'AC'
-                time_diff = sub.created_at - start_time
-                minutes = int(time_diff.total_seconds() / 60)
-                p_stat.time = minutes
-
-                stats[uid].solved += 1
-                penalty = minutes + 20 * (p_stat.tries - 1)
-                stats[uid].penalty += penalty
-
-                score_diff = max_score - p_stat.score
-                p_stat.score = max_score
-                stats[uid].total_score += score_diff
-            else:
-                p_stat.status = sub.status
-                submission_score = sub.score
-                if submission_score > p_stat.score:
-                    score_diff = submission_score - p_stat.score
-                    p_stat.score = submission_score
-                    stats[uid].total_score += score_diff
-
-        # Sort standings: total_score (desc) > solved (desc) > penalty (asc)
-        standings_list = list(stats.values())
-        standings_list.sort(key=lambda x: (-x.total_score, -x.solved, x.penalty))
-
-        for i, item in enumerate(standings_list):
-            item.rank = i + 1
+        if self._standings_cache is None:
+            self._standings_cache = self._compute_standings()
+        standings_list = self._standings_cache
 
         # Find user's stats if requested
         user_rank = None
@@ -250,6 +272,55 @@ class ContestDataService:
             standings=standings_list,
         )
 
+    def _compute_standings(self) -> List[UserStandingDTO]:
+        # Same ranking rules as the scoreboard API; imported here because the
+        # services package imports the exporters.
+        from ..services.scoreboard import iter_standing_submissions, tally_standings
+
+        contest_problems = self.get_contest_problems()
+        participants = self.get_participants()
+
+        if self._submissions_cache is not None:
+            rows = (
+                (s.user_id, s.problem_id, s.status, s.score, s.created_at)
+                for s in self._submissions_cache
+            )
+        else:
+            rows = iter_standing_submissions(self.contest)
+
+        tallies = tally_standings(
+            self.contest,
+            user_ids=[p.user_id for p in participants],
+            max_score_by_problem={cp.problem_id: cp.max_score for cp in contest_problems},
+            submissions=rows,
+        )
+
+        participant_by_user = {p.user_id: p for p in participants}
+        standings_list = []
+        for tally in tallies:
+            participant = participant_by_user[tally.user_id]
+            standings_list.append(UserStandingDTO(
+                user_id=tally.user_id,
+                username=participant.username,
+                display_name=participant.display_name or participant.username,
+                solved=tally.solved,
+                total_score=tally.total_score,
+                penalty=tally.penalty,
+                rank=tally.rank,
+                problems={
+                    problem_id: ProblemStatsDTO(
+                        problem_id=problem_id,
+                        status=problem.status,
+                        score=problem.score,
+                        max_score=problem.max_score,
+                        tries=problem.tries,
+                        time=problem.time,
+                    )
+                    for problem_id, problem in tally.problems.items()
+                },
+            ))
+        return standings_list
+
     def get_difficulty_stats(self, user_id: int) -> DifficultyStatsDTO:
         """
         Calculate difficulty statistics for a user.
@@ -302,7 +373,17 @@ class ContestDataService:
         Returns:
             Best SubmissionDTO or None if no submissions
         """
-        submissions = self.get_submissions(user_id)
+        best = self._pick_best_submission(self.get_submissions(user_id), problem_id)
+        if best is None:
+            return None
+        self._load_best_codes(user_id)
+        return self._with_code(best)
+
+    @staticmethod
+    def _pick_best_submission(
+        submissions: List[SubmissionDTO],
+        problem_id: str
+    ) -> Optional[SubmissionDTO]:
         problem_submissions = [s for s in submissions if s.problem_id == problem_id]
 
         if not problem_submissions:
@@ -316,6 +397,18 @@ class ContestDataService:
         # Otherwise, return the submission with highest score
         return max(problem_submissions, key=lambda s: (s.score, s.created_at))
 
+    def _load_best_codes(self, user_id: int) -> None:
+        """Fetch the code of a user's best submission on every problem in one query."""
+        submissions = self.get_submissions(user_id)
+        wanted = set()
+        for problem_id in {s.problem_id for s in submissions}:
+            best = self._pick_best_submission(submissions, problem_id)
+            if best.id not in self._code_cache:
+                wanted.add(best.id)
+        if wanted:
+            rows = Submission.objects.filter(id__in=wanted).values_list('id', 'code')
+            self._code_cache.update((sub_id, code or '') for sub_id, code in rows)
+
     def get_user_last_ac_submission(
         self,
         user_id: int,
@@ -337,7 +430,49 @@ class ContestDataService:
             s for s in submissions
             if s.problem_id == pid and s.status == 'AC'
         ]
-        return ac_submissions[-1] if ac_submissions else None
+        if not ac_submissions:
+            return None
+        self._load_best_codes(user_id)
+        return self._with_code(ac_submissions[-1])
+
+    def _with_code(self, submission: SubmissionDTO) -> SubmissionDTO:
+        return replace(submission, code=self.get_submission_code(submission))
+
+    def get_exam_questions(self) -> list:
+        """Paper-exam questions in display order (cached)."""
+        if self._exam_questions_cache is None:
+            from ..models import ExamQuestion
+
+            self._exam_questions_cache = list(
+                ExamQuestion.objects.filter(contest=self.contest).order_by('order', 'id')
+            )
+        return self._exam_questions_cache
+
+    def get_exam_participant(self, user_id: int) -> ContestParticipant:
+        """Participant row for a user; raises ``ContestParticipant.DoesNotExist``."""
+        if self._exam_participants_cache is not None:
+            participant = self._exam_participants_cache.get(user_id)
+            if participant is None:
+                raise ContestParticipant.DoesNotExist
+            return participant
+        return ContestParticipant.objects.get(contest=self.contest, user_id=user_id)
+
+    def get_exam_answers_map(self, participant: ContestParticipant) -> dict:
+        """Return dict mapping question_id -> ExamAnswer for a participant."""
+        if self._exam_answers_cache is not None:
+            return self._exam_answers_cache.get(participant.id, {})
+        from ..models import ExamAnswer
+
+        answers = ExamAnswer.objects.filter(participant=participant).select_related('question')
+        return {a.question_id: a for a in answers}
+
+    def get_exam_scoring_service(self):
+        """Shared ExamScoringService (caches questions and effective max scores)."""
+        if self._exam_scoring_service is None:
+            from ..services.exam_scoring import ExamScoringService
+
+            self._exam_scoring_service = ExamScoringService(self.contest)
+        return self._exam_scoring_service
 
     def _get_label(self, binding) -> str:
         """Return the display label for a contest problem binding (A, B, ...)."""
@@ -373,7 +508,9 @@ class ContestDataService:
                 pass
 
         # Get sample test cases
-        sample_cases = problem.test_cases.filter(is_sample=True).order_by('id')
+        sample_cases = getattr(problem, 'export_sample_cases', None)
+        if sample_cases is None:
+            sample_cases = problem.test_cases.filter(is_sample=True).order_by('id')
 
         return ProblemDTO(
             id=str(problem.id),
@@ -0,0 +1,124 @@
+"""
+Bounded cache for rendered HTML fragments (Markdown and highlighted code).
+
+Per-student reports render the same problem statements, option texts and
+code snippets over and over. Fragments are keyed by a hash of the render
+kind, its options and the source text and kept in a per-process LRU.
+When ``EXPORT_RENDER_CACHE_SHARED`` is on, misses also consult the Django
+cache (Redis) so Celery workers share their work.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from django.conf import settings
+
+DEFAULT_MAX_ENTRIES = 2048
+# Very large fragments are rendered every time instead of evicting many small ones.
+MAX_CACHEABLE_CHARS = 256 * 1024
+SHARED_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+class RenderCache:
+    """Thread-safe LRU of rendered fragments with hit-rate counters."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(kind: str, options: tuple, text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{kind}:{options!r}:".encode("utf-8"))
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_or_render(self, kind: str, options: tuple, text: str, render: Callable[[], str]) -> str:
+        if len(text) > MAX_CACHEABLE_CHARS:
+            return render()
+        key = self.make_key(kind, options, text)
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+
+        shared = _shared_cache()
+        shared_key = f"export_render:v1:{key}"
+        html = shared.get(shared_key) if shared is not None else None
+        if html is not None:
+            with self._lock:
+                self.shared_hits += 1
+        else:
+            html = render()
+            with self._lock:
+                self.misses += 1
+            if shared is not None:
+                shared.set(shared_key, html, timeout=SHARED_CACHE_TTL_SECONDS)
+
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = 0
+
+
+def _shared_cache():
+    if not getattr(settings, "EXPORT_RENDER_CACHE_SHARED", False):
+        return None
+    from django.core.cache import cache
+
+    return cache
+
+
+_RENDER_CACHE: RenderCache | None = None
+_RENDER_CACHE_LOCK = threading.Lock()
+
+
+def get_render_cache() -> RenderCache:
+    """Return the process-wide fragment cache."""
+    global _RENDER_CACHE
+    if _RENDER_CACHE is None:
+        with _RENDER_CACHE_LOCK:
+            if _RENDER_CACHE is None:
+                _RENDER_CACHE = RenderCache(
+                    getattr(settings, "EXPORT_RENDER_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+                )
+    return _RENDER_CACHE
+
+
+def render_cache_stats() -> dict:
+    """Hit/miss counters of the process-wide fragment cache."""
+    return get_render_cache().stats()
+
+
+def reset_render_cache_for_tests() -> None:
+    """Test helper: drop the process-wide fragment cache."""
+    global _RENDER_CACHE
+    _RENDER_CACHE = None
@@ -14,17 +14,19 @@ class BaseRenderer(ABC):
     Provides common functionality and defines the interface.
     """
 
-    def __init__(self, contest, language: str = 'zh-TW'):
+    def __init__(self, contest, language: str = 'zh-TW', data_service: ContestDataService | None = None):
         """
         Initialize the renderer.
 
         Args:
             contest: Contest model instance
             language: Language code for localization
+            data_service: Optional shared data service (e.g. one preloaded
+                instance reused across many student reports)
         """
         self.contest = contest
         self.language = language
-        self._data_service = None
+        self._data_service = data_service
         self._labels = None
 
     @property
@@ -22,8 +22,8 @@ class PaperExamReportRenderer(BaseRenderer):
 
     OPTION_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 
-    def __init__(self, contest, user, language='zh-TW', scale=1.0, include_grading=True):
-        super().__init__(contest, language)
+    def __init__(self, contest, user, language='zh-TW', scale=1.0, include_grading=True, data_service=None):
+        super().__init__(contest, language, data_service=data_service)
         self.user = user
         self.scale = max(0.5, min(2.0, scale))
         self.include_grading = include_grading
@@ -111,18 +111,14 @@ class PaperExamReportRenderer(BaseRenderer):
 
     def _get_participant(self):
         if self._participant_cache is None:
-            from apps.contests.models import ContestParticipant
-            self._participant_cache = ContestParticipant.objects.get(
-                contest=self.contest, user=self.user
-            )
+            self._participant_cache = self.data_service.get_exam_participant(self.user.id)
         return self._participant_cache
 
     def _get_scoring_context(self, answers_map):
         """Compute and cache scoring context: breakdown, effective_max, has_redistribute, items_by_qid."""
         if self._scoring_context_cache is not None:
             return self._scoring_context_cache
-        from apps.contests.services.exam_scoring import ExamScoringService
-        scoring = ExamScoringService(self.contest)
+        scoring = self.data_service.get_exam_scoring_service()
         participant = self._get_participant()
         breakdown = scoring.get_participant_breakdown(participant, answers_map)
         effective_max = scoring.get_effective_max_scores()
@@ -138,19 +134,13 @@ class PaperExamReportRenderer(BaseRenderer):
 
     def _get_questions(self):
         if self._questions_cache is None:
-            from apps.contests.models import ExamQuestion
-            self._questions_cache = list(
-                ExamQuestion.objects.filter(contest=self.contest).order_by('order', 'id')
-            )
+            self._questions_cache = self.data_service.get_exam_questions()
         return self._questions_cache
 
     def _get_answers_map(self):
         """Return dict mapping question_id -> ExamAnswer."""
         if self._answers_cache is None:
-            from apps.contests.models import ExamAnswer
-            participant = self._get_participant()
-            answers = ExamAnswer.objects.filter(participant=participant).select_related('question')
-            self._answers_cache = {a.question_id: a for a in answers}
+            self._answers_cache = self.data_service.get_exam_answers_map(self._get_participant())
         return self._answers_cache
 
     # ----------------------------------------------------------------
@@ -29,8 +29,9 @@ class StudentReportRenderer(BaseRenderer):
         language: str = 'zh-TW',
         scale: float = 1.0,
         include_grading: bool = True,
+        data_service=None,
     ):
-        super().__init__(contest, language)
+        super().__init__(contest, language, data_service=data_service)
         self.user = user
         self.scale = max(0.5, min(2.0, scale))
         self._submissions_cache = None
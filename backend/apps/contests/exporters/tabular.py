@@ -0,0 +1,183 @@
+"""
+Streaming CSV / XLSX writers for tabular exports.
+
+Both writers take an iterable of rows (lists of str / int / float / Decimal /
+None) and yield encoded bytes as they go, so memory stays flat however many
+rows the iterable produces. The XLSX writer emits a minimal single-sheet
+workbook with inline strings through ``zipfile`` on an unseekable sink; no
+spreadsheet library is needed.
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import re
+import zipfile
+from collections.abc import Iterable, Iterator
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+# Yield once this many encoded bytes are pending.
+_FLUSH_BYTES = 64 * 1024
+
+CSV_CONTENT_TYPE = "text/csv; charset=utf-8"
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Characters XML 1.0 does not allow; Excel refuses workbooks containing them.
+_XML_INVALID_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+class _Sink:
+    """Write-only buffer drained by the generators below."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self.size = 0
+
+    def write(self, data) -> int:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._parts.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        self.size = 0
+        return data
+
+
+def iter_csv(rows: Iterable[list]) -> Iterator[bytes]:
+    """UTF-8 CSV with a single BOM so Excel detects the encoding."""
+    sink = _Sink()
+    sink.write(codecs.BOM_UTF8)
+    writer = csv.writer(sink)
+    for row in rows:
+        writer.writerow(row)
+        if sink.size >= _FLUSH_BYTES:
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _column_name(index: int) -> str:
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(65 + remainder) + name
+    return name
+
+
+def _cell_xml(ref: str, value) -> str:
+    if value is None or value == "":
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    text = escape(_XML_INVALID_CHARS.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row_xml(row_number: int, row: list) -> str:
+    cells = "".join(_cell_xml(f"{_column_name(i)}{row_number}", value) for i, value in enumerate(row))
+    return f'<row r="{row_number}">{cells}</row>'
+
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+        '</styleSheet>'
+    ),
+}
+
+
+def _workbook_xml(sheet_name: str) -> str:
+    # Sheet names are at most 31 characters and may not contain []:*?/\
+    safe_name = re.sub(r"[\[\]:*?/\\]", "_", sheet_name)[:31] or "Sheet1"
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{escape(safe_name)}" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    )
+
+
+def iter_xlsx(rows: Iterable[list], *, sheet_name: str = "Sheet1") -> Iterator[bytes]:
+    """Single-sheet XLSX workbook, streamed row by row."""
+    sink = _Sink()
+    # An unseekable sink makes zipfile write sizes in data descriptors.
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, body in _XLSX_PARTS.items():
+            archive.writestr(name, body)
+        archive.writestr("xl/workbook.xml", _workbook_xml(sheet_name))
+        yield sink.drain()
+
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                b"<sheetData>"
+            )
+            for row_number, row in enumerate(rows, 1):
+                sheet.write(_row_xml(row_number, row).encode("utf-8"))
+                if sink.size >= _FLUSH_BYTES:
+                    yield sink.drain()
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.drain()
+
+
+# file_format -> (file extension, content type)
+TABULAR_FORMATS = {
+    "csv": ("csv", CSV_CONTENT_TYPE),
+    "xlsx": ("xlsx", XLSX_CONTENT_TYPE),
+}
+
+
+def iter_tabular(rows: Iterable[list], file_format: str, *, sheet_name: str = "Sheet1") -> Iterator[bytes]:
+    if file_format == "xlsx":
+        return iter_xlsx(rows, sheet_name=sheet_name)
+    return iter_csv(rows)
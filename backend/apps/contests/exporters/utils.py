@@ -4,6 +4,42 @@ Includes markdown helpers, filename sanitization, and chart generation.
 """
 import markdown
 import re
+import threading
+from functools import lru_cache
+
+from .render_cache import get_render_cache
+
+_MARKDOWN_EXTENSION_CONFIGS = {
+    'codehilite': {
+        'guess_lang': False,
+        'noclasses': True,
+    }
+}
+_converters = threading.local()
+
+
+def _get_markdown_converter(extensions: tuple[str, ...]) -> markdown.Markdown:
+    """
+    Return a reset, pre-configured converter for this thread.
+    Building ``markdown.Markdown`` (extension loading, pattern compilation)
+    costs more than converting a short statement, and instances are not
+    thread-safe, so one converter is kept per thread and extension set.
+    """
+    cached = getattr(_converters, 'by_extensions', None)
+    if cached is None:
+        cached = _converters.by_extensions = {}
+    converter = cached.get(extensions)
+    if converter is None:
+        converter = markdown.Markdown(
+            extensions=list(extensions),
+            extension_configs={
+                name: config
+                for name, config in _MARKDOWN_EXTENSION_CONFIGS.items()
+                if name in extensions
+            },
+        )
+        cached[extensions] = converter
+    return converter.reset()
 
 
 def inline_markdown(text: str) -> str:
@@ -13,8 +49,12 @@ def inline_markdown(text: str) -> str:
     """
     if not text:
         return ""
+    return get_render_cache().get_or_render('inline', (), text, lambda: _render_inline_markdown(text))
+
+
+def _render_inline_markdown(text: str) -> str:
     # Parse markdown
-    html = markdown.markdown(text, extensions=['extra'])
+    html = _get_markdown_converter(('extra',)).convert(text)
     # Remove paragraph tags for inline use
     html = re.sub(r'^<p>(.*)</p>$', r'\1', html.strip(), flags=re.DOTALL)
     return html
@@ -65,24 +105,21 @@ def render_markdown(text: str, *, soft_breaks: bool = True) -> str:
     """
     if not text:
         return ""
+    return get_render_cache().get_or_render(
+        'markdown', (soft_breaks,), text, lambda: _render_markdown(text, soft_breaks)
+    )
+
+
+def _render_markdown(text: str, soft_breaks: bool) -> str:
     # Ensure lists are preceded by blank lines
     text = ensure_markdown_lists(text)
     # Preprocess to enable markdown inside HTML blocks
     text = preprocess_markdown_html(text)
     # Render with all necessary extensions
-    extensions = ['extra', 'tables', 'sane_lists', 'md_in_html', 'codehilite']
+    extensions = ('extra', 'tables', 'sane_lists', 'md_in_html', 'codehilite')
     if soft_breaks:
-        extensions.append('nl2br')
-    return markdown.markdown(
-        text,
-        extensions=extensions,
-        extension_configs={
-            'codehilite': {
-                'guess_lang': False,
-                'noclasses': True,
-            }
-        }
-    )
+        extensions += ('nl2br',)
+    return _get_markdown_converter(extensions).convert(text)
 
 
 def sanitize_filename(filename: str) -> str:
@@ -103,15 +140,43 @@ def sanitize_filename(filename: str) -> str:
     return filename
 
 
+@lru_cache(maxsize=16)
+def _get_lexer(lexer_name: str):
+    from pygments.lexers import get_lexer_by_name, TextLexer
+
+    try:
+        return get_lexer_by_name(lexer_name)
+    except Exception:
+        return TextLexer()
+
+
+@lru_cache(maxsize=1)
+def _get_code_formatter():
+    from pygments.formatters import HtmlFormatter
+
+    # Custom Carbon-style formatter - use inline line numbers for compact display
+    return HtmlFormatter(
+        style='default',
+        noclasses=True,
+        linenos='inline',  # Inline line numbers instead of table
+        linenostart=1,
+        nowrap=False,
+    )
+
+
 def highlight_code(code: str, language: str = 'cpp') -> str:
     """
     Apply syntax highlighting to code using Pygments with Carbon-style theme.
     Returns HTML string with highlighted code.
     """
+    return get_render_cache().get_or_render(
+        'code', (language,), code, lambda: _highlight_code(code, language)
+    )
+
+
+def _highlight_code(code: str, language: str) -> str:
     try:
         from pygments import highlight
-        from pygments.lexers import get_lexer_by_name, TextLexer
-        from pygments.formatters import HtmlFormatter
 
         # Strip leading/trailing empty lines but preserve internal formatting
         code_lines = code.split('\n')
@@ -132,21 +197,7 @@ def highlight_code(code: str, language: str = 'cpp') -> str:
         }
         lexer_name = lexer_map.get(language, 'text')
 
-        try:
-            lexer = get_lexer_by_name(lexer_name)
-        except Exception:
-            lexer = TextLexer()
-
-        # Custom Carbon-style formatter - use inline line numbers for compact display
-        formatter = HtmlFormatter(
-            style='default',
-            noclasses=True,
-            linenos='inline',  # Inline line numbers instead of table
-            linenostart=1,
-            nowrap=False,
-        )
-
-        highlighted = highlight(code, lexer, formatter)
+        highlighted = highlight(code, _get_lexer(lexer_name), _get_code_formatter())
         return highlighted
     except ImportError:
         # Fallback if Pygments not available
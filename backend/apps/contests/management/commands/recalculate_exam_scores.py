@@ -0,0 +1,75 @@
+"""Recalculate persisted paper-exam totals from answers and score policies.
+
+``ContestParticipant.score`` is normally kept in sync by the exam views,
+but data fixes (bulk regrades, policy edits made outside the API) can
+leave it stale. This command recomputes every participant's total with
+``ExamScoringService`` in one pass and writes only the rows that changed.
+``--dry-run`` reports the differences without writing.
+"""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.contests.models import Contest
+from apps.contests.services.exam_scoring import ExamScoringService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculate ContestParticipant.score for paper-exam contests and "
+        "report the participants whose total changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--contest-id",
+            help="Recalculate a single contest only. Without this flag, every paper exam is checked.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report score differences without writing.",
+        )
+
+    def handle(self, *args, **options):
+        contest_id = options.get("contest_id")
+        dry_run = options.get("dry_run", False)
+
+        contests = Contest.objects.filter(contest_type="paper_exam")
+        if contest_id:
+            contests = contests.filter(id=contest_id)
+            if not contests.exists():
+                raise CommandError(f"Paper-exam contest {contest_id} not found.")
+
+        changed_contests = 0
+        changed_participants = 0
+        for contest in contests.order_by("id"):
+            service = ExamScoringService(contest)
+            plan = service.plan_recalculate_all()
+            if not plan.changes:
+                continue
+            changed_contests += 1
+            changed_participants += len(plan.changes)
+            self.stdout.write(
+                f"Contest {contest.id}: {len(plan.changes)}/{plan.participant_count} "
+                "participant score(s) differ."
+            )
+            for change in plan.changes[:5]:
+                self.stdout.write(
+                    f"  - user {change.participant.user_id}: "
+                    f"{change.old_score} -> {change.new_score}"
+                )
+            if len(plan.changes) > 5:
+                self.stdout.write(f"  ... (+{len(plan.changes) - 5} more)")
+            if not dry_run:
+                with transaction.atomic():
+                    service.apply_recalculation(plan)
+
+        verb = "would update" if dry_run else "updated"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {changed_participants} participant score(s) in {changed_contests} contest(s)."
+            )
+        )
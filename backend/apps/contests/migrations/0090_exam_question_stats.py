@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-19 05:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contests', '0089_remove_retired_contest_delivery_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamQuestionStats',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='dashboard_stats', serialize=False, to='contests.examquestion', verbose_name='題目')),
+                ('answer_count', models.IntegerField(default=0, verbose_name='作答數')),
+                ('graded_count', models.IntegerField(default=0, verbose_name='已評分數')),
+                ('score_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='得分總和')),
+                ('zero_count', models.IntegerField(default=0, verbose_name='零分數')),
+                ('full_count', models.IntegerField(default=0, verbose_name='滿分數')),
+                ('correct_count', models.IntegerField(default=0, verbose_name='答對數')),
+                ('option_counts', models.JSONField(blank=True, default=list, help_text='依 options 索引排列的選擇次數', verbose_name='選項分佈')),
+                ('question_score', models.PositiveIntegerField(blank=True, null=True)),
+                ('question_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('revision', models.PositiveBigIntegerField(default=0, verbose_name='版本')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新時間')),
+            ],
+            options={
+                'verbose_name': '題目作答統計',
+                'verbose_name_plural': '題目作答統計',
+                'db_table': 'exam_question_stats',
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contests', '0090_exam_question_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examevidenceframe',
+            name='thumbnail_key',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.CreateModel(
+            name='ExamEvidenceContactSheet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('evidence_cluster_id', models.CharField(max_length=64)),
+                ('source_module', models.CharField(choices=[('screen_share', 'Screen Share'), ('webcam', 'Webcam'), ('attendance', 'Attendance')], default='screen_share', max_length=20)),
+                ('object_key', models.TextField()),
+                ('frame_ids', models.JSONField(blank=True, default=list)),
+                ('columns', models.PositiveSmallIntegerField(default=1)),
+                ('tile_width', models.PositiveIntegerField(default=0)),
+                ('tile_height', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('contest', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exam_evidence_contact_sheets', to='contests.contest', verbose_name='考試')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exam_evidence_contact_sheets', to=settings.AUTH_USER_MODEL, verbose_name='學生')),
+            ],
+            options={
+                'verbose_name': '考試證據縮圖總覽',
+                'verbose_name_plural': '考試證據縮圖總覽',
+                'db_table': 'exam_evidence_contact_sheets',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='examevidencecontactsheet',
+            constraint=models.UniqueConstraint(fields=('contest', 'user', 'evidence_cluster_id', 'source_module'), name='uniq_evidence_contact_sheet_cluster'),
+        ),
+    ]
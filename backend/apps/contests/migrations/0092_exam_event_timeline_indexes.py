@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contests', '0091_exam_evidence_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contestactivity',
+            index=models.Index(fields=['contest', 'user', 'created_at'], name='contest_act_contest_666407_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='examevent',
+            index=models.Index(fields=['contest', 'user', 'created_at'], name='exam_events_contest_25978c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='examevent',
+            index=models.Index(fields=['contest', 'event_type', 'created_at'], name='exam_events_contest_da766e_idx'),
+        ),
+        # (contest, user, created_at) covers the old (contest, user) prefix.
+        migrations.RemoveIndex(
+            model_name='examevent',
+            name='exam_events_contest_e08345_idx',
+        ),
+    ]
@@ -13,8 +13,8 @@ from .questions import (
 )
 from .participants import ContestParticipant, ExamStatus
 from .communications import Clarification, ContestAnnouncement
-from .monitoring import ContestActivity, ExamEvent, ExamEvidenceFrame
-from .answers import ExamAnswer
+from .monitoring import ContestActivity, ExamEvent, ExamEvidenceContactSheet, ExamEvidenceFrame
+from .answers import ExamAnswer, ExamQuestionStats
 
 __all__ = [
     "Clarification",
@@ -24,11 +24,13 @@ __all__ = [
     "ContestParticipant",
     "ExamAnswer",
     "ExamEvent",
+    "ExamEvidenceContactSheet",
     "ExamEvidenceFrame",
     "ExamQuestion",
     "ExamQuestionAnswerFormat",
     "ExamQuestionGroup",
     "ExamQuestionScorePolicy",
+    "ExamQuestionStats",
     "ExamQuestionType",
     "ExamStatus",
     "SourceMode",
@@ -88,6 +88,16 @@ class ExamAnswer(models.Model):
     def __str__(self):
         return f"Answer by P#{self.participant_id} for Q#{self.question_id}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what this row contributed to ExamQuestionStats so the
+        # post_save signal can apply a delta instead of re-aggregating.
+        from ..services.exam_dashboard_stats import snapshot_answer_contribution
+
+        snapshot_answer_contribution(instance)
+        return instance
+
     def auto_grade(self):
         """Auto-grade objective questions (true_false, single_choice, multiple_choice).
         優先使用 question_snapshot 中的資料，確保評分基準與學生作答時一致。
@@ -114,3 +124,48 @@ class ExamAnswer(models.Model):
             correct_set = set(correct) if isinstance(correct, list) else set()
             self.is_correct = selected == correct_set
             self.score = q_score if self.is_correct else 0
+
+
+class ExamQuestionStats(models.Model):
+    """
+    Materialized per-question aggregates for the results dashboard.
+    Maintained incrementally by ExamAnswer signals (student answers only) and
+    rebuilt from ExamAnswer when missing or when the question changed.
+    """
+    question = models.OneToOneField(
+        "contests.ExamQuestion",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='dashboard_stats',
+        verbose_name='題目'
+    )
+    answer_count = models.IntegerField(default=0, verbose_name='作答數')
+    graded_count = models.IntegerField(default=0, verbose_name='已評分數')
+    score_sum = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='得分總和'
+    )
+    zero_count = models.IntegerField(default=0, verbose_name='零分數')
+    full_count = models.IntegerField(default=0, verbose_name='滿分數')
+    correct_count = models.IntegerField(default=0, verbose_name='答對數')
+    option_counts = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name='選項分佈',
+        help_text='依 options 索引排列的選擇次數'
+    )
+    # Question state the aggregates were built against; a mismatch means rebuild.
+    question_score = models.PositiveIntegerField(null=True, blank=True)
+    question_updated_at = models.DateTimeField(null=True, blank=True)
+    revision = models.PositiveBigIntegerField(default=0, verbose_name='版本')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新時間')
+
+    class Meta:
+        db_table = 'exam_question_stats'
+        verbose_name = '題目作答統計'
+        verbose_name_plural = '題目作答統計'
+
+    def __str__(self):
+        return f"Stats for Q#{self.question_id} (r{self.revision})"
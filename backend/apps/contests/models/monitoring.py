@@ -91,7 +91,10 @@ class ExamEvent(models.Model):
         verbose_name_plural = '考試事件'
         ordering = ['created_at']
         indexes = [
-            models.Index(fields=['contest', 'user']),
+            # Per-participant timelines / event feed pages (keyset on created_at).
+            models.Index(fields=['contest', 'user', 'created_at']),
+            # Contest-wide lists filtered by event type.
+            models.Index(fields=['contest', 'event_type', 'created_at']),
             models.Index(fields=['created_at']),
         ]
 
@@ -169,6 +172,8 @@ class ExamEvidenceFrame(models.Model):
     content_type = models.CharField(max_length=64, default="image/webp")
     byte_size = models.PositiveIntegerField(null=True, blank=True)
     sha256 = models.CharField(max_length=64, blank=True, default="")
+    # Downscaled copy stored next to object_key; empty until generated.
+    thumbnail_key = models.TextField(blank=True, default="")
     metadata = models.JSONField(default=dict, blank=True)
 
     class Meta:
@@ -188,6 +193,50 @@ class ExamEvidenceFrame(models.Model):
         return f"{self.source_module} frame {self.seq} for event {self.exam_event_id}"
 
 
+class ExamEvidenceContactSheet(models.Model):
+    """One tiled overview image of the uploaded frames of an evidence cluster."""
+
+    contest = models.ForeignKey(
+        "contests.Contest",
+        on_delete=models.CASCADE,
+        related_name="exam_evidence_contact_sheets",
+        verbose_name="考試",
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="exam_evidence_contact_sheets",
+        verbose_name="學生",
+    )
+    evidence_cluster_id = models.CharField(max_length=64)
+    source_module = models.CharField(
+        max_length=20,
+        choices=ExamEvidenceFrame.SourceModule.choices,
+        default=ExamEvidenceFrame.SourceModule.SCREEN_SHARE,
+    )
+    object_key = models.TextField()
+    # Evidence frame ids in tile order (row-major).
+    frame_ids = models.JSONField(default=list, blank=True)
+    columns = models.PositiveSmallIntegerField(default=1)
+    tile_width = models.PositiveIntegerField(default=0)
+    tile_height = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "exam_evidence_contact_sheets"
+        verbose_name = "考試證據縮圖總覽"
+        verbose_name_plural = "考試證據縮圖總覽"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["contest", "user", "evidence_cluster_id", "source_module"],
+                name="uniq_evidence_contact_sheet_cluster",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.source_module} contact sheet for cluster {self.evidence_cluster_id}"
+
+
 class ContestActivity(models.Model):
     """
     General activity log for a contest.
@@ -244,6 +293,7 @@ class ContestActivity(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['contest', 'created_at']),
+            models.Index(fields=['contest', 'user', 'created_at']),
         ]
 
     def __str__(self):
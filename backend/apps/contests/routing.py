@@ -0,0 +1,9 @@
+"""WebSocket URL routing for the live proctoring stream."""
+
+from django.urls import path
+
+from .consumers import ProctoringConsumer
+
+websocket_urlpatterns = [
+    path("ws/contests/<uuid:contest_id>/proctoring/", ProctoringConsumer.as_asgi()),
+]
@@ -1255,6 +1255,18 @@ class ExamAnswerSubmitSerializer(serializers.Serializer):
         return value
 
 
+class ExamAnswerAutosaveSerializer(serializers.Serializer):
+    """Serializer for a batched autosave of several answers."""
+    answers = ExamAnswerSubmitSerializer(many=True, allow_empty=False)
+
+    def validate_answers(self, value):
+        from .services.exam_autosave import MAX_AUTOSAVE_BATCH
+
+        if len(value) > MAX_AUTOSAVE_BATCH:
+            raise serializers.ValidationError(f'at most {MAX_AUTOSAVE_BATCH} answers per autosave')
+        return value
+
+
 class ExamAnswerGradeSerializer(serializers.Serializer):
     """Serializer for TA grading a single answer."""
     score = serializers.DecimalField(max_digits=6, decimal_places=2)
@@ -5,7 +5,7 @@ Service layer for contest domain logic.
 from .export_service import (
     ExportValidationError,
     build_contest_download_response,
-    build_paper_exam_results_csv_response,
+    build_paper_exam_results_response,
     build_paper_exam_sheet_response,
     build_student_report_response,
     parse_scale,
@@ -24,7 +24,7 @@ from .question_edit_lock import (
 __all__ = [
     "ExportValidationError",
     "build_contest_download_response",
-    "build_paper_exam_results_csv_response",
+    "build_paper_exam_results_response",
     "build_paper_exam_sheet_response",
     "build_student_report_response",
     "parse_scale",
@@ -367,6 +367,11 @@ def is_access_token_allowed(user_id: int, jti: str) -> bool:
     * If no pin exists → all tokens are allowed (normal operation).
     * If a pin exists → only the pinned JTI is allowed.
     """
+    # Fast path: pins are always indexed, so no index means no pin and the
+    # stale-pin cleanup below has nothing to release.
+    if not _load_exam_jti_index(user_id):
+        return True
+
     # Failsafe: if the user is no longer in an active exam lock state, release
     # any stale pin(s) to avoid login redirect loops.
     now = timezone.now()
@@ -439,6 +444,12 @@ def blacklist_other_tokens(user, access_jti: str, refresh_jti: str = "", contest
 # Part B: Standalone device-conflict check (usable outside ViewSet mixins)
 # ---------------------------------------------------------------------------
 
+def has_device_conflict(contest_id: int, user_id: int, request) -> bool:
+    """Whether another device holds the active exam session (cache read only)."""
+    active = get_active_session(contest_id, user_id)
+    return bool(active and active.get("device_id") and active.get("device_id") != get_device_id(request))
+
+
 def build_device_conflict_payload(contest, participant, request) -> dict[str, Any] | None:
     """Return conflict payload if the request comes from a different device.
 
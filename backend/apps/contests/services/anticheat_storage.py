@@ -4,41 +4,17 @@ S3-compatible helper utilities for anti-cheat upload and evidence access.
 from __future__ import annotations
 
 import uuid
-from functools import lru_cache
 from typing import Any
 from urllib.parse import urlparse, urlunparse
 
 from django.conf import settings
 
-
-def _get_boto3():
-    import boto3  # type: ignore
-
-    return boto3
-
-
-@lru_cache(maxsize=8)
-def _cached_s3_client(resolved_endpoint: str) -> Any:
-    """Create and cache boto3 S3 clients by endpoint.
-
-    Client construction is relatively expensive. In hot paths like
-    presigned-URL generation, reusing clients significantly reduces latency.
-    """
-    boto3 = _get_boto3()
-    kwargs: dict[str, Any] = {
-        "aws_access_key_id": settings.OBJECT_STORAGE_ACCESS_KEY,
-        "aws_secret_access_key": settings.OBJECT_STORAGE_SECRET_KEY,
-        "region_name": settings.OBJECT_STORAGE_REGION,
-    }
-    if resolved_endpoint:
-        kwargs["endpoint_url"] = resolved_endpoint
-    return boto3.client("s3", **kwargs)
+from apps.core.services import object_storage
 
 
 def get_s3_client(*, endpoint_url: str | None = None):
-    resolved_endpoint = endpoint_url if endpoint_url is not None else settings.OBJECT_STORAGE_ENDPOINT_URL
-    endpoint_key = (resolved_endpoint or "").strip()
-    return _cached_s3_client(endpoint_key)
+    """Pooled client from the shared object storage layer."""
+    return object_storage.get_client(endpoint_url=endpoint_url)
 
 
 def _rewrite_presigned_url_for_browser(url: str) -> str:
@@ -89,6 +65,25 @@ def build_raw_object_key(
     )
 
 
+def build_thumbnail_object_key(raw_object_key: str) -> str:
+    """Key of the downscaled copy stored next to a raw frame."""
+    base = raw_object_key[: -len(".webp")] if raw_object_key.endswith(".webp") else raw_object_key
+    return f"{base}.thumb.webp"
+
+
+def build_contact_sheet_object_key(
+    contest_id: int,
+    user_id: int,
+    evidence_cluster_id: str,
+    module: str = "screen_share",
+) -> str:
+    module_segment = (module or "screen_share").strip() or "screen_share"
+    return (
+        f"contest_{contest_id}/user_{user_id}/cluster_{evidence_cluster_id}/{module_segment}/"
+        "contact_sheet.webp"
+    )
+
+
 def generate_put_url(
     bucket: str,
     object_key: str,
@@ -0,0 +1,254 @@
+"""
+Thumbnails and contact sheets for anti-cheat evidence frames.
+
+After ``evidence_upload_confirm`` the ``generate_evidence_thumbnails`` Celery
+task downloads each newly uploaded raw frame once and stores:
+
+- a downscaled copy next to the raw object
+  (``build_thumbnail_object_key``, recorded on ``ExamEvidenceFrame.thumbnail_key``);
+- one contact sheet per evidence cluster and source module
+  (``build_contact_sheet_object_key``, recorded on ``ExamEvidenceContactSheet``)
+  tiling the cluster's first ``CONTACT_SHEET_MAX_TILES`` thumbnails in capture
+  order.
+
+Contact sheets are rebuilt by ``rebuild_evidence_contact_sheet``, at most once
+per cluster every ``CONTACT_SHEET_DEBOUNCE_SECONDS``, and only when the tiled
+frames differ from the stored sheet's.
+
+The screenshots API returns these small objects first so proctors only pull
+full-resolution frames they open.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from io import BytesIO
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+from redis.exceptions import RedisError
+
+from ..models import ExamEvidenceContactSheet, ExamEvidenceFrame
+from .anticheat_storage import build_contact_sheet_object_key, build_thumbnail_object_key, get_s3_client
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_MAX_EDGE = 320
+THUMBNAIL_QUALITY = 70
+CONTACT_SHEET_TILE_SIZE = (192, 108)
+CONTACT_SHEET_MAX_COLUMNS = 6
+CONTACT_SHEET_MAX_TILES = 60
+CONTACT_SHEET_BACKGROUND = (24, 24, 24)
+CONTACT_SHEET_DEBOUNCE_SECONDS = 30
+# Raw frames are capped at a few MB; refuse anything that decodes larger.
+MAX_SOURCE_PIXELS = 24_000_000
+WEBP_CONTENT_TYPE = "image/webp"
+
+_STORAGE_ERRORS = (ClientError, BotoCoreError)
+_IMAGE_ERRORS = (UnidentifiedImageError, OSError, ValueError, Image.DecompressionBombError)
+
+
+def thumbnails_enabled() -> bool:
+    return bool(getattr(settings, "ANTICHEAT_EVIDENCE_THUMBNAILS_ENABLED", True))
+
+
+# ──────────────────────────────────────────────────────────────────
+# Rendering
+# ──────────────────────────────────────────────────────────────────
+
+def _open_image(payload: bytes) -> Image.Image:
+    image = Image.open(BytesIO(payload))
+    if image.width * image.height > MAX_SOURCE_PIXELS:
+        raise ValueError("evidence frame is too large to thumbnail")
+    image = ImageOps.exif_transpose(image)
+    return image.convert("RGB")
+
+
+def _encode_webp(image: Image.Image) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="WEBP", quality=THUMBNAIL_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def render_thumbnail(payload: bytes) -> bytes:
+    """Downscale a raw frame so its longest edge is ``THUMBNAIL_MAX_EDGE``."""
+    image = _open_image(payload)
+    image.thumbnail((THUMBNAIL_MAX_EDGE, THUMBNAIL_MAX_EDGE), Image.Resampling.LANCZOS)
+    return _encode_webp(image)
+
+
+def render_contact_sheet(thumbnails: list[bytes]) -> tuple[bytes, int]:
+    """Tile ``thumbnails`` row-major; returns the WebP payload and column count."""
+    tile_width, tile_height = CONTACT_SHEET_TILE_SIZE
+    columns = max(1, min(CONTACT_SHEET_MAX_COLUMNS, len(thumbnails)))
+    rows = max(1, math.ceil(len(thumbnails) / columns))
+    sheet = Image.new("RGB", (columns * tile_width, rows * tile_height), CONTACT_SHEET_BACKGROUND)
+    for index, payload in enumerate(thumbnails):
+        tile = ImageOps.contain(_open_image(payload), CONTACT_SHEET_TILE_SIZE)
+        row, column = divmod(index, columns)
+        sheet.paste(
+            tile,
+            (
+                column * tile_width + (tile_width - tile.width) // 2,
+                row * tile_height + (tile_height - tile.height) // 2,
+            ),
+        )
+    return _encode_webp(sheet), columns
+
+
+# ──────────────────────────────────────────────────────────────────
+# Storage
+# ──────────────────────────────────────────────────────────────────
+
+def _get_object_bytes(client, object_key: str) -> bytes:
+    response = client.get_object(Bucket=settings.ANTICHEAT_RAW_BUCKET, Key=object_key)
+    return response["Body"].read()
+
+
+def _put_webp(client, object_key: str, payload: bytes) -> None:
+    params = {
+        "Bucket": settings.ANTICHEAT_RAW_BUCKET,
+        "Key": object_key,
+        "Body": payload,
+        "ContentType": WEBP_CONTENT_TYPE,
+    }
+    # Derived objects share the raw frames' cleanup lifecycle.
+    if settings.OBJECT_STORAGE_OBJECT_TAGGING_ENABLED:
+        params["Tagging"] = "cleanup=true"
+    client.put_object(**params)
+
+
+def generate_frame_thumbnails(frame_ids: list[int]) -> int:
+    """
+    Create missing thumbnails for uploaded ``frame_ids`` and refresh the
+    contact sheets of their clusters. Returns the number of thumbnails written.
+    """
+    frames = list(
+        ExamEvidenceFrame.objects.filter(
+            id__in=list(frame_ids),
+            status=ExamEvidenceFrame.Status.UPLOADED,
+            thumbnail_key="",
+        ).exclude(object_key="")
+    )
+    if not frames:
+        return 0
+
+    client = get_s3_client()
+    written = []
+    for frame in frames:
+        thumbnail_key = build_thumbnail_object_key(frame.object_key)
+        try:
+            payload = render_thumbnail(_get_object_bytes(client, frame.object_key))
+            _put_webp(client, thumbnail_key, payload)
+        except _STORAGE_ERRORS + _IMAGE_ERRORS as exc:
+            logger.warning("Failed to thumbnail evidence frame %s: %s", frame.id, exc)
+            continue
+        frame.thumbnail_key = thumbnail_key
+        written.append(frame)
+
+    if written:
+        ExamEvidenceFrame.objects.bulk_update(written, ["thumbnail_key"])
+
+    clusters = {
+        (frame.contest_id, frame.user_id, frame.evidence_cluster_id, frame.source_module)
+        for frame in written
+        if frame.evidence_cluster_id
+    }
+    for contest_id, user_id, cluster_id, source_module in sorted(clusters, key=str):
+        schedule_contact_sheet(contest_id, user_id, cluster_id, source_module)
+    return len(written)
+
+
+def _contact_sheet_pending_key(contest_id, user_id, evidence_cluster_id, source_module) -> str:
+    return f"evidence_contact_sheet:v1:{contest_id}:{user_id}:{evidence_cluster_id}:{source_module}"
+
+
+def schedule_contact_sheet(contest_id, user_id: int, evidence_cluster_id: str, source_module: str) -> None:
+    """
+    Rebuild a cluster's contact sheet once ``CONTACT_SHEET_DEBOUNCE_SECONDS``
+    from now, unless a rebuild is already pending (it will see these frames).
+    """
+    from ..tasks import rebuild_evidence_contact_sheet
+
+    pending_key = _contact_sheet_pending_key(contest_id, user_id, evidence_cluster_id, source_module)
+    try:
+        # Outlives the countdown so a lost task only delays the next batch's rebuild.
+        if not cache.add(pending_key, 1, timeout=CONTACT_SHEET_DEBOUNCE_SECONDS * 4):
+            return
+    except RedisError as exc:
+        logger.warning("Contact sheet debounce unavailable for cluster %s: %s", evidence_cluster_id, exc)
+    rebuild_evidence_contact_sheet.apply_async(
+        args=(str(contest_id), user_id, evidence_cluster_id, source_module),
+        countdown=CONTACT_SHEET_DEBOUNCE_SECONDS,
+    )
+
+
+def release_contact_sheet_debounce(contest_id, user_id: int, evidence_cluster_id: str, source_module: str) -> None:
+    """Let frames confirmed from now on schedule another rebuild."""
+    try:
+        cache.delete(_contact_sheet_pending_key(contest_id, user_id, evidence_cluster_id, source_module))
+    except RedisError as exc:
+        logger.warning("Failed to release contact sheet debounce for cluster %s: %s", evidence_cluster_id, exc)
+
+
+def rebuild_contact_sheet(
+    contest_id,
+    user_id: int,
+    evidence_cluster_id: str,
+    source_module: str,
+) -> ExamEvidenceContactSheet | None:
+    """
+    Re-tile the thumbnailed frames of one cluster into its contact sheet.
+
+    Nothing is downloaded or uploaded when the tiled frames match the stored
+    sheet (e.g. new frames past ``CONTACT_SHEET_MAX_TILES``).
+    """
+    frames = list(
+        ExamEvidenceFrame.objects.filter(
+            contest_id=contest_id,
+            user_id=user_id,
+            evidence_cluster_id=evidence_cluster_id,
+            source_module=source_module,
+            status=ExamEvidenceFrame.Status.UPLOADED,
+        )
+        .exclude(thumbnail_key="")
+        .order_by("client_captured_at_ms", "seq", "id")
+        .only("id", "thumbnail_key")[:CONTACT_SHEET_MAX_TILES]
+    )
+    if not frames:
+        return None
+    frame_ids = [frame.id for frame in frames]
+    lookup = {
+        "contest_id": contest_id,
+        "user_id": user_id,
+        "evidence_cluster_id": evidence_cluster_id,
+        "source_module": source_module,
+    }
+    existing = ExamEvidenceContactSheet.objects.filter(**lookup).first()
+    if existing is not None and existing.frame_ids == frame_ids:
+        return existing
+
+    client = get_s3_client()
+    thumbnails = [_get_object_bytes(client, frame.thumbnail_key) for frame in frames]
+    payload, columns = render_contact_sheet(thumbnails)
+    object_key = build_contact_sheet_object_key(contest_id, user_id, evidence_cluster_id, source_module)
+    _put_webp(client, object_key, payload)
+
+    values = {
+        "object_key": object_key,
+        "frame_ids": frame_ids,
+        "columns": columns,
+        "tile_width": CONTACT_SHEET_TILE_SIZE[0],
+        "tile_height": CONTACT_SHEET_TILE_SIZE[1],
+    }
+    try:
+        with transaction.atomic():
+            sheet, _ = ExamEvidenceContactSheet.objects.update_or_create(defaults=values, **lookup)
+    except IntegrityError:
+        # A concurrent task created the row first; the object key is the same.
+        ExamEvidenceContactSheet.objects.filter(**lookup).update(**values)
+        sheet = ExamEvidenceContactSheet.objects.get(**lookup)
+    return sheet
@@ -0,0 +1,140 @@
+"""
+Redis draft buffer for subjective exam answers.
+
+Essay / short-answer / open-document autosaves are staged in a Redis hash
+per participant instead of updating ``ExamAnswer`` on every keystroke
+burst. Drafts reach Postgres through ``exam_autosave.flush_answer_drafts``:
+
+- periodically (``flush_exam_answer_drafts`` Celery beat task) for
+  participants whose oldest pending draft is older than
+  ``EXAM_ANSWER_DRAFT_FLUSH_SECONDS``;
+- on submission (``finalize_submission``).
+
+Drafts of participants who already submitted are discarded rather than
+written, so a late flush can never change a finalized exam.
+
+Layout (keys go through the Django cache prefix):
+
+- ``exam_drafts:v1:p:{participant_id}`` hash, field ``question_id`` ->
+  JSON ``{"answer", "hash", "saved_at"}``;
+- ``exam_drafts:v1:dirty`` sorted set, member ``participant_id``, score =
+  time of the oldest unflushed draft.
+
+A flush deletes only the fields it wrote (compare-and-delete), so drafts
+staged while the flush runs are kept for the next one.
+"""
+from __future__ import annotations
+
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.cache import redis_client
+
+DRAFT_KEY_TTL_SECONDS = 24 * 60 * 60
+
+# KEYS[1] = draft hash, KEYS[2] = dirty set; ARGV[1] = participant id,
+# then (field, expected value) pairs.
+_RELEASE_FLUSHED_SCRIPT = """
+for i = 2, #ARGV, 2 do
+    if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[i + 1] then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    end
+end
+if redis.call('HLEN', KEYS[1]) == 0 then
+    redis.call('ZREM', KEYS[2], ARGV[1])
+end
+return redis.call('HLEN', KEYS[1])
+"""
+
+
+def drafts_enabled() -> bool:
+    return bool(getattr(settings, 'EXAM_ANSWER_DRAFTS_ENABLED', False))
+
+
+def flush_interval_seconds() -> int:
+    return int(getattr(settings, 'EXAM_ANSWER_DRAFT_FLUSH_SECONDS', 30))
+
+
+def _redis():
+    return redis_client()
+
+
+def _draft_key(participant_id) -> str:
+    return cache.make_key(f"exam_drafts:v1:p:{participant_id}")
+
+
+def _dirty_key() -> str:
+    return cache.make_key("exam_drafts:v1:dirty")
+
+
+def stage_drafts(participant_id, drafts: dict) -> None:
+    """Stage ``{question_id: (answer, answer_hash)}`` for a participant."""
+    if not drafts:
+        return
+    now = time.time()
+    fields = {
+        str(question_id): json.dumps(
+            {'answer': answer, 'hash': digest, 'saved_at': now},
+            ensure_ascii=False,
+        )
+        for question_id, (answer, digest) in drafts.items()
+    }
+    key = _draft_key(participant_id)
+    pipe = _redis().pipeline(transaction=True)
+    pipe.hset(key, mapping=fields)
+    pipe.expire(key, DRAFT_KEY_TTL_SECONDS)
+    # NX keeps the oldest pending time, so constant typing still flushes.
+    pipe.zadd(_dirty_key(), {str(participant_id): now}, nx=True)
+    pipe.execute()
+
+
+def read_drafts(participant_id) -> dict:
+    """``{question_id: {'answer', 'hash', 'saved_at', 'raw'}}`` pending for a participant."""
+    raw = _redis().hgetall(_draft_key(participant_id))
+    drafts = {}
+    for field, value in raw.items():
+        field = field.decode() if isinstance(field, bytes) else field
+        value = value.decode() if isinstance(value, bytes) else value
+        draft = json.loads(value)
+        draft['raw'] = value
+        drafts[field] = draft
+    return drafts
+
+
+def discard_draft(participant_id, question_id) -> None:
+    """Drop a pending draft superseded by a direct write."""
+    _redis().hdel(_draft_key(participant_id), str(question_id))
+
+
+def release_flushed(participant_id, drafts: dict) -> int:
+    """Remove drafts that were written to the database; returns how many remain."""
+    args = [str(participant_id)]
+    for question_id, draft in drafts.items():
+        args.extend([question_id, draft['raw']])
+    client = _redis()
+    return client.eval(_RELEASE_FLUSHED_SCRIPT, 2, _draft_key(participant_id), _dirty_key(), *args)
+
+
+def due_participant_ids(*, older_than_seconds: int | None = None, limit: int = 500) -> list:
+    """Participants with drafts pending for at least ``older_than_seconds``."""
+    if older_than_seconds is None:
+        older_than_seconds = flush_interval_seconds()
+    cutoff = time.time() - older_than_seconds
+    members = _redis().zrangebyscore(_dirty_key(), '-inf', cutoff, start=0, num=limit)
+    return [member.decode() if isinstance(member, bytes) else member for member in members]
+
+
+def discard_participant(participant_id) -> None:
+    """Drop every pending draft of a participant (e.g. after submission)."""
+    pipe = _redis().pipeline(transaction=True)
+    pipe.delete(_draft_key(participant_id))
+    pipe.zrem(_dirty_key(), str(participant_id))
+    pipe.execute()
+
+
+def forget_participant(participant_id) -> None:
+    """Drop the dirty marker of a participant without pending drafts."""
+    _redis().zrem(_dirty_key(), str(participant_id))
@@ -0,0 +1,388 @@
+"""
+Batched exam answer autosave.
+
+The exam client autosaves every few seconds. ``submit_answer`` handles one
+question per request and repeats the full exam validation, question lookup
+and two writes each time; this module backs the ``autosave`` endpoint,
+which accepts several answers at once and:
+
+- caches the participant validation per (contest, user) session and the
+  contest's question snapshots, invalidated by model signals;
+- skips answers whose content hash matches the last stored one;
+- writes the remaining answers with a single ``INSERT ... ON CONFLICT``
+  upsert and applies the dashboard stats deltas in the same transaction;
+- with ``EXAM_ANSWER_DRAFTS_ENABLED``, stages subjective answers in the
+  Redis draft buffer (``exam_answer_drafts``) instead, and
+  ``flush_answer_drafts`` writes them with the same upsert.
+
+Answer hashes are cached per (participant, question) and dropped whenever
+an ExamAnswer is saved through the ORM, so other writers (``submit``,
+grading) never leave a stale hash behind.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from ..models import Contest, ContestParticipant, ExamAnswer, ExamQuestion, ExamQuestionAnswerFormat, ExamStatus
+from ..permissions import can_manage_contest
+from . import exam_answer_drafts, exam_dashboard_stats
+from .exam_validation import validate_exam_operation
+from .open_answer_document import validate_open_answer_document
+from .question_edit_lock import is_non_empty_exam_answer, lock_contest_question_editing
+
+AUTOSAVE_SESSION_TTL_SECONDS = 30
+AUTOSAVE_QUESTION_SET_TTL_SECONDS = 10 * 60
+AUTOSAVE_HASH_TTL_SECONDS = 6 * 60 * 60
+MAX_AUTOSAVE_BATCH = 50
+MAX_OPEN_DOCUMENT_BYTES = 32 * 1024
+
+
+@dataclass(frozen=True)
+class AutosaveSession:
+    """Cached result of ``validate_exam_operation`` for one exam session."""
+    participant_id: object
+    user_id: int
+    can_manage: bool
+
+
+# ──────────────────────────────────────────────────────────────────
+# Cache keys and invalidation (called from signals)
+# ──────────────────────────────────────────────────────────────────
+
+def _session_cache_key(contest_id, user_id) -> str:
+    return f"exam_autosave:session:v1:{contest_id}:{user_id}"
+
+
+def _question_set_cache_key(contest_id) -> str:
+    return f"exam_autosave:questions:v1:{contest_id}"
+
+
+def _hash_cache_key(participant_id, question_id) -> str:
+    return f"exam_autosave:hash:v1:{participant_id}:{question_id}"
+
+
+def invalidate_autosave_session(contest_id, user_id) -> None:
+    cache.delete(_session_cache_key(contest_id, user_id))
+
+
+def invalidate_question_set(contest_id) -> None:
+    cache.delete(_question_set_cache_key(contest_id))
+
+
+def forget_answer_hash(participant_id, question_id) -> None:
+    cache.delete(_hash_cache_key(participant_id, question_id))
+
+
+def answer_hash(answer) -> str:
+    """Stable content hash of an answer payload."""
+    encoded = json.dumps(answer, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+# ──────────────────────────────────────────────────────────────────
+# Session and question set
+# ──────────────────────────────────────────────────────────────────
+
+def get_autosave_session(contest: Contest, user) -> AutosaveSession:
+    """
+    Return the validated session for ``user``, running the full exam
+    validation only when the cached one is missing or the contest changed.
+    Raises DRF exceptions like ``validate_exam_operation``.
+    """
+    contest_version = contest.updated_at.isoformat() if contest.updated_at else ''
+    key = _session_cache_key(contest.id, user.id)
+    cached = cache.get(key)
+    if isinstance(cached, dict) and cached.get('contest_version') == contest_version:
+        session = AutosaveSession(**cached['session'])
+    else:
+        participant = validate_exam_operation(contest, user, require_in_progress=True)
+        if participant is None:
+            raise ValidationError('Not registered for this contest.')
+        session = AutosaveSession(
+            participant_id=participant.id,
+            user_id=user.id,
+            can_manage=can_manage_contest(user, contest),
+        )
+        cache.set(
+            key,
+            {
+                'contest_version': contest_version,
+                'session': {
+                    'participant_id': session.participant_id,
+                    'user_id': session.user_id,
+                    'can_manage': session.can_manage,
+                },
+            },
+            timeout=AUTOSAVE_SESSION_TTL_SECONDS,
+        )
+
+    # The time window is cheap to check and must not lag behind the cache.
+    if not session.can_manage and contest.end_time and timezone.now() > contest.end_time:
+        invalidate_autosave_session(contest.id, user.id)
+        raise ValidationError('Contest has ended.')
+    return session
+
+
+def get_question_set(contest_id) -> dict:
+    """``{str(question_id): question snapshot}`` for the contest, cached."""
+    key = _question_set_cache_key(contest_id)
+    questions = cache.get(key)
+    if questions is None:
+        questions = {
+            str(question.id): question.to_snapshot()
+            for question in ExamQuestion.objects.filter(contest_id=contest_id)
+        }
+        cache.set(key, questions, timeout=AUTOSAVE_QUESTION_SET_TTL_SECONDS)
+    return questions
+
+
+def _load_answer_hashes(participant_id, question_ids: list) -> dict:
+    keys = {question_id: _hash_cache_key(participant_id, question_id) for question_id in question_ids}
+    cached = cache.get_many(keys.values())
+    hashes = {question_id: cached[key] for question_id, key in keys.items() if key in cached}
+    missing = [question_id for question_id in question_ids if question_id not in hashes]
+    if missing:
+        stored = {
+            str(question_id): answer
+            for question_id, answer in ExamAnswer.objects.filter(
+                participant_id=participant_id,
+                question_id__in=missing,
+            ).values_list('question_id', 'answer')
+        }
+        # '' marks "no stored answer" so the miss is cached as well.
+        loaded = {
+            question_id: answer_hash(stored[question_id]) if question_id in stored else ''
+            for question_id in missing
+        }
+        if exam_answer_drafts.drafts_enabled():
+            # A pending draft is newer than the stored row.
+            for question_id, draft in exam_answer_drafts.read_drafts(participant_id).items():
+                if question_id in loaded:
+                    loaded[question_id] = draft['hash']
+        cache.set_many({keys[qid]: value for qid, value in loaded.items()}, timeout=AUTOSAVE_HASH_TTL_SECONDS)
+        hashes.update(loaded)
+    return hashes
+
+
+def _answer_error(question: dict, answer) -> str | None:
+    if question.get('answer_format') != ExamQuestionAnswerFormat.OPEN_DOCUMENT:
+        return None
+    document = answer.get('document')
+    try:
+        validate_open_answer_document(document)
+    except ValidationError as exc:
+        detail = exc.detail[0] if isinstance(exc.detail, list) else exc.detail
+        return str(detail)
+    serialized = json.dumps(document, ensure_ascii=False)
+    if len(serialized.encode('utf-8')) > MAX_OPEN_DOCUMENT_BYTES:
+        return 'open answer document exceeds 32 KB'
+    return None
+
+
+# ──────────────────────────────────────────────────────────────────
+# Autosave
+# ──────────────────────────────────────────────────────────────────
+
+def autosave_answers(contest: Contest, session: AutosaveSession, items: list) -> dict:
+    """
+    Save a batch of ``{'question_id', 'answer'}`` items for ``session``.
+
+    Returns ``{'results': [...], 'saved_count': n, 'buffered_count': b,
+    'unchanged_count': m}`` with one result per item, in request order.
+    Later items for the same question win. ``buffered`` answers are in the
+    draft buffer and reach the database on the next flush.
+    """
+    questions = get_question_set(contest.id)
+    question_ids = list(dict.fromkeys(str(item['question_id']) for item in items))
+    known_ids = [question_id for question_id in question_ids if question_id in questions]
+    hashes = _load_answer_hashes(session.participant_id, known_ids)
+
+    results = []
+    pending = {}
+    for item in items:
+        question_id = str(item['question_id'])
+        answer = item['answer']
+        question = questions.get(question_id)
+        if question is None:
+            results.append({'question_id': question_id, 'status': 'error', 'detail': 'Question not found in this contest.'})
+            continue
+        error = _answer_error(question, answer)
+        if error is not None:
+            results.append({'question_id': question_id, 'status': 'error', 'detail': error})
+            continue
+        digest = answer_hash(answer)
+        result = {'question_id': question_id, 'answer_hash': digest}
+        if hashes.get(question_id) == digest and question_id not in pending:
+            result['status'] = 'unchanged'
+        else:
+            result['status'] = 'buffered' if _is_draftable(question) else 'saved'
+            pending[question_id] = (answer, digest)
+        results.append(result)
+
+    if pending:
+        drafts = {
+            question_id: value for question_id, value in pending.items()
+            if _is_draftable(questions[question_id])
+        }
+        direct = {question_id: value for question_id, value in pending.items() if question_id not in drafts}
+        if direct:
+            upsert_answers(session.participant_id, questions, direct)
+        if drafts:
+            exam_answer_drafts.stage_drafts(session.participant_id, drafts)
+        cache.set_many(
+            {
+                _hash_cache_key(session.participant_id, question_id): digest
+                for question_id, (_, digest) in pending.items()
+            },
+            timeout=AUTOSAVE_HASH_TTL_SECONDS,
+        )
+        if (
+            not contest.question_edit_locked
+            and not session.can_manage
+            and any(is_non_empty_exam_answer(answer) for answer, _ in pending.values())
+        ):
+            lock_contest_question_editing(
+                contest=contest,
+                trigger=Contest.QuestionEditLockTrigger.EXAM_ANSWER,
+                actor_id=session.user_id,
+            )
+
+    counts = {status: 0 for status in ('saved', 'buffered', 'unchanged')}
+    for result in results:
+        if result['status'] in counts:
+            counts[result['status']] += 1
+    return {
+        'results': results,
+        'saved_count': counts['saved'],
+        'buffered_count': counts['buffered'],
+        'unchanged_count': counts['unchanged'],
+    }
+
+
+def _is_draftable(question: dict) -> bool:
+    """Subjective answers are buffered; objective ones are graded on write."""
+    return (
+        exam_answer_drafts.drafts_enabled()
+        and question.get('question_type') not in exam_dashboard_stats.OBJECTIVE_QUESTION_TYPES
+    )
+
+
+def upsert_answers(participant_id, questions: dict, pending: dict) -> bool:
+    """
+    Write ``{question_id: (answer, hash)}`` with one upsert, auto-grading in memory.
+
+    Returns False without writing when the participant has already submitted.
+    The participant row is locked, so this either lands before
+    ``finalize_submission`` changes the status or sees the submitted status.
+    """
+    with transaction.atomic():
+        status, role = (
+            ContestParticipant.objects.select_for_update(of=('self',))
+            .filter(pk=participant_id)
+            .values_list('exam_status', 'user__role')
+            .first()
+        ) or (None, None)
+        if status == ExamStatus.SUBMITTED:
+            return False
+        existing = {
+            str(answer.question_id): answer
+            for answer in ExamAnswer.objects.filter(
+                participant_id=participant_id,
+                question_id__in=list(pending),
+            ).only('id', 'question_id', 'answer', 'score', 'is_correct', 'question_snapshot')
+        }
+        rows, changes = [], []
+        for question_id, (answer, _) in pending.items():
+            current = existing.get(question_id)
+            row = ExamAnswer(
+                participant_id=participant_id,
+                question_id=question_id,
+                answer=answer,
+                # Only inserted rows take this snapshot (the upsert never
+                # updates it); existing rows grade against their own.
+                question_snapshot=(current.question_snapshot if current else None) or questions[question_id],
+                score=current.score if current else None,
+                is_correct=current.is_correct if current else None,
+            )
+            row.auto_grade()
+            rows.append(row)
+            before = exam_dashboard_stats.answer_contribution(current) if current else None
+            changes.append((row.question_id, before, exam_dashboard_stats.answer_contribution(row)))
+
+        ExamAnswer.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['participant', 'question'],
+            update_fields=['answer', 'is_correct', 'score', 'updated_at'],
+        )
+        exam_dashboard_stats.apply_bulk_answer_changes(participant_id, changes, is_student=role == 'student')
+    return True
+
+
+def flush_answer_drafts(participant_id, contest_id=None) -> int:
+    """
+    Write a participant's pending drafts to ``ExamAnswer``.
+
+    Returns the number of answers written. Drafts for questions that no
+    longer exist, and all drafts of a participant who already submitted,
+    are dropped.
+    """
+    drafts = exam_answer_drafts.read_drafts(participant_id)
+    if not drafts:
+        exam_answer_drafts.forget_participant(participant_id)
+        return 0
+    if contest_id is None:
+        contest_id = (
+            ContestParticipant.objects.filter(pk=participant_id)
+            .values_list('contest_id', flat=True)
+            .first()
+        )
+    questions = get_question_set(contest_id) if contest_id is not None else {}
+    pending = {
+        question_id: (draft['answer'], draft['hash'])
+        for question_id, draft in drafts.items()
+        if question_id in questions
+    }
+    if pending and not upsert_answers(participant_id, questions, pending):
+        exam_answer_drafts.discard_participant(participant_id)
+        return 0
+    exam_answer_drafts.release_flushed(participant_id, drafts)
+    return len(pending)
+
+
+def merge_answer_drafts(participant_id, serialized_answers: list) -> list:
+    """Overlay pending drafts on serialized ``ExamAnswerSerializer`` rows."""
+    if not exam_answer_drafts.drafts_enabled():
+        return serialized_answers
+    drafts = exam_answer_drafts.read_drafts(participant_id)
+    if not drafts:
+        return serialized_answers
+    merged = []
+    for item in serialized_answers:
+        draft = drafts.pop(str(item['question_id']), None)
+        if draft is not None:
+            item = {**item, 'answer': draft['answer'], 'updated_at': _draft_time(draft)}
+        merged.append(item)
+    for question_id, draft in drafts.items():
+        merged.append({
+            'id': None,
+            'question_id': question_id,
+            'answer': draft['answer'],
+            'created_at': _draft_time(draft),
+            'updated_at': _draft_time(draft),
+        })
+    return merged
+
+
+def _draft_time(draft: dict) -> str:
+    saved_at = datetime.fromtimestamp(draft['saved_at'], tz=dt_timezone.utc)
+    return serializers.DateTimeField().to_representation(saved_at)
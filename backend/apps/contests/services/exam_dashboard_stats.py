@@ -0,0 +1,361 @@
+"""
+Materialized exam dashboard statistics.
+
+``ExamQuestionStats`` keeps per-question aggregates (answer/graded counts,
+score sum, zero/full/correct counts and the option histogram) for student
+answers. ``ExamAnswer`` post_save/post_delete signals (and the bulk
+autosave upsert) apply the difference between an answer's old and new
+contribution, so the dashboard reads one row per question instead of
+scanning every answer.
+
+Consistency rules:
+- deltas are applied after the answer transaction commits, as one ``F()``
+  UPDATE per question, so answer writes never hold the shared stats row
+  lock; a rolled-back write applies nothing;
+- rows are created when the exam is published (and on read when missing);
+  writes never create them;
+- a row is rebuilt from ``ExamAnswer`` when it is missing or was built
+  against an older question (``updated_at`` / ``score`` changed), and
+  deltas only apply to rows built against the current question;
+- changes the signals cannot see (queryset updates, unknown previous
+  state) mark the row stale instead of guessing.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, Now
+
+from ..models import ExamAnswer, ExamQuestion, ExamQuestionStats, ExamQuestionType
+from .exam_scoring import QuestionStats
+
+logger = logging.getLogger(__name__)
+
+OBJECTIVE_QUESTION_TYPES = {
+    ExamQuestionType.TRUE_FALSE,
+    ExamQuestionType.SINGLE_CHOICE,
+    ExamQuestionType.MULTIPLE_CHOICE,
+}
+
+_SNAPSHOT_ATTR = '_dashboard_stats_contribution'
+_COUNTER_FIELDS = ('answer_count', 'graded_count', 'score_sum', 'zero_count', 'full_count', 'correct_count')
+_UNKNOWN = object()
+
+
+# ──────────────────────────────────────────────────────────────────
+# Answer contributions
+# ──────────────────────────────────────────────────────────────────
+
+def extract_selected_values(answer) -> list:
+    """Selected option values of an objective answer payload."""
+    if not isinstance(answer, dict):
+        return []
+    selected = answer.get('selected')
+    if selected is None:
+        return []
+    if isinstance(selected, list):
+        return selected
+    return [selected]
+
+
+def matches_option(selected_values, option_value, option_index) -> bool:
+    """Whether an option is chosen, by value, index or letter (A, B, ...)."""
+    option_letter = chr(65 + option_index)
+    normalized = {str(option_value), str(option_index), option_letter}
+    return any(str(value) in normalized for value in selected_values)
+
+
+@dataclass(frozen=True)
+class AnswerContribution:
+    """The part of an answer that ExamQuestionStats depends on."""
+    score: Optional[Decimal]
+    is_correct: Optional[bool]
+    selected: tuple
+
+
+def answer_contribution(answer: ExamAnswer) -> AnswerContribution:
+    score = answer.score
+    return AnswerContribution(
+        score=Decimal(str(score)) if score is not None else None,
+        is_correct=answer.is_correct,
+        selected=tuple(str(value) for value in extract_selected_values(answer.answer)),
+    )
+
+
+def snapshot_answer_contribution(answer: ExamAnswer) -> None:
+    """Record the contribution of a freshly loaded/saved answer."""
+    deferred = answer.get_deferred_fields()
+    if deferred & {'answer', 'score', 'is_correct'}:
+        return
+    setattr(answer, _SNAPSHOT_ATTR, answer_contribution(answer))
+
+
+def _empty_delta(question: ExamQuestion) -> tuple[dict, list]:
+    counts = dict.fromkeys(_COUNTER_FIELDS, 0)
+    counts['score_sum'] = Decimal('0')
+    return counts, [0] * len(question.options or [])
+
+
+def _add_contribution(counts: dict, option_deltas: list, question: ExamQuestion, contribution, sign: int) -> None:
+    if contribution is None:
+        return
+    counts['answer_count'] += sign
+    if contribution.score is not None:
+        counts['graded_count'] += sign
+        counts['score_sum'] += sign * contribution.score
+        if contribution.score == 0:
+            counts['zero_count'] += sign
+        if contribution.score >= question.score:
+            counts['full_count'] += sign
+    if contribution.is_correct is True:
+        counts['correct_count'] += sign
+    if contribution.selected:
+        for index, option in enumerate(question.options or []):
+            if matches_option(contribution.selected, option, index):
+                option_deltas[index] += sign
+
+
+# ──────────────────────────────────────────────────────────────────
+# Incremental maintenance (applied after the answer write commits)
+# ──────────────────────────────────────────────────────────────────
+
+def _is_student_participant(participant_id) -> bool:
+    from ..models import ContestParticipant
+
+    return ContestParticipant.objects.filter(pk=participant_id, user__role='student').exists()
+
+
+def _is_fresh(row: ExamQuestionStats, question: ExamQuestion) -> bool:
+    return (
+        row.question_updated_at is not None
+        and row.question_updated_at == question.updated_at
+        and row.question_score == question.score
+        and len(row.option_counts) == len(question.options or [])
+    )
+
+
+def _shifted_option_counts(option_deltas: list) -> RawSQL:
+    # Rebuild the histogram array in SQL so the increment is one statement.
+    terms = ', '.join(['COALESCE((option_counts ->> %s)::int, 0) + %s'] * len(option_deltas))
+    params = [value for index, delta in enumerate(option_deltas) for value in (index, delta)]
+    return RawSQL(f'jsonb_build_array({terms})', params)
+
+
+def _update_row(question: ExamQuestion, before, after) -> None:
+    counts, option_deltas = _empty_delta(question)
+    _add_contribution(counts, option_deltas, question, before, -1)
+    _add_contribution(counts, option_deltas, question, after, 1)
+    updates = {field: F(field) + delta for field, delta in counts.items() if delta}
+    if any(option_deltas):
+        updates['option_counts'] = _shifted_option_counts(option_deltas)
+    if not updates:
+        return
+    # Rows that are missing or built against another version of the
+    # question are left alone; the next dashboard read rebuilds them.
+    ExamQuestionStats.objects.filter(
+        question_id=question.id,
+        question_updated_at=question.updated_at,
+        question_score=question.score,
+    ).update(revision=F('revision') + 1, updated_at=Now(), **updates)
+
+
+def _apply_committed_changes(participant_id, changes: list, is_student: Optional[bool]) -> None:
+    question_ids = [question_id for question_id, _, _ in changes]
+    try:
+        unknown = [question_id for question_id, before, _ in changes if before is _UNKNOWN]
+        if unknown:
+            mark_question_stats_stale(unknown)
+        known = [change for change in changes if change[1] is not _UNKNOWN]
+        if not known:
+            return
+        if is_student is None:
+            is_student = _is_student_participant(participant_id)
+        if not is_student:
+            return
+        questions = {
+            str(question.id): question
+            for question in ExamQuestion.objects.filter(
+                id__in=[question_id for question_id, _, _ in known]
+            ).only('id', 'options', 'score', 'updated_at')
+        }
+        for question_id, before, after in known:
+            question = questions.get(str(question_id))
+            if question is not None:
+                _update_row(question, before, after)
+    except Exception:
+        # Never fail the answer write because of dashboard bookkeeping.
+        logger.exception("Failed to update ExamQuestionStats for questions %s", question_ids)
+        try:
+            mark_question_stats_stale(question_ids)
+        except Exception:
+            logger.exception("Failed to mark ExamQuestionStats stale for questions %s", question_ids)
+
+
+def apply_answer_change(answer: ExamAnswer, *, created: bool = False, deleted: bool = False) -> None:
+    """Apply an answer write to its question's ExamQuestionStats row once it commits."""
+    before = None if created else getattr(answer, _SNAPSHOT_ATTR, _UNKNOWN)
+    after = None if deleted else answer_contribution(answer)
+    if not deleted:
+        setattr(answer, _SNAPSHOT_ATTR, after)
+    if before == after:
+        return
+    participant_id = answer.participant_id
+    changes = [(answer.question_id, before, after)]
+    transaction.on_commit(lambda: _apply_committed_changes(participant_id, changes, None))
+
+
+def apply_bulk_answer_changes(participant_id, changes: list, *, is_student: bool) -> None:
+    """
+    Apply ``(question_id, before, after)`` contribution changes for writes
+    that bypass model signals (bulk upserts) once they commit. ``before`` is
+    ``None`` for newly created answers; ``is_student`` comes from the
+    participant row the caller already holds.
+    """
+    changes = [(question_id, before, after) for question_id, before, after in changes if before != after]
+    if not changes or not is_student:
+        return
+    transaction.on_commit(lambda: _apply_committed_changes(participant_id, changes, is_student))
+
+
+def mark_question_stats_stale(question_ids: Iterable) -> None:
+    """Force a rebuild on the next read (used for writes the signals cannot diff)."""
+    ExamQuestionStats.objects.filter(question_id__in=list(question_ids)).update(
+        question_updated_at=None,
+        revision=F('revision') + 1,
+    )
+
+
+def touch_question_stats(question_ids: Iterable) -> None:
+    """Bump the revision so revision-keyed caches (question detail) refresh."""
+    ExamQuestionStats.objects.filter(question_id__in=list(question_ids)).update(
+        revision=F('revision') + 1,
+    )
+
+
+# ──────────────────────────────────────────────────────────────────
+# Rebuild and read
+# ──────────────────────────────────────────────────────────────────
+
+def rebuild_question_stats(questions: list[ExamQuestion]) -> dict:
+    """Recompute ExamQuestionStats rows from ExamAnswer for ``questions``."""
+    if not questions:
+        return {}
+    question_ids = [question.id for question in questions]
+    with transaction.atomic():
+        existing = {
+            row.question_id: row
+            for row in ExamQuestionStats.objects.select_for_update().filter(question_id__in=question_ids)
+        }
+        student_answers = ExamAnswer.objects.filter(
+            question_id__in=question_ids,
+            participant__user__role='student',
+        )
+        aggregates = {
+            item['question_id']: item
+            for item in student_answers.values('question_id').annotate(
+                answer_count=Count('id'),
+                graded_count=Count('score'),
+                score_sum=Coalesce(Sum('score'), Decimal('0')),
+                zero_count=Count('id', filter=Q(score=0)),
+                full_count=Count('id', filter=Q(score__gte=F('question__score'))),
+                correct_count=Count('id', filter=Q(is_correct=True)),
+            )
+        }
+
+        option_counts = {question.id: [0] * len(question.options or []) for question in questions}
+        options_by_id = {
+            question.id: question.options
+            for question in questions
+            if question.question_type in OBJECTIVE_QUESTION_TYPES and question.options
+        }
+        if options_by_id:
+            rows = student_answers.filter(question_id__in=list(options_by_id)).values_list('question_id', 'answer')
+            for question_id, payload in rows.iterator(chunk_size=2000):
+                selected = extract_selected_values(payload)
+                if not selected:
+                    continue
+                counts = option_counts[question_id]
+                for index, option in enumerate(options_by_id[question_id]):
+                    if matches_option(selected, option, index):
+                        counts[index] += 1
+
+        rebuilt, to_create, to_update = {}, [], []
+        for question in questions:
+            aggregate = aggregates.get(question.id, {})
+            row = existing.get(question.id) or ExamQuestionStats(question=question)
+            row.answer_count = aggregate.get('answer_count', 0)
+            row.graded_count = aggregate.get('graded_count', 0)
+            row.score_sum = aggregate.get('score_sum', Decimal('0'))
+            row.zero_count = aggregate.get('zero_count', 0)
+            row.full_count = aggregate.get('full_count', 0)
+            row.correct_count = aggregate.get('correct_count', 0)
+            row.option_counts = option_counts[question.id]
+            row.question_score = question.score
+            row.question_updated_at = question.updated_at
+            row.revision += 1
+            (to_update if question.id in existing else to_create).append(row)
+            rebuilt[question.id] = row
+
+        if to_update:
+            ExamQuestionStats.objects.bulk_update(
+                to_update,
+                [
+                    'answer_count', 'graded_count', 'score_sum', 'zero_count', 'full_count',
+                    'correct_count', 'option_counts', 'question_score', 'question_updated_at',
+                    'revision',
+                ],
+            )
+        if to_create:
+            ExamQuestionStats.objects.bulk_create(to_create, ignore_conflicts=True)
+    return rebuilt
+
+
+def load_question_stats(contest, question_ids: Optional[Iterable] = None) -> dict:
+    """
+    Return ``{question_id: ExamQuestionStats}`` for the contest's questions,
+    rebuilding rows that are missing or stale.
+    """
+    questions = ExamQuestion.objects.filter(contest=contest).only(
+        'id', 'contest_id', 'question_type', 'options', 'score', 'updated_at',
+    )
+    if question_ids is not None:
+        questions = questions.filter(id__in=list(question_ids))
+    questions = list(questions)
+    rows = {
+        row.question_id: row
+        for row in ExamQuestionStats.objects.filter(question_id__in=[q.id for q in questions])
+    }
+    stale = [
+        question
+        for question in questions
+        if question.id not in rows or not _is_fresh(rows[question.id], question)
+    ]
+    rows.update(rebuild_question_stats(stale))
+    return rows
+
+
+def prepare_question_stats(contest_id) -> None:
+    """Build the stats rows of a contest's questions (called on publish)."""
+    from ..models import Contest
+
+    contest = Contest.objects.filter(pk=contest_id).first()
+    if contest is not None:
+        load_question_stats(contest)
+
+
+def to_question_stats(row: ExamQuestionStats) -> QuestionStats:
+    return QuestionStats(
+        question_id=row.question_id,
+        answer_count=row.answer_count,
+        graded_count=row.graded_count,
+        score_sum=float(row.score_sum),
+        zero_count=row.zero_count,
+        full_count=row.full_count,
+        correct_count=row.correct_count,
+    )
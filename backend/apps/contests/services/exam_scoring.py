@@ -15,6 +15,7 @@ from decimal import Decimal, ROUND_HALF_UP
 from statistics import median
 from typing import Optional
 
+from django.db.models import Case, DecimalField, F, Sum, Value, When
 
 from ..models import (
     Contest,
@@ -63,6 +64,21 @@ class ParticipantScoreBreakdown:
     items: list = field(default_factory=list)  # list of {question_id, score, policy}
 
 
+@dataclass
+class ParticipantScoreChange:
+    """A participant whose persisted total differs from the recalculated one."""
+    participant: ContestParticipant
+    old_score: Decimal
+    new_score: Decimal
+
+
+@dataclass
+class ScoreRecalculation:
+    """Result of a contest-wide score recalculation (or its dry run)."""
+    participant_count: int
+    changes: list = field(default_factory=list)  # list of ParticipantScoreChange
+
+
 @dataclass
 class QuestionStats:
     """Aggregated stats for a single question."""
@@ -272,47 +288,83 @@ class ExamScoringService:
         participant.save(update_fields=['score'])
         return float(participant.score)
 
-    def recalculate_all(self) -> int:
+    def plan_recalculate_all(self) -> ScoreRecalculation:
         """
-        Recalculate scores for all participants.
-        Returns the number of participants updated.
+        Compute every participant's total in one pass without writing.
+
+        Loads all graded answers of the contest with a single query and
+        scales them with per-question factors computed once. Returns the
+        participants whose persisted score would change.
         """
         questions = self.get_questions()
         effective_max = self._compute_effective_max()
         has_redistribute = any(q.is_redistribute for q in questions)
-        full_marks_total = sum(q.score for q in questions if q.is_full_marks)
+        full_marks_total = Decimal(str(sum(q.score for q in questions if q.is_full_marks)))
+
+        # question_id -> (numerator, denominator) for redistribution scaling,
+        # or None when the raw answer score counts as-is.
+        scaling = {}
+        for q in questions:
+            if q.is_excluded or q.is_redistribute or q.is_full_marks:
+                continue
+            if has_redistribute and q.score > 0 and effective_max[q.id] != q.score:
+                scaling[q.id] = (Decimal(str(effective_max[q.id])), Decimal(str(q.score)))
+            else:
+                scaling[q.id] = None
+
+        participants = list(
+            ContestParticipant.objects.filter(contest=self.contest)
+            .only('id', 'user_id', 'score')
+            .order_by('id')
+        )
+        totals = {p.id: full_marks_total for p in participants}
+        answers = ExamAnswer.objects.filter(
+            participant__contest=self.contest,
+            question_id__in=list(scaling),
+            score__isnull=False,
+        ).values_list('participant_id', 'question_id', 'score')
+        for participant_id, question_id, score in answers.iterator(chunk_size=2000):
+            if participant_id not in totals:
+                continue
+            factor = scaling[question_id]
+            totals[participant_id] += score if factor is None else score * factor[0] / factor[1]
 
-        participants = ContestParticipant.objects.filter(contest=self.contest)
-        count = 0
+        changes = []
         for participant in participants:
-            answers = ExamAnswer.objects.filter(
-                participant=participant,
-                score__isnull=False,
-            ).values_list('question_id', 'score')
-            answer_scores = {qid: float(s) for qid, s in answers}
-
-            total = Decimal(str(full_marks_total))
-            for q in questions:
-                if q.is_excluded or q.is_redistribute or q.is_full_marks:
-                    continue
-                actual = answer_scores.get(q.id)
-                if actual is None:
-                    continue
-                if has_redistribute and q.score > 0 and effective_max[q.id] != q.score:
-                    scaled = (
-                        Decimal(str(actual))
-                        * Decimal(str(effective_max[q.id]))
-                        / Decimal(str(q.score))
-                    )
-                    total += scaled
-                else:
-                    total += Decimal(str(actual))
+            new_score = self._round_score(totals[participant.id])
+            old_score = self._round_score(participant.score or 0)
+            if new_score != old_score:
+                changes.append(ParticipantScoreChange(
+                    participant=participant,
+                    old_score=old_score,
+                    new_score=new_score,
+                ))
+        return ScoreRecalculation(participant_count=len(participants), changes=changes)
+
+    def recalculate_all(self, *, dry_run: bool = False) -> int:
+        """
+        Recalculate scores for all participants.
+
+        Only rows whose total actually changed are written, with a single
+        ``bulk_update``. With ``dry_run=True`` nothing is written; use
+        ``plan_recalculate_all()`` to inspect the diffs.
+        Returns the number of participants recalculated.
+        """
+        plan = self.plan_recalculate_all()
+        if not dry_run:
+            self.apply_recalculation(plan)
+        return plan.participant_count
 
-            rounded = self._round_score(total)
-            participant.score = rounded
-            participant.save(update_fields=['score'])
-            count += 1
-        return count
+    @staticmethod
+    def apply_recalculation(plan: ScoreRecalculation) -> int:
+        """Persist a planned recalculation; returns the number of rows written."""
+        updated = []
+        for change in plan.changes:
+            change.participant.score = change.new_score
+            updated.append(change.participant)
+        if updated:
+            ContestParticipant.objects.bulk_update(updated, ['score'], batch_size=500)
+        return len(updated)
 
     # ──────────────────────────────────────────────────────────────────
     # Participant breakdown (for PDF reports)
@@ -433,6 +485,45 @@ class ExamScoringService:
 
         return {pid: float(self._round_score(score)) for pid, score in scores.items()}
 
+    def aggregate_participant_scores(self, participant_ids: list) -> dict:
+        """
+        Same totals as ``compute_participant_scores`` but summed by the
+        database, so no answer rows are loaded.
+
+        Returns:
+            {participant_id: total_score_float}
+        """
+        questions = self.get_questions()
+        effective_max = self._compute_effective_max()
+        has_redistribute = any(q.is_redistribute for q in questions)
+        full_marks_total = sum(effective_max[q.id] for q in questions if q.is_full_marks)
+
+        whens = []
+        for q in questions:
+            if q.is_excluded or q.is_redistribute or q.is_full_marks:
+                continue
+            scaled = F('score')
+            if has_redistribute and q.score > 0 and effective_max[q.id] != q.score:
+                scaled = (
+                    F('score')
+                    * Value(Decimal(str(effective_max[q.id])))
+                    / Value(Decimal(str(q.score)))
+                )
+            whens.append(When(question_id=q.id, then=scaled))
+
+        scores = {pid: Decimal(str(full_marks_total)) for pid in participant_ids}
+        if whens and participant_ids:
+            totals = (
+                ExamAnswer.objects.filter(participant_id__in=participant_ids, score__isnull=False)
+                .values('participant_id')
+                .annotate(total=Sum(Case(*whens, default=Value(Decimal('0')), output_field=DecimalField())))
+                .values_list('participant_id', 'total')
+            )
+            for pid, total in totals:
+                scores[pid] += total or Decimal('0')
+
+        return {pid: float(self._round_score(score)) for pid, score in scores.items()}
+
     def get_score_distribution(self, participant_scores: list[float]) -> ScoreDistribution:
         """
         Build score distribution from pre-computed participant scores.
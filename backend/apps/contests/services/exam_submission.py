@@ -3,19 +3,25 @@ Submission finalization helpers for exam anti-cheat flows.
 """
 from __future__ import annotations
 
+import logging
 from typing import TYPE_CHECKING
 
 from django.utils import timezone
+from redis.exceptions import RedisError
 
 from apps.contests.models import ExamStatus
 
 from .activity_log import log_contest_activity
 from .anti_cheat_session import clear_active_session, clear_exam_allowed_jti
+from .exam_answer_drafts import discard_participant, drafts_enabled
+from .proctoring_stream import record_status_change
 
 if TYPE_CHECKING:
     from apps.contests.models import ContestParticipant
     from apps.users.models import User
 
+logger = logging.getLogger(__name__)
+
 VALID_SOURCE_MODULES = ("screen_share", "webcam", "attendance")
 
 
@@ -44,8 +50,22 @@ def finalize_submission(
     """Finalize participant submission in a single idempotent flow."""
     session_id = normalize_upload_session_id(upload_session_id)
 
+    if drafts_enabled():
+        # Buffered essay drafts must be durable before the exam closes. The
+        # buffer is an optimization: if Redis is unavailable, submit with the
+        # answers already in the database rather than failing the submission.
+        from .exam_autosave import flush_answer_drafts
+
+        try:
+            flush_answer_drafts(participant.id, participant.contest_id)
+        except RedisError:
+            logger.warning(
+                "Exam answer drafts unavailable on submit participant=%s", participant.id, exc_info=True
+            )
+
     update_fields: list[str] = []
     now = timezone.now()
+    previous_status = participant.exam_status
     if participant.exam_status != ExamStatus.SUBMITTED:
         participant.exam_status = ExamStatus.SUBMITTED
         update_fields.append("exam_status")
@@ -57,6 +77,14 @@ def finalize_submission(
         update_fields.append("submit_reason")
     if update_fields:
         participant.save(update_fields=update_fields)
+        record_status_change(participant, previous_status=previous_status)
+
+    if drafts_enabled():
+        # Drafts staged after the flush above must not reach a submitted exam.
+        try:
+            discard_participant(participant.id)
+        except RedisError:
+            logger.warning("Failed to discard exam answer drafts participant=%s", participant.id, exc_info=True)
 
     clear_active_session(participant.contest_id, participant.user_id)
     # Release JTI pin so other devices can work normally after exam ends
@@ -0,0 +1,259 @@
+"""Object-storage cache for rendered contest exports.
+
+Contest downloads and paper-exam sheets re-run Markdown, syntax
+highlighting and WeasyPrint on every request, although the paper rarely
+changes once published. Right before an exam many proctors download the
+same sheet at once, so rendered artifacts are cached in object storage
+under a key built from:
+
+- the contest id and a *content version*: a hash of the contest row, its
+  exam questions / groups, question bindings (ids, order, pinned question
+  version and ``updated_at``), the bound question assets and the sample
+  test cases of bound problems, so any edit, reorder or repin yields a new
+  key;
+- the render options (kind, language, scale, layout / mode).
+
+Objects of older content versions are deleted when a new version is
+first rendered. Concurrent misses for the same key are coalesced with a
+cache lock: one request renders and uploads. Requests that find the lock
+held render for themselves instead of blocking a worker thread until the
+upload lands.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.services import object_storage
+
+from .anticheat_storage import generate_get_url, get_s3_client
+
+logger = logging.getLogger(__name__)
+
+# Bump when renderer/template output changes so stale PDFs are not served.
+EXPORT_CACHE_FORMAT_VERSION = 1
+_MARKER_TTL_SECONDS = 24 * 60 * 60
+_RENDER_LOCK_TTL_SECONDS = 120
+
+_STORAGE_ERRORS = (BotoCoreError, ClientError, object_storage.ObjectStorageError)
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """Render options that identify one cached artifact."""
+
+    kind: str
+    language: str
+    scale: float
+    variant: str
+    extension: str
+    content_type: str
+    filename: str
+
+
+@dataclass(frozen=True)
+class CachedExport:
+    content: bytes | None
+    object_key: str
+    hit: bool
+
+
+def export_cache_enabled() -> bool:
+    return bool(getattr(settings, "CONTEST_EXPORT_CACHE_ENABLED", False))
+
+
+def contest_content_version(contest) -> str:
+    """Hash everything a contest export is rendered from."""
+    from django.db.models.functions import MD5
+
+    from apps.problems.models import TestCase
+    from apps.question_bank.models import ContestQuestionBinding
+
+    from ..models import ExamQuestion, ExamQuestionGroup
+
+    digest = hashlib.sha256()
+    digest.update(f"v{EXPORT_CACHE_FORMAT_VERSION}:{contest.id}:{contest.updated_at.isoformat()}".encode())
+    parts = (
+        ExamQuestion.objects.filter(contest=contest)
+        .order_by("id")
+        .values_list("id", "order", "group_id", "order_in_group", "updated_at"),
+        ExamQuestionGroup.objects.filter(contest=contest)
+        .order_by("id")
+        .values_list("id", "order", "updated_at"),
+        ContestQuestionBinding.objects.filter(contest=contest)
+        .order_by("id")
+        .values_list(
+            "id",
+            "order",
+            "score",
+            "question_version_id",
+            "question_asset__updated_at",
+            "coding_problem_id",
+            "coding_problem__updated_at",
+            "coding_problem__question_asset__updated_at",
+            "updated_at",
+        ),
+        # Test cases carry no updated_at; hash the sample contents in SQL.
+        TestCase.objects.filter(
+            problem__contest_bindings__contest=contest,
+            is_sample=True,
+        )
+        .order_by("problem_id", "id")
+        .values_list("problem_id", "id", "order", MD5("input_data"), MD5("output_data"))
+        .distinct(),
+    )
+    for rows in parts:
+        digest.update(b"|")
+        for row in rows:
+            digest.update(repr(row).encode())
+    return digest.hexdigest()[:24]
+
+
+def export_object_key(contest, version: str, spec: ExportSpec) -> str:
+    scale = f"{spec.scale:.2f}".rstrip("0").rstrip(".")
+    language = re.sub(r"[^A-Za-z0-9-]", "", spec.language or "") or "default"
+    return (
+        f"contest_{contest.id}/{version}/"
+        f"{spec.kind}_{language}_{scale}_{spec.variant}.{spec.extension}"
+    )
+
+
+def _marker_key(object_key: str) -> str:
+    return f"contest_export_cache:v1:{object_key}"
+
+
+def _lock_key(object_key: str) -> str:
+    return f"contest_export_cache:v1:lock:{object_key}"
+
+
+def _bucket() -> str:
+    return settings.CONTEST_EXPORT_CACHE_BUCKET
+
+
+def _read(client, object_key: str) -> bytes | None:
+    try:
+        obj = client.get_object(Bucket=_bucket(), Key=object_key)
+    except ClientError as exc:
+        code = str(exc.response.get("Error", {}).get("Code", "")).strip()
+        if code in {"404", "NoSuchKey", "NotFound"}:
+            cache.delete(_marker_key(object_key))
+            return None
+        raise
+    return obj["Body"].read()
+
+
+def _exists(client, object_key: str) -> bool:
+    if cache.get(_marker_key(object_key)):
+        return True
+    try:
+        client.head_object(Bucket=_bucket(), Key=object_key)
+    except ClientError as exc:
+        code = str(exc.response.get("Error", {}).get("Code", "")).strip()
+        if code in {"404", "NoSuchKey", "NotFound"}:
+            return False
+        raise
+    cache.set(_marker_key(object_key), True, timeout=_MARKER_TTL_SECONDS)
+    return True
+
+
+def _lookup(client, object_key: str, *, want_content: bool) -> CachedExport | None:
+    if want_content:
+        content = _read(client, object_key)
+        if content is None:
+            return None
+        return CachedExport(content=content, object_key=object_key, hit=True)
+    if _exists(client, object_key):
+        return CachedExport(content=None, object_key=object_key, hit=True)
+    return None
+
+
+def _purge_stale_versions(client, contest, version: str) -> None:
+    prefix = f"contest_{contest.id}/"
+    current = f"{prefix}{version}/"
+    stale: list[dict] = []
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=_bucket(), Prefix=prefix):
+        for obj in page.get("Contents", []):
+            if not obj["Key"].startswith(current):
+                stale.append({"Key": obj["Key"]})
+    for start in range(0, len(stale), 1000):
+        client.delete_objects(Bucket=_bucket(), Delete={"Objects": stale[start:start + 1000], "Quiet": True})
+    if stale:
+        logger.info("Purged %d stale export objects contest=%s", len(stale), contest.id)
+
+
+def fetch_or_render(
+    contest,
+    spec: ExportSpec,
+    render: Callable[[], bytes],
+    *,
+    want_content: bool = True,
+) -> CachedExport:
+    """Return a cached artifact, rendering and uploading it on a miss.
+
+    With ``want_content=False`` the bytes are not downloaded on a hit (the
+    caller only needs the object key for a presigned URL). Storage errors
+    while *reading* fall back to rendering; upload errors are raised only
+    when the caller needs the object itself.
+    """
+    version = contest_content_version(contest)
+    object_key = export_object_key(contest, version, spec)
+    client = get_s3_client()
+
+    try:
+        cached = _lookup(client, object_key, want_content=want_content)
+    except _STORAGE_ERRORS as exc:
+        logger.warning("Export cache lookup failed key=%s: %s", object_key, exc)
+        cached = None
+    if cached is not None:
+        return cached
+
+    lock_key = _lock_key(object_key)
+    owns_lock = cache.add(lock_key, 1, timeout=_RENDER_LOCK_TTL_SECONDS)
+    if not owns_lock and want_content:
+        # Another request is rendering this artifact. Polling for its upload
+        # would park this worker thread, so render locally and leave the
+        # upload to the lock holder.
+        return CachedExport(content=render(), object_key=object_key, hit=False)
+
+    try:
+        content = render()
+        try:
+            object_storage.ensure_bucket(client, _bucket())
+            client.put_object(
+                Bucket=_bucket(),
+                Key=object_key,
+                Body=content,
+                ContentType=spec.content_type,
+                ContentDisposition=f'attachment; filename="{spec.filename}"',
+            )
+        except _STORAGE_ERRORS as exc:
+            if not want_content:
+                raise
+            logger.warning("Export cache upload failed key=%s: %s", object_key, exc)
+            return CachedExport(content=content, object_key=object_key, hit=False)
+        cache.set(_marker_key(object_key), True, timeout=_MARKER_TTL_SECONDS)
+    finally:
+        if owns_lock:
+            cache.delete(lock_key)
+
+    try:
+        _purge_stale_versions(client, contest, version)
+    except _STORAGE_ERRORS as exc:
+        logger.warning("Export cache purge failed contest=%s: %s", contest.id, exc)
+    return CachedExport(content=content, object_key=object_key, hit=False)
+
+
+def presigned_download_url(object_key: str) -> str:
+    return generate_get_url(
+        _bucket(),
+        object_key,
+        expires_seconds=settings.OBJECT_STORAGE_PRESIGNED_URL_TTL_SECONDS,
+    )
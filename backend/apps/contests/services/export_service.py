@@ -1,28 +1,43 @@
 """Contest export/report service helpers."""
 
-import csv
 from collections import defaultdict
 from decimal import Decimal, ROUND_HALF_UP
+from itertools import islice
 
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+
+from apps.core.services.streaming import build_streaming_response
 
 from ..exporters import (
+    TABULAR_FORMATS,
     MarkdownRenderer,
     PDFRenderer,
     StudentReportRenderer,
     PaperExamReportRenderer,
     PaperExamSheetRenderer,
+    iter_tabular,
     sanitize_filename,
 )
+from .export_cache import (
+    ExportSpec,
+    export_cache_enabled,
+    fetch_or_render,
+    presigned_download_url,
+)
+
+
+# Participants fetched per server-side cursor round trip (and per answer query).
+RESULTS_EXPORT_CHUNK_SIZE = 500
 
 
 class ExportValidationError(Exception):
     """Raised when requested export parameters are invalid."""
 
 
-def _format_score(value) -> str:
-    """Format score values at canonical UI/export precision."""
-    return str(Decimal(str(value or 0)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+def _quantize_score(value) -> Decimal:
+    """Score at canonical UI/export precision (kept numeric for XLSX cells)."""
+    return Decimal(str(value or 0)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
 
 def parse_scale(value: str | None) -> float:
@@ -34,7 +49,49 @@ def parse_scale(value: str | None) -> float:
     return max(0.5, min(2.0, scale))
 
 
-def build_contest_download_response(contest, file_format: str, language: str, scale: float, layout: str):
+def _export_response(contest, spec: ExportSpec, render, delivery: str):
+    """Serve a rendered export, through the object-storage cache when enabled.
+
+    ``delivery="file"`` returns the bytes as an attachment (cached bytes on a
+    hit); ``delivery="url"`` returns a presigned object-storage URL instead so
+    the file itself never passes through the web worker.
+    """
+    normalized_delivery = (delivery or "file").lower()
+    if normalized_delivery not in {"file", "url"}:
+        raise ExportValidationError('Invalid delivery. Choose "file" or "url"')
+
+    if not export_cache_enabled():
+        if normalized_delivery == "url":
+            raise ExportValidationError("URL delivery requires the export cache")
+        content = render()
+    else:
+        cached = fetch_or_render(
+            contest, spec, render, want_content=(normalized_delivery == "file")
+        )
+        if normalized_delivery == "url":
+            return JsonResponse(
+                {
+                    "download_url": presigned_download_url(cached.object_key),
+                    "filename": spec.filename,
+                    "expires_in": settings.OBJECT_STORAGE_PRESIGNED_URL_TTL_SECONDS,
+                    "cached": cached.hit,
+                }
+            )
+        content = cached.content
+
+    response = HttpResponse(content, content_type=spec.content_type)
+    response["Content-Disposition"] = f'attachment; filename="{spec.filename}"'
+    return response
+
+
+def build_contest_download_response(
+    contest,
+    file_format: str,
+    language: str,
+    scale: float,
+    layout: str,
+    delivery: str = "file",
+):
     """Generate downloadable contest file response."""
     normalized = (file_format or "markdown").lower()
     if normalized not in {"markdown", "pdf"}:
@@ -42,24 +99,40 @@ def build_contest_download_response(contest, file_format: str, language: str, sc
 
     safe_name = sanitize_filename(contest.name)
     if normalized == "markdown":
-        exporter = MarkdownRenderer(contest, language)
-        content = exporter.export()
-        response = HttpResponse(content, content_type="text/markdown; charset=utf-8")
-        response["Content-Disposition"] = (
-            f'attachment; filename="contest_{contest.id}_{safe_name}.md"'
+        spec = ExportSpec(
+            kind="contest",
+            language=language,
+            scale=1.0,
+            variant="markdown",
+            extension="md",
+            content_type="text/markdown; charset=utf-8",
+            filename=f"contest_{contest.id}_{safe_name}.md",
+        )
+        return _export_response(
+            contest,
+            spec,
+            lambda: MarkdownRenderer(contest, language).export().encode("utf-8"),
+            delivery,
         )
-        return response
 
     normalized_layout = (layout or "normal").lower()
     if normalized_layout not in {"normal", "compact"}:
         normalized_layout = "normal"
-    exporter = PDFRenderer(contest, language, scale=scale, layout=normalized_layout)
-    pdf_file = exporter.export()
-    response = HttpResponse(pdf_file.read(), content_type="application/pdf")
-    response["Content-Disposition"] = (
-        f'attachment; filename="contest_{contest.id}_{safe_name}.pdf"'
+    spec = ExportSpec(
+        kind="contest",
+        language=language,
+        scale=scale,
+        variant=normalized_layout,
+        extension="pdf",
+        content_type="application/pdf",
+        filename=f"contest_{contest.id}_{safe_name}.pdf",
+    )
+    return _export_response(
+        contest,
+        spec,
+        lambda: PDFRenderer(contest, language, scale=scale, layout=normalized_layout).export().read(),
+        delivery,
     )
-    return response
 
 
 def build_student_report_response(contest, user, language: str, scale: float, include_grading: bool = True):
@@ -89,6 +162,7 @@ def build_paper_exam_sheet_response(
     language: str = "zh-TW",
     scale: float = 1.0,
     include_answer_area: bool = True,
+    delivery: str = "file",
 ):
     """Generate downloadable formal paper-exam sheet PDF."""
     normalized_mode = (mode or "question").lower()
@@ -98,22 +172,28 @@ def build_paper_exam_sheet_response(
     if contest.contest_type != "paper_exam":
         raise ExportValidationError("This contest is not a paper exam")
 
-    exporter = PaperExamSheetRenderer(
-        contest=contest,
-        language=language,
-        scale=scale,
-        include_answers=(normalized_mode == "answer"),
-        include_answer_area=include_answer_area,
-    )
-    pdf_file = exporter.export()
+    def _render() -> bytes:
+        exporter = PaperExamSheetRenderer(
+            contest=contest,
+            language=language,
+            scale=scale,
+            include_answers=(normalized_mode == "answer"),
+            include_answer_area=include_answer_area,
+        )
+        return exporter.export().read()
 
     safe_name = sanitize_filename(contest.name)
     suffix = "answer_sheet" if normalized_mode == "answer" else "question_paper"
-    filename = f"exam_{contest.id}_{safe_name}_{suffix}.pdf"
-
-    response = HttpResponse(pdf_file.read(), content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+    spec = ExportSpec(
+        kind="paper",
+        language=language,
+        scale=scale,
+        variant=f"{normalized_mode}_{'area' if include_answer_area else 'noarea'}",
+        extension="pdf",
+        content_type="application/pdf",
+        filename=f"exam_{contest.id}_{safe_name}_{suffix}.pdf",
+    )
+    return _export_response(contest, spec, _render, delivery)
 
 
 def _get_admin_user_ids(contest):
@@ -124,111 +204,127 @@ def _get_admin_user_ids(contest):
     return admin_ids
 
 
-def build_paper_exam_results_csv_response(contest):
-    """Generate CSV response for paper-exam results."""
-    from ..models import ExamAnswer, ExamQuestion, ExamQuestionType
+def _batched(iterable, size: int):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
-    response = HttpResponse(content_type='text/csv; charset=utf-8-sig')
-    safe_name = sanitize_filename(contest.name)
-    response['Content-Disposition'] = f'attachment; filename="exam_{contest.id}_{safe_name}_results.csv"'
 
-    questions = list(
-        ExamQuestion.objects.filter(contest=contest).order_by('order', 'id')
-    )
-    participants = list(
-        contest.registrations
-        .select_related('user')
-        .order_by('rank', '-score', 'joined_at')
+def _results_export_response(request, rows, *, file_format: str, filename_stem: str):
+    normalized_format = (file_format or "csv").lower()
+    if normalized_format not in TABULAR_FORMATS:
+        raise ExportValidationError('Invalid file_format. Choose "csv" or "xlsx"')
+    extension, content_type = TABULAR_FORMATS[normalized_format]
+    response = build_streaming_response(
+        request,
+        iter_tabular(rows, normalized_format, sheet_name="Results"),
+        content_type=content_type,
     )
-    answers = ExamAnswer.objects.filter(participant__contest=contest)
+    response['Content-Disposition'] = f'attachment; filename="{filename_stem}.{extension}"'
+    return response
 
-    # Build lookup: {participant_id: {question_id: ExamAnswer}}
-    answer_lookup = defaultdict(dict)
-    for ans in answers:
-        answer_lookup[ans.participant_id][ans.question_id] = ans
 
-    admin_user_ids = _get_admin_user_ids(contest)
+def _paper_exam_result_rows(contest):
+    """Header, one row per student participant, then the average row."""
+    from ..models import ExamAnswer, ExamQuestion, ExamQuestionType
+
+    questions = list(
+        ExamQuestion.objects.filter(contest=contest).order_by('order', 'id')
+    )
     total_questions = len(questions)
     full_score = sum(q.score for q in questions)
 
-    # Filter out admins/co-admins — only export student participants
-    students = [p for p in participants if p.user_id not in admin_user_ids]
-
-    # Header
-    writer = csv.writer(response)
     header = ['帳號', '顯示名稱', 'Email', '考試狀態', '已批改/總題數', '總分', '滿分']
     for idx, q in enumerate(questions, 1):
         type_label = ExamQuestionType(q.question_type).label
         header.append(f'Q{idx} ({type_label}, {q.score}分)')
-    writer.writerow(header)
+    yield header
+
+    # Only student participants; owner / co-admins are left out.
+    participants = (
+        contest.registrations
+        .exclude(user_id__in=_get_admin_user_ids(contest))
+        .select_related('user', 'user__profile')
+        .order_by('rank', '-score', 'joined_at')
+        .iterator(chunk_size=RESULTS_EXPORT_CHUNK_SIZE)
+    )
 
-    # Data rows — collect scores for average calculation
     score_sums = [0.0] * total_questions
     score_counts = [0] * total_questions
     total_score_sum = Decimal('0')
-    participant_count = len(students)
-
-    for p in students:
-        profile = getattr(p.user, 'profile', None)
-        display_name = getattr(profile, 'display_name', '') or ''
-        status_label = p.get_exam_status_display()
-        p_answers = answer_lookup.get(p.id, {})
-        graded_count = sum(
-            1 for q in questions
-            if q.id in p_answers and p_answers[q.id].score is not None
-        )
-
-        row = [
-            p.user.username,
-            display_name,
-            p.user.email,
-            status_label,
-            f'{graded_count}/{total_questions}',
-            _format_score(p.score),
-            _format_score(full_score),
-        ]
-        total_score_sum += Decimal(str(p.score or 0))
-        for i, q in enumerate(questions):
-            ans = p_answers.get(q.id)
-            if ans is not None and ans.score is not None:
-                row.append(_format_score(ans.score))
-                score_sums[i] += float(ans.score)
-                score_counts[i] += 1
-            else:
-                row.append('-')
-        writer.writerow(row)
+    participant_count = 0
+
+    for batch in _batched(participants, RESULTS_EXPORT_CHUNK_SIZE):
+        # {participant_id: {question_id: score}} for this batch only
+        answer_scores = defaultdict(dict)
+        for participant_id, question_id, score in ExamAnswer.objects.filter(
+            participant_id__in=[p.id for p in batch],
+        ).values_list('participant_id', 'question_id', 'score'):
+            answer_scores[participant_id][question_id] = score
+
+        for p in batch:
+            profile = getattr(p.user, 'profile', None)
+            display_name = getattr(profile, 'display_name', '') or ''
+            p_scores = answer_scores.get(p.id, {})
+            graded_count = sum(
+                1 for q in questions
+                if p_scores.get(q.id) is not None
+            )
+
+            row = [
+                p.user.username,
+                display_name,
+                p.user.email,
+                p.get_exam_status_display(),
+                f'{graded_count}/{total_questions}',
+                _quantize_score(p.score),
+                _quantize_score(full_score),
+            ]
+            participant_count += 1
+            total_score_sum += Decimal(str(p.score or 0))
+            for i, q in enumerate(questions):
+                score = p_scores.get(q.id)
+                if score is not None:
+                    row.append(_quantize_score(score))
+                    score_sums[i] += float(score)
+                    score_counts[i] += 1
+                else:
+                    row.append('-')
+            yield row
 
-    # Average row
     avg_row = ['', '', '', '', '平均']
-    avg_row.append(_format_score(total_score_sum / participant_count) if participant_count else '-')
-    avg_row.append(_format_score(full_score))
+    avg_row.append(_quantize_score(total_score_sum / participant_count) if participant_count else '-')
+    avg_row.append(_quantize_score(full_score))
     for i in range(total_questions):
         if score_counts[i] > 0:
-            avg_row.append(f'{score_sums[i] / score_counts[i]:.2f}')
+            avg_row.append(_quantize_score(score_sums[i] / score_counts[i]))
         else:
             avg_row.append('-')
-    writer.writerow(avg_row)
+    yield avg_row
 
-    return response
 
+def build_paper_exam_results_response(contest, *, file_format: str = 'csv', request=None):
+    """Stream paper-exam results as CSV or XLSX."""
+    safe_name = sanitize_filename(contest.name)
+    return _results_export_response(
+        request,
+        _paper_exam_result_rows(contest),
+        file_format=file_format,
+        filename_stem=f'exam_{contest.id}_{safe_name}_results',
+    )
 
-def build_contest_results_csv_response(contest, scoreboard_result):
-    """Generate CSV response for contest scoreboard results."""
-    response = HttpResponse(content_type='text/csv; charset=utf-8-sig')
-    response['Content-Disposition'] = f'attachment; filename="contest_{contest.id}_results.csv"'
 
+def _contest_result_rows(contest, scoreboard_result):
+    """Header, one row per standing, then the average row."""
     admin_user_ids = _get_admin_user_ids(contest)
-    writer = csv.writer(response)
 
-    # Header row
     header = ['帳號', '顯示名稱', 'Email', '身份', '解題數', '總分', '罰時']
     for problem in scoreboard_result.problems:
         label = problem.get('label') or chr(65 + problem['order'])
         title = problem.get('title') or ''
         header.append(f'{label} ({title})')
-    writer.writerow(header)
+    yield header
 
-    # Data rows
     standings = scoreboard_result.standings
     total_score_sum = 0.0
     total_solved_sum = 0
@@ -261,15 +357,21 @@ def build_contest_results_csv_response(contest, scoreboard_result):
             else:
                 cell = '-'
             row.append(cell)
+        yield row
 
-        writer.writerow(row)
-
-    # Average row
     avg_row = ['', '', '', '平均']
-    avg_row.append(f'{total_solved_sum / count:.2f}' if count else '-')
-    avg_row.append(f'{total_score_sum / count:.2f}' if count else '-')
+    avg_row.append(_quantize_score(total_solved_sum / count) if count else '-')
+    avg_row.append(_quantize_score(total_score_sum / count) if count else '-')
     avg_row.append('')  # penalty — no meaningful average
     avg_row.extend([''] * len(scoreboard_result.problems))
-    writer.writerow(avg_row)
+    yield avg_row
 
-    return response
+
+def build_contest_results_response(contest, scoreboard_result, *, file_format: str = 'csv', request=None):
+    """Stream contest scoreboard results as CSV or XLSX."""
+    return _results_export_response(
+        request,
+        _contest_result_rows(contest, scoreboard_result),
+        file_format=file_format,
+        filename_stem=f'contest_{contest.id}_results',
+    )
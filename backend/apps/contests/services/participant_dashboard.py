@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import base64
+import heapq
+import json
 from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import islice
 from typing import Any
 
-from django.db.models import Count
+from django.db.models import Count, Q
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from apps.contests.exporters.data_service import ContestDataService
 from apps.contests.models import (
@@ -518,38 +524,17 @@ def _merge_clipboard_metadata(base: dict[str, Any], incoming: dict[str, Any]) ->
     return merged
 
 
-def _serialize_event_feed(contest: Contest, participant: ContestParticipant) -> list[dict[str, Any]]:
-    """Build aggregated event feed with 60s-window incident grouping."""
+def _aggregate_event_feed(
+    participant: ContestParticipant,
+    exam_events: list[ExamEvent],
+    evidence_counts_by_event: dict[int, int],
+    activities: list[ContestActivity],
+) -> list[dict[str, Any]]:
+    """Group chronological ``exam_events`` into 60s-window incidents and add activities."""
     window = EVENT_FEED_AGGREGATION_WINDOW_SECONDS
 
     user_name = participant.user.username
 
-    # Fetch exam events (excluding heartbeat) in chronological order
-    exam_events = list(
-        ExamEvent.objects.filter(
-            contest=contest,
-            user_id=participant.user_id,
-        ).exclude(event_type="heartbeat").order_by("created_at")
-    )
-    evidence_counts_by_event = {
-        row["exam_event_id"]: row["count"]
-        for row in ExamEvidenceFrame.objects.filter(
-            contest=contest,
-            user_id=participant.user_id,
-            status=ExamEvidenceFrame.Status.UPLOADED,
-        )
-        .values("exam_event_id")
-        .annotate(count=Count("id"))
-    }
-
-    # Fetch contest activities
-    activities = list(
-        ContestActivity.objects.filter(
-            contest=contest,
-            user_id=participant.user_id,
-        ).order_by("created_at")
-    )
-
     # Aggregate exam events into incidents using (event_type, 60s window) key
     incidents: list[dict[str, Any]] = []
     # Track open incidents: event_type -> index in incidents list
@@ -642,6 +627,248 @@ def _serialize_event_feed(contest: Contest, participant: ContestParticipant) ->
     return incidents
 
 
+# ──────────────────────────────────────────────────────────────────
+# Paginated event feed
+# ──────────────────────────────────────────────────────────────────
+#
+# Incidents are maximal chains of same-type events whose consecutive gaps are
+# within the aggregation window, so they can be found by scanning events
+# newest-first on (contest, user, created_at) and closing a chain once the
+# scan is more than one window past its oldest event. A page scans only
+# ``(id, event_type, created_at)`` until ``limit`` incidents are closed, then
+# loads metadata and evidence counts for those incidents' events alone.
+#
+# Incidents are ordered by key ``(first_at, source_rank, first_id)``
+# descending. The cursor stores the key of the last returned incident and the
+# newest event that was not part of a returned incident; the next page
+# rescans from there and drops rebuilt incidents at or above the key.
+
+EVENT_FEED_PAGE_SIZE = 50
+EVENT_FEED_MAX_PAGE_SIZE = 200
+EVENT_FEED_SCAN_BATCH = 500
+
+_ACTIVITY_RANK = 0
+_EXAM_EVENT_RANK = 1
+
+
+class EventFeedCursorError(ValueError):
+    """Raised for a malformed event feed cursor."""
+
+
+def _encode_event_feed_cursor(boundary: tuple, scan_from: tuple | None) -> str:
+    """``scan_from`` ``None`` means no exam events remain below ``boundary``."""
+    payload = {
+        "b": [boundary[0].isoformat(), boundary[1], boundary[2]],
+        "s": [scan_from[0].isoformat(), scan_from[1]] if scan_from else None,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_event_feed_cursor(cursor: str) -> tuple[tuple, tuple | None, bool]:
+    """Return ``(boundary, scan_from, scan_done)``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        boundary_at, rank, boundary_id = payload["b"]
+        boundary = (_parse_cursor_datetime(boundary_at), int(rank), int(boundary_id))
+        scan_from = None
+        if payload.get("s"):
+            scan_at, scan_id = payload["s"]
+            scan_from = (_parse_cursor_datetime(scan_at), int(scan_id))
+    except (ValueError, TypeError, KeyError, json.JSONDecodeError) as exc:
+        raise EventFeedCursorError("invalid cursor") from exc
+    return boundary, scan_from, scan_from is None
+
+
+def _parse_cursor_datetime(value: str) -> datetime:
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"invalid datetime {value!r}")
+    return parsed
+
+
+def _keyset_before(boundary: tuple, rank: int) -> Q:
+    """Rows whose incident key ``(created_at, rank, id)`` sorts below ``boundary``."""
+    boundary_at, boundary_rank, boundary_id = boundary
+    if rank < boundary_rank:
+        same_instant = Q(created_at=boundary_at)
+    elif rank == boundary_rank:
+        same_instant = Q(created_at=boundary_at, id__lt=boundary_id)
+    else:
+        return Q(created_at__lt=boundary_at)
+    return Q(created_at__lt=boundary_at) | same_instant
+
+
+def _iter_event_chains(events, window_seconds: int, boundary: tuple | None, chains: list):
+    """
+    Yield ``(key, chain)`` for closed incident chains, newest first, from
+    ``events`` (``(id, event_type, created_at)`` ordered by ``(-created_at, -id)``).
+
+    Every chain started is appended to ``chains`` so the caller can tell which
+    ones did not make it into the page.
+    """
+    window = timedelta(seconds=window_seconds)
+    open_chains: dict[Any, dict[str, Any]] = {}
+
+    def close(chain_keys):
+        ordered = sorted(
+            (open_chains.pop(chain_key) for chain_key in chain_keys),
+            key=lambda chain: (chain["first_at"], chain["first_id"]),
+            reverse=True,
+        )
+        for chain in ordered:
+            key = (chain["first_at"], _EXAM_EVENT_RANK, chain["first_id"])
+            if boundary is None or key < boundary:
+                yield key, chain
+
+    for event_id, event_type, created_at in events:
+        # A chain is complete once the scan is a full window past its oldest event.
+        yield from close([
+            chain_key
+            for chain_key, chain in open_chains.items()
+            if chain["first_at"] - created_at > window
+        ])
+
+        chain_key = event_type if event_type != "manual_proctor_note" else ("manual", event_id)
+        chain = open_chains.get(chain_key)
+        if chain is None:
+            chain = {
+                "ids": [],
+                "newest": (created_at, event_id),
+            }
+            open_chains[chain_key] = chain
+            chains.append(chain)
+        chain["ids"].append(event_id)
+        chain["first_at"] = created_at
+        chain["first_id"] = event_id
+
+    yield from close(list(open_chains))
+
+
+def _scan_event_rows(queryset, scan_from: tuple | None, state: dict):
+    """Keyset-scan ``(id, event_type, created_at)`` newest-first, from ``scan_from`` inclusive."""
+    position = scan_from
+    inclusive = True
+    while True:
+        batch = queryset
+        if position is not None:
+            position_at, position_id = position
+            same_instant = Q(created_at=position_at, id__lte=position_id) if inclusive else Q(
+                created_at=position_at, id__lt=position_id
+            )
+            batch = batch.filter(Q(created_at__lt=position_at) | same_instant)
+        rows = list(
+            batch.order_by("-created_at", "-id").values_list("id", "event_type", "created_at")[
+                :EVENT_FEED_SCAN_BATCH
+            ]
+        )
+        for row in rows:
+            state["scanned"] = (row[2], row[0])
+            yield row
+        if len(rows) < EVENT_FEED_SCAN_BATCH:
+            state["exhausted"] = True
+            return
+        position = state["scanned"]
+        inclusive = False
+
+
+def build_participant_event_feed_page(
+    contest: Contest,
+    participant: ContestParticipant,
+    *,
+    cursor: str | None = None,
+    limit: int = EVENT_FEED_PAGE_SIZE,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> dict[str, Any]:
+    """
+    Return one page of the aggregated event feed, newest incidents first.
+
+    ``since`` / ``until`` bound the scanned time window; incidents crossing
+    the window edge are cut at it. Raises ``EventFeedCursorError`` for a
+    malformed cursor.
+    """
+    limit = max(1, min(int(limit), EVENT_FEED_MAX_PAGE_SIZE))
+    boundary, scan_from, scan_done = (None, None, False)
+    if cursor:
+        boundary, scan_from, scan_done = _decode_event_feed_cursor(cursor)
+
+    events = ExamEvent.objects.filter(
+        contest=contest,
+        user_id=participant.user_id,
+    ).exclude(event_type="heartbeat")
+    activities = ContestActivity.objects.filter(contest=contest, user_id=participant.user_id)
+    if since is not None:
+        events = events.filter(created_at__gte=since)
+        activities = activities.filter(created_at__gte=since)
+    if until is not None:
+        events = events.filter(created_at__lt=until)
+        activities = activities.filter(created_at__lt=until)
+    if boundary is not None:
+        activities = activities.filter(_keyset_before(boundary, _ACTIVITY_RANK))
+    activity_rows = list(activities.order_by("-created_at", "-id")[: limit + 1])
+
+    state: dict[str, Any] = {"scanned": None, "exhausted": scan_done}
+    started_chains: list[dict[str, Any]] = []
+    chains = (
+        _iter_event_chains(
+            _scan_event_rows(events, scan_from, state),
+            EVENT_FEED_AGGREGATION_WINDOW_SECONDS,
+            boundary,
+            started_chains,
+        )
+        if not scan_done
+        else iter(())
+    )
+    activity_stream = (
+        ((activity.created_at, _ACTIVITY_RANK, activity.id), activity) for activity in activity_rows
+    )
+    merged = heapq.merge(chains, activity_stream, key=lambda entry: entry[0], reverse=True)
+
+    page = list(islice(merged, limit + 1))
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    emitted_chains = [entry for key, entry in page if key[1] == _EXAM_EVENT_RANK]
+    page_activities = [entry for key, entry in page if key[1] == _ACTIVITY_RANK]
+    event_ids = [event_id for chain in emitted_chains for event_id in chain["ids"]]
+
+    exam_events = list(ExamEvent.objects.filter(id__in=event_ids).order_by("created_at", "id")) if event_ids else []
+    evidence_counts_by_event = (
+        {
+            row["exam_event_id"]: row["count"]
+            for row in ExamEvidenceFrame.objects.filter(
+                exam_event_id__in=event_ids,
+                status=ExamEvidenceFrame.Status.UPLOADED,
+            )
+            .values("exam_event_id")
+            .annotate(count=Count("id"))
+        }
+        if event_ids
+        else {}
+    )
+    items = _aggregate_event_feed(
+        participant,
+        exam_events,
+        evidence_counts_by_event,
+        sorted(page_activities, key=lambda activity: (activity.created_at, activity.id)),
+    )
+
+    next_cursor = None
+    if has_more:
+        # Resume at the newest event not covered by a returned incident. Chains
+        # pulled ahead by the merge but not returned are rebuilt next time.
+        emitted = {id(chain) for chain in emitted_chains}
+        resume_candidates = [chain["newest"] for chain in started_chains if id(chain) not in emitted]
+        if state["scanned"] is not None and not state["exhausted"]:
+            resume_candidates.append(state["scanned"])
+        resume = max(resume_candidates) if resume_candidates else None
+        next_cursor = _encode_event_feed_cursor(page[-1][0], resume)
+
+    return {"items": items, "next_cursor": next_cursor, "has_more": has_more}
+
+
 def build_participant_dashboard(contest: Contest, participant: ContestParticipant) -> dict[str, Any]:
     timeline = _serialize_timeline(contest, participant)
     actions = {
@@ -654,13 +881,15 @@ def build_participant_dashboard(contest: Contest, participant: ContestParticipan
         "can_open_grading": contest.contest_type == "paper_exam",
     }
 
-    event_feed = _serialize_event_feed(contest, participant)
+    # First page only; older incidents come from the event-feed endpoint.
+    event_feed = build_participant_event_feed_page(contest, participant)
 
     payload = {
         "contest_type": contest.contest_type,
         "participant": _serialize_participant(participant),
         "timeline": timeline,
-        "event_feed": event_feed,
+        "event_feed": event_feed["items"],
+        "event_feed_next_cursor": event_feed["next_cursor"],
         "actions": actions,
         "overview": {},
         "report": {},
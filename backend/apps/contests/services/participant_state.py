@@ -15,6 +15,7 @@ from apps.contests.models import (
 
 from .activity_log import log_contest_activity
 from .exam_submission import finalize_submission
+from .proctoring_stream import record_status_change
 from .anti_cheat_session import (
     clear_active_session,
     clear_exam_allowed_jti,
@@ -35,12 +36,14 @@ def unlock_participant(
     activity_details: str,
 ) -> ContestParticipant:
     """Reset a locked participant back to the paused state."""
+    previous_status = participant.exam_status
     participant.exam_status = ExamStatus.PAUSED
     participant.locked_at = None
     participant.lock_reason = ""
     participant.save(
         update_fields=["exam_status", "locked_at", "lock_reason"]
     )
+    record_status_change(participant, previous_status=previous_status)
 
     if activity_user:
         log_contest_activity(
@@ -90,6 +93,7 @@ def admin_update_participant(
 ) -> ContestParticipant:
     """Admin-driven participant field update with consistent lock metadata cleanup."""
     update_fields: list[str] = []
+    previous_status = participant.exam_status
 
     if exam_status is not None:
         participant.exam_status = exam_status
@@ -106,6 +110,7 @@ def admin_update_participant(
 
     if update_fields:
         participant.save(update_fields=update_fields)
+        record_status_change(participant, previous_status=previous_status)
         if exam_status is not None and exam_status not in ACTIVE_EXAM_STATUSES:
             clear_active_session(participant.contest_id, participant.user_id)
             clear_heartbeat(participant.contest_id, participant.user_id)
@@ -128,11 +133,13 @@ def reopen_participant_exam(
     activity_details: str,
 ) -> ContestParticipant:
     """Reopen a submitted exam back to PAUSED so the student can continue."""
+    previous_status = participant.exam_status
     participant.exam_status = ExamStatus.PAUSED
     participant.submit_reason = ""
     update_fields = ["exam_status", "submit_reason"]
     update_fields.extend(_clear_lock_metadata(participant))
     participant.save(update_fields=update_fields)
+    record_status_change(participant, previous_status=previous_status)
 
     log_contest_activity(
         contest=participant.contest,
@@ -0,0 +1,257 @@
+"""
+Live proctoring stream for contest staff.
+
+Request paths and Celery tasks never talk to the channel layer here. New exam
+events, participant status transitions (lock / pause / unlock / submit) and
+evidence upload confirmations are appended to a per-contest Redis buffer, and
+only while some proctor is watching that contest.
+
+Every connected ``ProctoringConsumer`` ticks every
+``PROCTORING_STREAM_FLUSH_SECONDS``; a short Redis lock lets one of them per
+tick drain the buffer into a single ``proctoring.batch`` message for the
+contest group. A 500-student room therefore emits at most one message per tick
+regardless of its event rate: each batch lists at most
+``PROCTORING_STREAM_MAX_EVENTS`` exam events (the rest are only counted), all
+status changes, and evidence confirmations folded per student. Heartbeats stay
+Redis-only; the flusher adds an online count every
+``PROCTORING_STREAM_ONLINE_SECONDS`` instead of reacting to each heartbeat.
+
+Recording is best effort: a Redis outage must never fail an exam request.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from redis.exceptions import RedisError
+
+from apps.core.cache import redis_client
+
+from .anti_cheat_session import get_last_heartbeats
+
+logger = logging.getLogger(__name__)
+
+BATCH_MESSAGE_TYPE = "proctoring.batch"
+# Same liveness window as the overview metrics endpoint.
+ONLINE_WINDOW_SECONDS = 90
+# Hard cap on rows buffered per contest between two flushes.
+BUFFER_LIMIT = 5000
+
+# KEYS: watch, buffer, total. ARGV: row, buffer limit, ttl seconds.
+_RECORD_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('RPUSH', KEYS[2], ARGV[1])
+redis.call('LTRIM', KEYS[2], -tonumber(ARGV[2]), -1)
+redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+return 1
+"""
+
+# KEYS: buffer, total. Returns {total recorded, rows}.
+_DRAIN_LUA = """
+local rows = redis.call('LRANGE', KEYS[1], 0, -1)
+local total = tonumber(redis.call('GET', KEYS[2]) or '0')
+redis.call('DEL', KEYS[1], KEYS[2])
+return {total, rows}
+"""
+
+
+def contest_group(contest_id) -> str:
+    return f"proctoring.contest.{contest_id}"
+
+
+def stream_enabled() -> bool:
+    return bool(getattr(settings, "PROCTORING_STREAM_ENABLED", True))
+
+
+def flush_seconds() -> float:
+    return max(float(getattr(settings, "PROCTORING_STREAM_FLUSH_SECONDS", 2.0)), 0.1)
+
+
+def _redis():
+    return redis_client()
+
+
+def _key(contest_id, suffix: str) -> str:
+    return cache.make_key(f"proctoring:v1:{contest_id}:{suffix}")
+
+
+def _watch_ttl_seconds() -> int:
+    # Outlive a few missed ticks, but stop buffering soon after the last proctor leaves.
+    return max(int(flush_seconds() * 3) + 1, 5)
+
+
+def watch(contest_id) -> None:
+    """Mark ``contest_id`` as watched; refreshed by every consumer tick."""
+    try:
+        _redis().set(_key(contest_id, "watch"), 1, ex=_watch_ttl_seconds())
+    except RedisError:
+        logger.warning("Failed to mark contest_id=%s as watched", contest_id, exc_info=True)
+
+
+def _record(contest_id, row: dict) -> None:
+    if not stream_enabled() or contest_id is None:
+        return
+    data = json.dumps(row, default=str, separators=(",", ":"))
+
+    def push():
+        try:
+            _redis().eval(
+                _RECORD_LUA,
+                3,
+                _key(contest_id, "watch"),
+                _key(contest_id, "buffer"),
+                _key(contest_id, "total"),
+                data,
+                BUFFER_LIMIT,
+                _watch_ttl_seconds() * 2,
+            )
+        except RedisError:
+            logger.warning("Failed to buffer %s for contest_id=%s", row["kind"], contest_id, exc_info=True)
+
+    # Never show proctors a lock or an event that is rolled back afterwards.
+    transaction.on_commit(push)
+
+
+def record_exam_event(event) -> None:
+    """A new ``ExamEvent`` row (heartbeats are never persisted, so never recorded)."""
+    metadata = event.metadata if isinstance(event.metadata, dict) else {}
+    _record(event.contest_id, {
+        "kind": "exam_event",
+        "id": event.id,
+        "user_id": event.user_id,
+        "event_type": event.event_type,
+        "module": metadata.get("module"),
+        "created_at": event.created_at.isoformat() if event.created_at else None,
+    })
+
+
+def record_status_change(participant, *, previous_status: str) -> None:
+    """``participant.exam_status`` moved away from ``previous_status``."""
+    if participant.exam_status == previous_status:
+        return
+    _record(participant.contest_id, {
+        "kind": "status",
+        "user_id": participant.user_id,
+        "from": previous_status,
+        "to": participant.exam_status,
+        "lock_reason": participant.lock_reason or "",
+        "at": timezone.now().isoformat(),
+    })
+
+
+def record_evidence_uploaded(contest_id, user_id, *, source_module: str | None, frames: int) -> None:
+    """``frames`` evidence frames of one student were confirmed as uploaded."""
+    if frames <= 0:
+        return
+    _record(contest_id, {
+        "kind": "evidence",
+        "user_id": user_id,
+        "source_module": source_module,
+        "frames": frames,
+    })
+
+
+def online_summary(contest_id) -> dict:
+    """Online participant count from Redis heartbeats plus exam status totals."""
+    from ..models import ContestParticipant
+    from .participant_state import ACTIVE_EXAM_STATUSES
+
+    status_counts = dict(
+        ContestParticipant.objects.filter(contest_id=contest_id)
+        .values_list("exam_status")
+        .annotate(total=Count("id"))
+    )
+    user_ids = list(
+        ContestParticipant.objects.filter(
+            contest_id=contest_id,
+            exam_status__in=ACTIVE_EXAM_STATUSES,
+        ).values_list("user_id", flat=True)
+    )
+    threshold = timezone.now() - timezone.timedelta(seconds=ONLINE_WINDOW_SECONDS)
+    online = 0
+    for raw in get_last_heartbeats(contest_id, user_ids).values():
+        heartbeat_at = parse_datetime(raw) if raw else None
+        if heartbeat_at and timezone.is_naive(heartbeat_at):
+            heartbeat_at = timezone.make_aware(heartbeat_at, timezone.get_current_timezone())
+        if heartbeat_at and heartbeat_at >= threshold:
+            online += 1
+    return {
+        "online_now": online,
+        "active": len(user_ids),
+        "status_counts": status_counts,
+    }
+
+
+def _aggregate(rows: list[dict], total: int) -> dict:
+    max_events = max(int(getattr(settings, "PROCTORING_STREAM_MAX_EVENTS", 50)), 0)
+    exam_events = [row for row in rows if row["kind"] == "exam_event"]
+    status_changes = [row for row in rows if row["kind"] == "status"]
+
+    evidence: dict[tuple, dict] = {}
+    for row in rows:
+        if row["kind"] != "evidence":
+            continue
+        slot = evidence.setdefault(
+            (row["user_id"], row.get("source_module")),
+            {"user_id": row["user_id"], "source_module": row.get("source_module"), "frames": 0},
+        )
+        slot["frames"] += int(row.get("frames") or 0)
+
+    listed = exam_events[-max_events:] if max_events else []
+    return {
+        # Newest last; older rows beyond the cap only show up in event_counts.
+        "events": [{k: v for k, v in row.items() if k != "kind"} for row in listed],
+        "event_counts": dict(Counter(row["event_type"] for row in exam_events)),
+        "status_changes": [{k: v for k, v in row.items() if k != "kind"} for row in status_changes],
+        "evidence_uploads": list(evidence.values()),
+        # Rows trimmed from a full buffer plus events left out of ``events``.
+        "omitted": max(total - len(rows), 0) + len(exam_events) - len(listed),
+    }
+
+
+def drain(contest_id) -> dict | None:
+    """
+    Build the next ``proctoring.batch`` payload for ``contest_id``.
+
+    Returns ``None`` when another connection already flushed this tick or there
+    is nothing to report.
+    """
+    client = _redis()
+    tick_ms = max(int(flush_seconds() * 1000) - 50, 50)
+    try:
+        if not client.set(_key(contest_id, "flush"), 1, nx=True, px=tick_ms):
+            return None
+        total, raw_rows = client.eval(_DRAIN_LUA, 2, _key(contest_id, "buffer"), _key(contest_id, "total"))
+        include_online = bool(
+            client.set(
+                _key(contest_id, "online"), 1, nx=True,
+                ex=max(int(getattr(settings, "PROCTORING_STREAM_ONLINE_SECONDS", 10)), 1),
+            )
+        )
+    except RedisError:
+        logger.warning("Failed to drain proctoring buffer for contest_id=%s", contest_id, exc_info=True)
+        return None
+
+    rows = [json.loads(raw) for raw in raw_rows]
+    if not rows and not include_online:
+        return None
+    payload = {
+        "type": BATCH_MESSAGE_TYPE,
+        "contest_id": str(contest_id),
+        "at": timezone.now().isoformat(),
+        **_aggregate(rows, int(total or 0)),
+    }
+    if include_online:
+        payload["online"] = online_summary(contest_id)
+    return payload
@@ -0,0 +1,312 @@
+"""Bulk participant-report export: every student PDF of a contest in one ZIP.
+
+Rendering one WeasyPrint PDF per HTTP request blocks a web worker for
+seconds per student. This service runs the whole class as one Celery job:
+
+- contest data is loaded once through a preloaded ``ContestDataService``
+  that every renderer shares (no per-student re-query of submissions,
+  standings or exam answers);
+- HTML is built in the task process (it needs the ORM); the CPU-bound
+  HTML -> PDF step runs in a small process pool when one can be started
+  (not from a prefork worker child) and in-process otherwise;
+- PDFs are appended to a spooled ZIP as they finish and the archive is
+  uploaded to object storage, then served through a presigned URL.
+
+Job state lives in the cache, like problem test-run jobs.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import tempfile
+import uuid
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.core.services import object_storage
+
+from ..exporters import (
+    ContestDataService,
+    PaperExamReportRenderer,
+    StudentReportRenderer,
+    render_cache_stats,
+    sanitize_filename,
+)
+from .anticheat_storage import generate_get_url, get_s3_client
+
+logger = logging.getLogger(__name__)
+
+REPORT_ARCHIVE_QUEUE = "default"
+REPORT_ARCHIVE_JOB_TTL_SECONDS = 24 * 60 * 60
+REPORT_ARCHIVE_TERMINAL_STATUSES = {"completed", "failed"}
+# Spool the ZIP in memory up to this size, then fall back to a temp file.
+_SPOOL_MAX_BYTES = 32 * 1024 * 1024
+
+
+class ReportArchiveError(Exception):
+    """Raised when a report archive cannot be produced or stored."""
+
+
+def render_pdf_bytes(html: str) -> bytes:
+    """HTML -> PDF; runs inside pool worker processes."""
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError) as e:
+        raise RuntimeError(
+            "PDF export is not available. WeasyPrint requires system libraries. "
+            f"Original error: {e}"
+        )
+    return HTML(string=html).write_pdf()
+
+
+class ContestReportArchiveService:
+    """Queue, run and describe bulk participant-report export jobs."""
+
+    RENDERERS = {
+        'coding': StudentReportRenderer,
+        'paper_exam': PaperExamReportRenderer,
+    }
+
+    @staticmethod
+    def _cache_key(job_id: str) -> str:
+        return f"contest_report_archive:v1:{job_id}"
+
+    @classmethod
+    def get(cls, job_id: str) -> dict | None:
+        return cache.get(cls._cache_key(job_id))
+
+    @classmethod
+    def _save(cls, job: dict) -> None:
+        cache.set(cls._cache_key(job["job_id"]), job, timeout=REPORT_ARCHIVE_JOB_TTL_SECONDS)
+
+    @classmethod
+    def submit(
+        cls,
+        *,
+        contest,
+        requested_by_id: int,
+        language: str,
+        scale: float,
+        include_grading: bool = True,
+    ) -> dict:
+        from ..tasks import build_contest_report_archive
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "contest_id": str(contest.id),
+            "requested_by_id": requested_by_id,
+            "language": language,
+            "scale": scale,
+            "include_grading": include_grading,
+            "status": "queued",
+            "total": 0,
+            "completed": 0,
+            "failed_users": [],
+            "object_key": "",
+            "error": "",
+            "created_at": timezone.now().isoformat(),
+        }
+        cls._save(job)
+        build_contest_report_archive.apply_async(
+            args=[job["job_id"]],
+            queue=REPORT_ARCHIVE_QUEUE,
+        )
+        return cls.get(job["job_id"]) or job
+
+    @classmethod
+    def execute(cls, job_id: str) -> None:
+        from ..models import Contest
+
+        job = cls.get(job_id)
+        if job is None:
+            return
+        contest = Contest.objects.filter(id=job["contest_id"]).first()
+        if contest is None:
+            cls._fail(job, "Contest not found")
+            return
+
+        data_service = ContestDataService(contest, job["language"]).preload()
+        admin_ids = set(contest.admins.values_list('id', flat=True))
+        if contest.owner_id:
+            admin_ids.add(contest.owner_id)
+        users = [
+            registration.user
+            for registration in contest.registrations.select_related('user')
+            .exclude(user_id__in=admin_ids)
+            .order_by('user__username')
+        ]
+
+        job["status"] = "running"
+        job["total"] = len(users)
+        cls._save(job)
+
+        renderer_class = cls.RENDERERS.get(contest.contest_type, StudentReportRenderer)
+        safe_contest_name = sanitize_filename(contest.name)
+
+        def _html_jobs():
+            for user in users:
+                renderer = renderer_class(
+                    contest,
+                    user,
+                    job["language"],
+                    job["scale"],
+                    include_grading=job["include_grading"],
+                    data_service=data_service,
+                )
+                try:
+                    html = renderer.render_html()
+                except Exception:
+                    logger.exception(
+                        "Report HTML failed contest=%s user=%s", contest.id, user.id
+                    )
+                    yield user, None
+                    continue
+                yield user, html
+
+        with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES) as spool:
+            with zipfile.ZipFile(spool, "w", compression=zipfile.ZIP_STORED) as archive:
+                for user, pdf in cls._render_all(_html_jobs()):
+                    if pdf is None:
+                        job["failed_users"].append(user.username)
+                    else:
+                        archive.writestr(
+                            f"report_{safe_contest_name}_{sanitize_filename(user.username)}_{user.id}.pdf",
+                            pdf,
+                        )
+                    job["completed"] += 1
+                    cls._save(job)
+
+            spool.seek(0)
+            object_key = (
+                f"contest_{contest.id}/{job_id}/reports_{contest.id}_{safe_contest_name}.zip"
+            )
+            bucket = settings.CONTEST_REPORT_ARCHIVE_BUCKET
+            client = get_s3_client()
+            try:
+                object_storage.ensure_bucket(client, bucket, error_cls=ReportArchiveError)
+                object_storage.upload_stream(
+                    client, spool, bucket, object_key, content_type="application/zip",
+                )
+            except ClientError as exc:
+                raise ReportArchiveError("Failed to upload report archive") from exc
+
+        job["status"] = "completed"
+        job["object_key"] = object_key
+        job["completed_at"] = timezone.now().isoformat()
+        cls._save(job)
+        logger.info(
+            "Report archive ready contest=%s job=%s reports=%d failed=%d render_cache_hit_rate=%.2f",
+            contest.id,
+            job_id,
+            job["completed"] - len(job["failed_users"]),
+            len(job["failed_users"]),
+            render_cache_stats()["hit_rate"],
+        )
+
+    @classmethod
+    def _render_all(cls, html_jobs):
+        """Yield ``(user, pdf_bytes | None)`` in input order.
+
+        PDFs are rendered in a process pool with a bounded number in flight
+        so HTML building for the next students overlaps with rendering.
+        Falls back to in-process rendering when a pool is not available.
+        """
+        workers = int(getattr(settings, "CONTEST_REPORT_ARCHIVE_RENDER_PROCESSES", 0) or 0)
+        executor = None
+        if workers > 1 and multiprocessing.current_process().daemon:
+            # Celery prefork children are daemonic and may not fork.
+            logger.info("Report render pool disabled in a daemonic worker, rendering in-process")
+        elif workers > 1:
+            # Pool workers only run WeasyPrint; they never touch the ORM.
+            try:
+                executor = ProcessPoolExecutor(max_workers=workers)
+            except (OSError, ValueError, AssertionError) as exc:
+                logger.warning("Report render pool unavailable, rendering in-process: %s", exc)
+
+        pending: deque[tuple[Any, Future | None]] = deque()
+        max_in_flight = workers * 2
+        try:
+            for user, html in html_jobs:
+                if executor is not None and html is not None:
+                    try:
+                        pending.append((user, executor.submit(render_pdf_bytes, html)))
+                    except Exception as exc:
+                        # Pool processes are only started on submit(), so a
+                        # pool that cannot fork fails here, not above.
+                        logger.warning("Report render pool unavailable, rendering in-process: %s", exc)
+                        executor.shutdown(wait=True, cancel_futures=False)
+                        executor = None
+                    else:
+                        while len(pending) >= max_in_flight:
+                            yield cls._collect(*pending.popleft())
+                        continue
+                if executor is not None:
+                    pending.append((user, None))
+                    continue
+                while pending:
+                    yield cls._collect(*pending.popleft())
+                yield cls._render_inline(user, html)
+            while pending:
+                yield cls._collect(*pending.popleft())
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _render_inline(user, html: str | None):
+        if html is None:
+            return user, None
+        try:
+            return user, render_pdf_bytes(html)
+        except Exception:
+            logger.exception("Report PDF failed user=%s", user.id)
+            return user, None
+
+    @staticmethod
+    def _collect(user, future: Future | None):
+        if future is None:
+            return user, None
+        try:
+            return user, future.result()
+        except Exception:
+            logger.exception("Report PDF failed user=%s", user.id)
+            return user, None
+
+    @classmethod
+    def fail(cls, job_id: str, error: str) -> None:
+        job = cls.get(job_id)
+        if job is not None and job["status"] not in REPORT_ARCHIVE_TERMINAL_STATUSES:
+            cls._fail(job, error)
+
+    @classmethod
+    def _fail(cls, job: dict, error: str) -> None:
+        job["status"] = "failed"
+        job["error"] = error
+        cls._save(job)
+
+    @staticmethod
+    def serialize(job: dict) -> dict:
+        """Public view of a job; completed jobs get a fresh presigned URL."""
+        payload = {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "total": job.get("total", 0),
+            "completed": job.get("completed", 0),
+            "failed_users": job.get("failed_users") or [],
+        }
+        if job["status"] == "completed" and job.get("object_key"):
+            payload["download_url"] = generate_get_url(
+                settings.CONTEST_REPORT_ARCHIVE_BUCKET,
+                job["object_key"],
+                expires_seconds=settings.OBJECT_STORAGE_PRESIGNED_URL_TTL_SECONDS,
+            )
+        if job["status"] == "failed":
+            payload["error"] = job.get("error") or "Report export failed"
+        return payload
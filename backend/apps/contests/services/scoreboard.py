@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional
 
 from apps.contests.models import Contest, ContestParticipant, ExamStatus
 from apps.contests.permissions import MANAGER_SCOPE_ROLES, get_contest_scope_role
@@ -25,6 +25,113 @@ class ScoreboardResult:
     standings: List[Dict[str, Any]]
 
 
+# Submissions fetched per server-side cursor round trip when tallying.
+STANDINGS_CHUNK_SIZE = 2000
+_TALLY_FIELDS = ("user_id", "problem_id", "status", "score", "created_at")
+
+
+@dataclass
+class ProblemTally:
+    max_score: int = 0
+    status: Optional[str] = None
+    tries: int = 0
+    time: int = 0  # minutes from contest start to the first AC
+    score: int = 0
+    pending: bool = False
+
+
+@dataclass
+class UserTally:
+    user_id: int
+    problems: Dict[str, ProblemTally]
+    solved: int = 0
+    total_score: int = 0
+    penalty: int = 0
+    rank: int = 0
+
+
+def iter_standing_submissions(contest: Contest) -> Iterator[tuple]:
+    """
+    ``(user_id, problem_id, status, score, created_at)`` of every counted
+    submission in judging order, read from a chunked cursor (code is never loaded).
+    """
+    return (
+        Submission.objects.filter(
+            contest=contest,
+            source_type="contest",
+            is_test=False,
+        )
+        .order_by("created_at", "id")
+        .values_list(*_TALLY_FIELDS)
+        .iterator(chunk_size=STANDINGS_CHUNK_SIZE)
+    )
+
+
+def tally_standings(
+    contest: Contest,
+    *,
+    user_ids: Iterable[int],
+    max_score_by_problem: Dict[str, int],
+    submissions: Iterable[tuple],
+    status_default: Optional[str] = None,
+) -> List[UserTally]:
+    """
+    ICPC-style standings shared by the scoreboard API, the results export and
+    the report renderers.
+
+    ``submissions`` yields ``iter_standing_submissions`` rows and is consumed
+    once, so only one tally per participant and problem is held in memory.
+    Returned tallies are ranked by total score, then solved count, then penalty.
+    """
+    stats: Dict[int, UserTally] = {
+        user_id: UserTally(
+            user_id=user_id,
+            problems={
+                key: ProblemTally(max_score=max_score, status=status_default)
+                for key, max_score in max_score_by_problem.items()
+            },
+        )
+        for user_id in user_ids
+    }
+    start_time = contest.start_time or contest.created_at
+
+    for user_id, problem_id, status, score, created_at in submissions:
+        user_stats = stats.get(user_id)
+        if user_stats is None:
+            continue
+        problem_stats = user_stats.problems.get(str(problem_id))
+        if problem_stats is None or problem_stats.status == "AC":
+            continue
+
+        if status in ["pending", "judging"]:
+            problem_stats.pending = True
+            continue
+
+        problem_stats.tries += 1
+        if status == "AC":
+            problem_stats.status = "AC"
+            minutes = int((created_at - start_time).total_seconds() / 60)
+            problem_stats.time = minutes
+
+            user_stats.solved += 1
+            user_stats.penalty += minutes + 20 * (problem_stats.tries - 1)
+
+            user_stats.total_score += problem_stats.max_score - problem_stats.score
+            problem_stats.score = problem_stats.max_score
+        else:
+            problem_stats.status = status
+            submission_score = score or 0
+            if submission_score > problem_stats.score:
+                user_stats.total_score += submission_score - problem_stats.score
+                problem_stats.score = submission_score
+
+    standings = list(stats.values())
+    standings.sort(key=lambda item: (-item.total_score, -item.solved, item.penalty))
+    for index, item in enumerate(standings):
+        item.rank = index + 1
+    return standings
+
+
 class ScoreboardService:
     """
     Shared standings calculation for API and export flows.
@@ -65,100 +172,53 @@ class ScoreboardService:
             for b in bindings
         ]
 
-        participants = ContestParticipant.objects.filter(contest=contest).select_related("user")
-
-        submissions = (
-            Submission.objects.filter(
-                contest=contest,
-                source_type="contest",
-                is_test=False,
-            )
-            .order_by("created_at")
+        participants = list(
+            ContestParticipant.objects.filter(contest=contest).select_related("user", "user__profile")
+        )
+        problem_keys = [
+            str(b.coding_problem_id) if b.coding_problem_id else str(b.question_asset_id)
+            for b in bindings
+        ]
+        tallies = tally_standings(
+            contest,
+            user_ids=[participant.user_id for participant in participants],
+            max_score_by_problem={key: max_score_by_problem.get(key, 0) for key in problem_keys},
+            submissions=iter_standing_submissions(contest),
+            status_default=status_default,
         )
 
-        stats: Dict[int, Dict[str, Any]] = {}
-        for participant in participants:
-            display_name = ScoreboardService._build_display_name(
-                participant=participant,
-                contest=contest,
-                is_privileged=is_privileged,
-                use_export_display=use_export_display,
-            )
-
-            stats[participant.user.id] = {
+        participant_by_user = {participant.user_id: participant for participant in participants}
+        standings_list: List[Dict[str, Any]] = []
+        for tally in tallies:
+            participant = participant_by_user[tally.user_id]
+            standings_list.append({
                 "user": UserSerializer(participant.user).data,
-                "display_name": display_name,
-                "solved": 0,
-                "rank": participant.rank,
+                "display_name": ScoreboardService._build_display_name(
+                    participant=participant,
+                    contest=contest,
+                    is_privileged=is_privileged,
+                    use_export_display=use_export_display,
+                ),
+                "solved": tally.solved,
+                "rank": tally.rank,
                 "score": float(participant.score or 0),
                 "joined_at": participant.joined_at,
                 "has_finished_exam": participant.exam_status == ExamStatus.SUBMITTED,
                 "started_at": participant.started_at,
-                "total_score": 0,
-                "time": 0,
-                "problems": {},
-            }
-
-            for b in bindings:
-                problem_key = str(b.coding_problem_id) if b.coding_problem_id else str(b.question_asset_id)
-                stats[participant.user.id]["problems"][problem_key] = {
-                    "status": status_default,
-                    "tries": 0,
-                    "time": 0,
-                    "pending": False,
-                    "score": 0,
-                    "max_score": max_score_by_problem.get(problem_key, 0),
-                }
-
-        for submission in submissions:
-            user_id = submission.user.id
-            problem_id = str(submission.problem_id)
-
-            if user_id not in stats:
-                continue
-            if problem_id not in stats[user_id]["problems"]:
-                continue
-
-            problem_stats = stats[user_id]["problems"][problem_id]
-
-            if problem_stats["status"] == "AC":
-                continue
-
-            if submission.status in ["pending", "judging"]:
-                problem_stats["pending"] = True
-                continue
-
-            problem_stats["tries"] += 1
-            max_problem_score = max_score_by_problem.get(problem_id, 0)
-
-            if submission.status == "AC":
-                problem_stats["status"] = "AC"
-                start_time = contest.start_time or contest.created_at
-                time_diff = submission.created_at - start_time
-                minutes = int(time_diff.total_seconds() / 60)
-                problem_stats["time"] = minutes
-
-                stats[user_id]["solved"] += 1
-                penalty = minutes + 20 * (problem_stats["tries"] - 1)
-                stats[user_id]["time"] += penalty
-
-                new_score = max_problem_score
-                score_diff = new_score - problem_stats["score"]
-                problem_stats["score"] = new_score
-                stats[user_id]["total_score"] += score_diff
-            else:
-                problem_stats["status"] = submission.status
-                submission_score = submission.score or 0
-                if submission_score > problem_stats["score"]:
-                    score_diff = submission_score - problem_stats["score"]
-                    problem_stats["score"] = submission_score
-                    stats[user_id]["total_score"] += score_diff
-
-        standings_list = list(stats.values())
-        standings_list.sort(key=lambda x: (-x["total_score"], -x["solved"], x["time"]))
-
-        for index, item in enumerate(standings_list):
-            item["rank"] = index + 1
+                "total_score": tally.total_score,
+                "time": tally.penalty,
+                "problems": {
+                    key: {
+                        "status": problem.status,
+                        "tries": problem.tries,
+                        "time": problem.time,
+                        "pending": problem.pending,
+                        "score": problem.score,
+                        "max_score": problem.max_score,
+                    }
+                    for key, problem in tally.problems.items()
+                },
+            })
 
         return ScoreboardResult(problems=problems_data, standings=standings_list)
 
@@ -0,0 +1,54 @@
+"""
+Signals for contest models.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Contest, ContestParticipant, ExamAnswer, ExamQuestion
+from .services.exam_autosave import (
+    forget_answer_hash,
+    invalidate_autosave_session,
+    invalidate_question_set,
+)
+from .services.exam_dashboard_stats import apply_answer_change, prepare_question_stats
+
+
+@receiver(post_save, sender=ExamAnswer)
+def update_question_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    """Keep ExamQuestionStats in step with answer submits and grading."""
+    if raw:
+        return
+    apply_answer_change(instance, created=created)
+    forget_answer_hash(instance.participant_id, instance.question_id)
+
+
+@receiver(post_delete, sender=ExamAnswer)
+def update_question_stats_on_delete(sender, instance, **kwargs):
+    apply_answer_change(instance, deleted=True)
+    forget_answer_hash(instance.participant_id, instance.question_id)
+
+
+@receiver(post_save, sender=Contest)
+def prepare_question_stats_on_publish(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Create the dashboard stats rows up front so answer writes only update them."""
+    if raw or instance.status != 'published':
+        return
+    if update_fields is not None and 'status' not in update_fields:
+        return
+    contest_id = instance.pk
+    transaction.on_commit(lambda: prepare_question_stats(contest_id))
+
+
+@receiver(post_save, sender=ExamQuestion)
+@receiver(post_delete, sender=ExamQuestion)
+def invalidate_autosave_question_set(sender, instance, **kwargs):
+    """Autosave caches question snapshots per contest."""
+    invalidate_question_set(instance.contest_id)
+
+
+@receiver(post_save, sender=ContestParticipant)
+@receiver(post_delete, sender=ContestParticipant)
+def invalidate_autosave_participant(sender, instance, **kwargs):
+    """Exam status changes (start, submit, lock) revoke cached autosave validation."""
+    invalidate_autosave_session(instance.contest_id, instance.user_id)
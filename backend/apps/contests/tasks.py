@@ -2,8 +2,10 @@
 Celery tasks for contest scheduled operations.
 Auto-submit participants when contest ends and enforce locked-attempt handling.
 """
+import logging
 
 from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
 from django.core.cache import cache
 from django.utils import timezone
 from django.db import transaction
@@ -21,8 +23,11 @@ from .services.anti_cheat_session import (
 )
 from .services.evidence_windows import attach_evidence_window_metadata
 from .services.exam_submission import finalize_submission
+from .services.proctoring_stream import record_exam_event, record_status_change
 from .constants import ENVIRONMENT_RECHECK_EVENT_TYPES, IMMEDIATE_LOCK_EVENT_TYPES, PENALIZED_EVENT_TYPES
 
+logger = logging.getLogger(__name__)
+
 FORCE_SUBMIT_LOCKED_SECONDS = 180  # 3 minutes
 
 
@@ -45,6 +50,7 @@ def _apply_penalty_from_event(participant: ContestParticipant, event_type: str):
         if participant.exam_status == ExamStatus.SUBMITTED:
             return participant
 
+        previous_status = participant.exam_status
         participant.violation_count += 1
         update_fields = ['violation_count']
         requires_recheck_pause = event_type in ENVIRONMENT_RECHECK_EVENT_TYPES
@@ -78,6 +84,7 @@ def _apply_penalty_from_event(participant: ContestParticipant, event_type: str):
                 else:
                     participant.lock_reason = f"System lock: {event_type}"
                 participant.save(update_fields=update_fields)
+                record_status_change(participant, previous_status=previous_status)
                 log_contest_activity(
                     contest=contest,
                     user=participant.user,
@@ -229,7 +236,7 @@ def force_submit_locked_participant(participant_id):
         )
 
         # Record ExamEvent
-        ExamEvent.objects.create(
+        event = ExamEvent.objects.create(
             contest=participant.contest,
             user=participant.user,
             event_type='force_submit_locked',
@@ -239,6 +246,7 @@ def force_submit_locked_participant(participant_id):
                 'lock_reason': participant.lock_reason,
             }
         )
+        record_exam_event(event)
 
         return f"Force-submitted participant {participant_id}"
 
@@ -308,4 +316,94 @@ def _lock_for_heartbeat_timeout(participant: ContestParticipant):
         metadata={'source': 'celery_heartbeat_check'},
     )
     attach_evidence_window_metadata(event)
+    record_exam_event(event)
     _apply_penalty_from_event(participant, 'heartbeat_timeout')
+
+
+# One export renders a whole class (~1-3 s per PDF); allow ~300 students.
+_REPORT_ARCHIVE_SOFT_TIME_LIMIT = 30 * 60
+_REPORT_ARCHIVE_HARD_TIME_LIMIT = _REPORT_ARCHIVE_SOFT_TIME_LIMIT + 60
+
+
+@shared_task(
+    ignore_result=True,
+    soft_time_limit=_REPORT_ARCHIVE_SOFT_TIME_LIMIT,
+    time_limit=_REPORT_ARCHIVE_HARD_TIME_LIMIT,
+)
+def build_contest_report_archive(job_id):
+    """Render every participant report of a contest into one ZIP archive."""
+    from .services.report_archive import ContestReportArchiveService
+
+    try:
+        ContestReportArchiveService.execute(job_id)
+    except SoftTimeLimitExceeded:
+        ContestReportArchiveService.fail(job_id, "Report export exceeded time limit")
+    except Exception:
+        logger.exception("Error building report archive job_id=%s", job_id)
+        ContestReportArchiveService.fail(job_id, "Failed to generate reports")
+
+
+@shared_task(ignore_result=True)
+def flush_exam_answer_drafts():
+    """
+    Periodic task: write buffered exam answer drafts to the database.
+
+    Runs via Celery Beat. Flushes participants whose oldest pending draft
+    is older than EXAM_ANSWER_DRAFT_FLUSH_SECONDS.
+    """
+    from .services import exam_answer_drafts
+    from .services.exam_autosave import flush_answer_drafts
+
+    if not exam_answer_drafts.drafts_enabled():
+        return "Exam answer drafts disabled"
+
+    participant_ids = exam_answer_drafts.due_participant_ids()
+    contest_ids = {}
+    submitted = set()
+    for participant_id, contest_id, exam_status in ContestParticipant.objects.filter(
+        pk__in=participant_ids,
+    ).values_list("id", "contest_id", "exam_status"):
+        contest_ids[str(participant_id)] = contest_id
+        if exam_status == ExamStatus.SUBMITTED:
+            submitted.add(str(participant_id))
+    written = 0
+    for participant_id in participant_ids:
+        try:
+            if participant_id in submitted:
+                # A finalized exam must not be changed by a late draft.
+                exam_answer_drafts.discard_participant(participant_id)
+                continue
+            written += flush_answer_drafts(
+                participant_id,
+                contest_ids.get(participant_id),
+            )
+        except Exception:
+            logger.exception("Failed to flush exam answer drafts participant_id=%s", participant_id)
+    return f"Flushed {written} answer drafts for {len(participant_ids)} participants"
+
+
+@shared_task(ignore_result=True)
+def generate_evidence_thumbnails(frame_ids):
+    """Create thumbnails and cluster contact sheets for confirmed evidence frames."""
+    from .services.evidence_thumbnails import generate_frame_thumbnails
+
+    try:
+        written = generate_frame_thumbnails(frame_ids)
+    except Exception:
+        logger.exception("Error generating evidence thumbnails frame_ids=%s", frame_ids)
+        return "Evidence thumbnails failed"
+    return f"Generated {written} evidence thumbnails"
+
+
+@shared_task(ignore_result=True)
+def rebuild_evidence_contact_sheet(contest_id, user_id, evidence_cluster_id, source_module):
+    """Debounced contact sheet rebuild for one evidence cluster."""
+    from .services.evidence_thumbnails import rebuild_contact_sheet, release_contact_sheet_debounce
+
+    release_contact_sheet_debounce(contest_id, user_id, evidence_cluster_id, source_module)
+    try:
+        rebuild_contact_sheet(contest_id, user_id, evidence_cluster_id, source_module)
+    except Exception:
+        logger.exception("Error building evidence contact sheet cluster=%s", evidence_cluster_id)
+        return "Evidence contact sheet failed"
+    return "Evidence contact sheet built"
@@ -0,0 +1,131 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+from redis.exceptions import RedisError
+from django.urls import reverse
+from rest_framework import status
+
+from apps.contests.models import ExamAnswer, ExamStatus
+from apps.contests.services import exam_answer_drafts, exam_autosave
+from apps.contests.services.exam_submission import finalize_submission
+from apps.contests.tasks import flush_exam_answer_drafts
+
+from .test_exam_answers import ExamAnswerTestBase
+
+
+@override_settings(EXAM_ANSWER_DRAFTS_ENABLED=True, EXAM_ANSWER_DRAFT_FLUSH_SECONDS=0)
+class ExamAnswerDraftBufferTests(ExamAnswerTestBase):
+    """Subjective autosaves are buffered in Redis and flushed to ExamAnswer."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.student)
+
+    def _autosave(self, *items):
+        url = reverse('contests:contest-exam-answers-autosave', kwargs={'contest_pk': self.contest.id})
+        return self.client.post(
+            url,
+            {'answers': [{'question_id': str(q.id), 'answer': answer} for q, answer in items]},
+            format='json',
+        )
+
+    def _my_answers(self):
+        url = reverse('contests:contest-exam-answers-my-answers', kwargs={'contest_pk': self.contest.id})
+        return {item['question_id']: item for item in self.client.get(url).data}
+
+    def test_essay_autosave_is_buffered_and_merged_into_my_answers(self):
+        resp = self._autosave((self.q_essay, {'text': 'draft'}), (self.q_single, {'selected': 'B'}))
+
+        self.assertEqual([r['status'] for r in resp.data['results']], ['buffered', 'saved'])
+        self.assertFalse(ExamAnswer.objects.filter(question=self.q_essay).exists())
+        self.assertTrue(ExamAnswer.objects.filter(question=self.q_single).exists())
+
+        answers = self._my_answers()
+        self.assertEqual(answers[str(self.q_essay.id)]['answer'], {'text': 'draft'})
+        self.assertIsNone(answers[str(self.q_essay.id)]['id'])
+        self.assertEqual(answers[str(self.q_single.id)]['answer'], {'selected': 'B'})
+
+    def test_periodic_flush_writes_drafts_and_clears_buffer(self):
+        self._autosave((self.q_essay, {'text': 'first'}))
+        self._autosave((self.q_essay, {'text': 'second'}))
+
+        flush_exam_answer_drafts()
+
+        self.assertEqual(ExamAnswer.objects.get(question=self.q_essay).answer, {'text': 'second'})
+        self.assertEqual(exam_answer_drafts.read_drafts(self.participant.id), {})
+        self.assertEqual(exam_answer_drafts.due_participant_ids(), [])
+        # The flushed draft is not re-sent as a change.
+        resp = self._autosave((self.q_essay, {'text': 'second'}))
+        self.assertEqual(resp.data['results'][0]['status'], 'unchanged')
+
+    def test_finalize_submission_flushes_drafts(self):
+        self._autosave((self.q_essay, {'text': 'final words'}))
+
+        finalize_submission(self.participant, submit_reason='Submitted')
+
+        self.participant.refresh_from_db()
+        self.assertEqual(self.participant.exam_status, ExamStatus.SUBMITTED)
+        self.assertEqual(ExamAnswer.objects.get(question=self.q_essay).answer, {'text': 'final words'})
+
+    def test_draft_staged_during_flush_is_kept(self):
+        self._autosave((self.q_essay, {'text': 'old'}))
+        flushed = exam_answer_drafts.read_drafts(self.participant.id)
+        exam_answer_drafts.stage_drafts(self.participant.id, {str(self.q_essay.id): ({'text': 'new'}, 'h')})
+
+        remaining = exam_answer_drafts.release_flushed(self.participant.id, flushed)
+
+        self.assertEqual(remaining, 1)
+        self.assertEqual(
+            exam_answer_drafts.read_drafts(self.participant.id)[str(self.q_essay.id)]['answer'],
+            {'text': 'new'},
+        )
+
+    def test_direct_submit_discards_buffered_draft(self):
+        self._autosave((self.q_essay, {'text': 'draft'}))
+        submit_url = reverse('contests:contest-exam-answers-submit-answer', kwargs={'contest_pk': self.contest.id})
+        resp = self.client.post(
+            submit_url,
+            {'question_id': self.q_essay.id, 'answer': {'text': 'direct'}},
+            format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+        flush_exam_answer_drafts()
+
+        self.assertEqual(ExamAnswer.objects.get(question=self.q_essay).answer, {'text': 'direct'})
+
+    def test_finalize_submission_survives_draft_buffer_outage(self):
+        ExamAnswer.objects.create(participant=self.participant, question=self.q_essay, answer={'text': 'saved'})
+
+        with patch.object(exam_answer_drafts, '_redis', side_effect=RedisError('down')):
+            finalize_submission(self.participant, submit_reason='Submitted')
+
+        self.participant.refresh_from_db()
+        self.assertEqual(self.participant.exam_status, ExamStatus.SUBMITTED)
+        self.assertEqual(ExamAnswer.objects.get(question=self.q_essay).answer, {'text': 'saved'})
+
+    def test_drafts_of_submitted_participant_are_discarded_not_flushed(self):
+        self._autosave((self.q_essay, {'text': 'before submit'}))
+        finalize_submission(self.participant, submit_reason='Submitted')
+        # A draft that lands after finalization (e.g. a delayed autosave).
+        exam_answer_drafts.stage_drafts(
+            self.participant.id, {str(self.q_essay.id): ({'text': 'too late'}, 'late')}
+        )
+
+        flush_exam_answer_drafts()
+
+        self.assertEqual(ExamAnswer.objects.get(question=self.q_essay).answer, {'text': 'before submit'})
+        self.assertEqual(exam_answer_drafts.read_drafts(self.participant.id), {})
+        self.assertEqual(exam_answer_drafts.due_participant_ids(), [])
+
+    def test_upsert_skips_submitted_participant(self):
+        self.participant.exam_status = ExamStatus.SUBMITTED
+        self.participant.save(update_fields=['exam_status'])
+        questions = exam_autosave.get_question_set(self.contest.id)
+
+        written = exam_autosave.upsert_answers(
+            self.participant.id, questions, {str(self.q_essay.id): ({'text': 'late'}, 'h')}
+        )
+
+        self.assertFalse(written)
+        self.assertFalse(ExamAnswer.objects.filter(question=self.q_essay).exists())
@@ -505,14 +505,15 @@ class ExamAnswerGradeTests(ExamAnswerTestBase):
             'contests:contest-exam-answers-submit-answer',
             kwargs={'contest_pk': self.contest.id},
         )
-        submit = self.client.post(
-            submit_url,
-            {
-                'question_id': self.q_single.id,
-                'answer': {'selected': 'B'},
-            },
-            format='json',
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            submit = self.client.post(
+                submit_url,
+                {
+                    'question_id': self.q_single.id,
+                    'answer': {'selected': 'B'},
+                },
+                format='json',
+            )
         self.assertEqual(submit.status_code, status.HTTP_201_CREATED)
 
         self.client.force_authenticate(user=self.teacher)
@@ -0,0 +1,138 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.contests.models import ExamAnswer, ExamQuestionStats, ExamStatus
+from apps.contests.services import exam_dashboard_stats
+
+from .test_exam_answers import ExamAnswerTestBase
+
+
+class ExamAnswerAutosaveTests(ExamAnswerTestBase):
+    """Tests for POST /exam-answers/autosave/"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.student)
+
+    def _url(self):
+        return reverse(
+            'contests:contest-exam-answers-autosave',
+            kwargs={'contest_pk': self.contest.id},
+        )
+
+    def _autosave(self, *items):
+        return self.client.post(
+            self._url(),
+            {'answers': [{'question_id': str(q.id), 'answer': answer} for q, answer in items]},
+            format='json',
+        )
+
+    def test_batch_is_saved_and_auto_graded(self):
+        resp = self._autosave(
+            (self.q_single, {'selected': 'B'}),
+            (self.q_multi, {'selected': ['X']}),
+            (self.q_essay, {'text': 'draft'}),
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['saved_count'], 3)
+        single = ExamAnswer.objects.get(participant=self.participant, question=self.q_single)
+        self.assertTrue(single.is_correct)
+        self.assertEqual(single.score, 5)
+        self.assertEqual(single.question_snapshot['correct_answer'], 'B')
+        multi = ExamAnswer.objects.get(participant=self.participant, question=self.q_multi)
+        self.assertFalse(multi.is_correct)
+        self.assertEqual(multi.score, 0)
+        self.contest.refresh_from_db()
+        self.assertTrue(self.contest.question_edit_locked)
+
+    def test_unchanged_answers_are_skipped_without_queries(self):
+        self._autosave((self.q_single, {'selected': 'B'}), (self.q_essay, {'text': 'draft'}))
+        # The first answer locks question editing, which touches the contest
+        # and so revalidates the session once.
+        self._autosave((self.q_single, {'selected': 'B'}))
+
+        # Only the contest lookup hits the database.
+        with self.assertNumQueries(1):
+            resp = self._autosave((self.q_single, {'selected': 'B'}), (self.q_essay, {'text': 'draft'}))
+
+        self.assertEqual(resp.data['unchanged_count'], 2)
+        self.assertEqual([r['status'] for r in resp.data['results']], ['unchanged', 'unchanged'])
+
+    def test_update_keeps_teacher_score_and_first_snapshot(self):
+        self._autosave((self.q_essay, {'text': 'draft'}))
+        answer = ExamAnswer.objects.get(question=self.q_essay)
+        answer.score = Decimal('12')
+        answer.save()
+        self.q_essay.prompt = 'Edited prompt'
+        self.q_essay.save()
+
+        resp = self._autosave((self.q_essay, {'text': 'final'}))
+
+        self.assertEqual(resp.data['saved_count'], 1)
+        answer.refresh_from_db()
+        self.assertEqual(answer.answer, {'text': 'final'})
+        self.assertEqual(answer.score, Decimal('12'))
+        self.assertEqual(answer.question_snapshot['prompt'], 'Explain something')
+
+    def test_write_through_submit_endpoint_drops_cached_hash(self):
+        self._autosave((self.q_single, {'selected': 'B'}))
+        submit_url = reverse(
+            'contests:contest-exam-answers-submit-answer',
+            kwargs={'contest_pk': self.contest.id},
+        )
+        self.client.post(submit_url, {'question_id': self.q_single.id, 'answer': {'selected': 'A'}}, format='json')
+
+        resp = self._autosave((self.q_single, {'selected': 'B'}))
+
+        self.assertEqual(resp.data['results'][0]['status'], 'saved')
+        self.assertEqual(ExamAnswer.objects.get(question=self.q_single).answer, {'selected': 'B'})
+
+    def test_dashboard_stats_follow_autosave(self):
+        exam_dashboard_stats.load_question_stats(self.contest)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._autosave((self.q_single, {'selected': 'B'}))
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            self._autosave((self.q_single, {'selected': 'C'}))
+
+        row = ExamQuestionStats.objects.get(question=self.q_single)
+        self.assertEqual(row.answer_count, 1)
+        self.assertEqual(row.correct_count, 0)
+        self.assertEqual(row.option_counts, [0, 0, 1])
+        # The role comes from the locked participant row; the stats row is
+        # updated after commit with a single UPDATE and never locked.
+        sql = [query['sql'] for query in ctx.captured_queries]
+        self.assertFalse(any('"users"."role" =' in q for q in sql))
+        self.assertFalse(any('exam_question_stats' in q and 'FOR UPDATE' in q for q in sql))
+
+    def test_submitted_exam_revokes_cached_session(self):
+        self._autosave((self.q_essay, {'text': 'draft'}))
+        self.participant.exam_status = ExamStatus.SUBMITTED
+        self.participant.save()
+
+        resp = self._autosave((self.q_essay, {'text': 'late edit'}))
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(ExamAnswer.objects.get(question=self.q_essay).answer, {'text': 'draft'})
+
+    def test_unknown_question_is_reported_per_item(self):
+        resp = self.client.post(
+            self._url(),
+            {'answers': [
+                {'question_id': str(uuid4()), 'answer': {'text': 'x'}},
+                {'question_id': str(self.q_essay.id), 'answer': {'text': 'ok'}},
+            ]},
+            format='json',
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['status'] for r in resp.data['results']], ['error', 'saved'])
+
+    def test_empty_batch_is_rejected(self):
+        resp = self.client.post(self._url(), {'answers': []}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,177 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.contests.models import ExamAnswer, ExamQuestionStats
+from apps.contests.services import exam_dashboard_stats
+from apps.contests.services.exam_scoring import ExamScoringService
+
+from .test_exam_answers import ExamAnswerTestBase
+
+
+class ExamQuestionStatsTests(ExamAnswerTestBase):
+    """Materialized per-question dashboard stats (ExamQuestionStats)."""
+
+    def _submit(self, question, answer):
+        self.client.force_authenticate(user=self.student)
+        url = reverse(
+            'contests:contest-exam-answers-submit-answer',
+            kwargs={'contest_pk': self.contest.id},
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(url, {'question_id': question.id, 'answer': answer}, format='json')
+        self.assertIn(resp.status_code, {status.HTTP_200_OK, status.HTTP_201_CREATED})
+
+    def _row(self, question):
+        return ExamQuestionStats.objects.get(question=question)
+
+    def _assert_matches_rebuild(self, question):
+        row = self._row(question)
+        rebuilt = exam_dashboard_stats.rebuild_question_stats([question])[question.id]
+        for field in (
+            'answer_count', 'graded_count', 'score_sum', 'zero_count',
+            'full_count', 'correct_count', 'option_counts',
+        ):
+            self.assertEqual(getattr(row, field), getattr(rebuilt, field), field)
+
+    def test_submissions_update_stats_incrementally(self):
+        exam_dashboard_stats.load_question_stats(self.contest)
+        built_revision = self._row(self.q_single).revision
+
+        self._submit(self.q_single, {'selected': 'B'})
+        row = self._row(self.q_single)
+        self.assertEqual(row.answer_count, 1)
+        self.assertEqual(row.correct_count, 1)
+        self.assertEqual(row.full_count, 1)
+        self.assertEqual(row.score_sum, Decimal('5'))
+        self.assertEqual(row.option_counts, [0, 1, 0])
+        self.assertGreater(row.revision, built_revision)
+
+        self._submit(self.q_single, {'selected': 'A'})
+        row = self._row(self.q_single)
+        self.assertEqual(row.answer_count, 1)
+        self.assertEqual(row.correct_count, 0)
+        self.assertEqual(row.zero_count, 1)
+        self.assertEqual(row.option_counts, [1, 0, 0])
+        self._assert_matches_rebuild(self.q_single)
+
+    def test_essay_autosave_does_not_touch_stats(self):
+        self._submit(self.q_essay, {'text': 'draft'})
+        exam_dashboard_stats.load_question_stats(self.contest)
+        revision = self._row(self.q_essay).revision
+
+        answer = ExamAnswer.objects.get(question=self.q_essay)
+        with self.assertNumQueries(0):
+            answer.answer = {'text': 'draft, longer'}
+            exam_dashboard_stats.apply_answer_change(answer)
+        self._submit(self.q_essay, {'text': 'final'})
+
+        self.assertEqual(self._row(self.q_essay).revision, revision)
+        self.assertEqual(self._row(self.q_essay).answer_count, 1)
+
+    def test_grading_ungrading_and_delete_update_stats(self):
+        self._submit(self.q_essay, {'text': 'answer'})
+        exam_dashboard_stats.load_question_stats(self.contest)
+        answer = ExamAnswer.objects.get(question=self.q_essay)
+
+        self.client.force_authenticate(user=self.teacher)
+        grade_url = reverse(
+            'contests:contest-exam-answers-grade-answer',
+            kwargs={'contest_pk': self.contest.id, 'pk': answer.id},
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(grade_url, {'score': 20}, format='json')
+        row = self._row(self.q_essay)
+        self.assertEqual((row.graded_count, row.full_count, row.score_sum), (1, 1, Decimal('20')))
+
+        ungrade_url = reverse(
+            'contests:contest-exam-answers-ungrade-answer',
+            kwargs={'contest_pk': self.contest.id, 'pk': answer.id},
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(ungrade_url)
+        row = self._row(self.q_essay)
+        self.assertEqual((row.answer_count, row.graded_count, row.score_sum), (1, 0, Decimal('0')))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ExamAnswer.objects.filter(pk=answer.pk).delete()
+        self.assertEqual(self._row(self.q_essay).answer_count, 0)
+
+    def test_non_student_answers_are_not_counted(self):
+        exam_dashboard_stats.load_question_stats(self.contest)
+        self.participant.user.role = 'teacher'
+        self.participant.user.save(update_fields=['role'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ExamAnswer.objects.create(participant=self.participant, question=self.q_single, answer={'selected': 'B'})
+
+        self.assertEqual(self._row(self.q_single).answer_count, 0)
+
+    def test_delta_waits_for_commit_and_never_creates_rows(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            ExamAnswer.objects.create(participant=self.participant, question=self.q_single, answer={'selected': 'B'})
+        self.assertFalse(ExamQuestionStats.objects.exists())
+        self.assertEqual(len(callbacks), 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            callbacks[0]()
+
+        self.assertFalse(ExamQuestionStats.objects.exists())
+        self.assertFalse(any('FOR UPDATE' in query['sql'] for query in ctx.captured_queries))
+
+    def test_publishing_builds_stats_rows(self):
+        self.contest.status = 'draft'
+        self.contest.save(update_fields=['status'])
+        self.assertFalse(ExamQuestionStats.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.contest.status = 'published'
+            self.contest.save(update_fields=['status'])
+
+        self.assertEqual(
+            set(ExamQuestionStats.objects.values_list('question_id', flat=True)),
+            {self.q_single.id, self.q_multi.id, self.q_essay.id},
+        )
+        self.assertTrue(all(
+            row.question_updated_at is not None for row in ExamQuestionStats.objects.all()
+        ))
+
+    def test_question_edit_triggers_rebuild(self):
+        self._submit(self.q_single, {'selected': 'B'})
+        exam_dashboard_stats.load_question_stats(self.contest)
+        self.assertEqual(self._row(self.q_single).full_count, 1)
+
+        self.q_single.score = 10
+        self.q_single.save()
+        rows = exam_dashboard_stats.load_question_stats(self.contest)
+
+        self.assertEqual(rows[self.q_single.id].full_count, 0)
+        self.assertEqual(rows[self.q_single.id].question_score, 10)
+
+    def test_database_totals_match_python_totals(self):
+        ExamAnswer.objects.create(participant=self.participant, question=self.q_single, answer={}, score=5)
+        ExamAnswer.objects.create(participant=self.participant, question=self.q_essay, answer={}, score=Decimal('7.5'))
+        scoring = ExamScoringService(self.contest)
+        answers = list(ExamAnswer.objects.values('participant_id', 'question_id', 'score'))
+
+        self.assertEqual(
+            scoring.aggregate_participant_scores([self.participant.id]),
+            scoring.compute_participant_scores([self.participant.id], answers),
+        )
+        self.assertEqual(scoring.aggregate_participant_scores([self.participant.id])[self.participant.id], 12.5)
+
+    def test_dashboard_summary_reads_materialized_option_counts(self):
+        self._submit(self.q_multi, {'selected': ['X', 'Z']})
+        self.client.force_authenticate(user=self.teacher)
+        resp = self.client.get(reverse(
+            'contests:contest-exam-answers-dashboard-summary',
+            kwargs={'contest_pk': self.contest.id},
+        ))
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        multi = next(q for q in resp.data['questions'] if q['question_id'] == str(self.q_multi.id))
+        self.assertEqual(multi['objective_stats']['option_counts'], [1, 0, 1])
+        self.assertEqual(multi['objective_stats']['correct_rate'], 100)
@@ -0,0 +1,146 @@
+"""
+Tests for ContestDataService: cursor-streamed submissions, lazily loaded code
+and standings shared with ScoreboardService.
+"""
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.contests.exporters import ContestDataService
+from apps.contests.models import Contest, ContestParticipant
+from apps.contests.services.scoreboard import ScoreboardScope, ScoreboardService
+from apps.contests.tests import bind_problem_to_contest
+from apps.problems.models import CodingProblem, TestCase
+from apps.submissions.models import Submission
+from apps.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def contest_with_submissions():
+    teacher = User.objects.create_user(
+        username='ds_teacher', email='ds_teacher@example.com', password='x', role='teacher'
+    )
+    start = timezone.now() - timedelta(hours=3)
+    contest = Contest.objects.create(
+        name='Practice',
+        owner=teacher,
+        status='published',
+        start_time=start,
+        end_time=timezone.now() + timedelta(hours=1),
+    )
+    problems = []
+    for order in range(2):
+        problem = CodingProblem.objects.create(
+            slug=f'ds-problem-{order}', time_limit=1000, memory_limit=128, created_by=teacher,
+        )
+        TestCase.objects.create(problem=problem, input_data='1 2', output_data='3', is_sample=True)
+        TestCase.objects.create(problem=problem, input_data='x' * 1000, output_data='y', is_sample=False)
+        bind_problem_to_contest(contest, problem, order=order, score=100)
+        problems.append(problem)
+
+    students = []
+    for idx in range(3):
+        student = User.objects.create_user(
+            username=f'ds_student{idx}', email=f'ds{idx}@example.com', password='x', role='student'
+        )
+        ContestParticipant.objects.create(contest=contest, user=student)
+        students.append(student)
+
+    def submit(user, problem, status, score, minutes, code='print(1)'):
+        sub = Submission.objects.create(
+            user=user, problem=problem, contest=contest, source_type='contest',
+            language='python', code=code, status=status, score=score,
+        )
+        Submission.objects.filter(id=sub.id).update(created_at=start + timedelta(minutes=minutes))
+
+    submit(students[0], problems[0], 'WA', 40, 10)
+    submit(students[0], problems[0], 'AC', 100, 30, code='best-0')
+    submit(students[0], problems[1], 'WA', 70, 40, code='best-1')
+    submit(students[1], problems[0], 'AC', 100, 20)
+    submit(students[1], problems[1], 'AC', 100, 50)
+    submit(students[2], problems[0], 'pending', 0, 5)
+    Submission.objects.create(
+        user=students[2], problem=problems[1], contest=contest, source_type='contest',
+        language='python', code='test run', status='AC', score=100, is_test=True,
+    )
+    return contest, problems, students
+
+
+def test_standings_match_scoreboard_service(contest_with_submissions):
+    contest, _, _ = contest_with_submissions
+
+    standings = ContestDataService(contest).calculate_standings().standings
+    scoreboard = ScoreboardService.calculate(contest, ScoreboardScope(viewer=None)).standings
+
+    assert [s.user_id for s in standings] == [row['user']['id'] for row in scoreboard]
+    for dto, row in zip(standings, scoreboard):
+        assert (dto.rank, dto.solved, dto.total_score, dto.penalty) == (
+            row['rank'], row['solved'], row['total_score'], row['time']
+        )
+        for problem_id, stats in dto.problems.items():
+            expected = row['problems'][problem_id]
+            assert (stats.status, stats.score, stats.tries, stats.time) == (
+                expected['status'], expected['score'], expected['tries'], expected['time']
+            )
+
+    leader = standings[0]
+    assert (leader.solved, leader.total_score, leader.penalty) == (2, 200, 70)
+    assert standings[1].total_score == 170
+    assert standings[1].penalty == 50  # 30 minutes + one rejected try
+    assert scoreboard[2]['problems'][str(contest_with_submissions[1][0].id)]['pending'] is True
+
+
+def test_standings_never_read_submission_code(contest_with_submissions):
+    contest, _, _ = contest_with_submissions
+
+    with CaptureQueriesContext(connection) as ctx:
+        ContestDataService(contest).calculate_standings()
+        ScoreboardService.calculate(contest, ScoreboardScope(viewer=None))
+
+    table = Submission._meta.db_table
+    submission_sql = [q['sql'] for q in ctx.captured_queries if f'FROM "{table}"' in q['sql']]
+    assert submission_sql
+    assert not any('"code"' in sql for sql in submission_sql)
+
+
+def test_submissions_stream_without_code_and_are_memoized(contest_with_submissions, django_assert_num_queries):
+    contest, _, students = contest_with_submissions
+    service = ContestDataService(contest)
+
+    rows = service.iter_submissions(students[0].id)
+    assert not isinstance(rows, list)
+    assert [(s.status, s.code) for s in rows] == [('WA', ''), ('AC', ''), ('WA', '')]
+
+    with django_assert_num_queries(1):
+        service.get_submissions(students[0].id)
+        service.get_submissions(students[0].id)
+
+
+def test_best_submission_codes_are_fetched_once_per_user(contest_with_submissions, django_assert_num_queries):
+    contest, problems, students = contest_with_submissions
+    service = ContestDataService(contest).preload()
+
+    with django_assert_num_queries(1):
+        first = service.get_user_best_submission(students[0].id, str(problems[0].id))
+        second = service.get_user_best_submission(students[0].id, str(problems[1].id))
+        last_ac = service.get_user_last_ac_submission(students[0].id, str(problems[0].id))
+
+    assert (first.code, second.code, last_ac.code) == ('best-0', 'best-1', 'best-0')
+    assert all(s.code == '' for s in service.get_submissions(students[0].id))
+
+
+def test_only_sample_cases_are_loaded(contest_with_submissions):
+    contest, _, _ = contest_with_submissions
+
+    with CaptureQueriesContext(connection) as ctx:
+        problems = ContestDataService(contest).get_contest_problems()
+
+    assert [len(cp.problem.sample_cases) for cp in problems] == [1, 1]
+    assert problems[0].problem.sample_cases[0].input == '1 2'
+    test_case_sql = [q['sql'] for q in ctx.captured_queries if TestCase._meta.db_table in q['sql']]
+    assert len(test_case_sql) == 1 and 'is_sample' in test_case_sql[0]
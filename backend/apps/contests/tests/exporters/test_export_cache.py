@@ -0,0 +1,217 @@
+"""
+Tests for the content-versioned rendered-export cache.
+"""
+import io
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+from django.core.cache import cache
+
+from apps.contests.models import Contest, ExamQuestion
+from apps.contests.tests import bind_problem_to_contest
+from apps.contests.services import export_cache, export_service
+from apps.contests.services.export_service import (
+    ExportValidationError,
+    build_paper_exam_sheet_response,
+)
+from apps.problems.models import CodingProblem, TestCase
+from apps.question_bank.models import ContestQuestionBinding, QuestionAsset, QuestionVersion
+from apps.users.models import User
+
+
+class _FakeS3:
+    def __init__(self):
+        self.objects = {}
+        self.gets = 0
+
+    def head_bucket(self, Bucket):
+        return {}
+
+    def _missing(self, op):
+        return ClientError({"Error": {"Code": "NoSuchKey"}}, op)
+
+    def get_object(self, Bucket, Key):
+        self.gets += 1
+        if (Bucket, Key) not in self.objects:
+            raise self._missing("GetObject")
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise self._missing("HeadObject")
+        return {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = Body
+
+    def get_paginator(self, name):
+        s3 = self
+
+        class _Paginator:
+            def paginate(self, Bucket, Prefix):
+                yield {
+                    "Contents": [
+                        {"Key": key} for bucket, key in s3.objects if bucket == Bucket and key.startswith(Prefix)
+                    ]
+                }
+
+        return _Paginator()
+
+    def delete_objects(self, Bucket, Delete):
+        for obj in Delete["Objects"]:
+            self.objects.pop((Bucket, obj["Key"]), None)
+
+
+@pytest.fixture
+def fake_storage(monkeypatch, settings):
+    settings.CONTEST_EXPORT_CACHE_ENABLED = True
+    settings.CONTEST_EXPORT_CACHE_BUCKET = "contest-exports-test"
+    s3 = _FakeS3()
+    monkeypatch.setattr(export_cache, "get_s3_client", lambda: s3)
+    monkeypatch.setattr(
+        export_cache,
+        "generate_get_url",
+        lambda bucket, key, expires_seconds: f"https://storage.test/{bucket}/{key}",
+    )
+    cache.clear()
+    return s3
+
+
+@pytest.fixture
+def render_calls(monkeypatch):
+    calls = []
+
+    class FakeRenderer:
+        def __init__(self, **kwargs):
+            calls.append(kwargs)
+
+        def export(self):
+            return io.BytesIO(f"%PDF-1.4 render {len(calls)}".encode())
+
+    monkeypatch.setattr(export_service, "PaperExamSheetRenderer", FakeRenderer)
+    return calls
+
+
+@pytest.fixture
+def paper_exam_contest():
+    teacher = User.objects.create_user(
+        username="export_cache_teacher",
+        email="export_cache_teacher@example.com",
+        password="pass123",
+        role="teacher",
+    )
+    contest = Contest.objects.create(
+        name="Cached Paper",
+        owner=teacher,
+        contest_type="paper_exam",
+        status="published",
+    )
+    ExamQuestion.objects.create(contest=contest, prompt="Q1", order=0, question_type="short_answer")
+    ExamQuestion.objects.create(contest=contest, prompt="Q2", order=1, question_type="short_answer")
+    return contest
+
+
+@pytest.mark.django_db
+def test_repeated_download_is_served_from_cache(fake_storage, render_calls, paper_exam_contest):
+    first = build_paper_exam_sheet_response(paper_exam_contest, mode="question")
+    second = build_paper_exam_sheet_response(paper_exam_contest, mode="question")
+
+    assert len(render_calls) == 1
+    assert first.content == second.content == b"%PDF-1.4 render 1"
+    assert "question_paper.pdf" in second["Content-Disposition"]
+    assert len(fake_storage.objects) == 1
+
+    # Different render options are separate artifacts.
+    build_paper_exam_sheet_response(paper_exam_contest, mode="answer")
+    assert len(render_calls) == 2
+
+
+@pytest.mark.django_db
+def test_editing_or_reordering_questions_invalidates_cache(fake_storage, render_calls, paper_exam_contest):
+    build_paper_exam_sheet_response(paper_exam_contest, mode="question")
+    version = export_cache.contest_content_version(paper_exam_contest)
+
+    first, second = ExamQuestion.objects.filter(contest=paper_exam_contest).order_by("order")
+    # Reorder uses queryset.update(), which does not touch updated_at.
+    ExamQuestion.objects.filter(pk=first.pk).update(order=2)
+    reordered = export_cache.contest_content_version(paper_exam_contest)
+    assert reordered != version
+
+    second.prompt = "Q2 (edited)"
+    second.save()
+    assert export_cache.contest_content_version(paper_exam_contest) != reordered
+
+    build_paper_exam_sheet_response(paper_exam_contest, mode="question")
+    assert len(render_calls) == 2
+    # The previous content version is purged once the new one is stored.
+    assert len(fake_storage.objects) == 1
+
+
+@pytest.mark.django_db
+def test_url_delivery_returns_presigned_url_without_downloading(fake_storage, render_calls, paper_exam_contest):
+    build_paper_exam_sheet_response(paper_exam_contest, mode="question")
+    gets_before = fake_storage.gets
+
+    response = build_paper_exam_sheet_response(paper_exam_contest, mode="question", delivery="url")
+    payload = json.loads(response.content)
+
+    assert len(render_calls) == 1
+    assert fake_storage.gets == gets_before
+    assert payload["cached"] is True
+    assert payload["download_url"].startswith("https://storage.test/contest-exports-test/")
+    assert payload["filename"].endswith("question_paper.pdf")
+
+
+@pytest.mark.django_db
+def test_url_delivery_requires_cache(settings, render_calls, paper_exam_contest):
+    settings.CONTEST_EXPORT_CACHE_ENABLED = False
+    with pytest.raises(ExportValidationError, match="URL delivery requires the export cache"):
+        build_paper_exam_sheet_response(paper_exam_contest, mode="question", delivery="url")
+
+
+@pytest.mark.django_db
+def test_statement_sample_and_version_changes_invalidate_cache(paper_exam_contest):
+    problem = CodingProblem.objects.create(
+        slug="export-cache-problem", time_limit=1000, memory_limit=128,
+        created_by=paper_exam_contest.owner,
+    )
+    sample = TestCase.objects.create(problem=problem, input_data="1 2", output_data="3", is_sample=True)
+    binding = bind_problem_to_contest(paper_exam_contest, problem, order=2, score=10)
+    versions = [export_cache.contest_content_version(paper_exam_contest)]
+
+    # Statement edits live on the question asset.
+    asset = QuestionAsset.objects.get(pk=binding.question_asset_id)
+    asset.payload = {**(asset.payload or {}), "description": "edited"}
+    asset.save()
+    versions.append(export_cache.contest_content_version(paper_exam_contest))
+
+    TestCase.objects.filter(pk=sample.pk).update(output_data="4")
+    versions.append(export_cache.contest_content_version(paper_exam_contest))
+
+    # Hidden test data is not rendered and does not affect the key.
+    TestCase.objects.create(problem=problem, input_data="x", output_data="y", is_sample=False)
+    assert export_cache.contest_content_version(paper_exam_contest) == versions[-1]
+
+    repinned = QuestionVersion.objects.create(question_asset=asset, version_number=99)
+    ContestQuestionBinding.objects.filter(pk=binding.pk).update(question_version=repinned)
+    versions.append(export_cache.contest_content_version(paper_exam_contest))
+
+    assert len(set(versions)) == len(versions)
+
+
+@pytest.mark.django_db
+def test_concurrent_miss_renders_without_waiting_for_lock_holder(fake_storage, render_calls, paper_exam_contest):
+    spec = export_cache.ExportSpec(
+        kind="paper", language="en", scale=1.0, variant="question_area",
+        extension="pdf", content_type="application/pdf", filename="exam.pdf",
+    )
+    version = export_cache.contest_content_version(paper_exam_contest)
+    object_key = export_cache.export_object_key(paper_exam_contest, version, spec)
+    cache.add(export_cache._lock_key(object_key), 1)
+
+    result = export_cache.fetch_or_render(paper_exam_contest, spec, lambda: b"%PDF-local")
+
+    assert result.content == b"%PDF-local" and result.hit is False
+    # The lock holder uploads; the waiter does not.
+    assert fake_storage.objects == {}
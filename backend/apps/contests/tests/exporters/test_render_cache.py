@@ -0,0 +1,85 @@
+"""
+Tests for the exporter Markdown / code-highlighting fragment cache.
+"""
+import markdown
+import pytest
+
+from apps.contests.exporters import render_cache, utils
+from apps.contests.exporters.render_cache import RenderCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(settings):
+    settings.EXPORT_RENDER_CACHE_SHARED = False
+    render_cache.reset_render_cache_for_tests()
+    yield
+    render_cache.reset_render_cache_for_tests()
+
+
+def test_lru_evicts_least_recently_used_and_counts_hits():
+    cache = RenderCache(max_entries=2)
+    calls = []
+
+    def render(text):
+        calls.append(text)
+        return text.upper()
+
+    cache.get_or_render("md", (), "a", lambda: render("a"))
+    cache.get_or_render("md", (), "b", lambda: render("b"))
+    cache.get_or_render("md", (), "a", lambda: render("a"))
+    cache.get_or_render("md", (), "c", lambda: render("c"))  # evicts "b"
+    cache.get_or_render("md", (), "b", lambda: render("b"))
+
+    assert calls == ["a", "b", "c", "b"]
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+    assert stats["entries"] == 2
+
+
+def test_options_are_part_of_the_key():
+    cache = RenderCache()
+    cache.get_or_render("markdown", (True,), "x", lambda: "soft")
+    assert cache.get_or_render("markdown", (False,), "x", lambda: "hard") == "hard"
+
+
+def test_render_markdown_is_memoized_and_matches_uncached_output():
+    text = "Intro[^1]\nsecond line\n\n[^1]: footnote"
+    expected = markdown.markdown(
+        text,
+        extensions=["extra", "tables", "sane_lists", "md_in_html", "codehilite", "nl2br"],
+        extension_configs={"codehilite": {"guess_lang": False, "noclasses": True}},
+    )
+
+    assert utils.render_markdown(text) == expected
+    assert utils.render_markdown(text) == expected
+    # The reused converter is reset between documents (no footnote carry-over).
+    assert "footnote" not in utils.render_markdown("plain paragraph")
+
+    stats = render_cache.render_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_highlight_code_is_memoized_per_language():
+    code = "int main() { return 0; }"
+    first = utils.highlight_code(code, "cpp")
+
+    assert utils.highlight_code(code, "cpp") == first
+    utils.highlight_code(code, "python")
+
+    stats = render_cache.render_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_shared_cache_serves_other_processes(settings):
+    from django.core.cache import cache as django_cache
+
+    settings.EXPORT_RENDER_CACHE_SHARED = True
+    django_cache.clear()
+    html = utils.inline_markdown("**shared**")
+
+    render_cache.reset_render_cache_for_tests()
+    assert utils.inline_markdown("**shared**") == html
+    assert render_cache.render_cache_stats()["shared_hits"] == 1
@@ -0,0 +1,174 @@
+"""
+Tests for the bulk participant-report ZIP export job.
+"""
+import io
+import zipfile
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contests.exporters import ContestDataService, StudentReportRenderer
+from apps.contests.models import Contest, ContestParticipant, ExamStatus
+from apps.contests.services import report_archive
+from apps.contests.tests import bind_problem_to_contest
+from apps.problems.models import CodingProblem
+from apps.question_bank.models import QuestionAsset
+from apps.submissions.models import Submission
+from apps.users.models import User
+
+
+class _FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def head_bucket(self, Bucket):
+        return {}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        self.objects[(bucket, key)] = fileobj.read()
+
+
+@pytest.fixture
+def fake_storage(monkeypatch, settings):
+    settings.CONTEST_REPORT_ARCHIVE_RENDER_PROCESSES = 0
+    s3 = _FakeS3()
+    monkeypatch.setattr(report_archive, "get_s3_client", lambda: s3)
+    monkeypatch.setattr(
+        report_archive,
+        "generate_get_url",
+        lambda bucket, key, expires_seconds=0: f"https://storage.example/{bucket}/{key}",
+    )
+    monkeypatch.setattr(report_archive, "render_pdf_bytes", lambda html: b"%PDF-" + html[:16].encode())
+    return s3
+
+
+@pytest.fixture
+def coding_contest(db):
+    teacher = User.objects.create_user(
+        username='teacher', email='teacher@example.com', password='x', role='teacher'
+    )
+    now = timezone.now()
+    contest = Contest.objects.create(
+        name='期中考試',
+        owner=teacher,
+        status='published',
+        start_time=now - timedelta(hours=2),
+        end_time=now + timedelta(hours=1),
+    )
+    asset = QuestionAsset.objects.create(
+        owner=teacher,
+        asset_type=QuestionAsset.AssetType.CODING,
+        title='A+B',
+        payload={"difficulty": "easy", "description": "add"},
+    )
+    problem = CodingProblem.objects.create(
+        slug='archive-a-plus-b', time_limit=1000, memory_limit=128,
+        question_asset=asset, created_by=teacher,
+    )
+    bind_problem_to_contest(contest, problem, order=0)
+    ContestParticipant.objects.create(contest=contest, user=teacher)
+    for idx in range(3):
+        student = User.objects.create_user(
+            username=f'student{idx}', email=f's{idx}@example.com', password='x', role='student'
+        )
+        ContestParticipant.objects.create(
+            contest=contest, user=student, exam_status=ExamStatus.SUBMITTED
+        )
+        Submission.objects.create(
+            user=student, problem=problem, contest=contest, source_type='contest',
+            language='cpp', code='int main(){}', status='AC', score=100,
+        )
+    return contest
+
+
+@pytest.mark.django_db
+def test_archive_job_zips_every_student_report(coding_contest, fake_storage):
+    client = APIClient()
+    client.force_authenticate(user=coding_contest.owner)
+
+    response = client.post(
+        f'/api/v1/contests/{coding_contest.id}/participant_reports/archive/',
+        {'language': 'en'},
+        format='json',
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job_id = response.data['job_id']
+
+    response = client.get(
+        f'/api/v1/contests/{coding_contest.id}/participant_reports/archive/{job_id}/'
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['status'] == 'completed'
+    assert response.data['total'] == 3
+    assert response.data['completed'] == 3
+    assert response.data['failed_users'] == []
+    assert response.data['download_url'].startswith('https://storage.example/contest-reports/')
+
+    (payload,) = fake_storage.objects.values()
+    names = zipfile.ZipFile(io.BytesIO(payload)).namelist()
+    assert len(names) == 3
+    assert all('student' in name for name in names)
+
+
+@pytest.mark.django_db
+def test_archive_job_is_scoped_to_contest_and_admins(coding_contest, fake_storage):
+    job = report_archive.ContestReportArchiveService.submit(
+        contest=coding_contest, requested_by_id=coding_contest.owner_id, language='en', scale=1.0,
+    )
+    other = Contest.objects.create(name='other', owner=coding_contest.owner)
+    client = APIClient()
+    client.force_authenticate(user=coding_contest.owner)
+
+    response = client.get(f'/api/v1/contests/{other.id}/participant_reports/archive/{job["job_id"]}/')
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    student = User.objects.get(username='student0')
+    client.force_authenticate(user=student)
+    response = client.get(
+        f'/api/v1/contests/{coding_contest.id}/participant_reports/archive/{job["job_id"]}/'
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_preloaded_data_service_is_shared_without_per_student_queries(
+    coding_contest, django_assert_max_num_queries
+):
+    data_service = ContestDataService(coding_contest, 'en').preload()
+    students = list(User.objects.filter(username__startswith='student'))
+
+    with django_assert_max_num_queries(0):
+        for student in students:
+            renderer = StudentReportRenderer(
+                coding_contest, student, 'en', data_service=data_service
+            )
+            assert len(renderer._get_user_submissions()) == 1
+            assert renderer._get_standings().user_stats.solved == 1
+
+
+def test_render_pool_that_cannot_fork_falls_back_to_in_process(monkeypatch, settings):
+    settings.CONTEST_REPORT_ARCHIVE_RENDER_PROCESSES = 2
+    shutdowns = []
+
+    class _DaemonicPool:
+        def __init__(self, max_workers):
+            pass
+
+        def submit(self, fn, *args):
+            raise AssertionError("daemonic processes are not allowed to have children")
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            shutdowns.append(wait)
+
+    monkeypatch.setattr(report_archive, "ProcessPoolExecutor", _DaemonicPool)
+    monkeypatch.setattr(report_archive, "render_pdf_bytes", lambda html: f"pdf:{html}".encode())
+    users = [User(id=idx, username=f"u{idx}") for idx in range(3)]
+    jobs = [(users[0], "a"), (users[1], None), (users[2], "c")]
+
+    results = list(report_archive.ContestReportArchiveService._render_all(iter(jobs)))
+
+    assert results == [(users[0], b"pdf:a"), (users[1], None), (users[2], b"pdf:c")]
+    assert shutdowns == [True]
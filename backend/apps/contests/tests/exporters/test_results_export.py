@@ -0,0 +1,138 @@
+"""
+Tests for the streamed results exports (CSV / XLSX) of export_results.
+"""
+import csv
+import io
+import re
+import zipfile
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncRequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.contests.exporters import iter_xlsx
+from apps.contests.models import Contest, ContestParticipant, ExamAnswer, ExamQuestion, ExamStatus
+from apps.contests.services import export_service
+from apps.core.services.streaming import build_streaming_response
+from apps.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def _user(username: str, **extra) -> User:
+    return User.objects.create_user(username=username, email=f"{username}@example.com", password="x", **extra)
+
+
+@pytest.fixture
+def paper_exam():
+    teacher = _user("results_teacher", role="teacher")
+    now = timezone.now()
+    contest = Contest.objects.create(
+        name="Final Exam",
+        owner=teacher,
+        contest_type="paper_exam",
+        status="published",
+        start_time=now - timedelta(hours=2),
+        end_time=now - timedelta(hours=1),
+    )
+    questions = [
+        ExamQuestion.objects.create(contest=contest, question_type="essay", prompt="Q1", score=4, order=0),
+        ExamQuestion.objects.create(contest=contest, question_type="essay", prompt="Q2", score=6, order=1),
+    ]
+    ContestParticipant.objects.create(contest=contest, user=teacher, exam_status=ExamStatus.SUBMITTED)
+    for rank in range(1, 6):
+        participant = ContestParticipant.objects.create(
+            contest=contest,
+            user=_user(f"results_student_{rank}"),
+            exam_status=ExamStatus.SUBMITTED,
+            score=10 - rank,
+            rank=rank,
+        )
+        ExamAnswer.objects.create(participant=participant, question=questions[0], answer={}, score=4 - rank % 2)
+        if rank % 2:
+            ExamAnswer.objects.create(participant=participant, question=questions[1], answer={}, score=5)
+    return contest
+
+
+def _get(client: APIClient, contest: Contest, **params):
+    client.force_authenticate(user=contest.owner)
+    return client.get(f"/api/v1/contests/{contest.id}/export_results/", params)
+
+
+def test_paper_exam_csv_streams_students_in_rank_order(paper_exam) -> None:
+    response = _get(APIClient(), paper_exam)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    body = b"".join(response.streaming_content)
+    assert body.startswith(b"\xef\xbb\xbf") and body.count(b"\xef\xbb\xbf") == 1
+    rows = list(csv.reader(io.StringIO(body.decode("utf-8-sig"))))
+    assert rows[0][:3] == ["帳號", "顯示名稱", "Email"]
+    assert [row[0] for row in rows[1:-1]] == [f"results_student_{rank}" for rank in range(1, 6)]
+    assert rows[1][4:] == ["2/2", "9.00", "10.00", "3.00", "5.00"]
+    assert rows[2][4:] == ["1/2", "8.00", "10.00", "4.00", "-"]
+    assert rows[-1][4:] == ["平均", "7.00", "10.00", "3.40", "5.00"]
+    assert 'exam_' in response["Content-Disposition"] and response["Content-Disposition"].endswith('.csv"')
+
+
+def test_paper_exam_answers_are_loaded_per_participant_chunk(paper_exam, monkeypatch) -> None:
+    monkeypatch.setattr(export_service, "RESULTS_EXPORT_CHUNK_SIZE", 2)
+    response = _get(APIClient(), paper_exam)
+
+    with CaptureQueriesContext(connection) as ctx:
+        rows = b"".join(response.streaming_content).decode("utf-8-sig").splitlines()
+
+    answer_table = ExamAnswer._meta.db_table
+    answer_queries = [q for q in ctx.captured_queries if f'FROM "{answer_table}"' in q["sql"]]
+    # 5 students in chunks of 2; profiles come with the participant rows.
+    assert len(answer_queries) == 3
+    assert len(rows) == 7
+
+
+def test_paper_exam_xlsx_is_a_valid_workbook(paper_exam) -> None:
+    response = _get(APIClient(), paper_exam, file_format="xlsx")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("application/vnd.openxmlformats-officedocument.spreadsheetml")
+    assert response["Content-Disposition"].endswith('.xlsx"')
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+    assert archive.testzip() is None
+    sheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+    assert sheet.count("<row ") == 7
+    assert '<c r="A2" t="inlineStr"><is><t xml:space="preserve">results_student_1</t></is></c>' in sheet
+    # Scores stay numeric cells.
+    assert '<c r="F2"><v>9.00</v></c>' in sheet
+
+
+def test_unknown_file_format_is_rejected(paper_exam) -> None:
+    response = _get(APIClient(), paper_exam, file_format="pdf")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_xlsx_writer_escapes_text_and_drops_invalid_xml_chars() -> None:
+    workbook = b"".join(iter_xlsx([["<a&b>", "x\x01y", None, 3]], sheet_name="Res/ults"))
+
+    archive = zipfile.ZipFile(io.BytesIO(workbook))
+    sheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+    assert "&lt;a&amp;b&gt;" in sheet
+    assert ">xy<" in sheet
+    assert '<c r="D1"><v>3</v></c>' in sheet
+    assert re.search(r'<sheet name="Res_ults"', archive.read("xl/workbook.xml").decode("utf-8"))
+
+
+def test_asgi_requests_get_an_async_iterator() -> None:
+    request = AsyncRequestFactory().get("/")
+    response = build_streaming_response(request, iter([b"a", b"b"]), content_type="text/plain")
+
+    async def consume():
+        return [part async for part in response.streaming_content]
+
+    assert response.is_async is True
+    assert async_to_sync(consume)() == [b"a", b"b"]
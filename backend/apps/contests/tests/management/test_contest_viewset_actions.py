@@ -1077,7 +1077,7 @@ def test_export_results_generates_csv_with_problem_cells(
 
     assert response.status_code == status.HTTP_200_OK
     assert "text/csv" in response["Content-Type"]
-    csv_body = response.content.decode("utf-8-sig")
+    csv_body = b"".join(response.streaming_content).decode("utf-8-sig")
     assert "A (Sum)" in csv_body
     assert "B (Sort)" in csv_body
     assert "AC (2 tries, 5m)" in csv_body
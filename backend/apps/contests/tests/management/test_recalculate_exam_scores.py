@@ -0,0 +1,72 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.contests.models import (
+    Contest,
+    ContestParticipant,
+    ExamAnswer,
+    ExamQuestion,
+    ExamQuestionScorePolicy,
+)
+from apps.users.models import User
+
+
+@pytest.fixture
+def stale_exam():
+    owner = User.objects.create_user(
+        username="recalc_owner",
+        email="recalc_owner@example.com",
+        password="testpass123",
+        role="teacher",
+    )
+    student = User.objects.create_user(
+        username="recalc_student",
+        email="recalc_student@example.com",
+        password="testpass123",
+        role="student",
+    )
+    contest = Contest.objects.create(
+        name="Recalculate Contest",
+        owner=owner,
+        status="published",
+        contest_type="paper_exam",
+    )
+    q1 = ExamQuestion.objects.create(contest=contest, prompt="Q1", score=10, order=0)
+    q2 = ExamQuestion.objects.create(
+        contest=contest,
+        prompt="Q2",
+        score=10,
+        order=1,
+        score_policy=ExamQuestionScorePolicy.FULL_MARKS,
+    )
+    participant = ContestParticipant.objects.create(contest=contest, user=student, score=4)
+    ExamAnswer.objects.create(participant=participant, question=q1, answer={}, score=4)
+    ExamAnswer.objects.create(participant=participant, question=q2, answer={}, score=0)
+    return contest, participant
+
+
+@pytest.mark.django_db
+def test_recalculate_exam_scores_dry_run_reports_without_writing(stale_exam):
+    contest, participant = stale_exam
+    out = StringIO()
+
+    call_command("recalculate_exam_scores", "--contest-id", str(contest.id), "--dry-run", stdout=out)
+
+    participant.refresh_from_db()
+    assert participant.score == 4
+    assert "4.00 -> 14.00" in out.getvalue()
+    assert "would update 1 participant score(s)" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_recalculate_exam_scores_writes_changed_totals(stale_exam):
+    contest, participant = stale_exam
+    out = StringIO()
+
+    call_command("recalculate_exam_scores", "--contest-id", str(contest.id), stdout=out)
+
+    participant.refresh_from_db()
+    assert participant.score == 14
+    assert "updated 1 participant score(s) in 1 contest(s)" in out.getvalue()
@@ -0,0 +1,232 @@
+"""
+Tests for evidence frame thumbnails and per-cluster contact sheets.
+"""
+import io
+from datetime import timedelta
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.contests.models import (
+    Contest,
+    ContestParticipant,
+    ExamEvent,
+    ExamEvidenceContactSheet,
+    ExamEvidenceFrame,
+    ExamStatus,
+)
+from apps.contests.services.evidence_thumbnails import (
+    CONTACT_SHEET_TILE_SIZE,
+    THUMBNAIL_MAX_EDGE,
+    generate_frame_thumbnails,
+    rebuild_contact_sheet,
+)
+from apps.contests.services.evidence_windows import attach_evidence_window_metadata
+from apps.contests.tasks import rebuild_evidence_contact_sheet
+
+User = get_user_model()
+
+
+def _webp(size=(1920, 1080), color=(200, 40, 40)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="WEBP")
+    return buffer.getvalue()
+
+
+class _FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def put_object(self, Bucket, Key, Body, ContentType, **kwargs):
+        self.objects[Key] = Body
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ContentLength": len(self.objects[Key]), "ContentType": "image/webp", "ETag": '"e"'}
+
+
+class EvidenceThumbnailTests(APITestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username="thumb_teacher", email="thumb_teacher@test.com", password="pw", role="teacher"
+        )
+        self.student = User.objects.create_user(
+            username="thumb_student", email="thumb_student@test.com", password="pw", role="student"
+        )
+        now = timezone.now()
+        self.contest = Contest.objects.create(
+            name="Thumbnail Contest",
+            start_time=now - timedelta(hours=1),
+            end_time=now + timedelta(hours=2),
+            owner=self.teacher,
+            visibility="public",
+            status="published",
+            cheat_detection_enabled=True,
+        )
+        ContestParticipant.objects.create(
+            contest=self.contest,
+            user=self.student,
+            exam_status=ExamStatus.IN_PROGRESS,
+            started_at=now,
+        )
+        self.anchor_ms = 1774106646951
+        self.event = attach_evidence_window_metadata(
+            ExamEvent.objects.create(
+                contest=self.contest,
+                user=self.student,
+                event_type="exit_fullscreen",
+                metadata={"module": "screen_share", "evidence_anchor_at_ms": self.anchor_ms},
+            )
+        )
+        self.cluster_id = self.event.metadata["evidence_cluster_id"]
+        self.storage = _FakeS3()
+        for target in (
+            "apps.contests.services.evidence_thumbnails.get_s3_client",
+            "apps.contests.views.exam_evidence.get_s3_client",
+        ):
+            patcher = patch(target, return_value=self.storage)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _frame(self, seq, status_value=ExamEvidenceFrame.Status.UPLOADED, payload=None):
+        object_key = (
+            f"contest_{self.contest.id}/user_{self.student.id}/session_s1/"
+            f"screen_share/ts_{self.anchor_ms + seq}_seq_{seq:04d}.webp"
+        )
+        self.storage.objects[object_key] = payload if payload is not None else _webp()
+        return ExamEvidenceFrame.objects.create(
+            contest=self.contest,
+            user=self.student,
+            exam_event=self.event,
+            evidence_cluster_id=self.cluster_id,
+            source_module="screen_share",
+            upload_session_id="s1",
+            seq=seq,
+            object_key=object_key,
+            client_captured_at_ms=self.anchor_ms + seq,
+            status=status_value,
+        )
+
+    def test_thumbnails_and_contact_sheet_are_stored_next_to_raw_frames(self):
+        frames = [self._frame(seq) for seq in (2, 1, 3)]
+
+        written = generate_frame_thumbnails([frame.id for frame in frames])
+
+        self.assertEqual(written, 3)
+        for frame in frames:
+            frame.refresh_from_db()
+            self.assertEqual(frame.thumbnail_key, frame.object_key.replace(".webp", ".thumb.webp"))
+            thumbnail = Image.open(io.BytesIO(self.storage.objects[frame.thumbnail_key]))
+            self.assertEqual(thumbnail.format, "WEBP")
+            self.assertEqual(max(thumbnail.size), THUMBNAIL_MAX_EDGE)
+
+        sheet = ExamEvidenceContactSheet.objects.get(evidence_cluster_id=self.cluster_id)
+        self.assertEqual(sheet.frame_ids, [frames[1].id, frames[0].id, frames[2].id])
+        self.assertEqual(sheet.columns, 3)
+        image = Image.open(io.BytesIO(self.storage.objects[sheet.object_key]))
+        self.assertEqual(image.size, (3 * CONTACT_SHEET_TILE_SIZE[0], CONTACT_SHEET_TILE_SIZE[1]))
+
+    def test_unreadable_frame_is_skipped(self):
+        broken = self._frame(1, payload=b"not an image")
+        good = self._frame(2)
+        issued = self._frame(3, status_value=ExamEvidenceFrame.Status.ISSUED)
+
+        written = generate_frame_thumbnails([broken.id, good.id, issued.id])
+
+        self.assertEqual(written, 1)
+        broken.refresh_from_db()
+        issued.refresh_from_db()
+        self.assertEqual(broken.thumbnail_key, "")
+        self.assertEqual(issued.thumbnail_key, "")
+        sheet = ExamEvidenceContactSheet.objects.get(evidence_cluster_id=self.cluster_id)
+        self.assertEqual(sheet.frame_ids, [good.id])
+
+    def test_unchanged_sheet_is_not_rebuilt(self):
+        frames = [self._frame(seq) for seq in (1, 2)]
+        generate_frame_thumbnails([frame.id for frame in frames])
+
+        with patch.object(self.storage, "get_object") as get_object, \
+                patch.object(self.storage, "put_object") as put_object:
+            sheet = rebuild_contact_sheet(self.contest.id, self.student.id, self.cluster_id, "screen_share")
+
+        get_object.assert_not_called()
+        put_object.assert_not_called()
+        self.assertEqual(sheet.frame_ids, [frames[0].id, frames[1].id])
+
+    def test_contact_sheet_rebuilds_are_debounced_per_cluster(self):
+        first, second = self._frame(1), self._frame(2)
+        with patch("apps.contests.tasks.rebuild_evidence_contact_sheet.apply_async") as apply_async:
+            generate_frame_thumbnails([first.id])
+            generate_frame_thumbnails([second.id])
+
+        apply_async.assert_called_once()
+        self.assertEqual(
+            apply_async.call_args.kwargs["args"],
+            (str(self.contest.id), self.student.id, self.cluster_id, "screen_share"),
+        )
+        rebuild_evidence_contact_sheet(*apply_async.call_args.kwargs["args"])
+        sheet = ExamEvidenceContactSheet.objects.get(evidence_cluster_id=self.cluster_id)
+        self.assertEqual(sheet.frame_ids, [first.id, second.id])
+        with patch("apps.contests.tasks.rebuild_evidence_contact_sheet.apply_async") as apply_async:
+            generate_frame_thumbnails([self._frame(3).id])
+        apply_async.assert_called_once()
+
+    @override_settings(ANTICHEAT_EVIDENCE_THUMBNAILS_ENABLED=True)
+    def test_upload_confirm_schedules_thumbnail_generation(self):
+        frame = self._frame(1, status_value=ExamEvidenceFrame.Status.ISSUED)
+
+        self.client.force_authenticate(user=self.student)
+        confirm_url = reverse("contests:contest-exam-evidence-upload-confirm", args=[self.contest.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                confirm_url,
+                {
+                    "event_id": self.event.id,
+                    "frames": [{"evidence_frame_id": frame.id, "object_key": frame.object_key}],
+                },
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        frame.refresh_from_db()
+        self.assertTrue(frame.thumbnail_key)
+        self.assertIn(frame.thumbnail_key, self.storage.objects)
+
+    def test_screenshots_return_thumbnail_and_contact_sheet_urls(self):
+        frames = [self._frame(seq) for seq in (1, 2)]
+        generate_frame_thumbnails([frame.id for frame in frames])
+        unprocessed = self._frame(3)
+
+        self.client.force_authenticate(user=self.teacher)
+        screenshots_url = reverse("contests:contest-exam-screenshots", args=[self.contest.id])
+        with patch(
+            "apps.contests.views.exam_evidence.generate_get_url",
+            side_effect=lambda bucket, key, **kwargs: f"https://example.test/{key}",
+        ):
+            response = self.client.get(
+                screenshots_url,
+                {"user_id": self.student.id, "event_id": self.event.id},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        items = {item["evidence_frame_id"]: item for item in response.data["items"]}
+        self.assertTrue(items[frames[0].id]["thumbnail_url"].endswith(".thumb.webp"))
+        self.assertTrue(items[frames[0].id]["url"].endswith("_seq_0001.webp"))
+        self.assertIsNone(items[unprocessed.id]["thumbnail_url"])
+        [sheet] = response.data["contact_sheets"]
+        self.assertEqual(sheet["evidence_cluster_id"], self.cluster_id)
+        self.assertEqual(sheet["evidence_frame_ids"], [frames[0].id, frames[1].id])
+        self.assertTrue(sheet["url"].endswith("contact_sheet.webp"))
@@ -369,6 +369,36 @@ class ExamAntiCheatTests(APITestCase):
         )
         self.assertIsNone(get_last_heartbeat(self.contest.id, self.student.id))
 
+    def test_teacher_event_list_supports_keyset_pages(self):
+        base = timezone.now() - timedelta(minutes=30)
+        for minute in range(5):
+            event = ExamEvent.objects.create(contest=self.contest, user=self.student, event_type="tab_hidden")
+            ExamEvent.objects.filter(id=event.id).update(created_at=base + timedelta(minutes=minute))
+        ExamEvent.objects.create(contest=self.contest, user=self.student, event_type="window_blur")
+
+        self.client.force_authenticate(user=self.teacher)
+        legacy = self.client.get(self.events_url)
+        self.assertEqual(len(legacy.data), 6)
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, "event_type": "tab_hidden"}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get(self.events_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(item["id"] for item in response.data["results"])
+            cursor = response.data["next_cursor"]
+            if not cursor:
+                break
+
+        expected = list(
+            ExamEvent.objects.filter(contest=self.contest, event_type="tab_hidden")
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
     def test_exam_lifecycle_events_accept_forced_capture_metadata(self):
         self.client.force_authenticate(user=self.student)
         payload = {
@@ -977,6 +1007,103 @@ class ExamAntiCheatTests(APITestCase):
         self.assertEqual(frame.sha256, "")
         self.assertEqual(frame.metadata["storage_head"]["etag"], "storage-etag")
 
+    def test_evidence_upload_batch_issues_and_confirms_frames_together(self):
+        anchor_ms = 1774106646951
+        event = ExamEvent.objects.create(
+            contest=self.contest,
+            user=self.student,
+            event_type="screen_share_stopped",
+            metadata={
+                "module": "screen_share",
+                "evidence_anchor_at_ms": anchor_ms,
+                "loss_detected_at_ms": anchor_ms,
+                "evidence_mode": "pre_loss",
+            },
+        )
+        event = attach_evidence_window_metadata(event)
+
+        self.client.force_authenticate(user=self.student)
+        intent_url = reverse("contests:contest-exam-evidence-upload-intents", args=[self.contest.id])
+        with patch("apps.contests.views.exam_evidence.get_s3_client"), patch(
+            "apps.contests.views.exam_evidence.generate_put_url",
+            return_value="https://example.test/put",
+        ):
+            response = self.client.post(
+                intent_url,
+                {
+                    "event_id": event.id,
+                    "source_module": "screen_share",
+                    "evidence_mode": "pre_loss",
+                    "upload_session_id": "session-batch",
+                    "frames": [
+                        {"client_captured_at_ms": anchor_ms - 3_000 + seq * 500, "seq": seq}
+                        for seq in range(1, 6)
+                    ],
+                },
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        items = response.data["items"]
+        self.assertEqual([item["seq"] for item in items], [1, 2, 3, 4, 5])
+        self.assertEqual(
+            ExamEvidenceFrame.objects.filter(
+                upload_session_id="session-batch",
+                status=ExamEvidenceFrame.Status.ISSUED,
+            ).count(),
+            5,
+        )
+
+        missing_key = items[3]["object_key"]
+
+        def head_object(Bucket, Key):
+            if Key == missing_key:
+                raise ClientError({"Error": {"Code": "404", "Message": "not found"}}, "HeadObject")
+            return {"ContentLength": 100, "ContentType": "image/webp", "ETag": '"etag"'}
+
+        confirm_url = reverse("contests:contest-exam-evidence-upload-confirm", args=[self.contest.id])
+        frames = [
+            {"evidence_frame_id": item["evidence_frame_id"], "object_key": item["object_key"]}
+            for item in items
+        ]
+        with patch("apps.contests.views.exam_evidence.get_s3_client") as mock_get_s3_client:
+            mock_get_s3_client.return_value.head_object.side_effect = head_object
+            response = self.client.post(
+                confirm_url,
+                {"event_id": event.id, "upload_session_id": "session-batch", "frames": frames},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data["error"], "evidence object was not found in storage")
+            self.assertFalse(
+                ExamEvidenceFrame.objects.filter(
+                    upload_session_id="session-batch",
+                    status=ExamEvidenceFrame.Status.UPLOADED,
+                ).exists()
+            )
+
+            missing_key = None
+            response = self.client.post(
+                confirm_url,
+                {"event_id": event.id, "upload_session_id": "session-batch", "frames": frames},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["confirmed_count"], 5)
+        self.assertEqual(
+            [item["evidence_frame_id"] for item in response.data["confirmed"]],
+            [item["evidence_frame_id"] for item in items],
+        )
+        self.assertEqual(
+            ExamEvidenceFrame.objects.filter(
+                upload_session_id="session-batch",
+                status=ExamEvidenceFrame.Status.UPLOADED,
+                byte_size=100,
+            ).count(),
+            5,
+        )
+
     def test_evidence_upload_confirm_rejects_missing_storage_object(self):
         anchor_ms = 1774106646951
         event = ExamEvent.objects.create(
@@ -3,6 +3,7 @@ from decimal import Decimal
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.db.models import Count
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -18,11 +19,38 @@ from apps.contests.models import (
     ExamQuestionType,
     ExamStatus,
 )
+from apps.contests.services.participant_dashboard import (
+    _aggregate_event_feed,
+    build_participant_event_feed_page,
+)
 
 
 User = get_user_model()
 
 
+def _full_event_feed(contest, participant):
+    """Reference feed: aggregate every event at once, for comparing with pages."""
+    exam_events = list(
+        ExamEvent.objects.filter(contest=contest, user_id=participant.user_id)
+        .exclude(event_type="heartbeat")
+        .order_by("created_at")
+    )
+    evidence_counts_by_event = {
+        row["exam_event_id"]: row["count"]
+        for row in ExamEvidenceFrame.objects.filter(
+            contest=contest,
+            user_id=participant.user_id,
+            status=ExamEvidenceFrame.Status.UPLOADED,
+        )
+        .values("exam_event_id")
+        .annotate(count=Count("id"))
+    }
+    activities = list(
+        ContestActivity.objects.filter(contest=contest, user_id=participant.user_id).order_by("created_at")
+    )
+    return _aggregate_event_feed(participant, exam_events, evidence_counts_by_event, activities)
+
+
 class ParticipantDashboardApiTests(APITestCase):
     def setUp(self):
         self.owner = User.objects.create_user(
@@ -164,6 +192,81 @@ class ParticipantDashboardApiTests(APITestCase):
         window_blur = next(item for item in response.data["event_feed"] if item["event_type"] == "window_blur")
         self.assertEqual(window_blur["evidence_count"], 2)
 
+    def _create_event_at(self, contest, event_type, created_at, **metadata):
+        event = ExamEvent.objects.create(
+            contest=contest,
+            user=self.student,
+            event_type=event_type,
+            metadata=metadata,
+        )
+        ExamEvent.objects.filter(id=event.id).update(created_at=created_at)
+        return event
+
+    def test_event_feed_pages_match_full_feed(self):
+        contest = self._create_contest(contest_type="paper_exam")
+        participant = self._create_participant(contest)
+        base = timezone.now() - timedelta(hours=2)
+        # Interleaved chains: blur every 20s (one long incident), periodic tab
+        # switches with gaps over the window, and ungrouped manual notes.
+        for second in range(0, 600, 20):
+            self._create_event_at(contest, "window_blur", base + timedelta(seconds=second), reason=f"blur {second}")
+        for second in range(5, 900, 95):
+            self._create_event_at(contest, "tab_hidden", base + timedelta(seconds=second))
+        for second in (102, 103, 700):
+            self._create_event_at(contest, "manual_proctor_note", base + timedelta(seconds=second))
+        self._create_event_at(contest, "heartbeat", base + timedelta(seconds=50))
+        for second in (30, 650):
+            activity = ContestActivity.objects.create(
+                contest=contest,
+                user=self.student,
+                action_type="start_exam",
+                details=f"activity {second}",
+            )
+            ContestActivity.objects.filter(id=activity.id).update(created_at=base + timedelta(seconds=second))
+
+        expected = _full_event_feed(contest, participant)
+
+        collected, cursor, pages = [], None, 0
+        while True:
+            page = build_participant_event_feed_page(contest, participant, cursor=cursor, limit=3)
+            collected.extend(page["items"])
+            pages += 1
+            cursor = page["next_cursor"]
+            self.assertEqual(page["has_more"], cursor is not None)
+            if cursor is None:
+                break
+
+        self.assertGreater(pages, 3)
+        self.assertEqual(
+            [(item["incident_key"], item["count"], item["summary"]) for item in collected],
+            [(item["incident_key"], item["count"], item["summary"]) for item in expected],
+        )
+        blur = next(item for item in collected if item["event_type"] == "window_blur")
+        self.assertEqual(blur["count"], 30)
+
+    def test_event_feed_endpoint_paginates_time_window(self):
+        contest = self._create_contest(contest_type="paper_exam")
+        participant = self._create_participant(contest)
+        base = timezone.now() - timedelta(hours=1)
+        for minute in range(5):
+            self._create_event_at(contest, "tab_hidden", base + timedelta(minutes=minute * 2))
+
+        self.client.force_authenticate(user=self.teacher)
+        url = f"/api/v1/contests/{contest.id}/participants/{participant.user_id}/event-feed/"
+        response = self.client.get(url, {"limit": 2, "since": (base + timedelta(minutes=1)).isoformat()})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["items"]), 2)
+        self.assertTrue(response.data["has_more"])
+        response = self.client.get(url, {"limit": 2, "cursor": response.data["next_cursor"],
+                                         "since": (base + timedelta(minutes=1)).isoformat()})
+        self.assertEqual(len(response.data["items"]), 2)
+        self.assertFalse(response.data["has_more"])
+        self.assertIsNone(response.data["next_cursor"])
+
+        invalid = self.client.get(url, {"cursor": "not-a-cursor"})
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_grouped_incident_preserves_latest_evidence_keys(self):
         contest = self._create_contest(contest_type="paper_exam")
         participant = self._create_participant(contest)
@@ -0,0 +1,218 @@
+"""
+Tests for the live proctoring stream
+(apps.contests.services.proctoring_stream, apps.contests.consumers).
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.contests.models import Contest, ContestParticipant, ExamEvent, ExamStatus
+from apps.contests.routing import websocket_urlpatterns
+from apps.contests.services import proctoring_stream
+from apps.contests.services.anti_cheat_session import touch_heartbeat
+from apps.contests.services.participant_state import admin_update_participant
+from apps.contests.tasks import _apply_penalty_from_event
+from apps.users.models import User
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("stream_enabled")]
+
+application = URLRouter(websocket_urlpatterns)
+
+
+@pytest.fixture
+def stream_enabled():
+    client = proctoring_stream._redis()
+
+    def flush():
+        for key in client.scan_iter(match=cache.make_key("proctoring:*")):
+            client.delete(key)
+
+    flush()
+    with override_settings(PROCTORING_STREAM_ENABLED=True, PROCTORING_STREAM_FLUSH_SECONDS=0.2):
+        yield
+    flush()
+
+
+def _user(username: str, **extra) -> User:
+    return User.objects.create_user(username=username, email=f"{username}@example.com", password="x", **extra)
+
+
+def _contest(owner: User) -> Contest:
+    now = timezone.now()
+    return Contest.objects.create(
+        name="Proctoring Contest",
+        owner=owner,
+        status="published",
+        visibility="public",
+        cheat_detection_enabled=True,
+        start_time=now - timedelta(hours=1),
+        end_time=now + timedelta(hours=1),
+    )
+
+
+def _participant(contest: Contest, user: User, exam_status=ExamStatus.IN_PROGRESS) -> ContestParticipant:
+    return ContestParticipant.objects.create(
+        contest=contest, user=user, exam_status=exam_status, started_at=timezone.now(),
+    )
+
+
+def _event(contest: Contest, user: User, event_type: str = "tab_hidden") -> ExamEvent:
+    return ExamEvent.objects.create(contest=contest, user=user, event_type=event_type, metadata={})
+
+
+def _next_batch(contest_id) -> dict | None:
+    # Let the per-tick flush lock lapse so every call drains.
+    proctoring_stream._redis().delete(proctoring_stream._key(contest_id, "flush"))
+    return proctoring_stream.drain(contest_id)
+
+
+def test_nothing_is_buffered_without_a_watching_proctor(django_capture_on_commit_callbacks) -> None:
+    owner = _user("ps_owner_idle", role="teacher")
+    contest = _contest(owner)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        proctoring_stream.record_exam_event(_event(contest, _user("ps_idle_student")))
+
+    assert proctoring_stream._redis().exists(proctoring_stream._key(contest.id, "buffer")) == 0
+
+
+def test_logged_event_and_lock_reach_one_batch(django_capture_on_commit_callbacks) -> None:
+    owner, student = _user("ps_owner", role="teacher"), _user("ps_student")
+    contest = _contest(owner)
+    _participant(contest, student)
+    proctoring_stream.watch(contest.id)
+    client = APIClient()
+    client.force_authenticate(user=student)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            reverse("contests:contest-exam-events", args=[contest.id]),
+            {"event_type": "screen_share_stopped"},
+        )
+    batch = _next_batch(contest.id)
+
+    assert response.status_code == 200
+    assert batch["type"] == "proctoring.batch"
+    assert [event["event_type"] for event in batch["events"]] == ["screen_share_stopped"]
+    [change] = batch["status_changes"]
+    assert (change["user_id"], change["from"], change["to"]) == (
+        student.id, ExamStatus.IN_PROGRESS, ExamStatus.PAUSED,
+    )
+    assert batch["online"]["status_counts"] == {ExamStatus.PAUSED: 1}
+
+
+def test_manual_unlock_and_heartbeat_timeout_lock_are_streamed(django_capture_on_commit_callbacks) -> None:
+    owner = _user("ps_owner_lock", role="teacher")
+    contest = _contest(owner)
+    locked = _participant(contest, _user("ps_locked"), exam_status=ExamStatus.LOCKED)
+    running = _participant(contest, _user("ps_running"))
+    proctoring_stream.watch(contest.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_update_participant(
+            locked, exam_status=ExamStatus.PAUSED, activity_user=owner, activity_details="unlock",
+        )
+        _apply_penalty_from_event(running, "screen_share_stopped")
+    changes = {row["user_id"]: (row["from"], row["to"]) for row in _next_batch(contest.id)["status_changes"]}
+
+    assert changes[locked.user_id] == (ExamStatus.LOCKED, ExamStatus.PAUSED)
+    assert changes[running.user_id][0] == ExamStatus.IN_PROGRESS
+
+
+@override_settings(PROCTORING_STREAM_MAX_EVENTS=20)
+def test_large_room_collapses_into_one_bounded_batch(django_capture_on_commit_callbacks) -> None:
+    owner = _user("ps_owner_room", role="teacher")
+    contest = _contest(owner)
+    students = User.objects.bulk_create([
+        User(username=f"ps_room_{i}", email=f"ps_room_{i}@example.com") for i in range(500)
+    ])
+    events = ExamEvent.objects.bulk_create([
+        ExamEvent(contest=contest, user=student, event_type="window_blur", metadata={}) for student in students
+    ])
+    proctoring_stream.watch(contest.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for event in events:
+            proctoring_stream.record_exam_event(event)
+        for student in students[:3]:
+            proctoring_stream.record_evidence_uploaded(contest.id, student.id, source_module="webcam", frames=2)
+        proctoring_stream.record_evidence_uploaded(contest.id, students[0].id, source_module="webcam", frames=1)
+    batch = proctoring_stream.drain(contest.id)
+
+    assert len(batch["events"]) == 20
+    assert batch["events"][-1]["id"] == events[-1].id
+    assert batch["event_counts"] == {"window_blur": 500}
+    assert batch["omitted"] == 480
+    assert {row["user_id"]: row["frames"] for row in batch["evidence_uploads"]} == {
+        students[0].id: 3, students[1].id: 2, students[2].id: 2,
+    }
+    # A second flush inside the same tick is suppressed.
+    assert proctoring_stream.drain(contest.id) is None
+
+
+def test_online_summary_counts_recent_heartbeats() -> None:
+    owner = _user("ps_owner_online", role="teacher")
+    contest = _contest(owner)
+    online, offline = _user("ps_online"), _user("ps_offline")
+    _participant(contest, online)
+    _participant(contest, offline)
+    touch_heartbeat(contest.id, online.id)
+
+    summary = proctoring_stream.online_summary(contest.id)
+
+    assert summary["online_now"] == 1
+    assert summary["active"] == 2
+
+
+# Test code runs sync work with asgiref's sync_to_async: channels'
+# database_sync_to_async closes the connection held by the test transaction.
+def _connect(contest_id, user):
+    communicator = WebsocketCommunicator(application, f"/ws/contests/{contest_id}/proctoring/")
+    communicator.scope["user"] = user
+    return communicator
+
+
+def test_staff_receive_snapshot_then_batches_and_students_are_rejected(
+    django_capture_on_commit_callbacks,
+) -> None:
+    owner, student = _user("ps_owner_ws", role="teacher"), _user("ps_student_ws")
+    contest = _contest(owner)
+    _participant(contest, student)
+    event = _event(contest, student, "exit_fullscreen")
+
+    def record():
+        with django_capture_on_commit_callbacks(execute=True):
+            proctoring_stream.record_exam_event(event)
+
+    async def scenario():
+        outsider = _connect(contest.id, student)
+        outsider_connected, _ = await outsider.connect()
+        staff = _connect(contest.id, owner)
+        staff_connected, _ = await staff.connect()
+        snapshot = await staff.receive_json_from()
+        await sync_to_async(record)()
+        # The first tick may flush only the online summary.
+        batch = await staff.receive_json_from(timeout=3)
+        if not batch["events"]:
+            batch = await staff.receive_json_from(timeout=3)
+        await staff.disconnect()
+        return outsider_connected, staff_connected, snapshot, batch
+
+    outsider_connected, staff_connected, snapshot, batch = async_to_sync(scenario)()
+
+    assert outsider_connected is False
+    assert staff_connected is True
+    assert snapshot["type"] == "proctoring.snapshot"
+    assert snapshot["online"]["active"] == 1
+    assert batch["type"] == "proctoring.batch"
+    assert [row["id"] for row in batch["events"]] == [event.id]
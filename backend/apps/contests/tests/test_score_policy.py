@@ -292,6 +292,45 @@ class ExamScoringServiceTests(TestCase):
         self.participant.refresh_from_db()
         self.assertEqual(self.participant.score, 13)
 
+    def test_recalculate_all_dry_run_reports_diff_without_writing(self):
+        self.questions[0].score_policy = ExamQuestionScorePolicy.EXCLUDED
+        self.questions[0].save()
+        ContestParticipant.objects.filter(pk=self.participant.pk).update(score=23)
+        svc = self._service()
+
+        plan = svc.plan_recalculate_all()
+        self.assertEqual(plan.participant_count, 1)
+        self.assertEqual(len(plan.changes), 1)
+        self.assertEqual(plan.changes[0].old_score, Decimal("23.00"))
+        self.assertEqual(plan.changes[0].new_score, Decimal("13.00"))
+
+        self.assertEqual(svc.recalculate_all(dry_run=True), 1)
+        self.participant.refresh_from_db()
+        self.assertEqual(self.participant.score, 23)
+
+    def test_recalculate_all_matches_single_participant_with_redistribution(self):
+        other = User.objects.create_user(
+            username="student-svc-2", email="ssvc2@example.com", password="password"
+        )
+        second = ContestParticipant.objects.create(contest=self.contest, user=other)
+        for q, score in zip(self.questions, [3, 7, 10, 1]):
+            ExamAnswer.objects.create(participant=second, question=q, answer={}, score=score)
+        self.questions[3].score_policy = ExamQuestionScorePolicy.REDISTRIBUTE
+        self.questions[3].score_policy_config = {"redistribute_to": []}
+        self.questions[3].save()
+
+        svc = self._service()
+        with self.assertNumQueries(4):  # questions, participants, answers, bulk update
+            svc.recalculate_all()
+        bulk = {p.pk: p.score for p in ContestParticipant.objects.filter(contest=self.contest)}
+
+        single = {
+            p.pk: Decimal(str(self._service().calculate_participant_score(p)))
+            for p in ContestParticipant.objects.filter(contest=self.contest)
+        }
+        self.assertEqual(bulk, single)
+        self.assertEqual(bulk[self.participant.pk], Decimal("20.00"))  # (10+5+0) * 40/30
+
     def test_get_participant_breakdown(self):
         self.questions[1].score_policy = ExamQuestionScorePolicy.FULL_MARKS
         self.questions[1].save()
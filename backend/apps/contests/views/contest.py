@@ -33,9 +33,9 @@ from ..permissions import (
 from ..services.export_service import (
     ExportValidationError,
     build_contest_download_response,
-    build_paper_exam_results_csv_response,
+    build_paper_exam_results_response,
     build_student_report_response,
-    build_contest_results_csv_response,
+    build_contest_results_response,
     parse_scale,
 )
 from ..services.participant_state import (
@@ -46,7 +46,13 @@ from ..services.participant_state import (
     unlock_participant as unlock_contest_participant,
 )
 from ..services.anti_cheat_session import get_active_session, get_last_heartbeat
-from ..services.participant_dashboard import build_participant_dashboard
+from ..services.participant_dashboard import (
+    EVENT_FEED_PAGE_SIZE,
+    EventFeedCursorError,
+    build_participant_dashboard,
+    build_participant_event_feed_page,
+)
+from ..services.report_archive import ContestReportArchiveService
 from ..services.anticheat_config import build_contest_anticheat_config
 from ..services.anticheat_storage import build_raw_object_key, build_upload_session_id, generate_put_url, get_s3_client
 from ..services.scoreboard import ScoreboardScope, ScoreboardService
@@ -547,6 +553,51 @@ class ContestViewSet(AttendanceMixin, viewsets.ModelViewSet):
 
         return Response(build_participant_dashboard(contest, participant))
 
+    @action(
+        detail=True,
+        methods=['get'],
+        permission_classes=[IsContestOwnerOrAdmin],
+        url_path=r'participants/(?P<user_id>\d+)/event-feed',
+    )
+    def participant_event_feed(self, request, pk=None, user_id=None):
+        """
+        Cursor-paginated aggregated event feed for one participant.
+
+        Query params: ``cursor`` (from ``next_cursor``), ``limit``, and an
+        optional ``since`` / ``until`` ISO datetime window.
+        """
+        contest = self.get_object()
+        participant = (
+            ContestParticipant.objects.select_related('user')
+            .filter(contest=contest, user_id=user_id)
+            .first()
+        )
+        if participant is None:
+            return Response(
+                {'error': 'Participant not found'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        params = request.query_params
+        try:
+            limit = int(params.get('limit') or EVENT_FEED_PAGE_SIZE)
+        except (TypeError, ValueError):
+            raise DRFValidationError({'limit': 'Invalid limit.'})
+        since = _parse_manual_event_datetime(params['since'], field_name='since') if params.get('since') else None
+        until = _parse_manual_event_datetime(params['until'], field_name='until') if params.get('until') else None
+        try:
+            page = build_participant_event_feed_page(
+                contest,
+                participant,
+                cursor=params.get('cursor') or None,
+                limit=limit,
+                since=since,
+                until=until,
+            )
+        except EventFeedCursorError:
+            raise DRFValidationError({'cursor': 'Invalid cursor.'})
+        return Response(page)
+
     @action(detail=True, methods=['post'], permission_classes=[IsContestOwnerOrAdmin], url_path='manual_proctor_event')
     def manual_proctor_event(self, request, pk=None):
         """Create a TA-authored manual evidence event for a participant."""
@@ -945,32 +996,39 @@ class ContestViewSet(AttendanceMixin, viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def export_results(self, request, pk=None):
         """
-        Export contest results as CSV file.
+        Export contest results as a streamed CSV (default) or XLSX file
+        (file_format=csv|xlsx).
         Only accessible by admins and teachers.
         """
         contest = self.get_object()
+        file_format = request.query_params.get('file_format', 'csv')
 
-        if contest.contest_type == 'paper_exam':
-            return build_paper_exam_results_csv_response(contest)
+        try:
+            if contest.contest_type == 'paper_exam':
+                return build_paper_exam_results_response(contest, file_format=file_format, request=request)
 
-        result = ScoreboardService.calculate(
-            contest,
-            ScoreboardScope(viewer=request.user, mode="export"),
-        )
+            result = ScoreboardService.calculate(
+                contest,
+                ScoreboardScope(viewer=request.user, mode="export"),
+            )
 
-        return build_contest_results_csv_response(contest, result)
+            return build_contest_results_response(contest, result, file_format=file_format, request=request)
+        except ExportValidationError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=['get'], permission_classes=[IsContestOwnerOrAdmin])
     def download(self, request, pk=None):
         """
         Download contest files in PDF or Markdown format.
         Only accessible by contest owners and admins (contains problem content).
+        delivery=url returns a presigned URL to the cached file instead.
         """
         contest = self.get_object()
         file_format = request.query_params.get('file_format', 'markdown')
         language = request.query_params.get('language', 'zh-TW')
         scale = parse_scale(request.query_params.get('scale', '1.0'))
         layout = request.query_params.get('layout', 'normal')
+        delivery = request.query_params.get('delivery', 'file')
 
         try:
             return build_contest_download_response(
@@ -979,6 +1037,7 @@ class ContestViewSet(AttendanceMixin, viewsets.ModelViewSet):
                 language=language,
                 scale=scale,
                 layout=layout,
+                delivery=delivery,
             )
         except ExportValidationError as exc:
             logger.warning("Export validation error: %s", exc)
@@ -1048,6 +1107,45 @@ class ContestViewSet(AttendanceMixin, viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=True, methods=['post'], permission_classes=[IsContestOwnerOrAdmin],
+            url_path='participant_reports/archive')
+    def participant_reports_archive(self, request, pk=None):
+        """
+        Queue a ZIP export of every student's report PDF.
+        Returns 202 with a job id; poll the job endpoint for progress and
+        the download URL.
+        """
+        contest = self.get_object()
+        language = request.data.get('language', request.query_params.get('language', 'zh-TW'))
+        scale = parse_scale(request.data.get('scale', request.query_params.get('scale', '1.0')))
+
+        job = ContestReportArchiveService.submit(
+            contest=contest,
+            requested_by_id=request.user.id,
+            language=language,
+            scale=scale,
+        )
+        log_contest_activity(contest, request.user, 'other', "Requested bulk participant report export")
+        return Response(ContestReportArchiveService.serialize(job), status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=['get'], permission_classes=[IsContestOwnerOrAdmin],
+            url_path=r'participant_reports/archive/(?P<job_id>[0-9a-f]{32})')
+    def participant_reports_archive_status(self, request, pk=None, job_id=None):
+        """Progress of a bulk report export; includes download_url once completed."""
+        contest = self.get_object()
+        job = ContestReportArchiveService.get(job_id)
+        if job is None or job.get("contest_id") != str(contest.id):
+            return Response({'error': 'Export job not found'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            payload = ContestReportArchiveService.serialize(job)
+        except Exception as e:
+            logger.exception("Failed to presign report archive: %s", e)
+            return Response(
+                {'error': 'Failed to generate download link'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        return Response(payload)
+
     @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated],
             url_path='my_report')
     def my_report(self, request, pk=None):
@@ -2,6 +2,7 @@
 import json
 from decimal import Decimal, ROUND_HALF_UP
 
+from django.db import transaction
 from django.utils import timezone
 from django.core.cache import cache
 from rest_framework import viewsets, permissions, status
@@ -24,15 +25,21 @@ from ..serializers import (
     ExamAnswerDetailSerializer,
     ExamAnswerGradingSerializer,
     ExamAnswerSubmitSerializer,
+    ExamAnswerAutosaveSerializer,
     ExamAnswerGradeSerializer,
 )
 from ..services.exam_scoring import ExamScoringService
+from ..services import exam_dashboard_stats
+from ..services.anti_cheat_session import has_device_conflict
+from ..services import exam_answer_drafts
+from ..services.exam_autosave import autosave_answers, merge_answer_drafts
 from ..permissions import can_manage_contest
 from apps.core.api.envelope import envelope
 from ..services.question_edit_lock import maybe_lock_from_exam_answer
 from ..services.open_answer_document import validate_open_answer_document
 from .exam_validation_response import (
     build_device_conflict_response_for_view,
+    get_autosave_session_for_view,
     validate_exam_operation_for_view,
 )
 
@@ -52,13 +59,18 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
     def _get_contest(self, contest_pk):
         return get_object_or_404(Contest, pk=contest_pk)
 
+    # Keyed by the ExamQuestionStats revision, so answer changes that move
+    # the aggregates refresh the detail without explicit deletes; the short
+    # TTL bounds staleness of free-text edits, which do not bump the revision.
+    QUESTION_DETAIL_CACHE_TTL = 15
+
     @staticmethod
-    def _question_detail_cache_key(contest_id, question_id):
-        return f"contest:{contest_id}:exam_question_detail:{question_id}:v2"
+    def _question_detail_cache_key(contest_id, question_id, revision):
+        return f"contest:{contest_id}:exam_question_detail:{question_id}:r{revision}:v3"
 
-    def _invalidate_dashboard_cache(self, contest_id, question_id=None):
-        if question_id is not None:
-            cache.delete(self._question_detail_cache_key(contest_id, question_id))
+    def _invalidate_dashboard_cache(self, contest_id, question_ids):
+        # Grading may change only feedback, which the aggregates do not track.
+        exam_dashboard_stats.touch_question_stats(question_ids)
 
     def _student_participants_qs(self, contest):
         return ContestParticipant.objects.filter(
@@ -134,20 +146,11 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
 
     @staticmethod
     def _extract_selected_values(answer):
-        if not isinstance(answer, dict):
-            return []
-        selected = answer.get('selected')
-        if selected is None:
-            return []
-        if isinstance(selected, list):
-            return selected
-        return [selected]
+        return exam_dashboard_stats.extract_selected_values(answer)
 
     @classmethod
     def _matches_option(cls, selected_values, option_value, option_index):
-        option_letter = chr(65 + option_index)
-        normalized = {str(option_value), str(option_index), option_letter}
-        return any(str(value) in normalized for value in selected_values)
+        return exam_dashboard_stats.matches_option(selected_values, option_value, option_index)
 
     @classmethod
     def _build_option_distribution(cls, question, answers, participants_by_id):
@@ -231,25 +234,56 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        answer_obj, created = ExamAnswer.objects.update_or_create(
-            participant=participant,
-            question=question,
-            defaults={'answer': answer}
-        )
-        # 首次建立時記錄題目快照（後續更新答案不覆蓋快照）
-        if created:
-            answer_obj.question_snapshot = question.to_snapshot()
-        # Auto-grade objective questions
-        answer_obj.auto_grade()
-        answer_obj.save()
+        # One transaction so the dashboard stats delta is applied only once the answer commits.
+        with transaction.atomic():
+            answer_obj, created = ExamAnswer.objects.update_or_create(
+                participant=participant,
+                question=question,
+                defaults={'answer': answer}
+            )
+            # 首次建立時記錄題目快照（後續更新答案不覆蓋快照）
+            if created:
+                answer_obj.question_snapshot = question.to_snapshot()
+            # Auto-grade objective questions
+            answer_obj.auto_grade()
+            answer_obj.save()
+        if exam_answer_drafts.drafts_enabled():
+            # This write supersedes any buffered autosave draft.
+            exam_answer_drafts.discard_draft(participant.id, question.id)
         maybe_lock_from_exam_answer(exam_answer=answer_obj)
-        self._invalidate_dashboard_cache(contest.id, answer_obj.question_id)
 
         return Response(
             ExamAnswerSerializer(answer_obj).data,
             status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
         )
 
+    @action(detail=False, methods=['post'], url_path='autosave')
+    def autosave(self, request, contest_pk=None):
+        """Batched autosave of several answers.
+
+        Request body: {"answers": [{"question_id": "...", "answer": {...}}]}
+
+        Validation and the question set are cached for the exam session,
+        unchanged answers are skipped by content hash and the rest are
+        written with one upsert. Auto-grading matches ``submit``.
+        """
+        contest = self._get_contest(contest_pk)
+        session, error_response = get_autosave_session_for_view(contest, request.user)
+        if error_response is not None:
+            return error_response
+
+        # Device guard (hard block); the conflict payload needs the participant row.
+        if has_device_conflict(contest.id, request.user.id, request):
+            participant = ContestParticipant.objects.select_related('user').get(pk=session.participant_id)
+            conflict_response = build_device_conflict_response_for_view(contest, participant, request)
+            if conflict_response is not None:
+                return conflict_response
+
+        serializer = ExamAnswerAutosaveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(autosave_answers(contest, session, serializer.validated_data['answers']))
+
     @action(detail=False, methods=['get'], url_path='my-answers')
     def my_answers(self, request, contest_pk=None):
         """Get all answers for the current student in this contest."""
@@ -274,7 +308,8 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
         answers = ExamAnswer.objects.filter(
             participant=participant
         ).select_related('question')
-        return Response(ExamAnswerSerializer(answers, many=True).data)
+        # Buffered autosave drafts are newer than the stored rows.
+        return Response(merge_answer_drafts(participant.id, ExamAnswerSerializer(answers, many=True).data))
 
     @action(detail=False, methods=['get'], url_path='results')
     def results(self, request, contest_pk=None):
@@ -410,17 +445,12 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
 
         questions = scoring.get_questions()
 
-        answers = list(
-            ExamAnswer.objects.filter(participant_id__in=participant_ids)
-            .values('participant_id', 'question_id', 'score', 'is_correct', 'graded_at')
-        )
-
-        # Compute per-participant totals via service
-        participant_scores_map = scoring.compute_participant_scores(participant_ids, answers)
+        # Per-participant totals are summed in the database; per-question
+        # stats come from the materialized ExamQuestionStats rows.
+        participant_scores_map = scoring.aggregate_participant_scores(participant_ids)
         total_scores = list(participant_scores_map.values())
 
-        # Compute per-question stats via service
-        question_stats = scoring.get_question_stats(answers)
+        stats_rows = exam_dashboard_stats.load_question_stats(contest)
 
         # Distribution
         distribution = scoring.get_score_distribution(total_scores)
@@ -430,7 +460,8 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
             if kind_filter is not None and q.question_type not in kind_filter:
                 continue
             qid_str = str(q.id)
-            stats = question_stats[qid_str]
+            stats_row = stats_rows[q.id]
+            stats = exam_dashboard_stats.to_question_stats(stats_row)
             answer_count = stats.answer_count
             graded_count = stats.graded_count
             missing_count = max(participant_count - answer_count, 0)
@@ -463,6 +494,7 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
                 correct_rate = round((stats.correct_count / answer_count) * 100) if answer_count else 0
                 summary['objective_stats'] = {
                     'correct_rate': correct_rate,
+                    'option_counts': stats_row.option_counts,
                 }
             else:
                 pending_count = max(answer_count - graded_count, 0)
@@ -509,12 +541,13 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        cache_key = self._question_detail_cache_key(contest.id, question_id)
+        question = get_object_or_404(ExamQuestion, pk=question_id, contest=contest)
+        stats_row = exam_dashboard_stats.load_question_stats(contest, [question.id])[question.id]
+        cache_key = self._question_detail_cache_key(contest.id, question.id, stats_row.revision)
         cached_payload = cache.get(cache_key)
         if cached_payload is not None:
             return Response(cached_payload)
 
-        question = get_object_or_404(ExamQuestion, pk=question_id, contest=contest)
         participants = list(self._student_participants_qs(contest))
         participant_ids = [participant.id for participant in participants]
         participants_by_id = {participant.id: participant for participant in participants}
@@ -579,7 +612,7 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
                 'total': len(answers),
             }
 
-        cache.set(cache_key, payload, timeout=60)
+        cache.set(cache_key, payload, timeout=self.QUESTION_DETAIL_CACHE_TTL)
         return Response(payload)
 
     @action(detail=True, methods=['post'], url_path='grade')
@@ -602,8 +635,9 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
         answer_obj.graded_by = request.user
         answer_obj.graded_at = timezone.now()
         answer_obj.is_correct = answer_obj.score > 0
-        answer_obj.save()
-        self._invalidate_dashboard_cache(contest.id, answer_obj.question_id)
+        with transaction.atomic():
+            answer_obj.save()
+            self._invalidate_dashboard_cache(contest.id, [answer_obj.question_id])
 
         # Update participant total score
         ExamScoringService(contest).calculate_participant_score(answer_obj.participant)
@@ -665,7 +699,8 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
             answer_obj.graded_by = request.user
             answer_obj.graded_at = now
             answer_obj.is_correct = validated_score > 0
-            answer_obj.save()
+            with transaction.atomic():
+                answer_obj.save()
 
             affected_participants.add(answer_obj.participant_id)
             affected_question_ids.add(answer_obj.question_id)
@@ -677,8 +712,8 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
             ExamScoringService(contest).calculate_participant_score(participant)
 
         # Invalidate caches
-        for qid in affected_question_ids:
-            self._invalidate_dashboard_cache(contest.id, qid)
+        if affected_question_ids:
+            self._invalidate_dashboard_cache(contest.id, affected_question_ids)
 
         return Response({'results': results, 'graded_count': sum(1 for r in results if r['status'] == 'ok')})
 
@@ -699,8 +734,9 @@ class ExamAnswerViewSet(viewsets.GenericViewSet):
         answer_obj.graded_by = None
         answer_obj.graded_at = None
         answer_obj.is_correct = None
-        answer_obj.save()
-        self._invalidate_dashboard_cache(contest.id, answer_obj.question_id)
+        with transaction.atomic():
+            answer_obj.save()
+            self._invalidate_dashboard_cache(contest.id, [answer_obj.question_id])
 
         # Recalculate participant total score
         ExamScoringService(contest).calculate_participant_score(answer_obj.participant)
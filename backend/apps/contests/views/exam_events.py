@@ -1,9 +1,12 @@
 """ExamEventsMixin — event logging and penalty processing."""
+import base64
 import logging
 from datetime import datetime, timezone as dt_timezone
 
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.db import transaction
+from django.db.models import Q
 from rest_framework import permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -31,11 +34,30 @@ from ..services.anti_cheat_session import (
 from ..services.exam_submission import finalize_submission, normalize_source_module
 from ..services.evidence_windows import attach_evidence_window_metadata
 from ..services.activity_log import log_contest_activity
+from ..services.proctoring_stream import record_exam_event, record_status_change
 from .exam_validation_response import validate_exam_operation_for_view
 from apps.core.throttles import ExamEventsThrottle
 
 logger = logging.getLogger(__name__)
 
+EVENT_LIST_PAGE_SIZE = 100
+EVENT_LIST_MAX_PAGE_SIZE = 500
+
+
+def _encode_event_list_cursor(event) -> str:
+    raw = f"{event.created_at.isoformat()}|{event.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_event_list_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at_raw, event_id = raw.rsplit("|", 1)
+        created_at = parse_datetime(created_at_raw)
+        return (created_at, int(event_id)) if created_at is not None else None
+    except (ValueError, UnicodeDecodeError):
+        return None
+
 
 class ExamEventsMixin:
     """Mixin for exam event logging and penalty logic."""
@@ -314,6 +336,7 @@ class ExamEventsMixin:
         if participant.exam_status == ExamStatus.SUBMITTED:
             return participant
 
+        previous_status = participant.exam_status
         participant.violation_count += 1
         update_fields = ['violation_count']
         normalized_role = (
@@ -340,6 +363,7 @@ class ExamEventsMixin:
                         participant.lock_reason = f"System lock (immediate): {event_type}"
                     update_fields.extend(['exam_status', 'locked_at', 'lock_reason'])
                     participant.save(update_fields=update_fields)
+                    record_status_change(participant, previous_status=previous_status)
                     log_contest_activity(
                         contest,
                         actor,
@@ -353,6 +377,7 @@ class ExamEventsMixin:
                     participant.lock_reason = self._environment_pause_reason(event_type)
                     update_fields.extend(['exam_status', 'locked_at', 'lock_reason'])
                 participant.save(update_fields=update_fields)
+                record_status_change(participant, previous_status=previous_status)
                 log_contest_activity(
                     contest,
                     actor,
@@ -491,6 +516,7 @@ class ExamEventsMixin:
                 metadata=metadata,
             )
             event = attach_evidence_window_metadata(event)
+            record_exam_event(event)
             logger.info(
                 "anticheat_event_decision contest=%s user=%s event=%s decision=terminal_guard status=submitted",
                 contest.id,
@@ -535,6 +561,7 @@ class ExamEventsMixin:
                     metadata=metadata
                 )
                 event = attach_evidence_window_metadata(event)
+                record_exam_event(event)
                 if not family_dup:
                     participant = ContestParticipant.objects.select_for_update().get(pk=participant.pk)
                     participant = self._process_penalized_event(
@@ -554,6 +581,7 @@ class ExamEventsMixin:
                 metadata=metadata
             )
             event = attach_evidence_window_metadata(event)
+            record_exam_event(event)
             clear_incident_family(
                 contest_id=contest.id,
                 user_id=request.user.id,
@@ -591,5 +619,46 @@ class ExamEventsMixin:
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        events = ExamEvent.objects.filter(contest_id=contest_pk).select_related('user').order_by('-created_at')
-        return Response(ExamEventSerializer(events, many=True).data)
+        params = request.query_params
+        events = ExamEvent.objects.filter(contest_id=contest_pk).select_related('user')
+        if params.get('user_id'):
+            try:
+                events = events.filter(user_id=int(params['user_id']))
+            except (TypeError, ValueError):
+                return Response({'error': 'invalid user_id'}, status=status.HTTP_400_BAD_REQUEST)
+        if params.get('event_type'):
+            events = events.filter(event_type=params['event_type'])
+        for name, lookup in (('since', 'created_at__gte'), ('until', 'created_at__lt')):
+            if params.get(name):
+                bound = parse_datetime(params[name])
+                if bound is None:
+                    return Response({'error': f'invalid {name}'}, status=status.HTTP_400_BAD_REQUEST)
+                if timezone.is_naive(bound):
+                    bound = timezone.make_aware(bound)
+                events = events.filter(**{lookup: bound})
+
+        # Unpaginated list for existing clients; ``limit`` / ``cursor`` opt in
+        # to keyset pages on the (contest, user|event_type, created_at) indexes.
+        if not params.get('limit') and not params.get('cursor'):
+            return Response(ExamEventSerializer(events.order_by('-created_at'), many=True).data)
+
+        try:
+            limit = max(1, min(int(params.get('limit') or EVENT_LIST_PAGE_SIZE), EVENT_LIST_MAX_PAGE_SIZE))
+        except (TypeError, ValueError):
+            return Response({'error': 'invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+        if params.get('cursor'):
+            position = _decode_event_list_cursor(params['cursor'])
+            if position is None:
+                return Response({'error': 'invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            created_at, event_id = position
+            events = events.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=event_id)
+            )
+        page = list(events.order_by('-created_at', '-id')[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+        return Response({
+            'results': ExamEventSerializer(page, many=True).data,
+            'next_cursor': _encode_event_list_cursor(page[-1]) if has_more else None,
+            'has_more': has_more,
+        })
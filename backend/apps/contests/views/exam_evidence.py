@@ -1,6 +1,8 @@
 """ExamEvidenceMixin — manifest-backed screenshot evidence APIs."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 from django.conf import settings
 from django.db import transaction
 from django.shortcuts import get_object_or_404
@@ -11,7 +13,14 @@ from rest_framework import permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from ..models import Contest, ContestParticipant, ExamEvent, ExamEvidenceFrame, ExamStatus
+from ..models import (
+    Contest,
+    ContestParticipant,
+    ExamEvent,
+    ExamEvidenceContactSheet,
+    ExamEvidenceFrame,
+    ExamStatus,
+)
 from ..permissions import can_manage_contest
 from ..serializers import EvidenceUploadConfirmSerializer, EvidenceUploadIntentSerializer
 from ..services.anticheat_storage import (
@@ -22,7 +31,9 @@ from ..services.anticheat_storage import (
     get_s3_client,
 )
 from ..services.attendance import ATTENDANCE_EVENT_TYPES
+from ..services.evidence_thumbnails import thumbnails_enabled
 from ..services.exam_submission import normalize_source_module
+from ..services.proctoring_stream import record_evidence_uploaded
 from .exam_validation_response import validate_exam_operation_for_view
 
 # Attendance event types that a TA may create on behalf of a student.
@@ -33,6 +44,7 @@ PRE_LOSS_WINDOW_MS = 6_000
 ANCHOR_WINDOW_MS = 3_000
 EVIDENCE_CONTENT_TYPE = "image/webp"
 DEFAULT_MAX_EVIDENCE_FRAME_BYTES = 2 * 1024 * 1024
+DEFAULT_EVIDENCE_HEAD_CONCURRENCY = 8
 
 
 def _parse_int_param(value: str | None) -> int | None:
@@ -214,6 +226,35 @@ def _validate_evidence_object_head(client, object_key: str):
     }, None
 
 
+def _head_evidence_objects(client, object_keys: list[str]) -> list:
+    """
+    Validate ``object_keys`` with concurrent HEAD requests.
+
+    Returns ``(facts, error_response)`` per key, in the order of ``object_keys``.
+    A confirm batch is bounded by the serializer (30 frames), so a small
+    thread pool turns N sequential round trips into a few parallel ones.
+    """
+    unique_keys = list(dict.fromkeys(object_keys))
+    max_workers = min(
+        len(unique_keys),
+        int(getattr(settings, "ANTICHEAT_EVIDENCE_HEAD_CONCURRENCY", DEFAULT_EVIDENCE_HEAD_CONCURRENCY)),
+    )
+    if max_workers <= 1:
+        results = {key: _validate_evidence_object_head(client, key) for key in unique_keys}
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = dict(
+                zip(unique_keys, pool.map(lambda key: _validate_evidence_object_head(client, key), unique_keys))
+            )
+    return [results[key] for key in object_keys]
+
+
+def _schedule_evidence_thumbnails(frame_ids: list[int]) -> None:
+    from ..tasks import generate_evidence_thumbnails
+
+    transaction.on_commit(lambda: generate_evidence_thumbnails.delay(frame_ids))
+
+
 class ExamEvidenceMixin:
     """Mixin for manifest-backed evidence lookup and upload intent APIs."""
 
@@ -353,20 +394,21 @@ class ExamEvidenceMixin:
             endpoint_url=(settings.OBJECT_STORAGE_PUBLIC_ENDPOINT_URL or "").strip() or None
         )
         expires_seconds = settings.OBJECT_STORAGE_PRESIGNED_URL_TTL_SECONDS
-        issued_items = []
-        with transaction.atomic():
-            for frame in frames:
-                seq = int(frame["seq"])
-                captured_at_ms = int(frame["client_captured_at_ms"])
-                object_key = build_raw_object_key(
-                    contest_id=contest.id,
-                    user_id=target_user.id,
-                    upload_session_id=upload_session_id,
-                    ts_ms=captured_at_ms,
-                    seq=seq,
-                    module=source_module,
-                )
-                manifest = ExamEvidenceFrame.objects.create(
+        window_start_ms, window_end_ms = _event_window_ms(event, None, None)
+        required_headers = {
+            "Content-Type": EVIDENCE_CONTENT_TYPE,
+            **(
+                {"x-amz-tagging": "cleanup=true"}
+                if settings.OBJECT_STORAGE_OBJECT_TAGGING_ENABLED
+                else {}
+            ),
+        }
+        manifests = []
+        for frame in frames:
+            seq = int(frame["seq"])
+            captured_at_ms = int(frame["client_captured_at_ms"])
+            manifests.append(
+                ExamEvidenceFrame(
                     contest=contest,
                     user=target_user,
                     exam_event=event,
@@ -375,39 +417,44 @@ class ExamEvidenceMixin:
                     evidence_mode=evidence_mode,
                     upload_session_id=upload_session_id,
                     seq=seq,
-                    object_key=object_key,
+                    object_key=build_raw_object_key(
+                        contest_id=contest.id,
+                        user_id=target_user.id,
+                        upload_session_id=upload_session_id,
+                        ts_ms=captured_at_ms,
+                        seq=seq,
+                        module=source_module,
+                    ),
                     client_captured_at_ms=captured_at_ms,
                     status=ExamEvidenceFrame.Status.ISSUED,
                     metadata={
                         "event_type": event.event_type,
-                        "window_start_ms": _event_window_ms(event, None, None)[0],
-                        "window_end_ms": _event_window_ms(event, None, None)[1],
+                        "window_start_ms": window_start_ms,
+                        "window_end_ms": window_end_ms,
                     },
                 )
-                put_url = generate_put_url(
+            )
+        # One INSERT for the whole batch; presigning is local signing only.
+        with transaction.atomic():
+            manifests = ExamEvidenceFrame.objects.bulk_create(manifests)
+
+        issued_items = [
+            {
+                "evidence_frame_id": manifest.id,
+                "seq": manifest.seq,
+                "object_key": manifest.object_key,
+                "source_module": source_module,
+                "client_captured_at_ms": manifest.client_captured_at_ms,
+                "put_url": generate_put_url(
                     settings.ANTICHEAT_RAW_BUCKET,
-                    object_key,
+                    manifest.object_key,
                     expires_seconds=expires_seconds,
                     client=presign_client,
-                )
-                issued_items.append(
-                    {
-                        "evidence_frame_id": manifest.id,
-                        "seq": seq,
-                        "object_key": object_key,
-                        "source_module": source_module,
-                        "client_captured_at_ms": captured_at_ms,
-                        "put_url": put_url,
-                        "required_headers": {
-                            "Content-Type": "image/webp",
-                            **(
-                                {"x-amz-tagging": "cleanup=true"}
-                                if settings.OBJECT_STORAGE_OBJECT_TAGGING_ENABLED
-                                else {}
-                            ),
-                        },
-                    }
-                )
+                ),
+                "required_headers": dict(required_headers),
+            }
+            for manifest in manifests
+        ]
 
         return Response(
             {
@@ -495,8 +542,6 @@ class ExamEvidenceMixin:
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        storage_facts = {}
-        storage_client = get_s3_client()
         for payload in frame_payloads:
             row = rows[payload["evidence_frame_id"]]
             if event_id is not None and row.exam_event_id != event_id:
@@ -509,10 +554,16 @@ class ExamEvidenceMixin:
             if row.object_key != payload["object_key"]:
                 return Response({"error": "frame object_key mismatch"}, status=status.HTTP_400_BAD_REQUEST)
 
-            facts, storage_error = _validate_evidence_object_head(storage_client, row.object_key)
+        storage_facts = {}
+        head_results = _head_evidence_objects(
+            get_s3_client(),
+            [rows[payload["evidence_frame_id"]].object_key for payload in frame_payloads],
+        )
+        for payload, (facts, storage_error) in zip(frame_payloads, head_results):
+            # Report the first failing frame in request order.
             if storage_error is not None:
                 return storage_error
-            storage_facts[row.id] = facts
+            storage_facts[payload["evidence_frame_id"]] = facts
 
         confirmed = []
         with transaction.atomic():
@@ -544,6 +595,7 @@ class ExamEvidenceMixin:
                 )
 
             now = timezone.now()
+            updated_rows = {}
             for payload in frame_payloads:
                 row = locked_rows[payload["evidence_frame_id"]]
                 facts = storage_facts[row.id]
@@ -566,14 +618,7 @@ class ExamEvidenceMixin:
                 row.byte_size = facts["byte_size"]
                 row.sha256 = ""
                 row.metadata = metadata
-                row.save(update_fields=[
-                    "status",
-                    "storage_confirmed_at",
-                    "content_type",
-                    "byte_size",
-                    "sha256",
-                    "metadata",
-                ])
+                updated_rows[row.id] = row
                 confirmed.append(
                     {
                         "evidence_frame_id": row.id,
@@ -582,6 +627,21 @@ class ExamEvidenceMixin:
                         "client_captured_at_ms": row.client_captured_at_ms,
                     }
                 )
+            # Rows are locked above, so one CASE-based UPDATE covers the batch.
+            ExamEvidenceFrame.objects.bulk_update(
+                list(updated_rows.values()),
+                ["status", "storage_confirmed_at", "content_type", "byte_size", "sha256", "metadata"],
+            )
+            if thumbnails_enabled():
+                _schedule_evidence_thumbnails(list(updated_rows))
+            if updated_rows:
+                # Teacher-assisted confirms carry the student's frames, not request.user's.
+                record_evidence_uploaded(
+                    contest.id,
+                    next(iter(updated_rows.values())).user_id,
+                    source_module=source_module,
+                    frames=len(updated_rows),
+                )
 
         return Response({"confirmed": confirmed, "confirmed_count": len(confirmed)})
 
@@ -656,10 +716,16 @@ class ExamEvidenceMixin:
             if not frame.object_key:
                 continue
             url = generate_get_url(settings.ANTICHEAT_RAW_BUCKET, frame.object_key, expires_seconds=120)
+            thumbnail_url = (
+                generate_get_url(settings.ANTICHEAT_RAW_BUCKET, frame.thumbnail_key, expires_seconds=120)
+                if frame.thumbnail_key
+                else None
+            )
             captured_at = frame.client_captured_at_ms
             items.append(
                 {
                     "url": url,
+                    "thumbnail_url": thumbnail_url,
                     "ts_ms": captured_at,
                     "seq": frame.seq,
                     "source_module": frame.source_module,
@@ -669,9 +735,38 @@ class ExamEvidenceMixin:
                 }
             )
 
+        cluster_ids = {frame.evidence_cluster_id for frame in frames if frame.evidence_cluster_id}
+        contact_sheets = []
+        if cluster_ids:
+            sheets = ExamEvidenceContactSheet.objects.filter(
+                contest=contest,
+                user_id=user_id,
+                evidence_cluster_id__in=cluster_ids,
+            ).order_by("evidence_cluster_id", "source_module")
+            if source_module:
+                sheets = sheets.filter(source_module=source_module)
+            for sheet in sheets:
+                contact_sheets.append(
+                    {
+                        "url": generate_get_url(
+                            settings.ANTICHEAT_RAW_BUCKET,
+                            sheet.object_key,
+                            expires_seconds=120,
+                        ),
+                        "evidence_cluster_id": sheet.evidence_cluster_id,
+                        "source_module": sheet.source_module,
+                        "evidence_frame_ids": sheet.frame_ids,
+                        "columns": sheet.columns,
+                        "tile_width": sheet.tile_width,
+                        "tile_height": sheet.tile_height,
+                        "expires_in": 120,
+                    }
+                )
+
         return Response(
             {
                 "items": items,
+                "contact_sheets": contact_sheets,
                 "total_raw_count": total_filtered_count,
                 "storage_error": False,
             }
@@ -35,6 +35,7 @@ from ..services.attendance import (
     normalize_attendance_error_code,
 )
 from ..services.activity_log import log_contest_activity
+from ..services.proctoring_stream import record_status_change
 from .exam_events import ExamEventsMixin
 from .exam_anticheat import ExamAnticheatMixin
 from .exam_evidence import ExamEvidenceMixin
@@ -86,6 +87,7 @@ class ExamLifecycleMixin:
                 # Re-entry keeps historical violations as the backend source of truth.
                 participant.exam_status = ExamStatus.IN_PROGRESS
                 participant.save(update_fields=["exam_status"])
+                record_status_change(participant, previous_status=ExamStatus.SUBMITTED)
             else:
                 return Response(
                     {'error': 'You have already finished this exam.'},
@@ -96,6 +98,7 @@ class ExamLifecycleMixin:
         if participant.exam_status == ExamStatus.PAUSED:
             participant.exam_status = ExamStatus.IN_PROGRESS
             participant.save()
+            record_status_change(participant, previous_status=ExamStatus.PAUSED)
 
             # Log activity
             log_contest_activity(
@@ -109,9 +112,11 @@ class ExamLifecycleMixin:
 
         # Start exam for user if not already started
         if not participant.started_at and participant.exam_status != ExamStatus.SUBMITTED:
+            previous_status = participant.exam_status
             participant.started_at = timezone.now()
             participant.exam_status = ExamStatus.IN_PROGRESS
             participant.save()
+            record_status_change(participant, previous_status=previous_status)
 
             # Log activity
             log_contest_activity(
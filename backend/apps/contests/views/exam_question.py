@@ -484,6 +484,7 @@ class ContestExamQuestionViewSet(viewsets.ModelViewSet):
         """
         Export formal paper-exam PDF from backend.
         mode=question | answer
+        delivery=file | url (presigned URL to the cached PDF)
         """
         contest = self._get_contest()
         self._ensure_admin_permission(contest)
@@ -492,6 +493,7 @@ class ContestExamQuestionViewSet(viewsets.ModelViewSet):
         language = request.query_params.get("language", "zh-TW")
         scale = parse_scale(request.query_params.get("scale", "1.0"))
         include_answer_area = request.query_params.get("include_answer_area", "true").lower() == "true"
+        delivery = request.query_params.get("delivery", "file")
 
         try:
             return build_paper_exam_sheet_response(
@@ -500,6 +502,7 @@ class ContestExamQuestionViewSet(viewsets.ModelViewSet):
                 language=language,
                 scale=scale,
                 include_answer_area=include_answer_area,
+                delivery=delivery,
             )
         except ExportValidationError as exc:
             logger.warning("Paper exam export validation error: %s", exc)
@@ -5,6 +5,7 @@ from rest_framework.exceptions import APIException
 from rest_framework.response import Response
 
 from ..services.anti_cheat_session import build_device_conflict_payload
+from ..services.exam_autosave import get_autosave_session
 from ..services.exam_validation import validate_exam_operation
 
 
@@ -22,10 +23,9 @@ def _error_detail_to_message(detail) -> str:
     return str(detail)
 
 
-def validate_exam_operation_for_view(*args, **kwargs):
-    """Return ``(participant, error_response)`` for view actions."""
+def _call_for_view(func, *args, **kwargs):
     try:
-        return validate_exam_operation(*args, **kwargs), None
+        return func(*args, **kwargs), None
     except APIException as exc:
         message = _error_detail_to_message(getattr(exc, "detail", str(exc)))
         return None, Response(
@@ -34,6 +34,16 @@ def validate_exam_operation_for_view(*args, **kwargs):
         )
 
 
+def validate_exam_operation_for_view(*args, **kwargs):
+    """Return ``(participant, error_response)`` for view actions."""
+    return _call_for_view(validate_exam_operation, *args, **kwargs)
+
+
+def get_autosave_session_for_view(contest, user):
+    """Return ``(autosave_session, error_response)`` for view actions."""
+    return _call_for_view(get_autosave_session, contest, user)
+
+
 def build_device_conflict_response_for_view(contest, participant, request) -> Response | None:
     """Return a 409 response for active-device conflicts."""
     conflict_payload = build_device_conflict_payload(contest, participant, request)
@@ -0,0 +1,56 @@
+"""Cache backends with Prometheus hit/miss accounting, and a shared raw Redis client."""
+import redis
+from django.conf import settings
+from django.core.cache.backends.redis import RedisCache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .metrics import observe_cache_lookups
+
+_MISSING = object()
+
+
+class InstrumentedRedisCache(RedisCache):
+    """``RedisCache`` that counts hits and misses for ``get``/``get_many``."""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            observe_cache_lookups(0, 1)
+            return default
+        observe_cache_lookups(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        observe_cache_lookups(len(found), len(keys) - len(found))
+        return found
+
+
+_clients: dict = {}
+
+
+def redis_client(alias: str = "default") -> redis.Redis:
+    """
+    Shared ``redis.Redis`` for the server and database behind cache ``alias``.
+
+    For hashes, sorted sets, pipelines and Lua scripts that the cache API does
+    not offer. Keys are not prefixed; build them with ``cache.make_key`` so they
+    share the cache's namespace. The connection pool is per process and
+    reconnects after a fork.
+    """
+    client = _clients.get(alias)
+    if client is None:
+        location = settings.CACHES[alias]["LOCATION"]
+        if isinstance(location, str):
+            location = location.split(",")
+        # Like RedisCache, the first server takes writes.
+        client = _clients[alias] = redis.Redis.from_url(location[0])
+    return client
+
+
+@receiver(setting_changed)
+def _reset_redis_clients(setting, **kwargs):
+    if setting == "CACHES":
+        _clients.clear()
@@ -0,0 +1,127 @@
+"""
+Prometheus metrics for the backend and the Celery judge workers.
+
+All collectors live in the default ``prometheus_client`` registry. Processes
+that fork workers (Celery prefork, multi-worker servers) set
+``PROMETHEUS_MULTIPROC_DIR`` so every child writes to a shared directory and
+``render_metrics`` aggregates them with ``MultiProcessCollector``.
+
+Label values are kept bounded: views are labelled by URL name (never the raw
+path) and judge metrics by canonical language.
+"""
+from __future__ import annotations
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+_JUDGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 60.0)
+_QUEUE_WAIT_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+# ──────────────────────────────────────────────────────────────────
+# HTTP
+# ──────────────────────────────────────────────────────────────────
+
+HTTP_REQUEST_DURATION = Histogram(
+    "qjudge_http_request_duration_seconds",
+    "Backend request latency by resolved view (DRF viewset action).",
+    ["method", "view", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "qjudge_http_request_db_queries",
+    "Database queries executed while serving one request.",
+    ["method", "view"],
+    buckets=_QUERY_COUNT_BUCKETS,
+)
+HTTP_QUERY_BUDGET_EXCEEDED = Counter(
+    "qjudge_http_query_budget_exceeded_total",
+    "Requests that ran more ORM queries than QUERY_BUDGET_MAX_QUERIES.",
+    ["view"],
+)
+CACHE_REQUESTS = Counter(
+    "qjudge_cache_requests_total",
+    "Django cache lookups by result.",
+    ["result"],
+)
+
+# ──────────────────────────────────────────────────────────────────
+# Judge
+# ──────────────────────────────────────────────────────────────────
+
+JUDGE_QUEUE_WAIT = Histogram(
+    "qjudge_judge_queue_wait_seconds",
+    "Time between submission creation and the judge task starting.",
+    ["queue"],
+    buckets=_QUEUE_WAIT_BUCKETS,
+)
+JUDGE_CONTAINER_START = Histogram(
+    "qjudge_judge_container_start_seconds",
+    "Latency of creating and starting one judge container.",
+    ["language"],
+    buckets=_LATENCY_BUCKETS,
+)
+JUDGE_COMPILE_DURATION = Histogram(
+    "qjudge_judge_compile_seconds",
+    "Compile step duration inside the judge container.",
+    ["language"],
+    buckets=_JUDGE_BUCKETS,
+)
+JUDGE_RUN_DURATION = Histogram(
+    "qjudge_judge_run_seconds",
+    "Test case execution duration inside the judge container (compile excluded).",
+    ["language"],
+    buckets=_JUDGE_BUCKETS,
+)
+JUDGE_VERDICTS = Counter(
+    "qjudge_judge_verdicts_total",
+    "Per test case verdicts returned by the judge.",
+    ["language", "verdict"],
+)
+
+
+def observe_request(method: str, view: str, status: int, duration_s: float, query_count: int) -> None:
+    HTTP_REQUEST_DURATION.labels(method, view, str(status)).observe(duration_s)
+    HTTP_REQUEST_DB_QUERIES.labels(method, view).observe(query_count)
+
+
+def observe_query_budget_exceeded(view: str) -> None:
+    HTTP_QUERY_BUDGET_EXCEEDED.labels(view).inc()
+
+
+def observe_cache_lookups(hits: int, misses: int) -> None:
+    if hits:
+        CACHE_REQUESTS.labels("hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels("miss").inc(misses)
+
+
+def observe_queue_wait(queue: str, enqueued_at) -> None:
+    """Record how long a job waited since ``enqueued_at`` (aware datetime)."""
+    if enqueued_at is None:
+        return
+    waited = time.time() - enqueued_at.timestamp()
+    JUDGE_QUEUE_WAIT.labels(queue or "default").observe(max(0.0, waited))
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the exposition payload and its content type."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
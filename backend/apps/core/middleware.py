@@ -1,6 +1,16 @@
 import logging
+import random
+import threading
 import time
 import uuid
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import observe_query_budget_exceeded, observe_request
+from .profiling import StackSampler, write_folded_profile
 
 logger = logging.getLogger("qjudge.requests")
 
@@ -33,3 +43,135 @@ class RequestIDMiddleware:
             )
 
         return response
+
+
+class QueryTracker:
+    """``execute_wrapper`` that counts queries, DB time and repeated SQL."""
+
+    def __init__(self, track_statements: bool = False):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter() if track_statements else None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.monotonic() - start
+            self.count += 1
+            if self.statements is not None:
+                self.statements[sql] += 1
+
+    @contextmanager
+    def installed(self):
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(self))
+            yield self
+
+
+def _view_label(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    return (match.view_name if match else "") or "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """Record Prometheus latency and DB query counts per resolved view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            return self.get_response(request)
+
+        start = time.monotonic()
+        with QueryTracker().installed() as queries:
+            response = self.get_response(request)
+        duration = time.monotonic() - start
+
+        observe_request(request.method, _view_label(request), response.status_code, duration, queries.count)
+        return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Flag requests whose ORM query count exceeds the budget and profile a sample.
+
+    - ``QUERY_BUDGET_ENABLED``: count queries / DB time per request, add
+      ``X-Query-Count`` and ``X-DB-Time-Ms`` headers and log requests over
+      ``QUERY_BUDGET_MAX_QUERIES`` (or the per-view ``QUERY_BUDGET_OVERRIDES``)
+      with the most repeated statement, which is usually the N+1.
+    - ``REQUEST_PROFILER_SAMPLE_RATE``: fraction of requests run under a
+      ``StackSampler``; those slower than ``REQUEST_PROFILER_SLOW_MS`` are
+      written to ``REQUEST_PROFILER_DIR/<request_id>.folded``.
+
+    Both are off by default and enabled in ``config.settings.loadtest``.
+    Must run after ``RequestIDMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        budget_enabled = getattr(settings, "QUERY_BUDGET_ENABLED", False)
+        sample_rate = getattr(settings, "REQUEST_PROFILER_SAMPLE_RATE", 0.0)
+        sampler = None
+        if sample_rate > 0 and random.random() < sample_rate:
+            interval = getattr(settings, "REQUEST_PROFILER_INTERVAL_MS", 5) / 1000.0
+            sampler = StackSampler(threading.get_ident(), interval).start()
+        if not budget_enabled and sampler is None:
+            return self.get_response(request)
+
+        start = time.monotonic()
+        try:
+            with QueryTracker(track_statements=budget_enabled).installed() as queries:
+                response = self.get_response(request)
+        finally:
+            stacks = sampler.stop() if sampler is not None else None
+        duration_ms = (time.monotonic() - start) * 1000
+        view = _view_label(request)
+
+        if budget_enabled:
+            response["X-Query-Count"] = str(queries.count)
+            response["X-DB-Time-Ms"] = f"{queries.duration * 1000:.1f}"
+            budget = getattr(settings, "QUERY_BUDGET_OVERRIDES", {}).get(
+                view, getattr(settings, "QUERY_BUDGET_MAX_QUERIES", 50)
+            )
+            if queries.count > budget:
+                observe_query_budget_exceeded(view)
+                statement, repeats = queries.statements.most_common(1)[0]
+                logger.warning(
+                    "Query budget exceeded %s %s view=%s queries=%d budget=%d db=%.0fms "
+                    "total=%.0fms req=%s most_repeated=%dx %s",
+                    request.method,
+                    request.get_full_path(),
+                    view,
+                    queries.count,
+                    budget,
+                    queries.duration * 1000,
+                    duration_ms,
+                    getattr(request, "request_id", "-"),
+                    repeats,
+                    statement[:300],
+                )
+
+        slow_ms = getattr(settings, "REQUEST_PROFILER_SLOW_MS", 500)
+        if stacks and duration_ms >= slow_ms:
+            request_id = getattr(request, "request_id", "") or uuid.uuid4().hex[:16]
+            try:
+                path = write_folded_profile(settings.REQUEST_PROFILER_DIR, request_id, stacks)
+            except OSError:
+                logger.exception("Failed to write request profile req=%s", request_id)
+            else:
+                logger.warning(
+                    "Slow request profiled %s %s view=%s %.0fms samples=%d profile=%s",
+                    request.method,
+                    request.get_full_path(),
+                    view,
+                    duration_ms,
+                    sum(stacks.values()),
+                    path,
+                )
+        return response
@@ -0,0 +1,73 @@
+"""
+Low-overhead statistical profiler for sampled requests.
+
+``StackSampler`` polls the stack of one thread at a fixed interval from a
+daemon thread (``sys._current_frames``) and aggregates identical stacks. The
+result is written in the "folded" format (``frame;frame;frame count``) that
+flamegraph.pl, speedscope and inferno read directly.
+"""
+from __future__ import annotations
+
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]")
+_MAX_DEPTH = 128
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or os.path.basename(code.co_filename)
+    return f"{module}.{code.co_name}:{frame.f_lineno}"
+
+
+class StackSampler:
+    """Sample the stack of ``thread_id`` every ``interval`` seconds."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="qjudge-stack-sampler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None and len(labels) < _MAX_DEPTH:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.reverse()
+            self.stacks[";".join(labels)] += 1
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.stacks.values())
+
+
+def write_folded_profile(directory: str, name: str, stacks: Counter[str]) -> Path:
+    """Write ``stacks`` as ``<directory>/<name>.folded``; returns the path."""
+    target_dir = Path(directory)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    safe_name = _SAFE_NAME_RE.sub("_", name)[:64] or "request"
+    path = target_dir / f"{safe_name}.folded"
+    with path.open("w", encoding="utf-8") as handle:
+        for stack, count in stacks.most_common():
+            handle.write(f"{stack} {count}\n")
+    return path
@@ -5,8 +5,12 @@ from .markdown_image_storage import (
     MarkdownImageObject,
     MarkdownImageStorageError,
     build_markdown_image_object_key,
+    build_markdown_image_presigned_url,
     fetch_markdown_image,
     is_valid_markdown_image_object_key,
+    markdown_image_delivery,
+    markdown_image_presigned_ttl,
+    open_markdown_image,
     reset_bucket_ready_cache,
     store_markdown_image,
 )
@@ -16,8 +20,12 @@ __all__ = [
     "MarkdownImageObject",
     "MarkdownImageStorageError",
     "build_markdown_image_object_key",
+    "build_markdown_image_presigned_url",
     "fetch_markdown_image",
     "is_valid_markdown_image_object_key",
+    "markdown_image_delivery",
+    "markdown_image_presigned_ttl",
+    "open_markdown_image",
     "reset_bucket_ready_cache",
     "store_markdown_image",
 ]
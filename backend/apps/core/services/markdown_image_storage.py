@@ -5,23 +5,25 @@ import re
 import uuid
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
 
 from botocore.exceptions import ClientError
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 
+from . import object_storage
+
 OBJECT_KEY_PATTERN = re.compile(
     r"^markdown/\d{4}/\d{2}/[0-9a-f]{32}\.(?:png|jpe?g|webp|gif)$"
 )
 
-_BUCKET_READY = False
+# Object keys embed a random UUID and are never overwritten.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
 
 def reset_bucket_ready_cache() -> None:
     """Reset the bucket-exists cache (useful in tests)."""
-    global _BUCKET_READY
-    _BUCKET_READY = False
+    object_storage.reset_bucket_ready_cache()
 
 
 class MarkdownImageStorageError(Exception):
@@ -56,64 +58,17 @@ def build_markdown_image_object_key(extension: str, now: datetime | None = None)
     )
 
 
-def _get_boto3():
-    import boto3  # type: ignore
-
-    return boto3
-
-
 def get_markdown_image_s3_client():
-    """Build boto3 S3 client for markdown images."""
-    boto3 = _get_boto3()
-    kwargs: dict[str, Any] = {
-        "aws_access_key_id": settings.MARKDOWN_IMAGE_S3_ACCESS_KEY,
-        "aws_secret_access_key": settings.MARKDOWN_IMAGE_S3_SECRET_KEY,
-        "region_name": settings.MARKDOWN_IMAGE_S3_REGION,
-    }
-    if settings.MARKDOWN_IMAGE_S3_ENDPOINT_URL:
-        kwargs["endpoint_url"] = settings.MARKDOWN_IMAGE_S3_ENDPOINT_URL
-    return boto3.client("s3", **kwargs)
+    """Pooled S3 client for markdown images."""
+    return object_storage.get_client(endpoint_url=settings.MARKDOWN_IMAGE_S3_ENDPOINT_URL)
 
 
 def _ensure_bucket_exists(client) -> None:
-    global _BUCKET_READY
-    if _BUCKET_READY:
-        return
-
-    bucket = settings.MARKDOWN_IMAGE_S3_BUCKET
-    auto_create = getattr(settings, "OBJECT_STORAGE_AUTO_CREATE_BUCKETS", True)
-    try:
-        client.head_bucket(Bucket=bucket)
-        _BUCKET_READY = True
-        return
-    except ClientError as exc:
-        code = str(exc.response.get("Error", {}).get("Code", "")).strip()
-        if not auto_create:
-            if code in {"403", "AccessDenied", "Forbidden"}:
-                _BUCKET_READY = True
-                return
-            if code in {"404", "NoSuchBucket", "NotFound"}:
-                raise MarkdownImageStorageError(
-                    f"Markdown image bucket '{bucket}' not found on object storage; "
-                    "create it in the provider dashboard before retrying."
-                ) from exc
-            raise MarkdownImageStorageError("Failed to access markdown image bucket") from exc
-        if code not in {"404", "NoSuchBucket", "NotFound"}:
-            raise MarkdownImageStorageError("Failed to access markdown image bucket") from exc
-
-    create_params: dict[str, Any] = {"Bucket": bucket}
-    region = (settings.MARKDOWN_IMAGE_S3_REGION or "").strip()
-    if region and region != "us-east-1":
-        create_params["CreateBucketConfiguration"] = {"LocationConstraint": region}
-
-    try:
-        client.create_bucket(**create_params)
-    except ClientError as exc:
-        code = str(exc.response.get("Error", {}).get("Code", "")).strip()
-        if code != "BucketAlreadyOwnedByYou":
-            raise MarkdownImageStorageError("Failed to create markdown image bucket") from exc
-
-    _BUCKET_READY = True
+    object_storage.ensure_bucket(
+        client,
+        settings.MARKDOWN_IMAGE_S3_BUCKET,
+        error_cls=MarkdownImageStorageError,
+    )
 
 
 def store_markdown_image(content: bytes, object_key: str, content_type: str) -> None:
@@ -126,6 +81,7 @@ def store_markdown_image(content: bytes, object_key: str, content_type: str) ->
             Key=object_key,
             Body=content,
             ContentType=content_type,
+            CacheControl=IMMUTABLE_CACHE_CONTROL,
         )
     except ClientError as exc:
         raise MarkdownImageStorageError("Failed to upload markdown image") from exc
@@ -133,24 +89,68 @@ def store_markdown_image(content: bytes, object_key: str, content_type: str) ->
 
 def fetch_markdown_image(object_key: str) -> MarkdownImageObject:
     """Fetch markdown image bytes + metadata from S3."""
-    client = get_markdown_image_s3_client()
+    image = open_markdown_image(object_key)
+    payload = image.read()
+    return MarkdownImageObject(
+        content=payload,
+        content_type=image.content_type,
+        size=image.content_length if image.content_length is not None else len(payload),
+    )
+
+
+def open_markdown_image(
+    object_key: str,
+    *,
+    byte_range: str | None = None,
+    if_none_match: str | None = None,
+) -> object_storage.StreamedObject:
+    """Open a markdown image for streaming, passing conditional/range headers through."""
     try:
-        response = client.get_object(
-            Bucket=settings.MARKDOWN_IMAGE_S3_BUCKET,
-            Key=object_key,
+        return object_storage.open_object(
+            get_markdown_image_s3_client(),
+            settings.MARKDOWN_IMAGE_S3_BUCKET,
+            object_key,
+            byte_range=byte_range,
+            if_none_match=if_none_match,
         )
-    except ClientError as exc:
-        code = str(exc.response.get("Error", {}).get("Code", "")).strip()
-        if code in {"404", "NoSuchKey", "NotFound", "NoSuchBucket"}:
-            raise MarkdownImageNotFoundError("Markdown image not found") from exc
+    except object_storage.ObjectNotFoundError as exc:
+        raise MarkdownImageNotFoundError("Markdown image not found") from exc
+    except object_storage.RangeNotSatisfiableError:
+        raise
+    except object_storage.ObjectStorageError as exc:
         raise MarkdownImageStorageError("Failed to fetch markdown image") from exc
 
-    stream = response["Body"]
+
+def build_markdown_image_presigned_url(object_key: str) -> str:
+    """
+    Browser-facing URL for a markdown image, reused across requests.
+
+    The URL is cached for half its lifetime so repeated redirects point at the
+    same URL and browsers / CDNs can cache the image under it.
+    """
+    cache_key = f"markdown_image:url:{object_key}"
+    url = cache.get(cache_key)
+    if url:
+        return url
+    ttl = markdown_image_presigned_ttl()
     try:
-        payload = stream.read()
-    finally:
-        stream.close()
+        url = object_storage.presigned_get_url(
+            settings.MARKDOWN_IMAGE_S3_BUCKET,
+            object_key,
+            expires_seconds=ttl,
+            response_headers={"ResponseCacheControl": IMMUTABLE_CACHE_CONTROL},
+        )
+    except object_storage.ObjectStorageError as exc:
+        raise MarkdownImageStorageError("Failed to presign markdown image") from exc
+    cache.set(cache_key, url, timeout=ttl // 2)
+    return url
+
+
+def markdown_image_presigned_ttl() -> int:
+    return max(int(getattr(settings, "MARKDOWN_IMAGE_PRESIGNED_URL_TTL_SECONDS", 3600)), 60)
+
 
-    content_type = response.get("ContentType") or "application/octet-stream"
-    size = int(response.get("ContentLength") or len(payload))
-    return MarkdownImageObject(content=payload, content_type=content_type, size=size)
+def markdown_image_delivery() -> str:
+    """``"redirect"`` to a presigned URL or ``"proxy"`` through the backend."""
+    mode = str(getattr(settings, "MARKDOWN_IMAGE_DELIVERY", "proxy")).strip().lower()
+    return mode if mode in {"redirect", "proxy"} else "proxy"
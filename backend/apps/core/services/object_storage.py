@@ -0,0 +1,289 @@
+"""
+Shared S3-compatible object storage layer.
+
+Every app that talks to object storage (anti-cheat evidence, AI artifacts,
+markdown images, export caches, report archives) goes through this module
+instead of building its own boto3 client:
+
+- clients are built once per (endpoint, credentials) and reused; boto3 clients
+  are thread-safe and keep a urllib3 connection pool sized by
+  ``OBJECT_STORAGE_MAX_POOL_CONNECTIONS``, so hot paths skip both client
+  construction and TLS handshakes;
+- bucket readiness (HeadBucket, optional CreateBucket) is checked once per
+  process per (endpoint, bucket);
+- downloads can be streamed in chunks with ``Range`` / ``If-None-Match``
+  passed through to the provider, and uploads of file objects go through the
+  managed multipart transfer.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, BinaryIO, Iterator
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+
+NOT_FOUND_CODES = frozenset({"404", "NoSuchKey", "NotFound", "NoSuchBucket"})
+_NOT_MODIFIED_CODES = frozenset({"304", "NotModified"})
+_INVALID_RANGE_CODES = frozenset({"416", "InvalidRange"})
+_FORBIDDEN_CODES = frozenset({"403", "AccessDenied", "Forbidden"})
+_MISSING_BUCKET_CODES = frozenset({"404", "NoSuchBucket", "NotFound"})
+
+_ready_buckets: set[tuple[str, str]] = set()
+_ready_lock = threading.Lock()
+
+
+class ObjectStorageError(Exception):
+    """Raised when an object storage operation fails."""
+
+
+class ObjectNotFoundError(ObjectStorageError):
+    """Raised when the requested object (or its bucket) does not exist."""
+
+
+class RangeNotSatisfiableError(ObjectStorageError):
+    """Raised when a ``Range`` request falls outside the object."""
+
+
+def error_code(exc: ClientError) -> str:
+    return str(exc.response.get("Error", {}).get("Code", "")).strip()
+
+
+def _get_boto3():
+    import boto3  # type: ignore
+
+    return boto3
+
+
+@lru_cache(maxsize=16)
+def _cached_client(endpoint: str, access_key: str, secret_key: str, region: str, pool_size: int) -> Any:
+    from botocore.config import Config
+
+    boto3 = _get_boto3()
+    kwargs: dict[str, Any] = {
+        "aws_access_key_id": access_key,
+        "aws_secret_access_key": secret_key,
+        "region_name": region,
+        "config": Config(
+            max_pool_connections=pool_size,
+            retries={"max_attempts": 3, "mode": "standard"},
+            tcp_keepalive=True,
+        ),
+    }
+    if endpoint:
+        kwargs["endpoint_url"] = endpoint
+    # boto3.client() shares the default session, which is not safe to
+    # initialise from several threads at once.
+    return boto3.session.Session().client("s3", **kwargs)
+
+
+def get_client(*, endpoint_url: str | None = None):
+    """Pooled client for ``endpoint_url`` (default: ``OBJECT_STORAGE_ENDPOINT_URL``)."""
+    endpoint = endpoint_url if endpoint_url is not None else settings.OBJECT_STORAGE_ENDPOINT_URL
+    return _cached_client(
+        (endpoint or "").strip(),
+        settings.OBJECT_STORAGE_ACCESS_KEY,
+        settings.OBJECT_STORAGE_SECRET_KEY,
+        settings.OBJECT_STORAGE_REGION,
+        max(int(getattr(settings, "OBJECT_STORAGE_MAX_POOL_CONNECTIONS", 32)), 1),
+    )
+
+
+def get_public_client():
+    """Client whose presigned URLs point at the browser-facing endpoint."""
+    return get_client(endpoint_url=(settings.OBJECT_STORAGE_PUBLIC_ENDPOINT_URL or "").strip() or None)
+
+
+def reset_bucket_ready_cache() -> None:
+    """Forget which buckets were already checked (useful in tests)."""
+    with _ready_lock:
+        _ready_buckets.clear()
+
+
+def ensure_bucket(client, bucket: str, *, error_cls: type[Exception] = ObjectStorageError) -> None:
+    """
+    Make sure ``bucket`` exists, creating it when
+    ``OBJECT_STORAGE_AUTO_CREATE_BUCKETS`` allows. Failures raise ``error_cls``.
+    """
+    endpoint = str(getattr(getattr(client, "meta", None), "endpoint_url", "") or "")
+    ready_key = (endpoint, bucket)
+    if ready_key in _ready_buckets:
+        return
+
+    auto_create = getattr(settings, "OBJECT_STORAGE_AUTO_CREATE_BUCKETS", True)
+    try:
+        client.head_bucket(Bucket=bucket)
+    except ClientError as exc:
+        code = error_code(exc)
+        if code in _FORBIDDEN_CODES and not auto_create:
+            # R2 / managed buckets: the token may not have HeadBucket
+            # permission. Trust the configured bucket; a real problem
+            # surfaces on the first object operation.
+            pass
+        elif code not in _MISSING_BUCKET_CODES:
+            raise error_cls(f"Failed to access bucket '{bucket}'") from exc
+        elif not auto_create:
+            raise error_cls(
+                f"Bucket '{bucket}' not found on object storage; "
+                "create it in the provider dashboard before retrying."
+            ) from exc
+        else:
+            _create_bucket(client, bucket, error_cls=error_cls)
+
+    with _ready_lock:
+        _ready_buckets.add(ready_key)
+
+
+def _create_bucket(client, bucket: str, *, error_cls: type[Exception]) -> None:
+    params: dict[str, Any] = {"Bucket": bucket}
+    region = (settings.OBJECT_STORAGE_REGION or "").strip()
+    if region and region != "us-east-1":
+        params["CreateBucketConfiguration"] = {"LocationConstraint": region}
+    try:
+        client.create_bucket(**params)
+    except ClientError as exc:
+        if error_code(exc) not in {"BucketAlreadyOwnedByYou", "BucketAlreadyExists"}:
+            raise error_cls(f"Failed to create bucket '{bucket}'") from exc
+
+
+def _transfer_config():
+    from boto3.s3.transfer import TransferConfig
+
+    # S3 rejects multipart parts below 5 MiB (except the last one).
+    threshold = max(
+        int(getattr(settings, "OBJECT_STORAGE_MULTIPART_THRESHOLD_BYTES", 8 * 1024 * 1024)),
+        5 * 1024 * 1024,
+    )
+    return TransferConfig(multipart_threshold=threshold, multipart_chunksize=threshold)
+
+
+def upload_stream(
+    client,
+    fileobj: BinaryIO,
+    bucket: str,
+    object_key: str,
+    *,
+    content_type: str,
+    extra_args: dict[str, Any] | None = None,
+) -> None:
+    """Upload a file object, switching to multipart above the configured threshold."""
+    client.upload_fileobj(
+        fileobj,
+        bucket,
+        object_key,
+        ExtraArgs={"ContentType": content_type, **(extra_args or {})},
+        Config=_transfer_config(),
+    )
+
+
+@dataclass
+class StreamedObject:
+    """An object (or byte range of one) whose body has not been read yet.
+
+    ``status`` is 200, 206 for a partial ``Range`` response or 304 when the
+    ``If-None-Match`` tag matched (``body`` is then ``None``).
+    """
+
+    body: Any
+    status: int
+    content_type: str
+    content_length: int | None
+    etag: str = ""
+    last_modified: Any = None
+    content_range: str = ""
+
+    def iter_chunks(self, chunk_size: int | None = None) -> Iterator[bytes]:
+        if self.body is None:
+            return
+        size = chunk_size or int(getattr(settings, "OBJECT_STORAGE_STREAM_CHUNK_BYTES", 64 * 1024))
+        try:
+            while True:
+                chunk = self.body.read(size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            self.close()
+
+    def read(self) -> bytes:
+        return b"".join(self.iter_chunks())
+
+    def close(self) -> None:
+        if self.body is not None:
+            self.body.close()
+
+
+def open_object(
+    client,
+    bucket: str,
+    object_key: str,
+    *,
+    byte_range: str | None = None,
+    if_none_match: str | None = None,
+) -> StreamedObject:
+    """
+    GET ``object_key`` without reading its body.
+
+    ``byte_range`` and ``if_none_match`` are raw HTTP header values passed
+    through to the provider.
+    """
+    params: dict[str, Any] = {"Bucket": bucket, "Key": object_key}
+    if byte_range:
+        params["Range"] = byte_range
+    if if_none_match:
+        params["IfNoneMatch"] = if_none_match
+    try:
+        response = client.get_object(**params)
+    except ClientError as exc:
+        code = error_code(exc)
+        if code in _NOT_MODIFIED_CODES:
+            headers = exc.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+            return StreamedObject(
+                body=None,
+                status=304,
+                content_type="",
+                content_length=None,
+                etag=headers.get("etag", if_none_match or ""),
+            )
+        if code in NOT_FOUND_CODES:
+            raise ObjectNotFoundError(f"Object '{object_key}' not found") from exc
+        if code in _INVALID_RANGE_CODES:
+            raise RangeNotSatisfiableError(f"Range '{byte_range}' not satisfiable") from exc
+        raise ObjectStorageError(f"Failed to fetch object '{object_key}'") from exc
+
+    content_range = response.get("ContentRange") or ""
+    length = response.get("ContentLength")
+    return StreamedObject(
+        body=response["Body"],
+        status=206 if content_range else 200,
+        content_type=response.get("ContentType") or "application/octet-stream",
+        content_length=int(length) if length is not None else None,
+        etag=response.get("ETag") or "",
+        last_modified=response.get("LastModified"),
+        content_range=content_range,
+    )
+
+
+def presigned_get_url(
+    bucket: str,
+    object_key: str,
+    *,
+    expires_seconds: int | None = None,
+    response_headers: dict[str, str] | None = None,
+    client=None,
+) -> str:
+    """
+    Browser-facing GET URL. ``response_headers`` maps S3 ``Response*``
+    overrides (e.g. ``{"ResponseCacheControl": "..."}``).
+    """
+    client = client or get_public_client()
+    try:
+        return client.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={"Bucket": bucket, "Key": object_key, **(response_headers or {})},
+            ExpiresIn=expires_seconds or settings.OBJECT_STORAGE_PRESIGNED_URL_TTL_SECONDS,
+        )
+    except ClientError as exc:
+        raise ObjectStorageError(f"Failed to presign '{object_key}'") from exc
@@ -0,0 +1,49 @@
+"""
+Streaming responses that stay streamed under both WSGI and ASGI.
+
+Django 4.2 serves a synchronous iterator under ASGI by collecting it into a
+list first (and an asynchronous one under WSGI the same way), so a plain
+``StreamingHttpResponse(generator)`` holds the whole body in memory on
+Daphne. ``build_streaming_response`` hands ASGI requests an async iterator
+that pulls the sync generator a few parts at a time in the request's
+thread-sensitive executor, so ORM cursors keep working on the connection
+that opened them.
+"""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+# Parts pulled per executor hop when serving a sync generator over ASGI.
+_ASGI_PULL_PARTS = 16
+
+
+def _is_asgi(request) -> bool:
+    # DRF wraps the Django request.
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+async def _pull_async(parts: Iterator[bytes]) -> AsyncIterator[bytes]:
+    pull = sync_to_async(lambda: list(islice(parts, _ASGI_PULL_PARTS)), thread_sensitive=True)
+    try:
+        while True:
+            batch = await pull()
+            if not batch:
+                return
+            for part in batch:
+                yield part
+    finally:
+        close = getattr(parts, "close", None)
+        if close is not None:
+            # Release server-side cursors when the client goes away mid-download.
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+def build_streaming_response(request, parts: Iterator[bytes], **kwargs) -> StreamingHttpResponse:
+    """``StreamingHttpResponse`` over ``parts`` that is not buffered by the server handler."""
+    content = _pull_async(parts) if request is not None and _is_asgi(request) else parts
+    return StreamingHttpResponse(content, **kwargs)
@@ -6,14 +6,15 @@ from unittest.mock import patch
 
 from PIL import Image
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from apps.core.services import (
-    MarkdownImageNotFoundError,
-    MarkdownImageObject,
-)
+from apps.core.services import MarkdownImageNotFoundError
+from apps.core.services.object_storage import RangeNotSatisfiableError, StreamedObject
+
+IMAGE_PATH = "/api/v1/markdown/images/markdown/2026/03/0123456789abcdef0123456789abcdef.png"
 
 User = get_user_model()
 
@@ -121,29 +122,85 @@ class MarkdownImageApiTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("File is too large", response.data["error"])
 
-    @patch("apps.core.views.markdown_images.fetch_markdown_image")
-    def test_read_image_public_success(self, mock_fetch):
-        mock_fetch.return_value = MarkdownImageObject(
-            content=b"abc",
+    @patch("apps.core.views.markdown_images.open_markdown_image")
+    def test_read_image_public_success(self, mock_open):
+        mock_open.return_value = StreamedObject(
+            body=BytesIO(b"abc"),
+            status=200,
             content_type="image/png",
-            size=3,
+            content_length=3,
+            etag='"etag-1"',
         )
 
-        response = self.client.get(
-            "/api/v1/markdown/images/markdown/2026/03/0123456789abcdef0123456789abcdef.png"
-        )
+        response = self.client.get(IMAGE_PATH)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response["Content-Type"], "image/png")
-        self.assertEqual(response.content, b"abc")
+        self.assertEqual(b"".join(response.streaming_content), b"abc")
+        self.assertEqual(response["ETag"], '"etag-1"')
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    @patch("apps.core.views.markdown_images.open_markdown_image")
+    def test_read_image_passes_range_through(self, mock_open):
+        mock_open.return_value = StreamedObject(
+            body=BytesIO(b"bc"),
+            status=206,
+            content_type="image/png",
+            content_length=2,
+            content_range="bytes 1-2/3",
+        )
+
+        response = self.client.get(IMAGE_PATH, HTTP_RANGE="bytes=1-2")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response["Content-Range"], "bytes 1-2/3")
+        self.assertEqual(b"".join(response.streaming_content), b"bc")
+        self.assertEqual(mock_open.call_args.kwargs["byte_range"], "bytes=1-2")
+
+    @patch("apps.core.views.markdown_images.open_markdown_image")
+    def test_read_image_returns_416_for_bad_range(self, mock_open):
+        mock_open.side_effect = RangeNotSatisfiableError("bad range")
+        response = self.client.get(IMAGE_PATH, HTTP_RANGE="bytes=10-20")
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+
+    @patch("apps.core.views.markdown_images.open_markdown_image")
+    def test_read_image_returns_304_when_etag_matches(self, mock_open):
+        mock_open.return_value = StreamedObject(
+            body=None,
+            status=304,
+            content_type="",
+            content_length=None,
+            etag='"etag-1"',
+        )
+
+        response = self.client.get(IMAGE_PATH, HTTP_IF_NONE_MATCH='"etag-1"')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(mock_open.call_args.kwargs["if_none_match"], '"etag-1"')
+
+    @override_settings(MARKDOWN_IMAGE_DELIVERY="redirect", MARKDOWN_IMAGE_PRESIGNED_URL_TTL_SECONDS=3600)
+    @patch("apps.core.services.object_storage.presigned_get_url")
+    @patch("apps.core.views.markdown_images.open_markdown_image")
+    def test_redirect_mode_reuses_presigned_url(self, mock_open, mock_presign):
+        object_key = "markdown/2026/03/0123456789abcdef0123456789abcdef.png"
+        cache.delete(f"markdown_image:url:{object_key}")
+        mock_presign.return_value = "https://storage.example/signed"
+
+        first = self.client.get(IMAGE_PATH)
+        second = self.client.get(IMAGE_PATH)
+        cache.delete(f"markdown_image:url:{object_key}")
+
+        self.assertEqual(first.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(first["Location"], "https://storage.example/signed")
+        self.assertEqual(second["Location"], "https://storage.example/signed")
+        self.assertEqual(first["Cache-Control"], "public, max-age=900")
+        mock_presign.assert_called_once()
+        mock_open.assert_not_called()
 
     def test_read_image_rejects_invalid_object_key(self):
         response = self.client.get("/api/v1/markdown/images/../../etc/passwd")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
-    @patch("apps.core.views.markdown_images.fetch_markdown_image")
-    def test_read_image_returns_404_when_not_found(self, mock_fetch):
-        mock_fetch.side_effect = MarkdownImageNotFoundError("not found")
-        response = self.client.get(
-            "/api/v1/markdown/images/markdown/2026/03/0123456789abcdef0123456789abcdef.png"
-        )
+    @patch("apps.core.views.markdown_images.open_markdown_image")
+    def test_read_image_returns_404_when_not_found(self, mock_open):
+        mock_open.side_effect = MarkdownImageNotFoundError("not found")
+        response = self.client.get(IMAGE_PATH)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from apps.core.cache import redis_client
+
+User = get_user_model()
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@override_settings(METRICS_AUTH_TOKEN="scrape-secret")
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        self.client.defaults["HTTP_AUTHORIZATION"] = "Bearer scrape-secret"
+
+    def test_request_latency_and_query_count_are_labelled_by_view(self):
+        labels = {"method": "GET", "view": "health-check"}
+        before_count = _sample("qjudge_http_request_duration_seconds_count", status="200", **labels)
+        before_queries = _sample("qjudge_http_request_db_queries_count", **labels)
+
+        self.assertEqual(self.client.get("/api/health/").status_code, 200)
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"qjudge_http_request_duration_seconds_bucket", response.content)
+        self.assertEqual(
+            _sample("qjudge_http_request_duration_seconds_count", status="200", **labels),
+            before_count + 1,
+        )
+        self.assertEqual(_sample("qjudge_http_request_db_queries_count", **labels), before_queries + 1)
+
+    def test_db_queries_are_counted_per_request(self):
+        user = User.objects.create_user(username="metrics_user", password="pw")
+        client = APIClient()
+        client.force_authenticate(user=user)
+        labels = {"method": "GET", "view": "contests:contest-list"}
+        before = _sample("qjudge_http_request_db_queries_sum", **labels)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/api/v1/contests/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(len(queries), 0)
+        self.assertEqual(_sample("qjudge_http_request_db_queries_sum", **labels), before + len(queries))
+
+    def test_token_is_required(self):
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="").status_code, 403)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+    @override_settings(METRICS_AUTH_TOKEN="")
+    def test_missing_token_fails_closed_outside_debug(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled_metrics_return_404(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+
+
+class CacheMetricsTests(TestCase):
+    def test_cache_hits_and_misses_are_counted(self):
+        hits = _sample("qjudge_cache_requests_total", result="hit")
+        misses = _sample("qjudge_cache_requests_total", result="miss")
+        cache.set("metrics:present", 0)
+
+        self.assertEqual(cache.get("metrics:present"), 0)
+        self.assertIsNone(cache.get("metrics:absent"))
+        self.assertEqual(cache.get_many(["metrics:present", "metrics:absent"]), {"metrics:present": 0})
+
+        self.assertEqual(_sample("qjudge_cache_requests_total", result="hit"), hits + 2)
+        self.assertEqual(_sample("qjudge_cache_requests_total", result="miss"), misses + 2)
+        cache.delete("metrics:present")
+
+
+class RedisClientTests(TestCase):
+    def test_raw_client_shares_the_cache_server(self):
+        cache.set("redis_client:probe", "x")
+
+        self.assertTrue(redis_client().exists(cache.make_key("redis_client:probe")))
+        self.assertIs(redis_client(), redis_client())
+        cache.delete("redis_client:probe")
@@ -0,0 +1,132 @@
+"""Tests for the shared object storage layer (apps.core.services.object_storage)."""
+from __future__ import annotations
+
+from io import BytesIO
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+from django.test import SimpleTestCase, override_settings
+
+from apps.ai.services import artifact_storage
+from apps.contests.services.anticheat_storage import get_s3_client
+from apps.core.services import object_storage
+
+
+def _client_error(code: str, op: str = "HeadBucket") -> ClientError:
+    return ClientError({"Error": {"Code": code}}, op)
+
+
+def _fake_client(endpoint: str = "http://storage.test") -> MagicMock:
+    client = MagicMock()
+    client.meta.endpoint_url = endpoint
+    return client
+
+
+class ObjectStorageClientTests(SimpleTestCase):
+    def test_clients_are_shared_across_callers(self):
+        self.assertIs(get_s3_client(), object_storage.get_client())
+        self.assertIs(artifact_storage.get_artifact_s3_client(), object_storage.get_client())
+
+    @override_settings(OBJECT_STORAGE_MAX_POOL_CONNECTIONS=7)
+    def test_client_uses_configured_pool_size(self):
+        client = object_storage.get_client(endpoint_url="http://pool.test")
+        self.assertEqual(client.meta.config.max_pool_connections, 7)
+
+    @override_settings(OBJECT_STORAGE_PUBLIC_ENDPOINT_URL="https://public.test")
+    def test_public_client_signs_against_public_endpoint(self):
+        url = object_storage.presigned_get_url("bucket", "a/b.png", expires_seconds=60)
+        self.assertTrue(url.startswith("https://public.test/"))
+
+
+class EnsureBucketTests(SimpleTestCase):
+    def setUp(self):
+        object_storage.reset_bucket_ready_cache()
+        self.addCleanup(object_storage.reset_bucket_ready_cache)
+
+    def test_bucket_is_checked_once_per_endpoint(self):
+        client = _fake_client()
+        object_storage.ensure_bucket(client, "images")
+        object_storage.ensure_bucket(client, "images")
+        object_storage.ensure_bucket(_fake_client("http://other.test"), "images")
+
+        client.head_bucket.assert_called_once_with(Bucket="images")
+
+    @override_settings(OBJECT_STORAGE_AUTO_CREATE_BUCKETS=True, OBJECT_STORAGE_REGION="ap-east-1")
+    def test_missing_bucket_is_created_in_region(self):
+        client = _fake_client()
+        client.head_bucket.side_effect = _client_error("404")
+
+        object_storage.ensure_bucket(client, "images")
+
+        client.create_bucket.assert_called_once_with(
+            Bucket="images",
+            CreateBucketConfiguration={"LocationConstraint": "ap-east-1"},
+        )
+
+    @override_settings(OBJECT_STORAGE_AUTO_CREATE_BUCKETS=False)
+    def test_forbidden_head_is_trusted_without_auto_create(self):
+        client = _fake_client()
+        client.head_bucket.side_effect = _client_error("403")
+
+        object_storage.ensure_bucket(client, "images")
+        object_storage.ensure_bucket(client, "images")
+
+        client.head_bucket.assert_called_once()
+        client.create_bucket.assert_not_called()
+
+    @override_settings(OBJECT_STORAGE_AUTO_CREATE_BUCKETS=False)
+    def test_missing_bucket_raises_caller_error_without_auto_create(self):
+        client = _fake_client()
+        client.head_bucket.side_effect = _client_error("NoSuchBucket")
+
+        with self.assertRaises(artifact_storage.AIArtifactStorageError):
+            object_storage.ensure_bucket(client, "images", error_cls=artifact_storage.AIArtifactStorageError)
+
+
+class OpenObjectTests(SimpleTestCase):
+    def test_range_response_streams_in_chunks(self):
+        client = _fake_client()
+        client.get_object.return_value = {
+            "Body": BytesIO(b"abcdef"),
+            "ContentType": "image/png",
+            "ContentLength": 6,
+            "ContentRange": "bytes 0-5/10",
+            "ETag": '"e1"',
+        }
+
+        obj = object_storage.open_object(client, "images", "k.png", byte_range="bytes=0-5")
+
+        client.get_object.assert_called_once_with(Bucket="images", Key="k.png", Range="bytes=0-5")
+        self.assertEqual(obj.status, 206)
+        self.assertEqual(list(obj.iter_chunks(4)), [b"abcd", b"ef"])
+
+    def test_matching_etag_returns_not_modified(self):
+        client = _fake_client()
+        client.get_object.side_effect = _client_error("304", "GetObject")
+
+        obj = object_storage.open_object(client, "images", "k.png", if_none_match='"e1"')
+
+        self.assertEqual(obj.status, 304)
+        self.assertEqual(obj.etag, '"e1"')
+        self.assertEqual(list(obj.iter_chunks()), [])
+
+    def test_error_codes_map_to_storage_errors(self):
+        client = _fake_client()
+        for code, error in (
+            ("NoSuchKey", object_storage.ObjectNotFoundError),
+            ("InvalidRange", object_storage.RangeNotSatisfiableError),
+            ("InternalError", object_storage.ObjectStorageError),
+        ):
+            client.get_object.side_effect = _client_error(code, "GetObject")
+            with self.assertRaises(error):
+                object_storage.open_object(client, "images", "k.png")
+
+    def test_upload_stream_uses_multipart_transfer_config(self):
+        client = _fake_client()
+
+        with override_settings(OBJECT_STORAGE_MULTIPART_THRESHOLD_BYTES=16 * 1024 * 1024):
+            object_storage.upload_stream(client, BytesIO(b"zip"), "reports", "r.zip", content_type="application/zip")
+
+        kwargs = client.upload_fileobj.call_args.kwargs
+        self.assertEqual(kwargs["ExtraArgs"], {"ContentType": "application/zip"})
+        self.assertEqual(kwargs["Config"].multipart_threshold, 16 * 1024 * 1024)
@@ -0,0 +1,122 @@
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from apps.core.profiling import StackSampler, write_folded_profile
+
+User = get_user_model()
+
+CONTEST_LIST_VIEW = "contests:contest-list"
+
+
+class _FakeSampler:
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+
+    def start(self):
+        return self
+
+    def stop(self):
+        return Counter({"django.handler:1;apps.contests.views.contest.list:42": 7})
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username="budget_user", password="pw"))
+
+    def test_disabled_by_default(self):
+        response = self.client.get("/api/v1/contests/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Query-Count", response)
+
+    @override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_MAX_QUERIES=0)
+    def test_over_budget_request_is_flagged(self):
+        exceeded = REGISTRY.get_sample_value(
+            "qjudge_http_query_budget_exceeded_total", {"view": CONTEST_LIST_VIEW}
+        ) or 0
+
+        with self.assertLogs("qjudge.requests", level="WARNING") as logs:
+            response = self.client.get("/api/v1/contests/", HTTP_X_REQUEST_ID="budget-req")
+
+        self.assertGreater(int(response["X-Query-Count"]), 0)
+        self.assertIn("X-DB-Time-Ms", response)
+        self.assertIn(f"view={CONTEST_LIST_VIEW}", logs.output[0])
+        self.assertIn("req=budget-req", logs.output[0])
+        self.assertIn("most_repeated=", logs.output[0])
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "qjudge_http_query_budget_exceeded_total", {"view": CONTEST_LIST_VIEW}
+            ),
+            exceeded + 1,
+        )
+
+    @override_settings(
+        QUERY_BUDGET_ENABLED=True,
+        QUERY_BUDGET_MAX_QUERIES=0,
+        QUERY_BUDGET_OVERRIDES={CONTEST_LIST_VIEW: 1000},
+    )
+    def test_per_view_override_raises_budget(self):
+        with self.assertNoLogs("qjudge.requests", level="WARNING"):
+            response = self.client.get("/api/v1/contests/")
+
+        self.assertIn("X-Query-Count", response)
+
+    @patch("apps.core.middleware.StackSampler", _FakeSampler)
+    def test_sampled_slow_request_writes_folded_profile(self):
+        with tempfile.TemporaryDirectory() as profile_dir:
+            with override_settings(
+                REQUEST_PROFILER_SAMPLE_RATE=1.0,
+                REQUEST_PROFILER_SLOW_MS=0,
+                REQUEST_PROFILER_DIR=profile_dir,
+            ):
+                self.client.get("/api/v1/contests/", HTTP_X_REQUEST_ID="slow-req/../1")
+
+            [profile] = Path(profile_dir).iterdir()
+            self.assertEqual(profile.name, "slow-req_.._1.folded")
+            self.assertEqual(
+                profile.read_text(),
+                "django.handler:1;apps.contests.views.contest.list:42 7\n",
+            )
+
+    @patch("apps.core.middleware.StackSampler", _FakeSampler)
+    def test_fast_sampled_request_is_not_written(self):
+        with tempfile.TemporaryDirectory() as profile_dir:
+            with override_settings(
+                REQUEST_PROFILER_SAMPLE_RATE=1.0,
+                REQUEST_PROFILER_SLOW_MS=60_000,
+                REQUEST_PROFILER_DIR=profile_dir,
+            ):
+                self.client.get("/api/v1/contests/")
+
+            self.assertEqual(list(Path(profile_dir).iterdir()), [])
+
+
+def _busy_wait(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+class StackSamplerTests(SimpleTestCase):
+    def test_samples_the_target_thread(self):
+        sampler = StackSampler(threading.get_ident(), interval=0.001).start()
+        _busy_wait(0.05)
+        stacks = sampler.stop()
+
+        self.assertGreater(sampler.sample_count, 0)
+        self.assertTrue(any("_busy_wait" in stack.rsplit(";", 2)[-1] for stack in stacks))
+
+        with tempfile.TemporaryDirectory() as profile_dir:
+            path = write_folded_profile(profile_dir, "req", stacks)
+            first_line = path.read_text().splitlines()[0]
+            self.assertRegex(first_line, r"^\S+ \d+$")
@@ -6,8 +6,13 @@ from pathlib import Path
 
 from PIL import Image, UnidentifiedImageError
 from django.conf import settings
-from django.http import HttpResponse
+from django.http import (
+    HttpResponse,
+    HttpResponseNotModified,
+    HttpResponseRedirect,
+)
 from django.urls import reverse
+from django.utils.http import http_date
 from rest_framework import permissions, status
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
@@ -17,10 +22,16 @@ from apps.core.services import (
     MarkdownImageNotFoundError,
     MarkdownImageStorageError,
     build_markdown_image_object_key,
-    fetch_markdown_image,
+    build_markdown_image_presigned_url,
     is_valid_markdown_image_object_key,
+    markdown_image_delivery,
+    markdown_image_presigned_ttl,
+    open_markdown_image,
     store_markdown_image,
 )
+from apps.core.services.markdown_image_storage import IMMUTABLE_CACHE_CONTROL
+from apps.core.services.object_storage import RangeNotSatisfiableError
+from apps.core.services.streaming import build_streaming_response
 
 SUPPORTED_IMAGE_FORMATS = {
     "PNG": ("png", "image/png"),
@@ -122,7 +133,14 @@ class MarkdownImageUploadView(APIView):
 
 
 class MarkdownImageReadView(APIView):
-    """Read markdown image through backend proxy."""
+    """
+    Read a markdown image.
+
+    With ``MARKDOWN_IMAGE_DELIVERY=redirect`` the browser is sent to a
+    presigned object storage URL so image bytes never pass through a backend
+    worker; otherwise the object is streamed through with ``Range`` and
+    ``If-None-Match`` passed to object storage.
+    """
 
     permission_classes = [permissions.AllowAny]
     authentication_classes: list = []
@@ -131,17 +149,58 @@ class MarkdownImageReadView(APIView):
         if not is_valid_markdown_image_object_key(object_key):
             return Response({"error": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
 
+        if markdown_image_delivery() == "redirect":
+            return self._redirect(object_key)
+        return self._proxy(request, object_key)
+
+    def _redirect(self, object_key: str):
         try:
-            image = fetch_markdown_image(object_key)
+            url = build_markdown_image_presigned_url(object_key)
+        except MarkdownImageStorageError:
+            return Response(
+                {"error": "Failed to read image"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        response = HttpResponseRedirect(url)
+        # A cached URL is at most half way through its lifetime; expiring the
+        # redirect at a quarter keeps CDNs from serving a stale signature.
+        response["Cache-Control"] = f"public, max-age={markdown_image_presigned_ttl() // 4}"
+        return response
+
+    def _proxy(self, request, object_key: str):
+        try:
+            image = open_markdown_image(
+                object_key,
+                byte_range=request.headers.get("Range"),
+                if_none_match=request.headers.get("If-None-Match"),
+            )
         except MarkdownImageNotFoundError:
             return Response({"error": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
+        except RangeNotSatisfiableError:
+            return HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
         except MarkdownImageStorageError:
             return Response(
                 {"error": "Failed to read image"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        response = HttpResponse(image.content, content_type=image.content_type)
-        response["Content-Length"] = str(image.size)
-        response["Cache-Control"] = "public, max-age=31536000, immutable"
+        if image.status == status.HTTP_304_NOT_MODIFIED:
+            response = HttpResponseNotModified()
+        else:
+            response = build_streaming_response(
+                request,
+                image.iter_chunks(),
+                status=image.status,
+                content_type=image.content_type,
+            )
+            if image.content_length is not None:
+                response["Content-Length"] = str(image.content_length)
+            if image.content_range:
+                response["Content-Range"] = image.content_range
+            if image.last_modified is not None:
+                response["Last-Modified"] = http_date(image.last_modified.timestamp())
+        if image.etag:
+            response["ETag"] = image.etag
+        response["Accept-Ranges"] = "bytes"
+        response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
         return response
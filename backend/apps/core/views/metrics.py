@@ -0,0 +1,30 @@
+import hmac
+import logging
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+
+from apps.core.metrics import render_metrics
+
+logger = logging.getLogger(__name__)
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint guarded by ``METRICS_AUTH_TOKEN``.
+
+    Without a token it is only served with ``DEBUG`` on; production fails
+    closed because the backend port is published.
+    """
+    if not getattr(settings, "METRICS_ENABLED", True):
+        return HttpResponseNotFound()
+    expected = getattr(settings, "METRICS_AUTH_TOKEN", "").strip()
+    if not expected and not settings.DEBUG:
+        logger.warning("/metrics refused: METRICS_AUTH_TOKEN is not set")
+        return HttpResponseForbidden()
+    if expected:
+        provided = request.META.get("HTTP_AUTHORIZATION", "").removeprefix("Bearer ").strip()
+        if not provided or not hmac.compare_digest(provided, expected):
+            return HttpResponseForbidden()
+    payload, content_type = render_metrics()
+    return HttpResponse(payload, content_type=content_type)
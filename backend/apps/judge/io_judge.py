@@ -17,9 +17,21 @@ from typing import Any, Dict, Optional
 import docker
 from django.conf import settings
 
+from apps.core.metrics import (
+    JUDGE_COMPILE_DURATION,
+    JUDGE_CONTAINER_START,
+    JUDGE_RUN_DURATION,
+    JUDGE_VERDICTS,
+)
+
 from .base_judge import BaseJudge
 
 _CE_SENTINEL = "QJUDGE_CE_7f3a"
+# First stdout line after a successful compile: "<sentinel> <compile_ms>".
+_COMPILED_SENTINEL = "QJUDGE_COMPILED_7f3a"
+# Label on every sandbox container; judge workers count them to size their pool.
+SANDBOX_LABEL = "qjudge.role"
+SANDBOX_LABEL_VALUE = "sandbox"
 
 
 @dataclass(frozen=True)
@@ -130,18 +142,42 @@ class IOJudge(BaseJudge):
                 timeout=time_limit / 1000.0 + 2.0,
                 mem_limit=memory_limit,
             )
-            return self._interpret(result, expected_output, time_limit)
+            compile_ms, result["output"] = self._split_compile_marker(result["output"])
+            verdict = self._interpret(result, expected_output, time_limit)
+            self._observe_phases(result, compile_ms)
         except RuntimeError as exc:
-            return {"status": "SE", "output": "", "error": str(exc), "time": 0, "memory": 0}
+            verdict = {"status": "SE", "output": "", "error": str(exc), "time": 0, "memory": 0}
         except docker.errors.DockerException as exc:
-            return {"status": "SE", "output": "", "error": f"Docker error: {exc}", "time": 0, "memory": 0}
+            verdict = {"status": "SE", "output": "", "error": f"Docker error: {exc}", "time": 0, "memory": 0}
         except Exception as exc:
-            return {"status": "SE", "output": "", "error": f"System Error: {exc}", "time": 0, "memory": 0}
+            verdict = {"status": "SE", "output": "", "error": f"System Error: {exc}", "time": 0, "memory": 0}
+        JUDGE_VERDICTS.labels(self._language, verdict["status"]).inc()
+        return verdict
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _split_compile_marker(output: str) -> tuple[Optional[int], str]:
+        """Strip the compile timing line; returns (compile_ms or None, output)."""
+        if not output.startswith(_COMPILED_SENTINEL):
+            return None, output
+        marker, _, rest = output.partition("\n")
+        try:
+            return int(marker[len(_COMPILED_SENTINEL):].strip()), rest
+        except ValueError:
+            return None, rest
+
+    def _observe_phases(self, result: Dict[str, Any], compile_ms: Optional[int]) -> None:
+        if compile_ms is not None:
+            JUDGE_COMPILE_DURATION.labels(self._language).observe(compile_ms / 1000.0)
+        run_ms = result.get("run_ms")
+        if run_ms is not None:
+            JUDGE_RUN_DURATION.labels(self._language).observe(
+                max(0, run_ms - (compile_ms or 0)) / 1000.0
+            )
+
     @staticmethod
     def _heredoc(target_file: str, content: str, prefix: str) -> str:
         delimiter = f"{prefix}_{uuid.uuid4().hex}"
@@ -164,13 +200,15 @@ class IOJudge(BaseJudge):
         if spec.compile_cmd:
             compile_cmd = spec.compile_cmd
             parts.append(
+                f"COMPILE_START=$(date +%s%N)\n"
                 f"{compile_cmd} > /tmp/compile_out.txt 2>&1\n"
                 f"COMPILE_EXIT=$?\n"
                 f"if [ $COMPILE_EXIT -ne 0 ]; then\n"
                 f"    echo '{_CE_SENTINEL}'\n"
                 f"    cat /tmp/compile_out.txt\n"
                 f"    exit $COMPILE_EXIT\n"
-                f"fi"
+                f"fi\n"
+                f"echo \"{_COMPILED_SENTINEL} $(( ($(date +%s%N) - COMPILE_START) / 1000000 ))\""
             )
 
         parts.append(self._heredoc("input.txt", input_data, "INPUT"))
@@ -220,6 +258,7 @@ class IOJudge(BaseJudge):
                 "image": self.image,
                 "command": ["/bin/bash", "-c", command],
                 "working_dir": "/tmp",
+                "labels": {SANDBOX_LABEL: SANDBOX_LABEL_VALUE},
                 "network_disabled": True,
                 "mem_limit": f"{mem_limit}m",
                 "memswap_limit": f"{mem_limit}m",
@@ -240,13 +279,17 @@ class IOJudge(BaseJudge):
                 run_kwargs["platform"] = self.platform
 
             container = self._client.containers.run(**run_kwargs)
+            started = _time.time()
+            JUDGE_CONTAINER_START.labels(self._language).observe(started - start)
             result = container.wait(timeout=int(timeout) + 5)
-            elapsed_ms = int((_time.time() - start) * 1000)
+            finished = _time.time()
+            elapsed_ms = int((finished - start) * 1000)
             output = container.logs().decode("utf-8", errors="ignore")
             return {
                 "exit_code": result["StatusCode"],
                 "output": output,
                 "time": elapsed_ms,
+                "run_ms": int((finished - started) * 1000),
                 "memory": 4096,
             }
         except docker.errors.APIError as exc:
@@ -15,7 +15,9 @@ from unittest.mock import patch
 import docker.errors
 from django.test import TestCase
 
-from apps.judge.io_judge import IOJudge, _CE_SENTINEL
+from prometheus_client import REGISTRY
+
+from apps.judge.io_judge import IOJudge, _CE_SENTINEL, _COMPILED_SENTINEL
 
 
 # ---------------------------------------------------------------------------
@@ -326,6 +328,31 @@ class IOJudgeMockTests(TestCase):
         self.assertIn("-Xmx256m", captured["cmd"])
         self.assertIn("javac", captured["cmd"])
 
+    def test_compile_marker_is_stripped_and_phases_recorded(self):
+        """編譯計時行不影響判定，並記錄 compile/run 時間與 verdict"""
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, labels) or 0
+
+        judge = self._mock_judge("cpp")
+        judge._run_in_container = lambda command, timeout, mem_limit: {
+            "exit_code": 0,
+            "output": f"{_COMPILED_SENTINEL} 300\n42\n",
+            "time": 900,
+            "run_ms": 800,
+            "memory": 4096,
+        }
+        compile_sum = sample("qjudge_judge_compile_seconds_sum", language="cpp")
+        run_sum = sample("qjudge_judge_run_seconds_sum", language="cpp")
+        accepted = sample("qjudge_judge_verdicts_total", language="cpp", verdict="AC")
+
+        r = judge.execute("", "", "42", 1000, 128)
+
+        self.assertEqual(r["status"], "AC")
+        self.assertEqual(r["output"], "42")
+        self.assertAlmostEqual(sample("qjudge_judge_compile_seconds_sum", language="cpp") - compile_sum, 0.3)
+        self.assertAlmostEqual(sample("qjudge_judge_run_seconds_sum", language="cpp") - run_sum, 0.5)
+        self.assertEqual(sample("qjudge_judge_verdicts_total", language="cpp", verdict="AC"), accepted + 1)
+
     @patch.object(IOJudge, "_ensure_docker_client")
     def test_patch_io_judge_works(self, mock_ensure):
         """可以正常 patch IOJudge 的方法"""
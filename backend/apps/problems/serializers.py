@@ -109,6 +109,12 @@ class TestRunSerializer(serializers.Serializer):
         allow_null=True,
         help_text='Optional contest context for participant access enforcement',
     )
+    mode = serializers.ChoiceField(
+        choices=['sync', 'async'],
+        required=False,
+        default='sync',
+        help_text='async queues the run on the judge workers and returns a job id to poll',
+    )
 
 
 class ProblemListSerializer(serializers.ModelSerializer):
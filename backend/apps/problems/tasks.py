@@ -0,0 +1,35 @@
+"""Celery tasks for problems app."""
+import logging
+
+from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+
+from .test_run_service import ProblemTestRunJobService
+
+logger = logging.getLogger(__name__)
+
+# Generous enough for a many-case Java run; a stuck sandbox must still
+# eventually mark the job failed so pollers stop waiting.
+_SOFT_TIME_LIMIT = 5 * 60
+_HARD_TIME_LIMIT = _SOFT_TIME_LIMIT + 30
+
+
+@shared_task(
+    ignore_result=True,
+    soft_time_limit=_SOFT_TIME_LIMIT,
+    time_limit=_HARD_TIME_LIMIT,
+)
+def run_problem_test_run(job_id, problem_id, language, source_code):
+    """Execute a queued test run and publish per-case progress."""
+    try:
+        ProblemTestRunJobService.execute(
+            job_id=job_id,
+            problem_id=problem_id,
+            language=language,
+            source_code=source_code,
+        )
+    except SoftTimeLimitExceeded:
+        ProblemTestRunJobService.fail(job_id, "Test run exceeded time limit")
+    except Exception:
+        logger.exception("Error executing test run job_id=%s", job_id)
+        ProblemTestRunJobService.fail(job_id, "Judge system error")
@@ -599,6 +599,75 @@ class ProblemTestRunTests(TestCase):
         self.assertEqual(response.data['results'][0]['status'], 'CE')
         self.assertEqual(mock_judge.execute.call_count, 1)
 
+    def test_test_run_async_mode_returns_job_and_poll_reports_cases(self):
+        """mode=async queues the run; polling returns per-case progress and the result."""
+        ProblemTestCase.objects.create(
+            problem=self.problem,
+            input_data='2 3',
+            output_data='5',
+            is_sample=False,
+            score=0,
+            order=2,
+        )
+
+        with patch('apps.judge.judge_factory.get_judge') as mock_get_judge:
+            mock_judge = MagicMock()
+            mock_judge.execute.return_value = {
+                'status': 'AC',
+                'time': 5,
+                'memory': 256,
+                'output': '3',
+                'error': '',
+            }
+            mock_get_judge.return_value = mock_judge
+
+            response = self.client.post(
+                f'/api/v1/management/problems/{self.problem.id}/test_run/',
+                {'language': 'python', 'code': 'x', 'mode': 'async'},
+                format='json',
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_id = response.data['job_id']
+
+        poll = self.client.get(
+            f'/api/v1/management/problems/{self.problem.id}/test_run/{job_id}/',
+            {'after': 1},
+        )
+
+        self.assertEqual(poll.status_code, status.HTTP_200_OK)
+        self.assertEqual(poll.data['status'], 'completed')
+        self.assertEqual(poll.data['total_cases'], 2)
+        self.assertEqual(poll.data['completed_cases'], 2)
+        self.assertEqual(len(poll.data['results']), 1)
+        self.assertEqual(poll.data['result']['status'], 'AC')
+        self.assertEqual(len(poll.data['result']['results']), 2)
+        self.assertEqual(Submission.objects.count(), 0)
+
+    def test_test_run_job_is_private_to_submitter(self):
+        with patch('apps.judge.judge_factory.get_judge') as mock_get_judge:
+            mock_judge = MagicMock()
+            mock_judge.execute.return_value = {
+                'status': 'AC', 'time': 1, 'memory': 1, 'output': '3', 'error': '',
+            }
+            mock_get_judge.return_value = mock_judge
+            response = self.client.post(
+                f'/api/v1/management/problems/{self.problem.id}/test_run/',
+                {'language': 'python', 'code': 'x', 'mode': 'async'},
+                format='json',
+            )
+
+        other = get_user_model().objects.create_user(
+            username='other-runner', email='other-runner@example.com',
+            password='password', role='teacher',
+        )
+        self.client.force_authenticate(user=other)
+        poll = self.client.get(
+            f"/api/v1/management/problems/{self.problem.id}/test_run/{response.data['job_id']}/"
+        )
+
+        self.assertEqual(poll.status_code, status.HTTP_404_NOT_FOUND)
+
 
 class ProblemTestRunContestAccessTests(TestCase):
     """Access policy mirrors Submission: any authenticated user may test_run,
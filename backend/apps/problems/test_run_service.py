@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
+import uuid
+from typing import Callable
+
+from django.core.cache import cache
+
 from apps.judge import judge_factory
 from apps.problems.models import CodingProblem, TestCase
 
 HARD_FAILURE_STATUSES = {"CE", "SE"}
 
+# Async test runs share the practice judge queue so they never compete with
+# contest submissions on ``high_priority``.
+TEST_RUN_QUEUE = "default"
+TEST_RUN_JOB_TTL_SECONDS = 60 * 60
+TEST_RUN_TERMINAL_STATUSES = {"completed", "failed"}
+
 
 class TestRunSetupError(Exception):
     """Raised when the test-run environment cannot be prepared."""
@@ -45,6 +56,8 @@ class ProblemTestRunService:
         problem: CodingProblem,
         language: str,
         source_code: str,
+        test_cases: list[TestCase] | None = None,
+        on_case_result: Callable[[dict], None] | None = None,
     ) -> dict:
         try:
             judge = judge_factory.get_judge(language)
@@ -58,7 +71,10 @@ class ProblemTestRunService:
         max_memory_usage = 0
         final_status = "AC"
 
-        for tc in cls._build_test_cases(problem):
+        if test_cases is None:
+            test_cases = cls._build_test_cases(problem)
+
+        for tc in test_cases:
             try:
                 exec_result = judge.execute(
                     code=source_code,
@@ -78,6 +94,10 @@ class ProblemTestRunService:
 
             case_result = cls._build_case_result(tc, exec_result)
             results.append(case_result)
+            if on_case_result is not None:
+                on_case_result(
+                    {key: value for key, value in case_result.items() if key != "raw_status"}
+                )
 
             max_exec_time = max(max_exec_time, case_result["exec_time"])
             max_memory_usage = max(max_memory_usage, case_result["memory_usage"])
@@ -99,3 +119,129 @@ class ProblemTestRunService:
             "memory_usage": max_memory_usage,
             "results": results,
         }
+
+
+class ProblemTestRunJobService:
+    """Queue test runs on the judge workers and track per-case progress.
+
+    Job state lives in the cache (not the DB): test runs are ephemeral and
+    polled for a few seconds to minutes, then discarded.
+    """
+
+    @staticmethod
+    def _cache_key(job_id: str) -> str:
+        return f"problem_test_run:v1:{job_id}"
+
+    @classmethod
+    def get(cls, job_id: str) -> dict | None:
+        return cache.get(cls._cache_key(job_id))
+
+    @classmethod
+    def _save(cls, job: dict) -> None:
+        cache.set(cls._cache_key(job["job_id"]), job, timeout=TEST_RUN_JOB_TTL_SECONDS)
+
+    @classmethod
+    def submit(
+        cls,
+        *,
+        problem: CodingProblem,
+        user_id: int,
+        language: str,
+        source_code: str,
+    ) -> dict:
+        from apps.problems.tasks import run_problem_test_run
+
+        # Validate the language up front so callers get a synchronous 400.
+        try:
+            judge_factory.get_judge(language)
+        except ValueError as exc:
+            raise TestRunSetupError(str(exc)) from exc
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "problem_id": str(problem.id),
+            "user_id": user_id,
+            "status": "queued",
+            "total_cases": problem.test_cases.count(),
+            "results": [],
+            "result": None,
+            "error": "",
+        }
+        cls._save(job)
+        run_problem_test_run.apply_async(
+            args=[job["job_id"], str(problem.id), language, source_code],
+            queue=TEST_RUN_QUEUE,
+        )
+        return cls.get(job["job_id"]) or job
+
+    @classmethod
+    def execute(
+        cls,
+        *,
+        job_id: str,
+        problem_id: str,
+        language: str,
+        source_code: str,
+    ) -> None:
+        job = cls.get(job_id)
+        if job is None:
+            return
+        problem = CodingProblem.objects.filter(id=problem_id).first()
+        if problem is None:
+            cls._fail(job, "Problem not found")
+            return
+
+        test_cases = ProblemTestRunService._build_test_cases(problem)
+        job["status"] = "running"
+        job["total_cases"] = len(test_cases)
+        cls._save(job)
+
+        def _record_case(case_result: dict) -> None:
+            job["results"].append(case_result)
+            cls._save(job)
+
+        try:
+            result = ProblemTestRunService.run(
+                problem=problem,
+                language=language,
+                source_code=source_code,
+                test_cases=test_cases,
+                on_case_result=_record_case,
+            )
+        except TestRunSetupError as exc:
+            cls._fail(job, str(exc))
+            return
+
+        job["status"] = "completed"
+        job["result"] = result
+        cls._save(job)
+
+    @classmethod
+    def fail(cls, job_id: str, error: str) -> None:
+        job = cls.get(job_id)
+        if job is not None and job["status"] not in TEST_RUN_TERMINAL_STATUSES:
+            cls._fail(job, error)
+
+    @classmethod
+    def _fail(cls, job: dict, error: str) -> None:
+        job["status"] = "failed"
+        job["error"] = error
+        cls._save(job)
+
+    @staticmethod
+    def serialize(job: dict, *, after: int = 0) -> dict:
+        """Public view of a job; ``after`` skips case results already seen."""
+        results = job.get("results") or []
+        payload = {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "total_cases": job.get("total_cases", 0),
+            "completed_cases": len(results),
+            "results": results[after:],
+            "next_after": len(results),
+        }
+        if job["status"] == "completed":
+            payload["result"] = job.get("result")
+        if job["status"] == "failed":
+            payload["error"] = job.get("error") or "Test run failed"
+        return payload
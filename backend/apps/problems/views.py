@@ -23,7 +23,11 @@ from .serializers import (
     TagSerializer,
     TestRunSerializer,
 )
-from .test_run_service import ProblemTestRunService, TestRunSetupError
+from .test_run_service import (
+    ProblemTestRunJobService,
+    ProblemTestRunService,
+    TestRunSetupError,
+)
 from apps.contests.services.question_edit_lock import ensure_contest_question_editable
 
 logger = logging.getLogger(__name__)
@@ -243,7 +247,9 @@ class ProblemViewSet(viewsets.ModelViewSet):
     def test_run(self, request, id=None):
         """
         Execute code against all stored test cases without creating a submission.
-        Returns execution results immediately.
+        Returns execution results immediately, or with ``mode=async`` queues the
+        run on the judge workers and returns 202 with a job id to poll via
+        ``test_run/<job_id>/``.
 
         Access mirrors Submission: any authenticated user may invoke test_run as
         long as they hold the problem id. If a `contest_id` is supplied, the
@@ -279,6 +285,17 @@ class ProblemViewSet(viewsets.ModelViewSet):
                 raise PermissionDenied(exc.message) from exc
 
         try:
+            if serializer.validated_data["mode"] == "async":
+                job = ProblemTestRunJobService.submit(
+                    problem=problem,
+                    user_id=request.user.id,
+                    language=serializer.validated_data["language"],
+                    source_code=serializer.validated_data["code"],
+                )
+                return Response(
+                    ProblemTestRunJobService.serialize(job),
+                    status=status.HTTP_202_ACCEPTED,
+                )
             result = ProblemTestRunService.run(
                 problem=problem,
                 language=serializer.validated_data["language"],
@@ -295,6 +312,37 @@ class ProblemViewSet(viewsets.ModelViewSet):
             return Response({"error": error_text}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(result)
+
+    @action(
+        detail=True,
+        methods=['get'],
+        permission_classes=[permissions.IsAuthenticated],
+        url_path=r'test_run/(?P<job_id>[0-9a-f]{32})',
+    )
+    def test_run_status(self, request, id=None, job_id=None):
+        """
+        Poll an async test run started with ``mode=async``.
+
+        ``?after=N`` returns only case results past the first N, so clients
+        can stream per-case progress; ``result`` is set once completed.
+        Jobs are visible only to the user who submitted them.
+        """
+        from django.http import Http404
+
+        job = ProblemTestRunJobService.get(job_id)
+        if (
+            job is None
+            or job.get("user_id") != request.user.id
+            or job.get("problem_id") != str(id)
+        ):
+            raise Http404("Test run not found.")
+
+        try:
+            after = max(0, int(request.query_params.get("after", 0)))
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({"after": "Must be a non-negative integer."})
+
+        return Response(ProblemTestRunJobService.serialize(job, after=after))
     
     @action(detail=True, methods=['get'])
     def statistics(self, request, id=None):
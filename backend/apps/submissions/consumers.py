@@ -0,0 +1,60 @@
+"""WebSocket consumer pushing judge progress and verdicts."""
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .events import contest_group, user_group
+
+
+class SubmissionEventsConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Stream ``submission.progress`` / ``submission.verdict`` events.
+
+    - ``ws/submissions/``: the authenticated user's own submissions.
+    - ``ws/contests/<contest_id>/submissions/``: verdicts (no per-case progress)
+      of every submission of a contest, for users allowed to view all of its
+      submissions (contest staff).
+
+    Clients send ``{"type": "ping"}`` as a keepalive and get ``pong`` back.
+    """
+
+    group_name = None
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close()
+            return
+
+        contest_id = self.scope["url_route"]["kwargs"].get("contest_id")
+        if contest_id is not None:
+            if not await self._can_view_contest_submissions(user, contest_id):
+                await self.close()
+                return
+            self.group_name = contest_group(contest_id)
+        else:
+            self.group_name = user_group(user.id)
+
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        if isinstance(content, dict) and content.get("type") == "ping":
+            await self.send_json({"type": "pong"})
+
+    async def submission_event(self, event):
+        await self.send_json(event["payload"])
+
+    @database_sync_to_async
+    def _can_view_contest_submissions(self, user, contest_id) -> bool:
+        from apps.contests.models import Contest
+        from apps.contests.permissions import get_contest_permissions
+
+        contest = Contest.objects.filter(id=contest_id).first()
+        if contest is None:
+            return False
+        return bool(get_contest_permissions(user, contest).get("can_view_all_submissions"))
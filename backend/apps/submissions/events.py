@@ -0,0 +1,91 @@
+"""
+Judge progress and verdict push over the Channels layer.
+
+``judge_submission`` publishes per-test-case progress to the submitter's group
+(``submissions.user.{user_id}``) only. Verdicts also go to the contest's group
+(``submissions.contest.{contest_id}``) that contest staff subscribe to via
+``SubmissionEventsConsumer``, so a contest-end burst does not fan every test
+case out to every staff socket. Events carry no code, input or output; clients
+fetch the submission detail once the verdict arrives.
+
+Publishing is best effort: a channel layer outage must never fail judging, and
+clients keep a slow polling fallback.
+"""
+from __future__ import annotations
+
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.exceptions import ChannelFull
+from channels.layers import get_channel_layer
+from django.conf import settings
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+EVENT_MESSAGE_TYPE = "submission.event"
+
+
+def user_group(user_id) -> str:
+    return f"submissions.user.{user_id}"
+
+
+def contest_group(contest_id) -> str:
+    return f"submissions.contest.{contest_id}"
+
+
+def push_enabled() -> bool:
+    return bool(getattr(settings, "SUBMISSION_PUSH_ENABLED", True))
+
+
+def _publish(submission, payload: dict, *, to_contest: bool) -> None:
+    if not push_enabled():
+        return
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    groups = [user_group(submission.user_id)]
+    if to_contest and submission.contest_id:
+        groups.append(contest_group(submission.contest_id))
+    message = {"type": EVENT_MESSAGE_TYPE, "payload": payload}
+    try:
+        for group in groups:
+            async_to_sync(layer.group_send)(group, message)
+    except (RedisError, ChannelFull, OSError):
+        logger.warning("Failed to push %s for submission_id=%s", payload["type"], submission.id, exc_info=True)
+
+
+def _base_payload(submission, event_type: str) -> dict:
+    return {
+        "type": event_type,
+        "submission_id": submission.id,
+        "user_id": submission.user_id,
+        "problem_id": str(submission.problem_id) if submission.problem_id else None,
+        "contest_id": str(submission.contest_id) if submission.contest_id else None,
+    }
+
+
+def publish_progress(submission, *, case_number: int, total_cases: int, status: str,
+                     exec_time: int, memory_usage: int) -> None:
+    """One test case finished (``case_number`` is 1-based); submitter only."""
+    payload = _base_payload(submission, "submission.progress")
+    payload.update({
+        "case": case_number,
+        "total": total_cases,
+        "case_status": status,
+        "exec_time": exec_time,
+        "memory_usage": memory_usage,
+    })
+    _publish(submission, payload, to_contest=False)
+
+
+def publish_verdict(submission) -> None:
+    """Final verdict, sent after the submission row is saved."""
+    payload = _base_payload(submission, "submission.verdict")
+    payload.update({
+        "status": submission.status,
+        "score": submission.score,
+        "exec_time": submission.exec_time,
+        "memory_usage": submission.memory_usage,
+    })
+    _publish(submission, payload, to_contest=True)
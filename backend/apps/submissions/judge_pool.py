@@ -0,0 +1,327 @@
+"""
+Judge worker pool: adaptive concurrency and queue-wait telemetry.
+
+Judge workers run with ``--autoscale=MAX,MIN`` and ``CELERY_WORKER_AUTOSCALER``
+pointing at :class:`JudgeAutoscaler`. On every probe the autoscaler caps the
+pool at what the Docker host can take (host cores x
+``JUDGE_WORKER_SLOTS_PER_CORE``, minus sandboxes started by other workers on
+the same host) and publishes a heartbeat to Redis.
+
+Heartbeats are the pool membership: a worker started on a new host with the
+same ``REDIS_URL`` is counted as soon as it reports and drops out once its
+heartbeat expires, so adding a judge host needs no config edit.
+
+``publish_queue_stats`` (celery beat) folds heartbeats, the broker backlog and
+the fair-scheduler backlog into per-queue depth and estimated wait, which the
+submission serializers expose as ``estimated_judge_wait``. It also publishes
+each lane's worker slots as the fair scheduler's capacity, so scaling the
+workers out (or raising ``--autoscale``) needs no scheduler config change.
+
+Keys (through the Django cache prefix, ``p`` = ``judge_pool:v1``):
+
+- ``p:workers`` sorted set, hostname -> last heartbeat;
+- ``p:worker:{hostname}`` heartbeat JSON;
+- ``p:queue:{queue}`` queue stats JSON;
+- ``p:avg:{queue}`` moving average of judge task seconds.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+
+import docker
+from celery import current_app
+from celery.worker.autoscale import Autoscaler
+from django.conf import settings
+from django.core.cache import cache
+from kombu.exceptions import ChannelError, OperationalError
+from redis.exceptions import RedisError
+
+from apps.core.cache import redis_client
+from apps.judge.io_judge import SANDBOX_LABEL, SANDBOX_LABEL_VALUE
+from apps.submissions import judge_scheduler
+
+logger = logging.getLogger(__name__)
+
+QUEUE_STATS_TTL_SECONDS = 60
+AVG_TTL_SECONDS = 24 * 60 * 60
+# Weight of the newest sample in the judge duration moving average.
+AVG_ALPHA = 0.2
+
+# KEYS[1] = average key; ARGV = sample seconds, alpha, ttl.
+_EWMA_SCRIPT = """
+local cur = tonumber(redis.call('GET', KEYS[1]) or '')
+local x = tonumber(ARGV[1])
+if cur then
+    x = cur + tonumber(ARGV[2]) * (x - cur)
+end
+redis.call('SET', KEYS[1], tostring(x), 'EX', tonumber(ARGV[3]))
+return tostring(x)
+"""
+
+
+def _redis():
+    return redis_client()
+
+
+def _key(suffix: str) -> str:
+    return cache.make_key(f"judge_pool:v1:{suffix}")
+
+
+def probe_interval() -> float:
+    return float(getattr(settings, "JUDGE_POOL_PROBE_SECONDS", 5))
+
+
+def heartbeat_ttl() -> int:
+    return max(1, int(probe_interval() * 3))
+
+
+def slot_budget(
+    *,
+    host_cores: int,
+    running_sandboxes: int,
+    own_active: int,
+    ceiling: int,
+    floor: int = 1,
+) -> int:
+    """
+    Pool size this worker may run: its share of the host's sandbox slots.
+
+    Sandboxes of other workers on the same Docker host (``running_sandboxes``
+    minus our own ``own_active``) are taken off the host budget; the result
+    is clamped to the worker's ``--autoscale`` range.
+    """
+    per_core = float(getattr(settings, "JUDGE_WORKER_SLOTS_PER_CORE", 1.0))
+    foreign = max(0, running_sandboxes - own_active)
+    budget = int(host_cores * per_core) - foreign
+    return max(floor, min(ceiling, budget))
+
+
+# ──────────────────────────────────────────────────────────────────
+# Worker side
+# ──────────────────────────────────────────────────────────────────
+
+
+def publish_heartbeat(
+    hostname: str,
+    *,
+    queues: list[str],
+    concurrency: int,
+    busy: int,
+    host_cores: int,
+    sandboxes: int,
+) -> None:
+    now = time.time()
+    payload = {
+        "hostname": hostname,
+        "queues": queues,
+        "concurrency": concurrency,
+        "busy": busy,
+        "host_cores": host_cores,
+        "sandboxes": sandboxes,
+        "updated_at": now,
+    }
+    pipe = _redis().pipeline()
+    pipe.set(_key(f"worker:{hostname}"), json.dumps(payload), ex=heartbeat_ttl())
+    pipe.zadd(_key("workers"), {hostname: now})
+    pipe.expire(_key("workers"), AVG_TTL_SECONDS)
+    pipe.execute()
+
+
+def record_judge_duration(queue: str, seconds: float) -> None:
+    _redis().eval(
+        _EWMA_SCRIPT,
+        1,
+        _key(f"avg:{queue or 'default'}"),
+        f"{max(0.0, seconds):.3f}",
+        AVG_ALPHA,
+        AVG_TTL_SECONDS,
+    )
+
+
+class JudgeAutoscaler(Autoscaler):
+    """
+    Celery autoscaler whose ceiling follows the Docker host's free sandbox
+    slots instead of staying at the ``--autoscale`` maximum.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ceiling = self.max_concurrency
+        self.host_cores = os.cpu_count() or 1
+        self.sandboxes = 0
+        self._next_probe = 0.0
+        self._docker = None
+
+    def _maybe_scale(self, req=None):
+        now = time.monotonic()
+        if now >= self._next_probe:
+            self._next_probe = now + probe_interval()
+            self.probe()
+        return super()._maybe_scale(req)
+
+    def probe(self) -> None:
+        self.host_cores, self.sandboxes = self._probe_docker()
+        target = slot_budget(
+            host_cores=self.host_cores,
+            running_sandboxes=self.sandboxes,
+            own_active=self.qty,
+            ceiling=self.ceiling,
+            floor=max(1, self.min_concurrency),
+        )
+        if target != self.max_concurrency:
+            self._resize(target)
+        if self.worker is None:
+            return
+        try:
+            publish_heartbeat(
+                self.worker.hostname,
+                queues=self._queues(),
+                concurrency=self.max_concurrency,
+                busy=self.qty,
+                host_cores=self.host_cores,
+                sandboxes=self.sandboxes,
+            )
+        except RedisError:
+            logger.warning("Failed to publish judge worker heartbeat", exc_info=True)
+
+    def _resize(self, target: int) -> None:
+        # Called with self.mutex held; Autoscaler.update() would take it again.
+        logger.info("Judge pool ceiling %s -> %s (host cores=%s, sandboxes=%s)",
+                    self.max_concurrency, target, self.host_cores, self.sandboxes)
+        if target < self.processes:
+            self._shrink(self.processes - target)
+        if self.worker is not None:
+            self._update_consumer_prefetch_count(target)
+        self.max_concurrency = target
+
+    def _probe_docker(self) -> tuple[int, int]:
+        """(host cores, running sandbox containers) of the Docker host."""
+        try:
+            if self._docker is None:
+                self._docker = docker.DockerClient(timeout=5)
+            cores = int(self._docker.info().get("NCPU") or 0)
+            running = self._docker.containers.list(
+                filters={"label": f"{SANDBOX_LABEL}={SANDBOX_LABEL_VALUE}", "status": "running"},
+            )
+            return cores or self.host_cores, len(running)
+        except (docker.errors.DockerException, OSError):
+            logger.warning("Docker host probe failed; keeping judge pool at %s", self.max_concurrency,
+                           exc_info=True)
+            self._docker = None
+            return self.host_cores, self.sandboxes
+
+    def _queues(self) -> list[str]:
+        queues = self.worker.app.amqp.queues
+        return sorted((queues.consume_from or queues).keys())
+
+
+# ──────────────────────────────────────────────────────────────────
+# Queue telemetry
+# ──────────────────────────────────────────────────────────────────
+
+
+def live_workers() -> list[dict]:
+    client = _redis()
+    client.zremrangebyscore(_key("workers"), "-inf", time.time() - heartbeat_ttl())
+    hostnames = [h.decode() if isinstance(h, bytes) else h for h in client.zrange(_key("workers"), 0, -1)]
+    if not hostnames:
+        return []
+    payloads = client.mget([_key(f"worker:{hostname}") for hostname in hostnames])
+    return [json.loads(payload) for payload in payloads if payload]
+
+
+def broker_backlog(queues) -> dict[str, int]:
+    """Messages waiting in the Celery broker per queue (0 when unknown)."""
+    backlog = {queue: 0 for queue in queues}
+    try:
+        with current_app.connection_for_read() as conn:
+            channel = conn.default_channel
+            for queue in queues:
+                try:
+                    backlog[queue] = channel.queue_declare(queue=queue, passive=True).message_count
+                except ChannelError:
+                    pass
+    except (OperationalError, OSError):
+        logger.warning("Celery broker unavailable for queue depth", exc_info=True)
+    return backlog
+
+
+def average_judge_seconds(queue: str) -> float:
+    value = _redis().get(_key(f"avg:{queue}"))
+    if value is None:
+        return float(getattr(settings, "JUDGE_WAIT_DEFAULT_SECONDS", 3.0))
+    return float(value)
+
+
+def _lane_share(worker: dict) -> float:
+    """Slots a worker gives each judge lane it consumes (shared workers split evenly)."""
+    lanes = [queue for queue in worker["queues"] if queue in judge_scheduler.LANES]
+    return worker["concurrency"] / max(1, len(lanes))
+
+
+def publish_queue_stats() -> dict[str, dict]:
+    """
+    Compute depth and estimated wait per judge queue and store them in Redis.
+
+    Also hands the scheduler each lane's live capacity: every slot of every
+    worker consuming the lane, so the broker holds enough jobs for the
+    autoscalers to grow to their ``--autoscale`` maximum.
+    """
+    now = time.time()
+    workers = live_workers()
+    backlog = broker_backlog(judge_scheduler.LANES)
+    scheduled = judge_scheduler.scheduler_enabled()
+    stats = {}
+    for queue in judge_scheduler.LANES:
+        serving = [worker for worker in workers if queue in worker["queues"]]
+        slots = sum(_lane_share(worker) for worker in serving)
+        depth = backlog[queue]
+        capacity = None
+        if scheduled:
+            judge_scheduler.set_live_capacity(
+                queue, sum(worker["concurrency"] for worker in serving), QUEUE_STATS_TTL_SECONDS,
+            )
+            capacity = judge_scheduler.lane_capacity(queue)
+            # The scheduler never lets more than ``capacity`` run at once.
+            slots = min(slots, capacity)
+            depth += judge_scheduler.queue_depth(queue)
+        avg = average_judge_seconds(queue)
+        stats[queue] = {
+            "depth": depth,
+            "workers": len(serving),
+            "slots": round(slots, 2),
+            "capacity": capacity,
+            "busy": sum(worker["busy"] for worker in serving),
+            "avg_judge_seconds": round(avg, 2),
+            # Backlog drains ``slots`` jobs at a time; None while no worker serves the queue.
+            "estimated_wait_seconds": round(depth / slots * avg, 1) if slots else None,
+            "updated_at": now,
+        }
+    pipe = _redis().pipeline()
+    for queue, payload in stats.items():
+        pipe.set(_key(f"queue:{queue}"), json.dumps(payload), ex=QUEUE_STATS_TTL_SECONDS)
+    pipe.execute()
+    return stats
+
+
+def queue_stats() -> dict[str, dict]:
+    """Last published stats per queue; queues without fresh stats are omitted."""
+    payloads = _redis().mget([_key(f"queue:{queue}") for queue in judge_scheduler.LANES])
+    return {
+        queue: json.loads(payload)
+        for queue, payload in zip(judge_scheduler.LANES, payloads)
+        if payload
+    }
+
+
+def estimated_judge_wait(submission, stats: dict[str, dict]) -> float | None:
+    """Seconds until ``submission`` is likely judged, or None if unknown / done."""
+    if submission.status != "pending":
+        return None
+    queue = stats.get(judge_scheduler.lane_for(submission.source_type))
+    if not queue or queue["estimated_wait_seconds"] is None:
+        return None
+    return round(queue["estimated_wait_seconds"] + queue["avg_judge_seconds"], 1)
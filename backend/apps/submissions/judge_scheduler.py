@@ -0,0 +1,252 @@
+"""
+Fair-share scheduler in front of the judge workers.
+
+Submissions are not pushed straight into the Celery queues. ``enqueue`` parks
+them in a Redis fair queue per lane (the Celery queue: ``high_priority`` for
+contests, ``default`` for practice) and ``dispatch`` releases at most
+``lane_capacity(lane)`` of them into Celery at a time (the lane's live worker
+slots from ``judge_pool`` heartbeats, else ``JUDGE_SCHEDULER_CAPACITY``). Every
+finished judge task calls ``release``, which frees its slot and dispatches the
+next job, so a burst waits in Redis where the order can still be chosen.
+
+Ordering is two-level start-time fair queuing (SFQ): the lane picks the
+group (contest, or ``practice``) with the smallest start tag, then the user
+with the smallest start tag inside that group. Tags advance by the job's
+estimated cost (test cases x time limit), so one contest's burst cannot
+starve another contest, one user's resubmits cannot starve classmates, and
+a 60-case Java submission is charged like 60 tiny ones.
+
+Layout (keys go through the Django cache prefix, ``p`` = ``judge_sched:v1:{lane}``):
+
+- ``p:groups`` sorted set, group -> start tag; ``p:vt`` lane virtual time;
+- ``p:gfin`` / ``p:gvt`` hashes, group -> last finish tag / group virtual time;
+- ``p:users:{group}`` sorted set, user -> start tag; ``p:ufin:{group}`` hash,
+  user -> last finish tag;
+- ``p:jobs:{group}:{user}`` list of ``"{submission_id}:{cost}"``;
+- ``p:pending`` hash of queued submission ids (idempotent enqueue);
+- ``p:inflight`` sorted set, submission id -> lease deadline. Leases of
+  tasks that died without ``release`` expire after
+  ``JUDGE_SCHEDULER_LEASE_SECONDS``.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.core.cache import redis_client
+
+logger = logging.getLogger(__name__)
+
+LANES = ("high_priority", "default")
+PRACTICE_GROUP = "practice"
+STATE_TTL_SECONDS = 24 * 60 * 60
+
+# KEYS[1] = lane prefix; ARGV = submission id, group, user, cost, ttl.
+_ENQUEUE_SCRIPT = """
+local p = KEYS[1]
+local sid, g, u, ttl = ARGV[1], ARGV[2], ARGV[3], tonumber(ARGV[5])
+if redis.call('HEXISTS', p .. ':pending', sid) == 1 then
+    return 0
+end
+redis.call('HSET', p .. ':pending', sid, g .. '|' .. u)
+local jobs = p .. ':jobs:' .. g .. ':' .. u
+redis.call('RPUSH', jobs, sid .. ':' .. ARGV[4])
+redis.call('EXPIRE', jobs, ttl)
+local users = p .. ':users:' .. g
+if not redis.call('ZSCORE', users, u) then
+    local vg = tonumber(redis.call('HGET', p .. ':gvt', g) or '0')
+    local fu = tonumber(redis.call('HGET', p .. ':ufin:' .. g, u) or '0')
+    redis.call('ZADD', users, math.max(vg, fu), u)
+end
+redis.call('EXPIRE', users, ttl)
+if not redis.call('ZSCORE', p .. ':groups', g) then
+    local v = tonumber(redis.call('GET', p .. ':vt') or '0')
+    local fg = tonumber(redis.call('HGET', p .. ':gfin', g) or '0')
+    redis.call('ZADD', p .. ':groups', math.max(v, fg), g)
+end
+for _, suffix in ipairs({':groups', ':gfin', ':gvt', ':pending', ':vt', ':ufin:' .. g}) do
+    redis.call('EXPIRE', p .. suffix, ttl)
+end
+return 1
+"""
+
+# KEYS[1] = lane prefix; ARGV = capacity, now, lease seconds.
+# Returns the submission ids to hand to Celery, in fair order.
+_DISPATCH_SCRIPT = """
+local p = KEYS[1]
+local now = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', p .. ':inflight', '-inf', now)
+local free = tonumber(ARGV[1]) - redis.call('ZCARD', p .. ':inflight')
+local out = {}
+while free > 0 do
+    local head = redis.call('ZRANGE', p .. ':groups', 0, 0, 'WITHSCORES')
+    if #head == 0 then
+        break
+    end
+    local g, sg = head[1], tonumber(head[2])
+    local users = p .. ':users:' .. g
+    local uhead = redis.call('ZRANGE', users, 0, 0, 'WITHSCORES')
+    if #uhead == 0 then
+        redis.call('ZREM', p .. ':groups', g)
+    else
+        local u, su = uhead[1], tonumber(uhead[2])
+        local jobs = p .. ':jobs:' .. g .. ':' .. u
+        local job = redis.call('LPOP', jobs)
+        if not job then
+            redis.call('ZREM', users, u)
+        else
+            local sep = string.find(job, ':', 1, true)
+            local sid = string.sub(job, 1, sep - 1)
+            local cost = tonumber(string.sub(job, sep + 1))
+            redis.call('SET', p .. ':vt', sg)
+            redis.call('HSET', p .. ':gvt', g, su)
+            redis.call('HSET', p .. ':ufin:' .. g, u, su + cost)
+            if redis.call('LLEN', jobs) > 0 then
+                redis.call('ZADD', users, su + cost, u)
+            else
+                redis.call('ZREM', users, u)
+            end
+            redis.call('HSET', p .. ':gfin', g, sg + cost)
+            if redis.call('ZCARD', users) > 0 then
+                redis.call('ZADD', p .. ':groups', sg + cost, g)
+            else
+                redis.call('ZREM', p .. ':groups', g)
+            end
+            redis.call('HDEL', p .. ':pending', sid)
+            redis.call('ZADD', p .. ':inflight', now + tonumber(ARGV[3]), sid)
+            table.insert(out, sid)
+            free = free - 1
+        end
+    end
+end
+return out
+"""
+
+
+def scheduler_enabled() -> bool:
+    return bool(getattr(settings, "JUDGE_SCHEDULER_ENABLED", False))
+
+
+def lane_for(source_type: str) -> str:
+    return "high_priority" if source_type == "contest" else "default"
+
+
+def lane_capacity(lane: str) -> int:
+    """
+    Submissions the lane may have in Celery: the worker slots serving it as
+    last published by ``judge_pool``, else ``JUDGE_SCHEDULER_CAPACITY[lane]``.
+    """
+    live = _redis().get(f"{_prefix(lane)}:capacity")
+    if live is not None:
+        return int(live)
+    return int(getattr(settings, "JUDGE_SCHEDULER_CAPACITY", {}).get(lane, 8))
+
+
+def set_live_capacity(lane: str, capacity: int, ttl: int) -> None:
+    """Record the lane's live worker slots; the config value applies again after ``ttl``."""
+    if capacity > 0:
+        _redis().set(f"{_prefix(lane)}:capacity", capacity, ex=ttl)
+    else:
+        _redis().delete(f"{_prefix(lane)}:capacity")
+
+
+def _redis():
+    return redis_client()
+
+
+def _prefix(lane: str) -> str:
+    return cache.make_key(f"judge_sched:v1:{lane}")
+
+
+def estimate_cost(submission) -> float:
+    """Judge cost in seconds of CPU budget: test cases x time limit."""
+    problem = submission.problem
+    if submission.is_test:
+        cases = problem.test_cases.filter(is_sample=True).count() + len(submission.custom_test_cases or [])
+    else:
+        cases = problem.test_cases.count()
+    return max(1, cases) * max(1, problem.time_limit) / 1000.0
+
+
+def enqueue(submission) -> bool:
+    """Park ``submission`` in its lane's fair queue; False if already queued."""
+    lane = lane_for(submission.source_type)
+    group = f"contest:{submission.contest_id}" if submission.contest_id else PRACTICE_GROUP
+    added = _redis().eval(
+        _ENQUEUE_SCRIPT,
+        1,
+        _prefix(lane),
+        str(submission.id),
+        group,
+        str(submission.user_id),
+        f"{estimate_cost(submission):.3f}",
+        STATE_TTL_SECONDS,
+    )
+    return bool(added)
+
+
+def dispatch(lane: str) -> list[int]:
+    """Hand queued submissions to Celery up to the lane's free capacity."""
+    from apps.submissions.tasks import judge_submission
+
+    submission_ids = _redis().eval(
+        _DISPATCH_SCRIPT,
+        1,
+        _prefix(lane),
+        lane_capacity(lane),
+        time.time(),
+        int(getattr(settings, "JUDGE_SCHEDULER_LEASE_SECONDS", 600)),
+    )
+    dispatched = [int(sid) for sid in submission_ids]
+    for submission_id in dispatched:
+        judge_submission.apply_async(args=[submission_id], queue=lane)
+    return dispatched
+
+
+def release(submission_id: int) -> None:
+    """Free the slot held by a finished submission and dispatch the next jobs."""
+    client = _redis()
+    for lane in LANES:
+        client.zrem(f"{_prefix(lane)}:inflight", str(submission_id))
+    dispatch_all()
+
+
+def dispatch_all() -> list[int]:
+    dispatched = []
+    for lane in LANES:
+        dispatched.extend(dispatch(lane))
+    return dispatched
+
+
+def queue_depth(lane: str) -> int:
+    return int(_redis().hlen(f"{_prefix(lane)}:pending"))
+
+
+def find_pending_duplicate(*, user, data: dict, contest_id):
+    """
+    Return a recent still-pending submission identical to ``data`` (same
+    user, problem, contest, language, code and custom cases), if any.
+    """
+    window = int(getattr(settings, "JUDGE_DEDUP_WINDOW_SECONDS", 600))
+    candidates = (
+        user.submissions.filter(
+            problem=data["problem"],
+            contest_id=contest_id,
+            language=data.get("language"),
+            is_test=bool(data.get("is_test", False)),
+            status="pending",
+            code=data.get("code", ""),
+            created_at__gte=timezone.now() - timedelta(seconds=window),
+        )
+        .order_by("-created_at")
+    )
+    custom_cases = data.get("custom_test_cases") or []
+    for candidate in candidates[:5]:
+        if (candidate.custom_test_cases or []) == custom_cases:
+            return candidate
+    return None
@@ -0,0 +1,10 @@
+"""WebSocket URL routing for judge progress and verdict push."""
+
+from django.urls import path
+
+from .consumers import SubmissionEventsConsumer
+
+websocket_urlpatterns = [
+    path("ws/submissions/", SubmissionEventsConsumer.as_asgi()),
+    path("ws/contests/<uuid:contest_id>/submissions/", SubmissionEventsConsumer.as_asgi()),
+]
@@ -1,7 +1,9 @@
 """
 Serializers for submissions app.
 """
+from redis.exceptions import RedisError
 from rest_framework import serializers
+from . import judge_pool
 from .models import Submission, SubmissionResult, ScreenEvent
 from apps.problems.serializers import ProblemListSerializer
 from apps.users.serializers import UserSerializer
@@ -15,6 +17,21 @@ def _get_total_test_cases(submission: Submission) -> int:
     return submission.problem.test_cases.count()
 
 
+def _get_estimated_judge_wait(serializer, submission: Submission):
+    if submission.status != 'pending':
+        return None
+    # Queue stats are read once per response, not once per row.
+    root = serializer.root
+    stats = getattr(root, '_judge_queue_stats', None)
+    if stats is None:
+        try:
+            stats = judge_pool.queue_stats()
+        except RedisError:
+            stats = {}
+        root._judge_queue_stats = stats
+    return judge_pool.estimated_judge_wait(submission, stats)
+
+
 class SubmissionResultSerializer(serializers.ModelSerializer):
     """Serializer for submission results."""
     class Meta:
@@ -97,10 +114,14 @@ class SubmissionListSerializer(serializers.ModelSerializer):
                 pass
         return f"Problem {obj.problem_id}"
     contest_id = serializers.UUIDField(source='contest.id', read_only=True, allow_null=True)
+    estimated_judge_wait = serializers.SerializerMethodField()
     
     def get_username(self, obj):
         """Return submitter username."""
         return obj.user.username
+
+    def get_estimated_judge_wait(self, obj):
+        return _get_estimated_judge_wait(self, obj)
     
     class Meta:
         model = Submission
@@ -118,6 +139,7 @@ class SubmissionListSerializer(serializers.ModelSerializer):
             'exec_time',
             'memory_usage',
             'created_at',
+            'estimated_judge_wait',
         ]
 
 
@@ -128,6 +150,7 @@ class SubmissionDetailSerializer(serializers.ModelSerializer):
     results = SubmissionResultSerializer(many=True, read_only=True)
     screen_events = ScreenEventSerializer(many=True, read_only=True)
     total_test_cases = serializers.SerializerMethodField()
+    estimated_judge_wait = serializers.SerializerMethodField()
     
     class Meta:
         model = Submission
@@ -150,15 +173,20 @@ class SubmissionDetailSerializer(serializers.ModelSerializer):
             'screen_events',
             'custom_test_cases',
             'total_test_cases',
+            'estimated_judge_wait',
         ]
 
     def get_total_test_cases(self, obj):
         return _get_total_test_cases(obj)
 
+    def get_estimated_judge_wait(self, obj):
+        return _get_estimated_judge_wait(self, obj)
+
 
 class CreateSubmissionSerializer(serializers.ModelSerializer):
     """Serializer for creating a submission."""
     total_test_cases = serializers.SerializerMethodField()
+    estimated_judge_wait = serializers.SerializerMethodField()
 
     class Meta:
         model = Submission
@@ -173,6 +201,7 @@ class CreateSubmissionSerializer(serializers.ModelSerializer):
             'error_message',
             'created_at',
             'total_test_cases',
+            'estimated_judge_wait',
         ]
         read_only_fields = ['id', 'status', 'created_at']
         extra_kwargs = {
@@ -196,3 +225,6 @@ class CreateSubmissionSerializer(serializers.ModelSerializer):
 
     def get_total_test_cases(self, obj):
         return _get_total_test_cases(obj)
+
+    def get_estimated_judge_wait(self, obj):
+        return _get_estimated_judge_wait(self, obj)
@@ -5,11 +5,13 @@ from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 from django.db import transaction
+from redis.exceptions import RedisError
 
 from apps.contests.models import Contest
 from apps.contests.services.activity_log import log_contest_activity
 from apps.contests.services.question_edit_lock import maybe_lock_from_coding_submission
 from apps.problems.models import CodingProblem
+from apps.submissions import judge_scheduler
 from apps.submissions.access_policy import SubmissionAccessPolicy
 from apps.submissions.models import Submission
 from apps.users.models import User
@@ -94,6 +96,19 @@ class SubmissionService:
             required_keywords=required_keywords,
         )
 
+        # An identical submission still waiting for the judge is returned as-is
+        # instead of queueing the same work twice.
+        if not violation_message and judge_scheduler.scheduler_enabled():
+            duplicate = judge_scheduler.find_pending_duplicate(
+                user=user, data=data, contest_id=contest_id
+            )
+            if duplicate is not None:
+                return SubmissionCreateResult(
+                    submission=duplicate,
+                    should_judge=False,
+                    source_type=source_type,
+                )
+
         create_payload = dict(data)
         create_payload.pop("source_type", None)
 
@@ -148,8 +163,28 @@ class SubmissionService:
     def _dispatch_judging(result: SubmissionCreateResult) -> None:
         from apps.submissions.tasks import judge_submission
 
-        queue = "high_priority" if result.source_type == "contest" else "default"
-        sid = result.submission.id
+        queue = judge_scheduler.lane_for(result.source_type)
+        submission = result.submission
+        if judge_scheduler.scheduler_enabled():
+            def schedule():
+                try:
+                    judge_scheduler.enqueue(submission)
+                except RedisError:
+                    # Scheduler state unavailable: judge directly rather than stall.
+                    logger.warning("Judge scheduler unavailable; dispatching %s directly", submission.id)
+                    judge_submission.apply_async(args=[submission.id], queue=queue)
+                    return
+                try:
+                    judge_scheduler.dispatch(queue)
+                except RedisError:
+                    # Already queued: judging it directly as well would run it twice.
+                    # The periodic dispatch picks it up once Redis is back.
+                    logger.warning("Judge dispatch failed; %s stays queued", submission.id, exc_info=True)
+
+            transaction.on_commit(schedule)
+            return
+
+        sid = submission.id
         transaction.on_commit(
             lambda: judge_submission.apply_async(args=[sid], queue=queue)
         )
@@ -5,10 +5,14 @@ Supports priority queues via apply_async(queue=...):
 - default: Practice submissions
 """
 import logging
+import time
 from celery import shared_task
+from redis.exceptions import RedisError
 from .models import Submission, SubmissionResult
 from apps.problems.models import TestCase
+from apps.core.metrics import observe_queue_wait
 from apps.judge.judge_factory import get_judge
+from apps.submissions import events, judge_pool, judge_scheduler
 from apps.question_bank.models import ContestQuestionBinding, QuestionAsset
 
 logger = logging.getLogger(__name__)
@@ -37,8 +41,41 @@ def judge_submission(submission_id):
     """
     Judge a submission. Queue is determined by the caller via apply_async(queue=...).
     """
+    started = time.monotonic()
+    try:
+        return _judge_submission(submission_id)
+    finally:
+        delivery_info = judge_submission.request.delivery_info or {}
+        try:
+            judge_pool.record_judge_duration(delivery_info.get('routing_key'), time.monotonic() - started)
+        except RedisError:
+            logger.warning("Failed to record judge duration for submission_id=%s", submission_id, exc_info=True)
+        if judge_scheduler.scheduler_enabled():
+            try:
+                judge_scheduler.release(submission_id)
+            except RedisError:
+                logger.warning("Failed to release judge slot for submission_id=%s", submission_id, exc_info=True)
+
+
+@shared_task
+def dispatch_judge_queue():
+    """Periodic safety net: dispatch jobs freed by expired judge leases."""
+    if not judge_scheduler.scheduler_enabled():
+        return 0
+    return len(judge_scheduler.dispatch_all())
+
+
+@shared_task
+def publish_judge_queue_stats():
+    """Refresh per-queue depth and estimated wait read by the submission API."""
+    return judge_pool.publish_queue_stats()
+
+
+def _judge_submission(submission_id):
     try:
         submission = Submission.objects.get(id=submission_id)
+        delivery_info = judge_submission.request.delivery_info or {}
+        observe_queue_wait(delivery_info.get('routing_key'), submission.created_at)
         # ... (rest of function)
         
         # Filter for test submissions
@@ -79,9 +116,10 @@ def judge_submission(submission_id):
             submission.status = 'SE'
             submission.error_message = f"Unsupported language: {submission.language}"
             submission.save()
+            events.publish_verdict(submission)
             return f"Submission {submission_id} failed: Unsupported language"
         
-        for tc in test_cases:
+        for case_number, tc in enumerate(test_cases, start=1):
             result = judge.execute(
                 code=submission.code,
                 input_data=tc.input_data,
@@ -128,6 +166,14 @@ def judge_submission(submission_id):
                 input_data=tc.input_data[:2000],  # Save snapshot of input
                 expected_output=tc.output_data[:2000] # Save snapshot of expected output
             )
+            events.publish_progress(
+                submission,
+                case_number=case_number,
+                total_cases=len(test_cases),
+                status=status,
+                exec_time=exec_time,
+                memory_usage=memory,
+            )
             
             # If CE or SE, stop testing other cases
             if status in ['CE', 'SE']:
@@ -165,6 +211,7 @@ def judge_submission(submission_id):
         submission.exec_time = max_exec_time
         submission.memory_usage = max_memory
         submission.save()
+        events.publish_verdict(submission)
         
         # Update statistics
         try:
@@ -206,4 +253,5 @@ def judge_submission(submission_id):
             submission.status = 'SE'
             submission.error_message = "Judge internal error"
             submission.save()
+            events.publish_verdict(submission)
         return f"Error judging submission {submission_id}"
@@ -0,0 +1,213 @@
+"""
+Tests for judge worker pool sizing and queue-wait telemetry
+(apps.submissions.judge_pool).
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from pytest_mock import MockerFixture
+
+from apps.problems.models import CodingProblem
+from apps.submissions import judge_pool, judge_scheduler
+from apps.submissions.models import Submission
+from apps.submissions.serializers import SubmissionListSerializer
+from apps.users.models import User
+
+
+@pytest.fixture(autouse=True)
+def pool_state():
+    client = judge_pool._redis()
+
+    def flush():
+        for key in client.scan_iter(match=cache.make_key("judge_pool:*")):
+            client.delete(key)
+
+    flush()
+    yield
+    flush()
+
+
+@pytest.fixture
+def empty_broker(mocker: MockerFixture) -> Mock:
+    return mocker.patch(
+        "apps.submissions.judge_pool.broker_backlog",
+        side_effect=lambda queues: {queue: 0 for queue in queues},
+    )
+
+
+def _heartbeat(hostname: str, queues: list[str], concurrency: int, busy: int = 0) -> None:
+    judge_pool.publish_heartbeat(
+        hostname, queues=queues, concurrency=concurrency, busy=busy, host_cores=8, sandboxes=busy,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Pool sizing
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "host_cores, running, own, ceiling, floor, expected",
+    [
+        (8, 0, 0, 16, 1, 8),     # idle host: one slot per core
+        (8, 0, 0, 4, 1, 4),      # --autoscale maximum still applies
+        (8, 6, 2, 16, 1, 4),     # 4 sandboxes belong to other workers
+        (4, 10, 0, 16, 2, 2),    # overloaded host keeps the floor
+    ],
+)
+def test_slot_budget(host_cores, running, own, ceiling, floor, expected) -> None:
+    assert judge_pool.slot_budget(
+        host_cores=host_cores, running_sandboxes=running, own_active=own, ceiling=ceiling, floor=floor,
+    ) == expected
+
+
+@override_settings(JUDGE_WORKER_SLOTS_PER_CORE=1.5)
+def test_slot_budget_scales_with_slots_per_core() -> None:
+    assert judge_pool.slot_budget(host_cores=4, running_sandboxes=0, own_active=0, ceiling=16) == 6
+
+
+def test_autoscaler_follows_docker_host(mocker: MockerFixture) -> None:
+    pool = SimpleNamespace(num_processes=8, shrink=Mock(), grow=Mock())
+    worker = SimpleNamespace(
+        hostname="judge@host-a",
+        consumer=Mock(),
+        app=SimpleNamespace(amqp=SimpleNamespace(queues=SimpleNamespace(
+            consume_from={"high_priority": None, "default": None},
+        ))),
+    )
+    scaler = judge_pool.JudgeAutoscaler(pool, 16, 1, worker=worker, mutex=Mock())
+    mocker.patch.object(scaler, "_probe_docker", return_value=(4, 3))
+
+    scaler.probe()
+
+    # 4 cores, 3 sandboxes of other workers (none of ours) -> 1 slot left.
+    assert scaler.max_concurrency == 1
+    pool.shrink.assert_called_once_with(7)
+    worker.consumer._update_prefetch_count.assert_called_once_with(-15)
+    [heartbeat] = judge_pool.live_workers()
+    assert heartbeat["hostname"] == "judge@host-a"
+    assert heartbeat["queues"] == ["default", "high_priority"]
+    assert heartbeat["concurrency"] == 1
+    assert heartbeat["sandboxes"] == 3
+
+
+# ---------------------------------------------------------------------------
+# Queue telemetry
+# ---------------------------------------------------------------------------
+
+def test_new_host_joins_pool_through_heartbeat(empty_broker: Mock) -> None:
+    _heartbeat("judge@host-a", ["high_priority", "default"], concurrency=4)
+    # A worker consuming both lanes gives each half of its slots.
+    assert judge_pool.publish_queue_stats()["high_priority"]["slots"] == 2
+
+    _heartbeat("judge@host-b", ["high_priority"], concurrency=6)
+    stats = judge_pool.publish_queue_stats()
+
+    assert stats["high_priority"]["workers"] == 2
+    assert stats["high_priority"]["slots"] == 8
+    assert stats["default"]["slots"] == 2
+
+
+@pytest.fixture
+def scheduler_on(mocker: MockerFixture):
+    client = judge_pool._redis()
+
+    def flush():
+        for key in client.scan_iter(match=cache.make_key("judge_sched:*")):
+            client.delete(key)
+
+    flush()
+    mocker.patch("apps.submissions.judge_scheduler.scheduler_enabled", return_value=True)
+    yield
+    flush()
+
+
+@override_settings(JUDGE_SCHEDULER_CAPACITY={"high_priority": 2, "default": 2})
+def test_worker_slots_become_scheduler_capacity(empty_broker: Mock, scheduler_on) -> None:
+    assert judge_scheduler.lane_capacity("high_priority") == 2
+
+    _heartbeat("judge@high", ["high_priority", "default"], concurrency=8)
+    _heartbeat("judge@default", ["default"], concurrency=8)
+    stats = judge_pool.publish_queue_stats()
+
+    # Enough jobs are admitted for every serving worker to scale to its maximum.
+    assert judge_scheduler.lane_capacity("high_priority") == 8
+    assert judge_scheduler.lane_capacity("default") == 16
+    assert stats["high_priority"]["capacity"] == 8
+    assert (stats["high_priority"]["slots"], stats["default"]["slots"]) == (4, 12)
+
+
+@override_settings(JUDGE_SCHEDULER_CAPACITY={"high_priority": 3, "default": 3})
+def test_wait_estimate_is_capped_by_scheduler_capacity(mocker: MockerFixture, scheduler_on) -> None:
+    mocker.patch(
+        "apps.submissions.judge_pool.broker_backlog",
+        return_value={"high_priority": 0, "default": 0},
+    )
+    mocker.patch("apps.submissions.judge_scheduler.set_live_capacity")
+    mocker.patch("apps.submissions.judge_scheduler.queue_depth", return_value=6)
+    _heartbeat("judge@host-a", ["default"], concurrency=8)
+    judge_pool.record_judge_duration("default", 2.0)
+
+    stats = judge_pool.publish_queue_stats()
+
+    # 8 worker slots, but only 3 submissions are let through at once.
+    assert stats["default"]["slots"] == 3
+    assert stats["default"]["estimated_wait_seconds"] == 4.0
+
+
+def test_expired_heartbeat_leaves_pool(empty_broker: Mock) -> None:
+    _heartbeat("judge@gone", ["default"], concurrency=4)
+    judge_pool._redis().zadd(judge_pool._key("workers"), {"judge@gone": 0})
+
+    stats = judge_pool.publish_queue_stats()
+
+    assert stats["default"]["workers"] == 0
+    assert stats["default"]["estimated_wait_seconds"] is None
+
+
+def test_estimated_wait_from_backlog_and_judge_duration(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "apps.submissions.judge_pool.broker_backlog",
+        return_value={"high_priority": 12, "default": 0},
+    )
+    _heartbeat("judge@host-a", ["high_priority"], concurrency=4, busy=4)
+    judge_pool.record_judge_duration("high_priority", 2.0)
+
+    stats = judge_pool.publish_queue_stats()
+
+    assert stats["high_priority"]["depth"] == 12
+    assert stats["high_priority"]["avg_judge_seconds"] == 2.0
+    assert stats["high_priority"]["estimated_wait_seconds"] == 6.0
+    assert judge_pool.queue_stats()["high_priority"] == stats["high_priority"]
+
+
+def test_judge_duration_is_a_moving_average() -> None:
+    judge_pool.record_judge_duration("default", 10.0)
+    judge_pool.record_judge_duration("default", 0.0)
+
+    assert judge_pool.average_judge_seconds("default") == pytest.approx(10.0 * (1 - judge_pool.AVG_ALPHA))
+
+
+@override_settings(JUDGE_WAIT_DEFAULT_SECONDS=4.0)
+def test_average_defaults_before_any_judge_reports() -> None:
+    assert judge_pool.average_judge_seconds("default") == 4.0
+
+
+@pytest.mark.django_db
+def test_serializer_exposes_estimated_judge_wait(empty_broker: Mock) -> None:
+    user = User.objects.create_user(username="pool_user", email="pool_user@example.com", password="x")
+    problem = CodingProblem.objects.create(slug="pool-problem", created_by=user)
+    pending = Submission.objects.create(user=user, problem=problem, language="python", code="1")
+    judged = Submission.objects.create(user=user, problem=problem, language="python", code="2", status="AC")
+    _heartbeat("judge@host-a", ["default"], concurrency=2)
+    judge_pool.record_judge_duration("default", 3.0)
+    judge_pool.publish_queue_stats()
+
+    data = SubmissionListSerializer([pending, judged], many=True).data
+
+    assert data[0]["estimated_judge_wait"] == 3.0
+    assert data[1]["estimated_judge_wait"] is None
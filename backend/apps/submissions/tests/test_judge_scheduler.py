@@ -0,0 +1,295 @@
+"""
+Tests for the fair-share judge scheduler (apps.submissions.judge_scheduler).
+
+The scheduler state lives in the test Redis; Celery dispatch is mocked so the
+order in which submissions are handed to the workers can be asserted.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import Mock
+
+import factory
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from pytest_mock import MockerFixture
+from redis.exceptions import RedisError
+
+from apps.contests.models import Contest, ContestParticipant, ExamStatus
+from apps.problems.models import CodingProblem, TestCase
+from apps.submissions import judge_scheduler
+from apps.submissions.models import Submission
+from apps.submissions.services import SubmissionService
+from apps.users.models import User
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = User
+
+    username = factory.Sequence(lambda n: f"sched_user{n}")
+    email = factory.Sequence(lambda n: f"sched_user{n}@example.com")
+    role = "student"
+
+
+class ProblemFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = CodingProblem
+
+    slug = factory.Sequence(lambda n: f"sched-problem-{n}")
+    created_by = factory.SubFactory(UserFactory, role="teacher")
+    forbidden_keywords = factory.LazyFunction(list)
+    required_keywords = factory.LazyFunction(list)
+
+
+class ContestFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Contest
+
+    name = factory.Sequence(lambda n: f"SchedContest {n}")
+    owner = factory.SubFactory(UserFactory, role="teacher")
+    status = "published"
+    visibility = "public"
+    start_time = factory.LazyFunction(lambda: timezone.now() - timedelta(hours=1))
+    end_time = factory.LazyFunction(lambda: timezone.now() + timedelta(hours=1))
+
+
+SCHEDULER_SETTINGS = {
+    "JUDGE_SCHEDULER_ENABLED": True,
+    "JUDGE_SCHEDULER_CAPACITY": {"high_priority": 1, "default": 1},
+}
+
+
+@pytest.fixture(autouse=True)
+def scheduler_state():
+    client = judge_scheduler._redis()
+
+    def flush():
+        for key in client.scan_iter(match=cache.make_key("judge_sched:*")):
+            client.delete(key)
+
+    flush()
+    with override_settings(**SCHEDULER_SETTINGS):
+        yield
+    flush()
+
+
+@pytest.fixture
+def judge_mock(mocker: MockerFixture) -> Mock:
+    return mocker.patch("apps.submissions.tasks.judge_submission.apply_async")
+
+
+def _dispatched(judge_mock: Mock) -> list[int]:
+    return [call.kwargs["args"][0] for call in judge_mock.call_args_list]
+
+
+def _submit(user, problem, contest=None, code="print(1)") -> Submission:
+    return Submission.objects.create(
+        user=user,
+        problem=problem,
+        contest=contest,
+        source_type="contest" if contest else "practice",
+        language="python",
+        code=code,
+    )
+
+
+def _drain(lane: str, judge_mock: Mock) -> list[int]:
+    """Release each dispatched submission in turn until the lane is empty."""
+    released = 0
+    while released < len(_dispatched(judge_mock)):
+        judge_scheduler.release(_dispatched(judge_mock)[released])
+        released += 1
+    assert judge_scheduler.queue_depth(lane) == 0
+    return _dispatched(judge_mock)
+
+
+@pytest.mark.django_db
+def test_dispatch_respects_lane_capacity(judge_mock: Mock) -> None:
+    user = UserFactory()
+    problem = ProblemFactory(created_by=user)
+    submissions = [_submit(user, problem, code=f"print({i})") for i in range(3)]
+
+    for submission in submissions:
+        judge_scheduler.enqueue(submission)
+    with override_settings(JUDGE_SCHEDULER_CAPACITY={"default": 2}):
+        dispatched = judge_scheduler.dispatch("default")
+
+    assert dispatched == [submissions[0].id, submissions[1].id]
+    judge_mock.assert_any_call(args=[submissions[0].id], queue="default")
+    assert judge_scheduler.queue_depth("default") == 1
+
+
+@pytest.mark.django_db
+def test_enqueue_is_idempotent(judge_mock: Mock) -> None:
+    user = UserFactory()
+    submission = _submit(user, ProblemFactory(created_by=user))
+
+    assert judge_scheduler.enqueue(submission) is True
+    assert judge_scheduler.enqueue(submission) is False
+    assert judge_scheduler.queue_depth("default") == 1
+
+
+@pytest.mark.django_db
+def test_release_frees_slot_and_dispatches_next(judge_mock: Mock) -> None:
+    user = UserFactory()
+    problem = ProblemFactory(created_by=user)
+    first, second = _submit(user, problem, code="a"), _submit(user, problem, code="b")
+    judge_scheduler.enqueue(first)
+    judge_scheduler.enqueue(second)
+
+    assert judge_scheduler.dispatch("default") == [first.id]
+    assert judge_scheduler.dispatch("default") == []
+
+    judge_scheduler.release(first.id)
+
+    assert _dispatched(judge_mock) == [first.id, second.id]
+
+
+@pytest.mark.django_db
+def test_contest_burst_does_not_starve_other_contest(judge_mock: Mock) -> None:
+    contest_a, contest_b = ContestFactory(), ContestFactory()
+    problem = ProblemFactory()
+    burst = [_submit(UserFactory(), problem, contest_a) for _ in range(4)]
+    late = [_submit(UserFactory(), problem, contest_b) for _ in range(2)]
+
+    for submission in burst + late:
+        judge_scheduler.enqueue(submission)
+    judge_scheduler.dispatch("high_priority")
+    order = _drain("high_priority", judge_mock)
+
+    # Contest B's jobs are interleaved with A's burst instead of waiting behind it.
+    assert {late[0].id, late[1].id} <= set(order[:4])
+
+
+@pytest.mark.django_db
+def test_resubmitting_user_does_not_starve_classmate(judge_mock: Mock) -> None:
+    contest = ContestFactory()
+    problem = ProblemFactory()
+    spammer, classmate = UserFactory(), UserFactory()
+    spam = [_submit(spammer, problem, contest, code=f"print({i})") for i in range(5)]
+    single = _submit(classmate, problem, contest)
+
+    for submission in spam + [single]:
+        judge_scheduler.enqueue(submission)
+    judge_scheduler.dispatch("high_priority")
+    order = _drain("high_priority", judge_mock)
+
+    assert order.index(single.id) <= 1
+
+
+@pytest.mark.django_db
+def test_expensive_jobs_are_charged_by_cost(judge_mock: Mock) -> None:
+    contest = ContestFactory()
+    cheap_problem = ProblemFactory(time_limit=1000)
+    heavy_problem = ProblemFactory(time_limit=1000)
+    TestCase.objects.bulk_create(
+        [TestCase(problem=heavy_problem, input_data="", output_data="") for _ in range(4)]
+    )
+    heavy_user, light_user = UserFactory(), UserFactory()
+    heavy = [_submit(heavy_user, heavy_problem, contest, code=f"h{i}") for i in range(2)]
+    light = [_submit(light_user, cheap_problem, contest, code=f"l{i}") for i in range(4)]
+
+    assert judge_scheduler.estimate_cost(heavy[0]) == 4.0
+    assert judge_scheduler.estimate_cost(light[0]) == 1.0
+
+    for submission in heavy + light:
+        judge_scheduler.enqueue(submission)
+    judge_scheduler.dispatch("high_priority")
+    order = _drain("high_priority", judge_mock)
+
+    # One 4-case job buys the heavy user as much time as four 1-case jobs.
+    assert order.index(heavy[0].id) <= 1
+    assert order[-1] == heavy[1].id
+
+
+@pytest.mark.django_db
+def test_expired_lease_frees_slot(judge_mock: Mock) -> None:
+    user = UserFactory()
+    problem = ProblemFactory(created_by=user)
+    first, second = _submit(user, problem, code="a"), _submit(user, problem, code="b")
+    judge_scheduler.enqueue(first)
+    judge_scheduler.enqueue(second)
+
+    with override_settings(JUDGE_SCHEDULER_LEASE_SECONDS=-1):
+        judge_scheduler.dispatch("default")
+    # The first task never released its slot; its lease is already past due.
+    assert judge_scheduler.dispatch("default") == [second.id]
+
+
+@pytest.mark.django_db
+def test_service_routes_through_scheduler(mocker: MockerFixture, judge_mock: Mock) -> None:
+    mocker.patch("django.db.transaction.on_commit", side_effect=lambda func: func())
+    user = UserFactory()
+    problem = ProblemFactory(created_by=user)
+
+    first = SubmissionService.create_and_dispatch(
+        user=user, data={"problem": problem, "language": "python", "code": "print(1)"}
+    )
+    second = SubmissionService.create_and_dispatch(
+        user=user, data={"problem": problem, "language": "python", "code": "print(2)"}
+    )
+
+    judge_mock.assert_called_once_with(args=[first.id], queue="default")
+    assert judge_scheduler.queue_depth("default") == 1
+    judge_scheduler.release(first.id)
+    judge_mock.assert_called_with(args=[second.id], queue="default")
+
+
+@pytest.mark.django_db
+def test_failed_dispatch_leaves_enqueued_submission_queued(mocker: MockerFixture, judge_mock: Mock) -> None:
+    mocker.patch("django.db.transaction.on_commit", side_effect=lambda func: func())
+    dispatch = judge_scheduler.dispatch
+    mocker.patch("apps.submissions.judge_scheduler.dispatch", side_effect=RedisError("timeout"))
+    user = UserFactory()
+    problem = ProblemFactory(created_by=user)
+
+    submission = SubmissionService.create_and_dispatch(
+        user=user, data={"problem": problem, "language": "python", "code": "print(1)"}
+    )
+
+    judge_mock.assert_not_called()
+    assert judge_scheduler.queue_depth("default") == 1
+    # The next dispatch tick judges it exactly once.
+    assert dispatch("default") == [submission.id]
+    judge_mock.assert_called_once_with(args=[submission.id], queue="default")
+
+
+@pytest.mark.django_db
+def test_failed_enqueue_judges_directly(mocker: MockerFixture, judge_mock: Mock) -> None:
+    mocker.patch("django.db.transaction.on_commit", side_effect=lambda func: func())
+    mocker.patch("apps.submissions.judge_scheduler.enqueue", side_effect=RedisError("down"))
+    user = UserFactory()
+    problem = ProblemFactory(created_by=user)
+
+    submission = SubmissionService.create_and_dispatch(
+        user=user, data={"problem": problem, "language": "python", "code": "print(1)"}
+    )
+
+    judge_mock.assert_called_once_with(args=[submission.id], queue="default")
+
+
+@pytest.mark.django_db
+def test_identical_pending_submission_is_deduplicated(mocker: MockerFixture, judge_mock: Mock) -> None:
+    mocker.patch("django.db.transaction.on_commit", side_effect=lambda func: func())
+    mocker.patch("apps.submissions.services.log_contest_activity")
+    user = UserFactory()
+    contest = ContestFactory()
+    problem = ProblemFactory(created_by=contest.owner)
+    ContestParticipant.objects.create(contest=contest, user=user, exam_status=ExamStatus.IN_PROGRESS)
+    data = {"problem": problem, "language": "python", "code": "print('ok')", "contest": contest}
+
+    first = SubmissionService.create_and_dispatch(user=user, data=dict(data))
+    again = SubmissionService.create_and_dispatch(user=user, data=dict(data))
+    changed = SubmissionService.create_and_dispatch(user=user, data={**data, "code": "print('ok!')"})
+
+    assert again.id == first.id
+    assert changed.id != first.id
+    assert Submission.objects.filter(user=user).count() == 2
+
+    # Once judged, the same code may be submitted again.
+    Submission.objects.filter(pk=first.pk).update(status="AC")
+    rerun = SubmissionService.create_and_dispatch(user=user, data=dict(data))
+    assert rerun.id not in (first.id, changed.id)
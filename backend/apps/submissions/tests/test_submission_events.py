@@ -0,0 +1,204 @@
+"""
+Tests for the judge progress / verdict WebSocket push
+(apps.submissions.events, apps.submissions.consumers).
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import AnonymousUser
+from django.test import override_settings
+from django.utils import timezone
+from pytest_mock import MockerFixture
+
+from apps.ai.middleware import JWTAuthMiddleware
+from apps.contests.models import Contest
+from apps.problems.models import CodingProblem, TestCase
+from apps.submissions import events
+from apps.submissions.models import Submission
+from apps.submissions.routing import websocket_urlpatterns
+from apps.submissions.tasks import judge_submission
+from apps.users.models import User
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("push_enabled")]
+
+application = URLRouter(websocket_urlpatterns)
+
+
+@pytest.fixture
+def push_enabled():
+    with override_settings(SUBMISSION_PUSH_ENABLED=True):
+        yield
+
+
+def _user(username: str, **extra) -> User:
+    return User.objects.create_user(username=username, email=f"{username}@example.com", password="x", **extra)
+
+
+def _contest(owner: User) -> Contest:
+    now = timezone.now()
+    return Contest.objects.create(
+        name="Push Contest",
+        owner=owner,
+        status="published",
+        start_time=now - timedelta(hours=1),
+        end_time=now + timedelta(hours=1),
+    )
+
+
+def _submission(user: User, contest: Contest | None = None) -> Submission:
+    problem = CodingProblem.objects.create(slug=f"push-{user.username}", created_by=user)
+    return Submission.objects.create(
+        user=user,
+        problem=problem,
+        contest=contest,
+        source_type="contest" if contest else "practice",
+        language="python",
+        code="print(1)",
+    )
+
+
+# Test code runs sync work with asgiref's sync_to_async: channels'
+# database_sync_to_async closes the connection held by the test transaction.
+def _connect(path: str, user):
+    communicator = WebsocketCommunicator(application, path)
+    communicator.scope["user"] = user
+    return communicator
+
+
+def test_user_receives_verdict_for_own_submission() -> None:
+    user = _user("push_owner")
+    submission = _submission(user)
+    submission.status = "AC"
+    submission.score = 100
+
+    async def scenario():
+        communicator = _connect("/ws/submissions/", user)
+        connected, _ = await communicator.connect()
+        assert connected
+        await sync_to_async(events.publish_verdict)(submission)
+        message = await communicator.receive_json_from()
+        await communicator.disconnect()
+        return message
+
+    message = async_to_sync(scenario)()
+
+    assert message["type"] == "submission.verdict"
+    assert message["submission_id"] == submission.id
+    assert message["status"] == "AC"
+    assert message["score"] == 100
+
+
+def test_other_users_do_not_receive_events() -> None:
+    owner, other = _user("push_a"), _user("push_b")
+    submission = _submission(owner)
+
+    async def scenario():
+        communicator = _connect("/ws/submissions/", other)
+        await communicator.connect()
+        await sync_to_async(events.publish_verdict)(submission)
+        nothing = await communicator.receive_nothing()
+        await communicator.disconnect()
+        return nothing
+
+    assert async_to_sync(scenario)() is True
+
+
+def test_anonymous_connection_is_rejected() -> None:
+    async def scenario():
+        communicator = _connect("/ws/submissions/", AnonymousUser())
+        connected, _ = await communicator.connect()
+        return connected
+
+    assert async_to_sync(scenario)() is False
+
+
+def test_contest_staff_receive_contest_submissions() -> None:
+    owner, student = _user("push_teacher", role="teacher"), _user("push_student")
+    contest = _contest(owner)
+    submission = _submission(student, contest)
+
+    async def scenario():
+        staff = _connect(f"/ws/contests/{contest.id}/submissions/", owner)
+        outsider = _connect(f"/ws/contests/{contest.id}/submissions/", student)
+        staff_connected, _ = await staff.connect()
+        outsider_connected, _ = await outsider.connect()
+        await sync_to_async(events.publish_verdict)(submission)
+        message = await staff.receive_json_from()
+        await staff.disconnect()
+        return staff_connected, outsider_connected, message
+
+    staff_connected, outsider_connected, message = async_to_sync(scenario)()
+
+    assert staff_connected is True
+    assert outsider_connected is False
+    assert message["contest_id"] == str(contest.id)
+    assert message["user_id"] == student.id
+
+
+def test_judge_task_pushes_progress_then_verdict(mocker: MockerFixture) -> None:
+    user = _user("push_judge")
+    submission = _submission(user)
+    TestCase.objects.bulk_create([
+        TestCase(problem=submission.problem, input_data="1", output_data="1", order=1),
+        TestCase(problem=submission.problem, input_data="2", output_data="2", order=2),
+    ])
+    judge = mocker.Mock()
+    judge.execute.return_value = {"status": "AC", "time": 5, "memory": 1024, "output": "1", "error": ""}
+    mocker.patch("apps.submissions.tasks.get_judge", return_value=judge)
+
+    async def scenario():
+        communicator = _connect("/ws/submissions/", user)
+        await communicator.connect()
+        await sync_to_async(judge_submission)(submission.id)
+        received = [await communicator.receive_json_from() for _ in range(3)]
+        await communicator.disconnect()
+        return received
+
+    first, second, verdict = async_to_sync(scenario)()
+
+    assert [first["type"], second["type"], verdict["type"]] == [
+        "submission.progress", "submission.progress", "submission.verdict",
+    ]
+    assert (first["case"], first["total"], first["case_status"]) == (1, 2, "AC")
+    assert second["case"] == 2
+    assert verdict["status"] == "AC"
+    assert "output" not in first
+
+
+def test_contest_group_gets_verdicts_but_not_progress(mocker: MockerFixture) -> None:
+    layer = mocker.patch("apps.submissions.events.get_channel_layer").return_value
+    layer.group_send = mocker.AsyncMock()
+    owner, student = _user("push_progress_teacher", role="teacher"), _user("push_progress_student")
+    submission = _submission(student, _contest(owner))
+
+    events.publish_progress(submission, case_number=1, total_cases=3, status="AC", exec_time=1, memory_usage=1)
+    events.publish_verdict(submission)
+
+    sent = [(call.args[0], call.args[1]["payload"]["type"]) for call in layer.group_send.await_args_list]
+    assert sent == [
+        (events.user_group(student.id), "submission.progress"),
+        (events.user_group(student.id), "submission.verdict"),
+        (events.contest_group(submission.contest_id), "submission.verdict"),
+    ]
+
+
+def test_push_disabled_sends_nothing(mocker: MockerFixture) -> None:
+    layer = mocker.patch("apps.submissions.events.get_channel_layer")
+    submission = _submission(_user("push_off"))
+
+    with override_settings(SUBMISSION_PUSH_ENABLED=False):
+        events.publish_verdict(submission)
+
+    layer.assert_not_called()
+
+
+def test_websocket_auth_reads_access_cookie() -> None:
+    scope = {"headers": [(b"cookie", b"csrftoken=abc; access_token=jwt-value")]}
+
+    assert JWTAuthMiddleware.get_cookie_token(scope) == "jwt-value"
+    assert JWTAuthMiddleware.get_cookie_token({"headers": []}) is None
@@ -13,9 +13,13 @@ CSRF Protection Strategy:
 
 from django.conf import settings
 from django.middleware.csrf import CsrfViewMiddleware
+from oauth2_provider.contrib.rest_framework import OAuth2Authentication
 from rest_framework import exceptions
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from . import principal_cache
 
 try:
     from drf_spectacular.extensions import OpenApiAuthenticationExtension
@@ -31,6 +35,29 @@ class CSRFCheck(CsrfViewMiddleware):
         return reason
 
 
+def _looks_like_jwt(token: str) -> bool:
+    # A JWT is three base64url segments whose header starts with '{"'; OAuth
+    # access tokens issued by django-oauth-toolkit are opaque and dot-free.
+    return token.startswith("eyJ") and token.count(".") == 2
+
+
+class JWTAwareOAuth2Authentication(OAuth2Authentication):
+    """
+    OAuth2 bearer authentication that steps aside for JWT bearer tokens.
+
+    OAuth2 runs first in DEFAULT_AUTHENTICATION_CLASSES and looks every bearer
+    token up in the AccessToken table. Our own access tokens are JWTs, so skip
+    that query and let CookieJWTAuthentication handle them.
+    """
+
+    def authenticate(self, request):
+        auth = request.META.get("HTTP_AUTHORIZATION", "")
+        scheme, _, token = auth.partition(" ")
+        if scheme.lower() == "bearer" and _looks_like_jwt(token.strip()):
+            return None
+        return super().authenticate(request)
+
+
 class CookieJWTAuthentication(JWTAuthentication):
     """
     Custom JWT Authentication that reads token from HttpOnly cookie.
@@ -85,6 +112,27 @@ class CookieJWTAuthentication(JWTAuthentication):
 
         return None
 
+    def get_user(self, validated_token):
+        """Resolve the user through ``principal_cache`` before hitting the DB."""
+        jti = str(validated_token.get(api_settings.JTI_CLAIM, "") or "")
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        # Revocation compares the password hash, which is never cached.
+        if (
+            not jti
+            or user_id is None
+            or api_settings.CHECK_REVOKE_TOKEN
+            or principal_cache.principal_ttl() <= 0
+        ):
+            return super().get_user(validated_token)
+
+        user, version = principal_cache.lookup(user_id, jti)
+        if user is None:
+            user = super().get_user(validated_token)
+            principal_cache.store(user, jti, version)
+        elif api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
+
     @staticmethod
     def _enforce_exam_jti(user, token):
         """Reject access tokens not matching the exam-pinned JTI."""
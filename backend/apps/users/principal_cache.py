@@ -0,0 +1,92 @@
+"""
+Short-lived cache of the user behind a JWT access token.
+
+``CookieJWTAuthentication.get_user`` would otherwise SELECT the user on every
+request. Entries are keyed by the access token's JTI and hold every concrete
+field except the password hash, so serializers and permission checks never
+trigger a lazy per-field SELECT on a cached user; only reading ``password``
+loads it (one query). Entries written with a different field list (after a
+model change) are treated as misses.
+
+Each user has a version counter that is bumped on save/delete (role change,
+deactivation) and on logout; entries written under an older version are
+ignored, so those changes apply on the next request rather than after the TTL.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+
+from .models import User
+
+KEY_PREFIX = "auth:principal"
+# Never copied into the cache; deferred on cached users.
+EXCLUDED_FIELDS = frozenset({"password"})
+# Extra lifetime of a version counter past the entries it invalidates.
+_VERSION_GRACE_SECONDS = 60
+
+
+def principal_ttl() -> int:
+    return max(int(getattr(settings, "AUTH_PRINCIPAL_CACHE_SECONDS", 60)), 0)
+
+
+def _entry_key(jti: str) -> str:
+    return f"{KEY_PREFIX}:{jti}"
+
+
+def _version_key(user_id) -> str:
+    return f"{KEY_PREFIX}:ver:{user_id}"
+
+
+def _cached_attnames() -> list[str]:
+    # Model.from_db expects loaded values in concrete-field order.
+    return [field.attname for field in User._meta.concrete_fields if field.attname not in EXCLUDED_FIELDS]
+
+
+def lookup(user_id, jti: str) -> tuple[User | None, int]:
+    """
+    Return ``(user, version)`` for a cached principal, or ``(None, version)``
+    on a miss; pass ``version`` back to ``store`` after loading the user.
+    """
+    entry_key, version_key = _entry_key(jti), _version_key(user_id)
+    values = cache.get_many([entry_key, version_key])
+    version = values.get(version_key) or 0
+    entry = values.get(entry_key)
+    attnames = _cached_attnames()
+    if (
+        not isinstance(entry, dict)
+        or str(entry.get("user_id")) != str(user_id)
+        or entry.get("version") != version
+        or entry.get("fields") != attnames
+    ):
+        return None, version
+    user = User.from_db(router.db_for_read(User), attnames, entry["values"])
+    return user, version
+
+
+def store(user: User, jti: str, version: int) -> None:
+    attnames = _cached_attnames()
+    values = [getattr(user, attname) for attname in attnames]
+    cache.set(
+        _entry_key(jti),
+        {"user_id": user.pk, "version": version, "fields": attnames, "values": values},
+        timeout=principal_ttl(),
+    )
+
+
+def invalidate(user_id) -> None:
+    """Drop every cached principal of ``user_id``."""
+    if user_id is None:
+        return
+    key = _version_key(user_id)
+    timeout = principal_ttl() + _VERSION_GRACE_SECONDS
+    if cache.add(key, 1, timeout=timeout):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Expired between add() and incr().
+        cache.set(key, 1, timeout=timeout)
+        return
+    cache.touch(key, timeout)
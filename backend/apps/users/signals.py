@@ -1,8 +1,9 @@
 """
 Signals for user model.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from . import principal_cache
 from .models import User, UserProfile
 
 
@@ -15,6 +16,17 @@ def create_user_profile(sender, instance, created, **kwargs):
         UserProfile.objects.create(user=instance)
 
 
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_principal(sender, instance, created=False, **kwargs):
+    """
+    Role, staff or active-status changes must apply to already issued tokens
+    on their next request.
+    """
+    if not created:
+        principal_cache.invalidate(instance.pk)
+
+
 # NOTE:
 # Do not auto-save profile on every user save.
 # It can overwrite freshly-synced profile fields (e.g. OAuth avatar) with a stale
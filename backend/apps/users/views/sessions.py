@@ -45,6 +45,8 @@ class LogoutOtherSessionsView(SchemaAPIView):
         # Mark other login records as not current
         from ..models import UserLoginRecord
         UserLoginRecord.objects.filter(user=request.user, is_current=True).exclude(jti=jti).update(is_current=False)
+        from .. import principal_cache
+        principal_cache.invalidate(request.user.id)
 
         return Response({
             'success': True,
@@ -10,6 +10,7 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .. import principal_cache
 from ..authentication import clear_jwt_cookies, get_refresh_token_from_cookie, set_jwt_cookies
 from ..serializers import TokenRefreshSerializer
 from .common import (
@@ -82,6 +83,7 @@ class LogoutView(SchemaAPIView):
                     except Exception:
                         pass
         finally:
+            principal_cache.invalidate(request.user.id)
             response = Response({"success": True, "message": "登出成功"})
             clear_jwt_cookies(response)
             return response
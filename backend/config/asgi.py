@@ -16,13 +16,21 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.security.websocket import AllowedHostsOriginValidator
 
 from apps.ai.middleware import JWTAuthMiddleware
-from apps.ai.routing import websocket_urlpatterns
+from apps.ai.routing import websocket_urlpatterns as ai_websocket_urlpatterns
+from apps.contests.routing import websocket_urlpatterns as contest_websocket_urlpatterns
+from apps.submissions.routing import websocket_urlpatterns as submission_websocket_urlpatterns
 
 application = ProtocolTypeRouter(
     {
         "http": django_asgi_app,
         "websocket": AllowedHostsOriginValidator(
-            JWTAuthMiddleware(URLRouter(websocket_urlpatterns))
+            JWTAuthMiddleware(
+                URLRouter(
+                    ai_websocket_urlpatterns
+                    + submission_websocket_urlpatterns
+                    + contest_websocket_urlpatterns
+                )
+            )
         ),
     }
 )
@@ -1,5 +1,7 @@
+import glob
 import os
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.dev')
@@ -15,6 +17,43 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+
+@worker_init.connect
+def start_metrics_exporter(**kwargs):
+    """Serve Prometheus metrics from the worker's main process.
+
+    Pool children record into PROMETHEUS_MULTIPROC_DIR; the exporter in the
+    parent aggregates them so one port covers the whole worker.
+    """
+    from django.conf import settings
+
+    port = getattr(settings, 'WORKER_METRICS_PORT', 0)
+    if not port or not getattr(settings, 'METRICS_ENABLED', True):
+        return
+
+    from prometheus_client import CollectorRegistry, start_http_server, multiprocess
+
+    multiproc_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if multiproc_dir:
+        os.makedirs(multiproc_dir, exist_ok=True)
+        # Drop samples left by the previous worker run in this container.
+        for stale in glob.glob(os.path.join(multiproc_dir, '*.db')):
+            os.remove(stale)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(port, registry=registry)
+    else:
+        start_http_server(port)
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -59,6 +59,8 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # Serve static files in production
     "apps.core.middleware.RequestIDMiddleware",
+    "apps.core.middleware.RequestMetricsMiddleware",
+    "apps.core.middleware.QueryBudgetMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -164,7 +166,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "oauth2_provider.contrib.rest_framework.OAuth2Authentication",  # MCP OAuth (first: returns None for non-OAuth tokens)
+        "apps.users.authentication.JWTAwareOAuth2Authentication",  # MCP OAuth (first: returns None for JWT / non-OAuth tokens)
         "apps.users.authentication.CookieJWTAuthentication",  # Cookie-based JWT (more secure)
         "rest_framework_simplejwt.authentication.JWTAuthentication",  # Header-based JWT (fallback for API clients)
     ],
@@ -202,6 +204,11 @@ SIMPLE_JWT = {
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
 }
 
+# Authenticated JWT principal cache (users.principal_cache), keyed by token JTI.
+# Saves the per-request user SELECT; role/active changes and logout invalidate
+# it immediately. 0 disables.
+AUTH_PRINCIPAL_CACHE_SECONDS = int(os.getenv("AUTH_PRINCIPAL_CACHE_SECONDS", "60"))
+
 # JWT Cookie settings (HttpOnly for security)
 JWT_AUTH_COOKIE = "access_token"
 JWT_AUTH_REFRESH_COOKIE = "refresh_token"
@@ -292,10 +299,10 @@ CSRF_COOKIE_NAME = "csrftoken"
 CSRF_HEADER_NAME = "HTTP_X_CSRFTOKEN"
 
 # Redis Cache settings
-# Using Django's built-in Redis backend (Django 4.0+)
+# Django's built-in Redis backend (Django 4.0+) with Prometheus hit/miss counters
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "BACKEND": "apps.core.cache.InstrumentedRedisCache",
         "LOCATION": os.getenv("REDIS_URL", "redis://localhost:6379/1"),
         "KEY_PREFIX": "qjudge",
         "TIMEOUT": 300,  # 5 minutes default
@@ -351,6 +358,18 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.ai.tasks.sweep_stale_ai_runs",
         "schedule": 60.0,
     },
+    "flush-exam-answer-drafts-every-10-seconds": {
+        "task": "apps.contests.tasks.flush_exam_answer_drafts",
+        "schedule": 10.0,
+    },
+    "dispatch-judge-queue-every-30-seconds": {
+        "task": "apps.submissions.tasks.dispatch_judge_queue",
+        "schedule": 30.0,
+    },
+    "publish-judge-queue-stats-every-5-seconds": {
+        "task": "apps.submissions.tasks.publish_judge_queue_stats",
+        "schedule": 5.0,
+    },
 }
 
 # NYCU OAuth settings
@@ -444,6 +463,19 @@ OBJECT_STORAGE_AUTO_CREATE_BUCKETS = os.getenv(
     "OBJECT_STORAGE_AUTO_CREATE_BUCKETS",
     "false" if _OBJECT_STORAGE_IS_R2 else "true",
 ).lower() == "true"
+# Clients are shared process-wide (apps.core.services.object_storage); this
+# bounds the HTTP connections each one keeps open to the provider.
+OBJECT_STORAGE_MAX_POOL_CONNECTIONS = int(
+    os.getenv("OBJECT_STORAGE_MAX_POOL_CONNECTIONS", "32")
+)
+# File-object uploads above this size switch to multipart (min 5 MiB).
+OBJECT_STORAGE_MULTIPART_THRESHOLD_BYTES = int(
+    os.getenv("OBJECT_STORAGE_MULTIPART_THRESHOLD_BYTES", str(8 * 1024 * 1024))
+)
+# Chunk size when streaming an object through a backend response.
+OBJECT_STORAGE_STREAM_CHUNK_BYTES = int(
+    os.getenv("OBJECT_STORAGE_STREAM_CHUNK_BYTES", str(64 * 1024))
+)
 
 MARKDOWN_IMAGE_S3_ENDPOINT_URL = OBJECT_STORAGE_ENDPOINT_URL
 MARKDOWN_IMAGE_S3_REGION = OBJECT_STORAGE_REGION
@@ -455,6 +487,14 @@ ANTICHEAT_RAW_BUCKET = os.getenv("ANTICHEAT_RAW_BUCKET", "anticheat-raw")
 ANTICHEAT_CAPTURE_INTERVAL_SECONDS = int(
     os.getenv("ANTICHEAT_CAPTURE_INTERVAL_SECONDS", "3")
 )
+# Thumbnails / per-cluster contact sheets generated after evidence upload confirm.
+ANTICHEAT_EVIDENCE_THUMBNAILS_ENABLED = (
+    os.getenv("ANTICHEAT_EVIDENCE_THUMBNAILS_ENABLED", "true").lower() == "true"
+)
+# Parallel HEAD requests when validating one evidence upload-confirm batch.
+ANTICHEAT_EVIDENCE_HEAD_CONCURRENCY = int(
+    os.getenv("ANTICHEAT_EVIDENCE_HEAD_CONCURRENCY", "8")
+)
 
 # Cloudflare Realtime SFU live monitoring settings.
 # Keep disabled by default so existing exam monitoring/CD flows are untouched.
@@ -482,13 +522,101 @@ MARKDOWN_IMAGE_PUBLIC_BASE_URL = os.getenv(
     "MARKDOWN_IMAGE_PUBLIC_BASE_URL",
     os.getenv("FRONTEND_URL", ""),
 ).strip()
+# "redirect": image reads answer with a 302 to a presigned object storage URL,
+# so image bytes skip the backend workers; "proxy": stream them through the
+# backend. Redirects need a browser-reachable OBJECT_STORAGE_PUBLIC_ENDPOINT_URL.
+MARKDOWN_IMAGE_DELIVERY = os.getenv(
+    "MARKDOWN_IMAGE_DELIVERY",
+    "redirect" if OBJECT_STORAGE_PUBLIC_ENDPOINT_URL else "proxy",
+).strip().lower()
+MARKDOWN_IMAGE_PRESIGNED_URL_TTL_SECONDS = int(
+    os.getenv("MARKDOWN_IMAGE_PRESIGNED_URL_TTL_SECONDS", "3600")
+)
 
 AI_ARTIFACT_S3_BUCKET = os.getenv("AI_ARTIFACT_S3_BUCKET", "ai-artifacts")
 AI_ARTIFACT_MAX_BYTES = int(os.getenv("AI_ARTIFACT_MAX_BYTES", "10485760"))  # 10 MB
 
+# Bulk participant-report ZIP exports (contests.services.report_archive).
+CONTEST_REPORT_ARCHIVE_BUCKET = os.getenv("CONTEST_REPORT_ARCHIVE_BUCKET", "contest-reports")
+# Worker processes for HTML -> PDF rendering inside one export job (<=1: in-process).
+# Celery prefork children cannot fork, so only raise this for solo/threads workers;
+# the job falls back to in-process rendering when the pool cannot start.
+CONTEST_REPORT_ARCHIVE_RENDER_PROCESSES = int(
+    os.getenv("CONTEST_REPORT_ARCHIVE_RENDER_PROCESSES", "0")
+)
+
+# Rendered Markdown / highlighted-code fragments shared by exporters
+# (contests.exporters.render_cache). SHARED also stores them in the Django cache.
+EXPORT_RENDER_CACHE_MAX_ENTRIES = int(os.getenv("EXPORT_RENDER_CACHE_MAX_ENTRIES", "2048"))
+EXPORT_RENDER_CACHE_SHARED = os.getenv("EXPORT_RENDER_CACHE_SHARED", "false").lower() == "true"
+
+# Rendered contest / paper-exam exports cached by content version
+# (contests.services.export_cache).
+CONTEST_EXPORT_CACHE_ENABLED = os.getenv("CONTEST_EXPORT_CACHE_ENABLED", "true").lower() == "true"
+CONTEST_EXPORT_CACHE_BUCKET = os.getenv("CONTEST_EXPORT_CACHE_BUCKET", "contest-exports")
+
+# Fair-share judge scheduler (submissions.judge_scheduler): per-contest / per-user
+# fair queuing in Redis. Each lane admits as many submissions into Celery as the
+# live worker slots serving it (judge_pool heartbeats); JUDGE_SCHEDULER_CAPACITY
+# applies until workers report and should match the workers' --autoscale maximum.
+JUDGE_SCHEDULER_ENABLED = os.getenv("JUDGE_SCHEDULER_ENABLED", "true").lower() == "true"
+JUDGE_SCHEDULER_CAPACITY = {
+    "high_priority": int(os.getenv("JUDGE_SCHEDULER_HIGH_PRIORITY_CAPACITY", "8")),
+    "default": int(os.getenv("JUDGE_SCHEDULER_DEFAULT_CAPACITY", "8")),
+}
+JUDGE_SCHEDULER_LEASE_SECONDS = int(os.getenv("JUDGE_SCHEDULER_LEASE_SECONDS", "600"))
+# Identical pending submissions within this window are collapsed into one.
+JUDGE_DEDUP_WINDOW_SECONDS = int(os.getenv("JUDGE_DEDUP_WINDOW_SECONDS", "600"))
+
+# Judge worker pool (submissions.judge_pool): workers started with
+# --autoscale=MAX,MIN size themselves to the Docker host (cores x slots per core,
+# minus sandboxes of other workers on that host) and heartbeat into Redis.
+CELERY_WORKER_AUTOSCALER = "apps.submissions.judge_pool:JudgeAutoscaler"
+JUDGE_WORKER_SLOTS_PER_CORE = float(os.getenv("JUDGE_WORKER_SLOTS_PER_CORE", "1.0"))
+JUDGE_POOL_PROBE_SECONDS = float(os.getenv("JUDGE_POOL_PROBE_SECONDS", "5"))
+# Assumed judge task duration until workers have reported real ones.
+JUDGE_WAIT_DEFAULT_SECONDS = float(os.getenv("JUDGE_WAIT_DEFAULT_SECONDS", "3"))
+
+# Push judge progress / verdicts to WebSocket subscribers (submissions.events)
+# through CHANNEL_LAYERS; clients fall back to slow polling when disconnected.
+SUBMISSION_PUSH_ENABLED = os.getenv("SUBMISSION_PUSH_ENABLED", "true").lower() == "true"
+
+# Live proctoring stream (contests.services.proctoring_stream): exam events,
+# status transitions and evidence confirmations are buffered per contest while a
+# proctor is connected and flushed as one aggregated batch per tick, so message
+# rate does not grow with room size.
+PROCTORING_STREAM_ENABLED = os.getenv("PROCTORING_STREAM_ENABLED", "true").lower() == "true"
+PROCTORING_STREAM_FLUSH_SECONDS = float(os.getenv("PROCTORING_STREAM_FLUSH_SECONDS", "2"))
+PROCTORING_STREAM_MAX_EVENTS = int(os.getenv("PROCTORING_STREAM_MAX_EVENTS", "50"))
+PROCTORING_STREAM_ONLINE_SECONDS = int(os.getenv("PROCTORING_STREAM_ONLINE_SECONDS", "10"))
+
+# Essay / open-document autosaves buffered in Redis and flushed to ExamAnswer
+# periodically and on submission (contests.services.exam_answer_drafts).
+EXAM_ANSWER_DRAFTS_ENABLED = os.getenv("EXAM_ANSWER_DRAFTS_ENABLED", "true").lower() == "true"
+EXAM_ANSWER_DRAFT_FLUSH_SECONDS = int(os.getenv("EXAM_ANSWER_DRAFT_FLUSH_SECONDS", "30"))
+
 # Recur Payment settings
 RECUR_PUBLISHABLE_KEY = os.getenv("RECUR_PUBLISHABLE_KEY", "")
 RECUR_SECRET_KEY = os.getenv("RECUR_SECRET_KEY", "")
 RECUR_WEBHOOK_SECRET = os.getenv("RECUR_WEBHOOK_SECRET", "")
 RECUR_PRODUCT_PRO_ID = os.getenv("RECUR_PRODUCT_PRO_ID", "")
 RECUR_PRODUCT_TEAM_ID = os.getenv("RECUR_PRODUCT_TEAM_ID", "")
+
+# Prometheus metrics (apps.core.metrics). /metrics is served by the web process;
+# Celery workers expose the same registry on WORKER_METRICS_PORT (0 = disabled).
+# /metrics requires METRICS_AUTH_TOKEN as a bearer token (Prometheus reads it from
+# monitoring/prometheus/metrics_token); without a token it is only served in DEBUG.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_AUTH_TOKEN = os.getenv("METRICS_AUTH_TOKEN", "")
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "0"))
+
+# Per-request query budget and sampled stack profiles
+# (apps.core.middleware.QueryBudgetMiddleware). Off by default; see loadtest.py.
+QUERY_BUDGET_ENABLED = os.getenv("QUERY_BUDGET_ENABLED", "false").lower() == "true"
+QUERY_BUDGET_MAX_QUERIES = int(os.getenv("QUERY_BUDGET_MAX_QUERIES", "50"))
+# URL name -> budget, for endpoints that legitimately need more (or fewer) queries.
+QUERY_BUDGET_OVERRIDES = {}
+REQUEST_PROFILER_SAMPLE_RATE = float(os.getenv("REQUEST_PROFILER_SAMPLE_RATE", "0"))
+REQUEST_PROFILER_INTERVAL_MS = float(os.getenv("REQUEST_PROFILER_INTERVAL_MS", "5"))
+REQUEST_PROFILER_SLOW_MS = float(os.getenv("REQUEST_PROFILER_SLOW_MS", "500"))
+REQUEST_PROFILER_DIR = os.getenv("REQUEST_PROFILER_DIR", "/tmp/qjudge-profiles")
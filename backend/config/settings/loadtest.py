@@ -30,6 +30,15 @@ LOADTEST_DISABLE_LOGIN_RATELIMIT = os.getenv(
     "LOADTEST_DISABLE_LOGIN_RATELIMIT", "1"
 ) == "1"
 
+# --- Query budget / sampled profiles (apps.core.middleware.QueryBudgetMiddleware) ---
+# Over-budget requests are logged with their most repeated statement (N+1);
+# sampled requests slower than REQUEST_PROFILER_SLOW_MS are written as
+# flame-graph folded stacks to REQUEST_PROFILER_DIR/<request_id>.folded.
+QUERY_BUDGET_ENABLED = os.getenv("QUERY_BUDGET_ENABLED", "true").lower() == "true"
+QUERY_BUDGET_MAX_QUERIES = int(os.getenv("QUERY_BUDGET_MAX_QUERIES", "30"))
+REQUEST_PROFILER_SAMPLE_RATE = float(os.getenv("REQUEST_PROFILER_SAMPLE_RATE", "0.05"))
+REQUEST_PROFILER_SLOW_MS = float(os.getenv("REQUEST_PROFILER_SLOW_MS", "300"))
+
 # --- Object storage / Anticheat ---
 OBJECT_STORAGE_ENDPOINT_URL = os.getenv("OBJECT_STORAGE_ENDPOINT_URL", "")
 # For Locust / browser direct PUT.
@@ -72,7 +72,7 @@ else:
 # CI environment provides Redis service
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'BACKEND': 'apps.core.cache.InstrumentedRedisCache',
         'LOCATION': os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
         'KEY_PREFIX': 'qjudge_test',
         'TIMEOUT': 300,
@@ -88,6 +88,31 @@ RATELIMIT_ENABLE = False
 # DRF UserRateThrottle（base 預設 120/min）易與 pytest / Playwright E2E 撞 429，測試 settings 關閉。
 REST_FRAMEWORK = {**REST_FRAMEWORK, "DEFAULT_THROTTLE_CLASSES": []}
 
+# 匯出快取需要物件儲存；個別測試以 fake client 開啟
+CONTEST_EXPORT_CACHE_ENABLED = False
+
+# 作答草稿緩衝預設關閉，讓作答立即寫入資料庫；個別測試自行開啟
+EXAM_ANSWER_DRAFTS_ENABLED = False
+
+# 公平排程器將評測暫存於 Redis；測試預設直接送進 Celery，個別測試自行開啟
+JUDGE_SCHEDULER_ENABLED = False
+
+# 評測結果推播使用記憶體 channel layer；預設關閉，個別測試自行開啟
+CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+SUBMISSION_PUSH_ENABLED = False
+
+# 監考即時串流預設關閉，個別測試自行開啟
+PROCTORING_STREAM_ENABLED = False
+
+# JWT 使用者快取跨請求保留使用者資料；預設關閉，個別測試自行開啟
+AUTH_PRINCIPAL_CACHE_SECONDS = 0
+
+# 證據縮圖需要物件儲存；個別測試以 fake client 開啟
+ANTICHEAT_EVIDENCE_THUMBNAILS_ENABLED = False
+
+# Markdown 圖片走後端串流；轉址模式由個別測試開啟
+MARKDOWN_IMAGE_DELIVERY = "proxy"
+
 # Faster password hashing for tests
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
@@ -9,6 +9,7 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, Spec
 from rest_framework.permissions import IsAdminUser
 from apps.core.views.health import health_check
 from apps.core.views.landing_markdown import LandingMarkdownView
+from apps.core.views.metrics import metrics_view
 from apps.users.views import ActionLinkInspectView, ActionLinkIssueView, ActionLinkRedeemView
 schema_view_kwargs = {}
 if not settings.DEBUG:
@@ -17,6 +18,7 @@ if not settings.DEBUG:
 urlpatterns = [
     path('', LandingMarkdownView.as_view(), name='landing-markdown'),
     path('api/health/', health_check, name='health-check'),
+    path('metrics', metrics_view, name='metrics'),
     path('django-admin/', admin.site.urls),  # Django backend admin (use only when frontend cannot handle it)
     path('', include('apps.oauth.urls')),  # Custom OAuth views (must be before oauth2_provider)
     path('o/', include('oauth2_provider.urls', namespace='oauth2_provider')),  # OAuth 2.1
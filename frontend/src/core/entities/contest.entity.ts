@@ -285,9 +285,17 @@ export interface ParticipantDashboard {
       };
   timeline: ParticipantDashboardTimelineItem[];
   eventFeed: EventFeedItem[];
+  /** Cursor for older incidents; null when the first page is complete. */
+  eventFeedNextCursor: string | null;
   actions: ParticipantDashboardActions;
 }
 
+export interface ParticipantEventFeedPage {
+  items: EventFeedItem[];
+  nextCursor: string | null;
+  hasMore: boolean;
+}
+
 export interface Contest {
   id: string;
   name: string;
@@ -35,6 +35,8 @@ export interface Submission {
   execTime?: number;
   memoryUsage?: number;
   createdAt: string;
+  /** Seconds until a pending submission is likely judged; null when unknown. */
+  estimatedJudgeWait?: number | null;
   
   // Optional context
   contestId?: string;
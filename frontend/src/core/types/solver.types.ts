@@ -71,6 +71,8 @@ export interface SubmissionResult {
   error?: string;
   submissionId?: string;
   cases?: TestCaseResult[];
+  /** Seconds until a pending submission is likely judged (from the judge pool). */
+  estimatedWait?: number | null;
 }
 
 /**
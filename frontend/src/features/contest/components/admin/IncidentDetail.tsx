@@ -365,7 +365,11 @@ export default function IncidentDetail({
                             className={styles.frame}
                             onClick={() => setImageViewerIndex(Math.max(0, frames.indexOf(frame)))}
                           >
-                            <img src={frame.url} alt={`${source} seq ${frame.seq}`} loading="lazy" />
+                            <img
+                              src={frame.thumbnail_url || frame.url}
+                              alt={`${source} seq ${frame.seq}`}
+                              loading="lazy"
+                            />
                             <span>
                               {formatContestClockTime(frame.ts_ms, undefined, { includeSeconds: true })}
                             </span>
@@ -49,6 +49,7 @@ import PaperQuestionReportCard from "@/features/contest/components/exam/PaperQue
 import ContestLogsScreen from "@/features/contest/screens/settings/ContestLogsScreen";
 import { questionTypeLabel } from "@/features/contest/screens/settings/grading/gradingTypes";
 import { useContestSubmissions } from "@/features/contest/hooks/useContestSubmissions";
+import { useParticipantEventFeed } from "@/features/contest/hooks/useParticipantEventFeed";
 import { OverviewDataCards } from "@/shared/ui/dataCard";
 import ContainerCard from "@/shared/layout/ContainerCard";
 import { useTheme } from "@/shared/ui/theme/ThemeContext";
@@ -144,6 +145,7 @@ const ParticipantDashboardPane: React.FC<ParticipantDashboardPaneProps> = ({
 }) => {
   const { t } = useTranslation("contest");
   const { theme } = useTheme();
+  const participantEventFeed = useParticipantEventFeed(contestId, dashboard);
   const [submissionsPage, setSubmissionsPage] = useState(1);
   const [submissionsPageSize, setSubmissionsPageSize] = useState(10);
 
@@ -831,7 +833,9 @@ const ParticipantDashboardPane: React.FC<ParticipantDashboardPaneProps> = ({
                   <ContestLogsScreen
                     embedded
                     userIdFilter={participant.userId}
-                    eventFeed={dashboard?.eventFeed}
+                    eventFeed={participantEventFeed.eventFeed}
+                    hasOlderEvents={participantEventFeed.hasOlder}
+                    onLoadOlderEvents={participantEventFeed.loadOlder}
                     onRefresh={onRefreshEvents}
                   />
                 ) : null}
@@ -4,6 +4,7 @@ import React, {
   useContext,
   useEffect,
   useMemo,
+  useRef,
   useState,
 } from "react";
 import type { ReactNode } from "react";
@@ -19,6 +20,10 @@ import type {
   ContestOverviewMetrics,
   ExamEvent,
 } from "@/core/entities/contest.entity";
+import {
+  useProctoringStream,
+  type ProctoringMessage,
+} from "../hooks/useProctoringStream";
 
 interface ContestAdminContextType {
   participants: ContestParticipant[];
@@ -84,6 +89,9 @@ const sameParticipantSnapshot = (
   return true;
 };
 
+/** Live-stream driven refetches of one slice happen at most this often. */
+const LIVE_REFRESH_MS = 5_000;
+
 interface ContestAdminProviderProps {
   children: ReactNode;
   contestId?: string;
@@ -190,6 +198,45 @@ export const ContestAdminProvider: React.FC<ContestAdminProviderProps> = ({
     refreshParticipants,
   ]);
 
+  // Live proctoring stream: status changes and evidence refresh the
+  // participant grid, new events refresh the event feed, and online counts
+  // patch the overview metrics in place.
+  const liveRefreshTimers = useRef<Record<string, ReturnType<typeof setTimeout>>>({});
+  const scheduleLiveRefresh = useCallback(
+    (key: string, refresh: () => Promise<void>) => {
+      if (liveRefreshTimers.current[key]) return;
+      liveRefreshTimers.current[key] = setTimeout(() => {
+        delete liveRefreshTimers.current[key];
+        void refresh();
+      }, LIVE_REFRESH_MS);
+    },
+    [],
+  );
+
+  useEffect(() => {
+    const timers = liveRefreshTimers.current;
+    return () => Object.values(timers).forEach(clearTimeout);
+  }, []);
+
+  const handleProctoringMessage = useCallback(
+    (message: ProctoringMessage) => {
+      if (message.online) {
+        const onlineNow = message.online.online_now;
+        setOverviewMetrics((prev) => (prev ? { ...prev, onlineNow } : prev));
+      }
+      if (message.type !== "proctoring.batch") return;
+      if (message.status_changes.length > 0 || message.evidence_uploads.length > 0) {
+        scheduleLiveRefresh("participants", refreshParticipants);
+      }
+      if (message.events.length > 0 || message.omitted > 0) {
+        scheduleLiveRefresh("events", refreshExamEvents);
+      }
+    },
+    [refreshExamEvents, refreshParticipants, scheduleLiveRefresh],
+  );
+
+  useProctoringStream(contestId, handleProctoringMessage, { enabled: autoLoad });
+
   const value = useMemo(
     () => ({
       participants,
@@ -6,3 +6,5 @@ export { useContestRuntimeMode } from "./useContestRuntimeMode";
 export type { ContestRuntimeMode } from "./useContestRuntimeMode";
 export { useContestSubmissions } from "./useContestSubmissions";
 export { useContestTimers } from "./useContestTimers";
+export { useProctoringStream } from "./useProctoringStream";
+export type { ProctoringMessage } from "./useProctoringStream";
@@ -0,0 +1,51 @@
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
+import { getParticipantEventFeedPage } from "@/infrastructure/api/repositories/contestParticipants.repository";
+import type { EventFeedItem, ParticipantDashboard } from "@/core/entities/contest.entity";
+
+/**
+ * Participant event feed: the dashboard's first page plus older pages
+ * fetched on demand through the cursor-paginated event-feed endpoint.
+ */
+export const useParticipantEventFeed = (
+  contestId: string | undefined,
+  dashboard: ParticipantDashboard | null,
+) => {
+  const [olderItems, setOlderItems] = useState<EventFeedItem[]>([]);
+  const [cursor, setCursor] = useState<string | null>(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
+  const inFlightRef = useRef(false);
+
+  // A refreshed dashboard restarts the feed from its first page.
+  useEffect(() => {
+    setOlderItems([]);
+    setCursor(dashboard?.eventFeedNextCursor ?? null);
+  }, [dashboard]);
+
+  const userId = dashboard?.participant.userId;
+  const loadOlder = useCallback(async () => {
+    if (!contestId || !userId || !cursor || inFlightRef.current) return;
+    inFlightRef.current = true;
+    setLoadingOlder(true);
+    try {
+      const page = await getParticipantEventFeedPage(contestId, userId, { cursor });
+      setOlderItems((prev) => [...prev, ...page.items]);
+      setCursor(page.nextCursor);
+    } finally {
+      inFlightRef.current = false;
+      setLoadingOlder(false);
+    }
+  }, [contestId, cursor, userId]);
+
+  const firstPage = dashboard?.eventFeed;
+  const eventFeed = useMemo(
+    () => (firstPage ? [...firstPage, ...olderItems] : undefined),
+    [firstPage, olderItems],
+  );
+
+  return {
+    eventFeed,
+    hasOlder: cursor != null,
+    loadingOlder,
+    loadOlder,
+  };
+};
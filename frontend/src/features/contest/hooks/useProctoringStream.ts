@@ -0,0 +1,113 @@
+import { useEffect, useRef, useState } from "react";
+
+export interface ProctoringOnlineSummary {
+  online_now: number;
+  active: number;
+  status_counts: Record<string, number>;
+}
+
+export interface ProctoringSnapshotMessage {
+  type: "proctoring.snapshot";
+  contest_id: string;
+  online: ProctoringOnlineSummary;
+}
+
+export interface ProctoringBatchMessage {
+  type: "proctoring.batch";
+  contest_id: string;
+  at: string;
+  events: Array<{
+    id: number;
+    user_id: number;
+    event_type: string;
+    module: string | null;
+    created_at: string | null;
+  }>;
+  event_counts: Record<string, number>;
+  status_changes: Array<{
+    user_id: number;
+    from: string;
+    to: string;
+    lock_reason: string;
+    at: string;
+  }>;
+  evidence_uploads: Array<{ user_id: number; source_module: string | null; frames: number }>;
+  omitted: number;
+  online?: ProctoringOnlineSummary;
+}
+
+export type ProctoringMessage = ProctoringSnapshotMessage | ProctoringBatchMessage;
+
+const PING_INTERVAL_MS = 25_000;
+const MAX_RETRY_DELAY_MS = 30_000;
+
+const buildSocketUrl = (contestId: string) => {
+  const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
+  return `${protocol}//${window.location.host}/ws/contests/${contestId}/proctoring/`;
+};
+
+/**
+ * Live proctoring stream for contest staff (auth via the HttpOnly access
+ * cookie). The server aggregates a whole room into at most one batch per
+ * flush tick; reconnects with backoff.
+ */
+export const useProctoringStream = (
+  contestId: string | undefined,
+  onMessage: (message: ProctoringMessage) => void,
+  { enabled = true }: { enabled?: boolean } = {},
+) => {
+  const [connected, setConnected] = useState(false);
+  const onMessageRef = useRef(onMessage);
+
+  useEffect(() => {
+    onMessageRef.current = onMessage;
+  }, [onMessage]);
+
+  useEffect(() => {
+    if (!enabled || !contestId || typeof WebSocket === "undefined") return undefined;
+
+    let socket: WebSocket | null = null;
+    let retryTimer: ReturnType<typeof setTimeout> | undefined;
+    let pingTimer: ReturnType<typeof setInterval> | undefined;
+    let attempts = 0;
+    let closed = false;
+
+    const connect = () => {
+      socket = new WebSocket(buildSocketUrl(contestId));
+      socket.onopen = () => {
+        attempts = 0;
+        setConnected(true);
+        pingTimer = setInterval(() => socket?.send(JSON.stringify({ type: "ping" })), PING_INTERVAL_MS);
+      };
+      socket.onmessage = (message) => {
+        try {
+          const data = JSON.parse(message.data);
+          if (data?.type === "proctoring.snapshot" || data?.type === "proctoring.batch") {
+            onMessageRef.current(data as ProctoringMessage);
+          }
+        } catch {
+          // Ignore malformed frames.
+        }
+      };
+      socket.onclose = () => {
+        setConnected(false);
+        clearInterval(pingTimer);
+        if (closed) return;
+        const delay = Math.min(MAX_RETRY_DELAY_MS, 1000 * 2 ** attempts);
+        attempts += 1;
+        retryTimer = setTimeout(connect, delay);
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      clearInterval(pingTimer);
+      socket?.close();
+      setConnected(false);
+    };
+  }, [enabled, contestId]);
+
+  return { connected };
+};
@@ -259,6 +259,9 @@ interface ContestLogsScreenProps extends Partial<AdminPanelProps> {
   userIdFilter?: string;
   embedded?: boolean;
   eventFeed?: EventFeedItem[];
+  /** Server-side pages remain beyond ``eventFeed`` (participant event feed). */
+  hasOlderEvents?: boolean;
+  onLoadOlderEvents?: () => Promise<void> | void;
   onRefresh?: () => Promise<void> | void;
 }
 
@@ -266,6 +269,8 @@ const ContestLogsScreen: React.FC<ContestLogsScreenProps> = ({
   userIdFilter,
   embedded = false,
   eventFeed: externalEventFeed,
+  hasOlderEvents = false,
+  onLoadOlderEvents,
   onRefresh,
 }) => {
   const { contestId } = useParams<{ contestId: string }>();
@@ -461,6 +466,7 @@ const ContestLogsScreen: React.FC<ContestLogsScreenProps> = ({
   }, [activeTab, embedded]);
 
   const hasMore = visibleCount < filteredFeed.length;
+  const canLoadOlder = hasOlderEvents && !!onLoadOlderEvents;
 
   const handleLoadMore = useCallback(() => {
     setVisibleCount((prev) => prev + PAGE_SIZE);
@@ -469,16 +475,19 @@ const ContestLogsScreen: React.FC<ContestLogsScreenProps> = ({
   useEffect(() => {
     const sentinel = sentinelRef.current;
     const container = scrollContainerRef.current;
-    if (!sentinel || !container || !hasMore) return;
+    if (!sentinel || !container || (!hasMore && !canLoadOlder)) return;
     const observer = new IntersectionObserver(
       (entries) => {
-        if (entries[0].isIntersecting) handleLoadMore();
+        if (!entries[0].isIntersecting) return;
+        // Reveal locally loaded incidents first, then fetch older pages.
+        if (hasMore) handleLoadMore();
+        else void onLoadOlderEvents?.();
       },
       { root: embedded ? null : container, rootMargin: "200px" },
     );
     observer.observe(sentinel);
     return () => observer.disconnect();
-  }, [embedded, hasMore, handleLoadMore]);
+  }, [embedded, hasMore, canLoadOlder, handleLoadMore, onLoadOlderEvents]);
 
   const loading =
     antiCheatConfigLoading ||
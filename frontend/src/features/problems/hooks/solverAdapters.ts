@@ -67,5 +67,6 @@ export const transformSubmissionToResult = (data: any): SubmissionResult => {
     error: data.errorMessage,
     submissionId: data.id,
     cases,
+    estimatedWait: isPending ? data.estimatedJudgeWait ?? null : null,
   };
 };
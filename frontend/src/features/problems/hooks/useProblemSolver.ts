@@ -2,6 +2,7 @@ import { useState, useEffect, useCallback, useMemo } from "react";
 import { submitSolution, getSubmission } from "@/infrastructure/api/repositories/submission.repository";
 import { testRun } from "@/infrastructure/api/repositories/problem.repository";
 import { useInterval } from "@/shared/hooks/useInterval";
+import { useSubmissionEvents, type SubmissionEvent } from "@/features/submissions/hooks";
 import type { CodingProblemDetail } from "@/core/entities/problem.entity";
 import type { TestCaseItem } from "@/core/entities/testcase.entity";
 import {
@@ -356,11 +357,8 @@ export function useProblemSolver({
     return executeSubmit();
   }, [executeSubmit]);
 
-  // Polling Effect - only for formal submissions (test runs don't need polling)
-  useInterval(() => {
-    if (executionState.status !== 'polling' || !executionState.pollingId) return;
-    
-    getSubmission(executionState.pollingId)
+  const pollSubmission = useCallback((submissionId: string) => {
+    getSubmission(submissionId)
       .then((data) => {
         if (!data) return;
         const isPending = data.status === "pending" || data.status === "judging";
@@ -387,8 +385,30 @@ export function useProblemSolver({
           error: "無法獲取結果: " + (err.message || "Unknown error")
         }));
       });
+  }, []);
+
+  // Verdicts are pushed over WebSocket; fetch the full result once it lands.
+  const isPolling = executionState.status === 'polling';
+  const pollingId = executionState.pollingId;
+  const handleSubmissionEvent = useCallback((event: SubmissionEvent) => {
+    if (!pollingId || String(event.submission_id) !== pollingId) return;
+    if (event.type === "submission.verdict") {
+      pollSubmission(pollingId);
+    }
+  }, [pollingId, pollSubmission]);
+  const { connected: pushConnected } = useSubmissionEvents(handleSubmissionEvent, { enabled: isPolling });
+
+  // The verdict may have landed before the socket subscribed: check once on connect.
+  useEffect(() => {
+    if (pushConnected && isPolling && pollingId) pollSubmission(pollingId);
+  }, [pushConnected, isPolling, pollingId, pollSubmission]);
 
-  }, executionState.status === 'polling' ? 2000 : null);
+  // Polling fallback - only for formal submissions (test runs don't need polling);
+  // slowed down while the push channel is connected.
+  useInterval(() => {
+    if (!isPolling || !pollingId) return;
+    pollSubmission(pollingId);
+  }, isPolling ? (pushConnected ? 15000 : 2000) : null);
 
   return {
     resultOpen,
@@ -0,0 +1,6 @@
+export {
+  useSubmissionEvents,
+  type SubmissionEvent,
+  type SubmissionProgressEvent,
+  type SubmissionVerdictEvent,
+} from "./useSubmissionEvents";
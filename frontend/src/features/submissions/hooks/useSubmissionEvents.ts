@@ -0,0 +1,102 @@
+import { useEffect, useRef, useState } from "react";
+
+export interface SubmissionProgressEvent {
+  type: "submission.progress";
+  submission_id: number;
+  user_id: number;
+  problem_id: string | null;
+  contest_id: string | null;
+  case: number;
+  total: number;
+  case_status: string;
+  exec_time: number;
+  memory_usage: number;
+}
+
+export interface SubmissionVerdictEvent {
+  type: "submission.verdict";
+  submission_id: number;
+  user_id: number;
+  problem_id: string | null;
+  contest_id: string | null;
+  status: string;
+  score: number;
+  exec_time: number;
+  memory_usage: number;
+}
+
+export type SubmissionEvent = SubmissionProgressEvent | SubmissionVerdictEvent;
+
+const PING_INTERVAL_MS = 25_000;
+const MAX_RETRY_DELAY_MS = 30_000;
+
+const buildSocketUrl = (contestId?: string) => {
+  const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
+  const path = contestId ? `/ws/contests/${contestId}/submissions/` : "/ws/submissions/";
+  return `${protocol}//${window.location.host}${path}`;
+};
+
+/**
+ * Judge progress / verdict push (auth via the HttpOnly access cookie).
+ * Reconnects with backoff; `connected` lets callers slow their polling
+ * fallback while the socket is up.
+ */
+export const useSubmissionEvents = (
+  onEvent: (event: SubmissionEvent) => void,
+  { enabled = true, contestId }: { enabled?: boolean; contestId?: string } = {},
+) => {
+  const [connected, setConnected] = useState(false);
+  const onEventRef = useRef(onEvent);
+
+  useEffect(() => {
+    onEventRef.current = onEvent;
+  }, [onEvent]);
+
+  useEffect(() => {
+    if (!enabled || typeof WebSocket === "undefined") return undefined;
+
+    let socket: WebSocket | null = null;
+    let retryTimer: ReturnType<typeof setTimeout> | undefined;
+    let pingTimer: ReturnType<typeof setInterval> | undefined;
+    let attempts = 0;
+    let closed = false;
+
+    const connect = () => {
+      socket = new WebSocket(buildSocketUrl(contestId));
+      socket.onopen = () => {
+        attempts = 0;
+        setConnected(true);
+        pingTimer = setInterval(() => socket?.send(JSON.stringify({ type: "ping" })), PING_INTERVAL_MS);
+      };
+      socket.onmessage = (message) => {
+        try {
+          const data = JSON.parse(message.data);
+          if (data?.type === "submission.progress" || data?.type === "submission.verdict") {
+            onEventRef.current(data as SubmissionEvent);
+          }
+        } catch {
+          // Ignore malformed frames.
+        }
+      };
+      socket.onclose = () => {
+        setConnected(false);
+        clearInterval(pingTimer);
+        if (closed) return;
+        const delay = Math.min(MAX_RETRY_DELAY_MS, 1000 * 2 ** attempts);
+        attempts += 1;
+        retryTimer = setTimeout(connect, delay);
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      clearInterval(pingTimer);
+      socket?.close();
+      setConnected(false);
+    };
+  }, [enabled, contestId]);
+
+  return { connected };
+};
@@ -8,3 +8,11 @@ export {
   type SubmissionRow,
   type StatusFilterType,
 } from "./components";
+
+// Hooks
+export {
+  useSubmissionEvents,
+  type SubmissionEvent,
+  type SubmissionProgressEvent,
+  type SubmissionVerdictEvent,
+} from "./hooks";
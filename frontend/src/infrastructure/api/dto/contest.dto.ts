@@ -288,6 +288,12 @@ export interface EventFeedItemDto {
   metadata?: any;
 }
 
+export interface ParticipantEventFeedPageDto {
+  items?: EventFeedItemDto[];
+  next_cursor?: string | null;
+  has_more?: boolean;
+}
+
 export interface ParticipantDashboardDto {
   contest_type?: string;
   participant?: ContestParticipantDto;
@@ -318,6 +324,7 @@ export interface ParticipantDashboardDto {
   };
   timeline?: ParticipantTimelineItemDto[];
   event_feed?: EventFeedItemDto[];
+  event_feed_next_cursor?: string | null;
   actions?: {
     can_download_report?: boolean;
     can_edit_status?: boolean;
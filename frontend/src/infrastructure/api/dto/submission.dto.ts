@@ -25,6 +25,7 @@ export interface SubmissionDto {
   memory_usage?: number;
   created_at: string;
   contest_id?: number | string;
+  estimated_judge_wait?: number | null;
 }
 
 export interface SubmissionDetailDto extends SubmissionDto {
@@ -1,12 +1,14 @@
 import { httpClient } from "@/infrastructure/api/http.client";
 
 /**
- * Export contest results as CSV file download
+ * Export contest results as CSV (default) or XLSX file download
  */
 export const exportContestResults = async (
-  contestId: string
+  contestId: string,
+  fileFormat: "csv" | "xlsx" = "csv"
 ): Promise<void> => {
-  const res = await httpClient.get(`/api/v1/contests/${contestId}/export_results/`, {
+  const params = new URLSearchParams({ file_format: fileFormat });
+  const res = await httpClient.get(`/api/v1/contests/${contestId}/export_results/?${params}`, {
     headers: {
       Accept: "*/*",
     },
@@ -24,7 +26,7 @@ export const exportContestResults = async (
   const url = window.URL.createObjectURL(blob);
   const a = document.createElement("a");
   a.href = url;
-  a.download = `contest_${contestId}_results.csv`;
+  a.download = `contest_${contestId}_results.${fileFormat}`;
   document.body.appendChild(a);
   a.click();
   window.URL.revokeObjectURL(url);
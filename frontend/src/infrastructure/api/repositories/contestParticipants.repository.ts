@@ -1,6 +1,14 @@
 import { httpClient, requestJson, ensureOk } from "@/infrastructure/api/http.client";
-import type { ContestParticipant, ParticipantDashboard } from "@/core/entities/contest.entity";
-import { mapContestParticipantDto, mapParticipantDashboardDto } from "@/infrastructure/mappers";
+import type {
+  ContestParticipant,
+  ParticipantDashboard,
+  ParticipantEventFeedPage,
+} from "@/core/entities/contest.entity";
+import {
+  mapContestParticipantDto,
+  mapParticipantDashboardDto,
+  mapParticipantEventFeedPageDto,
+} from "@/infrastructure/mappers";
 
 export const getContestParticipants = async (
   contestId: string
@@ -23,6 +31,26 @@ export const getParticipantDashboard = async (
   return mapParticipantDashboardDto(data);
 };
 
+export const getParticipantEventFeedPage = async (
+  contestId: string,
+  userId: string | number,
+  params: { cursor?: string | null; limit?: number; since?: string; until?: string } = {},
+): Promise<ParticipantEventFeedPage> => {
+  const search = new URLSearchParams();
+  if (params.cursor) search.set("cursor", params.cursor);
+  if (params.limit != null) search.set("limit", String(params.limit));
+  if (params.since) search.set("since", params.since);
+  if (params.until) search.set("until", params.until);
+  const query = search.toString();
+  const data = await requestJson<any>(
+    httpClient.get(
+      `/api/v1/contests/${contestId}/participants/${userId}/event-feed/${query ? `?${query}` : ""}`,
+    ),
+    "Failed to fetch participant event feed",
+  );
+  return mapParticipantEventFeedPageDto(data);
+};
+
 export const unlockParticipant = async (
   contestId: string,
   userId: number
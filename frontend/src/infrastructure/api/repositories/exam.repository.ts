@@ -553,6 +553,8 @@ export const confirmEvidenceUpload = async (
 
 export interface ScreenshotFrame {
   url: string;
+  /** Downscaled copy; null until the thumbnail task has processed the frame. */
+  thumbnail_url?: string | null;
   ts_ms: number;
   seq: number;
   source_module?: EvidenceSourceModule;
@@ -561,6 +563,24 @@ export interface ScreenshotFrame {
   expires_in: number;
 }
 
+export interface ScreenshotContactSheet {
+  url: string;
+  evidence_cluster_id: string;
+  source_module: EvidenceSourceModule;
+  /** Frame ids in tile order (row-major). */
+  evidence_frame_ids: number[];
+  columns: number;
+  tile_width: number;
+  tile_height: number;
+  expires_in: number;
+}
+
+export interface ScreenshotsResponse {
+  items: ScreenshotFrame[];
+  contact_sheets?: ScreenshotContactSheet[];
+  total_raw_count: number;
+}
+
 export const fetchScreenshots = async (
   contestId: string,
   params: {
@@ -574,7 +594,7 @@ export const fetchScreenshots = async (
     object_keys?: string[];
     limit?: number;
   }
-): Promise<{ items: ScreenshotFrame[]; total_raw_count: number }> => {
+): Promise<ScreenshotsResponse> => {
   const search = new URLSearchParams();
   search.set("user_id", params.user_id);
   if (params.ts_from != null) search.set("ts_from", String(params.ts_from));
@@ -587,7 +607,7 @@ export const fetchScreenshots = async (
     params.object_keys.forEach((key) => search.append("object_key", key));
   }
   if (params.limit != null) search.set("limit", String(params.limit));
-  return requestJson<{ items: ScreenshotFrame[]; total_raw_count: number }>(
+  return requestJson<ScreenshotsResponse>(
     httpClient.get(`/api/v1/contests/${contestId}/exam/screenshots/?${search.toString()}`),
     "Failed to fetch screenshots"
   );
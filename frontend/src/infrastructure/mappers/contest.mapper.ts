@@ -33,6 +33,7 @@ export { mapContestAnticheatConfigDto } from "./contest.anticheat.mapper";
 export {
   mapContestParticipantDto,
   mapParticipantDashboardDto,
+  mapParticipantEventFeedPageDto,
 } from "./contest.participant.mapper";
 
 function mapContestProblemSummaryDto(
@@ -9,6 +9,7 @@ import type {
   ParticipantDashboard,
   ParticipantDashboardStatus,
   ParticipantDashboardTimelineItem,
+  ParticipantEventFeedPage,
   ParticipantOverviewSummary,
   ParticipantPaperQuestionDetail,
   ParticipantPaperReportOverviewRow,
@@ -19,6 +20,7 @@ import type {
   ParticipantCodingProblemRowDto,
   ParticipantDashboardDto,
   ParticipantDashboardStatusDto,
+  ParticipantEventFeedPageDto,
   ParticipantPaperReportRowDto,
   ParticipantTimelineItemDto,
 } from "@/infrastructure/api/dto/contest.dto";
@@ -196,6 +198,16 @@ const mapEventFeedItemDto = (dto: EventFeedItemDto): EventFeedItem => ({
   metadata: dto?.metadata || {},
 });
 
+export function mapParticipantEventFeedPageDto(
+  dto: ParticipantEventFeedPageDto,
+): ParticipantEventFeedPage {
+  return {
+    items: Array.isArray(dto?.items) ? dto.items.map(mapEventFeedItemDto) : [],
+    nextCursor: dto?.next_cursor || null,
+    hasMore: !!dto?.has_more,
+  };
+}
+
 export function mapParticipantDashboardDto(
   dto: ParticipantDashboardDto,
 ): ParticipantDashboard {
@@ -253,6 +265,7 @@ export function mapParticipantDashboardDto(
     eventFeed: Array.isArray(dto?.event_feed)
       ? dto.event_feed.map(mapEventFeedItemDto)
       : [],
+    eventFeedNextCursor: dto?.event_feed_next_cursor || null,
     actions: {
       canDownloadReport: !!dto?.actions?.can_download_report,
       canEditStatus: !!dto?.actions?.can_edit_status,
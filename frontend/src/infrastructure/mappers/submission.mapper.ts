@@ -53,6 +53,7 @@ export function mapSubmissionDto(dto: SubmissionDto | any): Submission {
     execTime: dto.exec_time || 0,
     memoryUsage: dto.memory_usage,
     createdAt: dto.created_at || "",
+    estimatedJudgeWait: dto.estimated_judge_wait ?? null,
     contestId: dto.contest?.toString() || dto.contest_id?.toString(),
   };
 }
@@ -176,7 +176,12 @@ export const getHeaderInfo = (
     result: ExecutionState["result"]
 ): HeaderInfo => {
      if (isPending) {
-         return { title: "Executing...", type: "blue", subtitle: "Running tests..." };
+         const wait = result?.type === 'submit' ? result.estimatedWait : null;
+         return {
+             title: "Executing...",
+             type: "blue",
+             subtitle: wait != null ? `Estimated judge wait ~${Math.max(1, Math.ceil(wait))}s` : "Running tests...",
+         };
      }
      if (globalError) {
          return { title: "Error", type: "red", subtitle: globalError };
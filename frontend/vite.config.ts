@@ -100,6 +100,11 @@ export default defineConfig(({ mode }) => {
           target: env.VITE_API_TARGET || 'http://localhost:8000',
           changeOrigin: true,
         },
+        '/ws': {
+          target: env.VITE_API_TARGET || 'http://localhost:8000',
+          changeOrigin: true,
+          ws: true,
+        },
         '/.well-known': {
           target: env.VITE_API_TARGET || 'http://localhost:8000',
           changeOrigin: true,
@@ -13,3 +13,9 @@ DJANGO_FORWARDED_PROTO = os.getenv(
         MCP_PUBLIC_URL.startswith("https://")
     ) else "http",
 )
+
+# Shared Django HTTP client (connection pooling + short GET cache)
+DJANGO_HTTP_MAX_CONNECTIONS = int(os.getenv("DJANGO_HTTP_MAX_CONNECTIONS", "100"))
+DJANGO_HTTP_MAX_KEEPALIVE = int(os.getenv("DJANGO_HTTP_MAX_KEEPALIVE", "20"))
+DJANGO_RESPONSE_CACHE_TTL = float(os.getenv("DJANGO_RESPONSE_CACHE_TTL", "10"))
+DJANGO_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("DJANGO_RESPONSE_CACHE_MAX_ENTRIES", "1024"))
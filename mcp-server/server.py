@@ -1,7 +1,12 @@
 """QJudge MCP Server tools."""
 
+import asyncio
+import copy
 import csv
+import hashlib
 import json
+import re
+import time
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlencode
@@ -18,6 +23,10 @@ import uvicorn
 from config import (
     DJANGO_BASE_URL,
     DJANGO_FORWARDED_PROTO,
+    DJANGO_HTTP_MAX_CONNECTIONS,
+    DJANGO_HTTP_MAX_KEEPALIVE,
+    DJANGO_RESPONSE_CACHE_MAX_ENTRIES,
+    DJANGO_RESPONSE_CACHE_TTL,
     MCP_HOST,
     MCP_PORT,
     MCP_PUBLIC_URL,
@@ -26,20 +35,121 @@ from config import (
 from exam_preview import build_exam_problem_preview
 
 
+# ---------------------------------------------------------------------------
+# Shared Django HTTP client
+# ---------------------------------------------------------------------------
+# One pooled client per process (per event loop) instead of a new TCP
+# connection per Django call. HTTP/2 is negotiated when ``h2`` is installed.
+
+_HTTP_CLIENT: httpx.AsyncClient | None = None
+_HTTP_CLIENT_LOOP: asyncio.AbstractEventLoop | None = None
+
+# Identical GETs with the same credential share one in-flight request.
+_INFLIGHT_GETS: dict[tuple[str, str], asyncio.Future] = {}
+
+# (credential hash, url) -> (expires_at, status_code, body). Only read-only
+# discovery endpoints are cached; any write with the same credential drops
+# that credential's entries so agents never read their own stale writes.
+_RESPONSE_CACHE: dict[tuple[str, str], tuple[float, int, Any]] = {}
+
+_UUID_RE = r"[0-9a-fA-F-]{36}"
+_CACHEABLE_GET_PATHS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"^/api/v1/classrooms/(\?.*)?$",
+        rf"^/api/v1/classrooms/{_UUID_RE}/(contests/)?$",
+        r"^/api/v1/contests/(\?.*)?$",
+        rf"^/api/v1/contests/{_UUID_RE}/$",
+    )
+)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client, creating it on first use."""
+    global _HTTP_CLIENT, _HTTP_CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if _HTTP_CLIENT is None or _HTTP_CLIENT_LOOP is not loop:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=DJANGO_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=DJANGO_HTTP_MAX_KEEPALIVE,
+            ),
+            http2=_http2_available(),
+        )
+        _HTTP_CLIENT_LOOP = loop
+    return _HTTP_CLIENT
+
+
+def _reset_http_state() -> None:
+    """Drop the shared client, in-flight map and response cache (tests)."""
+    global _HTTP_CLIENT, _HTTP_CLIENT_LOOP
+    _HTTP_CLIENT = None
+    _HTTP_CLIENT_LOOP = None
+    _INFLIGHT_GETS.clear()
+    _RESPONSE_CACHE.clear()
+
+
+def _credential_key(auth_header: str) -> str:
+    if not auth_header:
+        return ""
+    return hashlib.sha256(auth_header.encode("utf-8")).hexdigest()
+
+
+def _is_cacheable_get(path: str) -> bool:
+    return any(pattern.match(path) for pattern in _CACHEABLE_GET_PATHS)
+
+
+def _cache_get(key: tuple[str, str]) -> tuple[int, Any] | None:
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is None:
+        return None
+    expires_at, status_code, body = entry
+    if expires_at < time.monotonic():
+        _RESPONSE_CACHE.pop(key, None)
+        return None
+    return status_code, copy.deepcopy(body)
+
+
+def _cache_put(key: tuple[str, str], status_code: int, body: Any) -> None:
+    if DJANGO_RESPONSE_CACHE_TTL <= 0:
+        return
+    while len(_RESPONSE_CACHE) >= DJANGO_RESPONSE_CACHE_MAX_ENTRIES:
+        _RESPONSE_CACHE.pop(next(iter(_RESPONSE_CACHE)))
+    _RESPONSE_CACHE[key] = (
+        time.monotonic() + DJANGO_RESPONSE_CACHE_TTL,
+        status_code,
+        copy.deepcopy(body),
+    )
+
+
+def _invalidate_credential_cache(credential: str) -> None:
+    for key in [key for key in _RESPONSE_CACHE if key[0] == credential]:
+        _RESPONSE_CACHE.pop(key, None)
+
+
 class DjangoTokenVerifier(TokenVerifier):
     """Verify OAuth tokens by forwarding to Django backend."""
 
     async def verify_token(self, token: str) -> AccessToken | None:
         """Check token against Django. Return AccessToken if valid, None if not."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{DJANGO_BASE_URL}/api/v1/auth/me",
-                    headers={
-                        "Authorization": f"Bearer {token}",
-                        "X-Forwarded-Proto": DJANGO_FORWARDED_PROTO,
-                    },
-                )
+            response = await _get_http_client().get(
+                f"{DJANGO_BASE_URL}/api/v1/auth/me",
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "X-Forwarded-Proto": DJANGO_FORWARDED_PROTO,
+                },
+                timeout=10.0,
+            )
         except (httpx.RequestError, httpx.TimeoutException):
             return None
         if response.status_code != 200:
@@ -103,10 +213,16 @@ async def django_api(
 ) -> Any:
     """Call Django API with OAuth token passthrough.
 
+    Requests go through the shared pooled client. Identical concurrent GETs
+    with the same credential are coalesced, and discovery GETs (classroom /
+    contest listings and details) are served from a short per-credential
+    cache that any non-GET call with that credential invalidates.
+
     Never raises httpx errors — returns ``_error(...)`` so MCP does not wrap a bare
     exception with an empty ``str(e)`` (FastMCP: "Error executing tool ...: ").
     """
     headers: dict[str, str] = {"X-Forwarded-Proto": DJANGO_FORWARDED_PROTO}
+    auth_header = ""
     transport_request = getattr(ctx.request_context, "request", None)
     if transport_request and hasattr(transport_request, "headers"):
         auth_header = transport_request.headers.get("authorization", "")
@@ -114,37 +230,102 @@ async def django_api(
             headers["Authorization"] = auth_header
 
     url = f"{DJANGO_BASE_URL}{path}"
+    credential = _credential_key(auth_header)
+
+    if method.upper() != "GET" or json_body is not None:
+        _invalidate_credential_cache(credential)
+        return _django_result(
+            *await _send_django_request(method, url, headers, json_body=json_body, timeout=timeout)
+        )
 
+    cache_key = (credential, url)
+    cacheable = _is_cacheable_get(path)
+    if cacheable:
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return _django_result(*cached)
+
+    inflight = _INFLIGHT_GETS.get(cache_key)
+    if inflight is not None:
+        try:
+            status_code, body = await asyncio.shield(inflight)
+            return _django_result(status_code, copy.deepcopy(body))
+        except asyncio.CancelledError:
+            if not inflight.cancelled():
+                raise
+            # The leading request was cancelled; issue our own below.
+
+    future = asyncio.get_running_loop().create_future()
+    _INFLIGHT_GETS[cache_key] = future
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=json_body,
-            )
+        status_code, body = await _send_django_request(
+            method, url, headers, json_body=None, timeout=timeout
+        )
+    except BaseException as exc:
+        if isinstance(exc, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(exc)
+            future.exception()  # followers re-raise; mark retrieved
+        raise
+    finally:
+        if _INFLIGHT_GETS.get(cache_key) is future:
+            del _INFLIGHT_GETS[cache_key]
+
+    future.set_result((status_code, copy.deepcopy(body)))
+    if cacheable and status_code == 200:
+        _cache_put(cache_key, status_code, body)
+    return _django_result(status_code, body)
+
+
+async def _send_django_request(
+    method: str,
+    url: str,
+    headers: dict[str, str],
+    *,
+    json_body: dict | None,
+    timeout: float,
+) -> tuple[int | None, Any]:
+    """Issue one Django request.
+
+    Returns ``(status_code, body)``; transport failures come back as
+    ``(None, _error(...))`` so coalesced callers share the same result.
+    """
+    try:
+        response = await _get_http_client().request(
+            method=method,
+            url=url,
+            headers=headers,
+            json=json_body,
+            timeout=timeout,
+        )
     except httpx.TimeoutException as e:
-        return _error(f"Django HTTP timeout after {timeout}s: {e!r}", status=504)
+        return None, _error(f"Django HTTP timeout after {timeout}s: {e!r}", status=504)
     except httpx.RequestError as e:
-        return _error(f"Django HTTP request failed: {e!r}", status=502)
+        return None, _error(f"Django HTTP request failed: {e!r}", status=502)
 
     if response.status_code == 204:
-        return {"status": "success"}
+        return 204, None
 
     try:
         body = response.json()
     except Exception:
         body = {"raw": response.text}
+    return response.status_code, body
 
-    if response.status_code >= 400:
+
+def _django_result(status_code: int | None, body: Any) -> Any:
+    if status_code is None:
+        return body
+    if status_code == 204:
+        return {"status": "success"}
+    if status_code >= 400:
         result = _format_django_errors(body)
-        result["status"] = response.status_code
+        result["status"] = status_code
         return result
-
     return body
 
 
-
 def _error(detail: str, *, status: int | None = None) -> dict[str, Any]:
     payload: dict[str, Any] = {"error": True, "detail": detail}
     if status is not None:
@@ -981,7 +1162,6 @@ async def qjudge_browse(
                     merged[contest_uuid] = compact
             return _items(list(merged.values()))
 
-        import asyncio
         detail_calls = [
             django_api("GET", f"/api/v1/contests/{row.get('id')}/", ctx)
             for row in contests
@@ -1888,16 +2068,52 @@ async def qjudge_code_runner(
     body: dict[str, Any] = {
         "language": normalized_language,
         "code": code,
+        "mode": "async",
     }
-    # Judge runs can exceed the default 30s client timeout; avoid httpx ReadTimeout
-    # surfacing as an empty FastMCP ToolError ("Error executing tool ...: ").
-    return await django_api(
-        "POST",
-        f"/api/v1/management/problems/{problem_id}/test_run/",
-        ctx,
-        json_body=body,
-        timeout=120.0,
-    )
+    path = f"/api/v1/management/problems/{problem_id}/test_run/"
+    submitted = await django_api("POST", path, ctx, json_body=body)
+    if not isinstance(submitted, dict) or submitted.get("error") is True or "job_id" not in submitted:
+        # Error, or a backend without async test runs that answered inline.
+        return submitted
+    return await _poll_test_run(path, submitted, ctx)
+
+
+# The backend queues test runs on the judge workers; poll until the job
+# finishes instead of holding a Django worker for the whole run.
+_CODE_RUNNER_DEADLINE_SECONDS = 120.0
+_CODE_RUNNER_POLL_INTERVAL_SECONDS = 0.5
+_CODE_RUNNER_MAX_POLL_INTERVAL_SECONDS = 2.0
+
+
+async def _poll_test_run(path: str, job: dict[str, Any], ctx: Context) -> Any:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + _CODE_RUNNER_DEADLINE_SECONDS
+    interval = _CODE_RUNNER_POLL_INTERVAL_SECONDS
+    job_id = job["job_id"]
+
+    while job.get("status") not in ("completed", "failed"):
+        if loop.time() >= deadline:
+            return {
+                **_tool_error(
+                    tool_name="qjudge_code_runner",
+                    detail=(
+                        f"Test run still running after {_CODE_RUNNER_DEADLINE_SECONDS:.0f}s "
+                        f"(job_id={job_id})."
+                    ),
+                    status=504,
+                ),
+                "job_id": job_id,
+            }
+        await asyncio.sleep(interval)
+        interval = min(interval * 2, _CODE_RUNNER_MAX_POLL_INTERVAL_SECONDS)
+        polled = await django_api("GET", f"{path}{job_id}/", ctx, timeout=10.0)
+        if not isinstance(polled, dict) or polled.get("error") is True:
+            return polled
+        job = polled
+
+    if job["status"] == "failed":
+        return _error(f"Test run failed: {job.get('error') or 'unknown error'}", status=500)
+    return job.get("result")
 
 
 if __name__ == "__main__":
@@ -18,6 +18,13 @@ def run(coro):
     return asyncio.run(coro)
 
 
+@pytest.fixture(autouse=True)
+def _reset_shared_http_client():
+    server._reset_http_state()
+    yield
+    server._reset_http_state()
+
+
 class DummyRequest:
     def __init__(self, headers=None):
         self.headers = headers or {}
@@ -46,10 +53,11 @@ class FakeResponse:
 
 
 class FakeAsyncClient:
-    def __init__(self, response, recorder, timeout=None):
+    def __init__(self, response, recorder, timeout=None, **client_options):
         self._response = response
         self._recorder = recorder
         self.timeout = timeout
+        self.client_options = client_options
 
     async def __aenter__(self):
         return self
@@ -80,7 +88,7 @@ def test_django_api_forwards_auth_header_and_json_body(monkeypatch):
     monkeypatch.setattr(
         server.httpx,
         "AsyncClient",
-        lambda timeout: FakeAsyncClient(response, calls, timeout=timeout),
+        lambda **kwargs: FakeAsyncClient(response, calls, **kwargs),
     )
 
     ctx = DummyContext(headers={"authorization": "Bearer token"})
@@ -99,6 +107,7 @@ def test_django_api_forwards_auth_header_and_json_body(monkeypatch):
         "url": f"{server.DJANGO_BASE_URL}/api/v1/demo/",
         "headers": {"X-Forwarded-Proto": server.DJANGO_FORWARDED_PROTO, "Authorization": "Bearer token"},
         "json": {"hello": "world"},
+        "timeout": 30.0,
     }]
 
 
@@ -108,7 +117,7 @@ def test_django_api_returns_success_for_204(monkeypatch):
     monkeypatch.setattr(
         server.httpx,
         "AsyncClient",
-        lambda timeout: FakeAsyncClient(response, calls, timeout=timeout),
+        lambda **kwargs: FakeAsyncClient(response, calls, **kwargs),
     )
 
     result = run(server.django_api("DELETE", "/api/v1/demo/", DummyContext()))
@@ -120,7 +129,7 @@ def test_django_api_maps_httpx_connect_error_to_error_dict(monkeypatch):
     """Uncaught httpx errors become FastMCP ToolError with empty str(e); django_api must not raise."""
 
     class RaisingClient:
-        def __init__(self, timeout=None):
+        def __init__(self, **kwargs):
             pass
 
         async def __aenter__(self):
@@ -141,12 +150,118 @@ def test_django_api_maps_httpx_connect_error_to_error_dict(monkeypatch):
     assert result.get("status") == 502
 
 
+def test_django_api_reuses_one_pooled_client(monkeypatch):
+    created = []
+    calls = []
+    response = FakeResponse(200, payload={"ok": True})
+
+    def _factory(**kwargs):
+        created.append(kwargs)
+        return FakeAsyncClient(response, calls, **kwargs)
+
+    monkeypatch.setattr(server.httpx, "AsyncClient", _factory)
+
+    async def _calls():
+        ctx = DummyContext(headers={"authorization": "Bearer token"})
+        await server.django_api("GET", "/api/v1/demo/", ctx)
+        await server.django_api("POST", "/api/v1/demo/", ctx, json_body={})
+
+    run(_calls())
+
+    assert len(created) == 1
+    assert "limits" in created[0]
+    assert len(calls) == 2
+
+
+def test_django_api_coalesces_identical_inflight_gets(monkeypatch):
+    calls = []
+
+    class SlowClient(FakeAsyncClient):
+        async def request(self, **kwargs):
+            self._recorder.append(kwargs)
+            await asyncio.sleep(0.01)
+            return self._response
+
+    response = FakeResponse(200, payload={"results": [{"id": "x"}]})
+    monkeypatch.setattr(
+        server.httpx,
+        "AsyncClient",
+        lambda **kwargs: SlowClient(response, calls, **kwargs),
+    )
+
+    async def _calls():
+        ctx = DummyContext(headers={"authorization": "Bearer token"})
+        other = DummyContext(headers={"authorization": "Bearer other"})
+        return await asyncio.gather(
+            server.django_api("GET", "/api/v1/problems/1/", ctx),
+            server.django_api("GET", "/api/v1/problems/1/", ctx),
+            server.django_api("GET", "/api/v1/problems/1/", other),
+        )
+
+    results = run(_calls())
+
+    assert len(calls) == 2
+    assert results[0] == results[1] == {"results": [{"id": "x"}]}
+    results[0]["results"].clear()
+    assert results[1] == {"results": [{"id": "x"}]}
+
+
+def test_django_api_caches_discovery_gets_until_write(monkeypatch):
+    calls = []
+    response = FakeResponse(200, payload={"results": []})
+    monkeypatch.setattr(
+        server.httpx,
+        "AsyncClient",
+        lambda **kwargs: FakeAsyncClient(response, calls, **kwargs),
+    )
+
+    async def _calls():
+        ctx = DummyContext(headers={"authorization": "Bearer token"})
+        await server.django_api("GET", "/api/v1/classrooms/?scope=manage", ctx)
+        await server.django_api("GET", "/api/v1/classrooms/?scope=manage", ctx)
+        # Non-discovery endpoints are never cached.
+        await server.django_api("GET", "/api/v1/contests/abc/exam-answers/", ctx)
+        await server.django_api("GET", "/api/v1/contests/abc/exam-answers/", ctx)
+        await server.django_api("PATCH", "/api/v1/contests/abc/", ctx, json_body={})
+        await server.django_api("GET", "/api/v1/classrooms/?scope=manage", ctx)
+
+    run(_calls())
+
+    urls = [call["url"].removeprefix(server.DJANGO_BASE_URL) for call in calls]
+    assert urls == [
+        "/api/v1/classrooms/?scope=manage",
+        "/api/v1/contests/abc/exam-answers/",
+        "/api/v1/contests/abc/exam-answers/",
+        "/api/v1/contests/abc/",
+        "/api/v1/classrooms/?scope=manage",
+    ]
+
+
+def test_django_api_does_not_cache_error_responses(monkeypatch):
+    calls = []
+    response = FakeResponse(403, payload={"detail": "nope"})
+    monkeypatch.setattr(
+        server.httpx,
+        "AsyncClient",
+        lambda **kwargs: FakeAsyncClient(response, calls, **kwargs),
+    )
+
+    async def _calls():
+        ctx = DummyContext(headers={"authorization": "Bearer token"})
+        await server.django_api("GET", "/api/v1/classrooms/", ctx)
+        await server.django_api("GET", "/api/v1/classrooms/", ctx)
+
+    run(_calls())
+
+    assert len(calls) == 2
+
+
 def test_django_api_wraps_json_error_payload(monkeypatch):
     response = FakeResponse(400, payload={"message": "bad request"})
     monkeypatch.setattr(
         server.httpx,
         "AsyncClient",
-        lambda timeout: FakeAsyncClient(response, [], timeout=timeout),
+        lambda **kwargs: FakeAsyncClient(response, [], **kwargs),
     )
 
     result = run(server.django_api("GET", "/api/v1/demo/", DummyContext()))
@@ -163,7 +278,7 @@ def test_django_api_wraps_non_json_error_payload(monkeypatch):
     monkeypatch.setattr(
         server.httpx,
         "AsyncClient",
-        lambda timeout: FakeAsyncClient(response, [], timeout=timeout),
+        lambda **kwargs: FakeAsyncClient(response, [], **kwargs),
     )
 
     result = run(server.django_api("GET", "/api/v1/demo/", DummyContext()))
@@ -192,7 +307,7 @@ def test_django_api_handles_custom_exception_handler_format(monkeypatch):
     monkeypatch.setattr(
         server.httpx,
         "AsyncClient",
-        lambda timeout: FakeAsyncClient(response, [], timeout=timeout),
+        lambda **kwargs: FakeAsyncClient(response, [], **kwargs),
     )
 
     result = run(server.django_api("POST", "/api/v1/demo/", DummyContext()))
@@ -216,7 +331,7 @@ def test_django_api_handles_custom_exception_handler_message_only(monkeypatch):
     monkeypatch.setattr(
         server.httpx,
         "AsyncClient",
-        lambda timeout: FakeAsyncClient(response, [], timeout=timeout),
+        lambda **kwargs: FakeAsyncClient(response, [], **kwargs),
     )
 
     result = run(server.django_api("GET", "/api/v1/demo/", DummyContext()))
@@ -427,7 +542,7 @@ def test_verify_token_uses_canonical_auth_me_path(monkeypatch):
     monkeypatch.setattr(
         server.httpx,
         "AsyncClient",
-        lambda timeout: FakeAsyncClient(response, calls, timeout=timeout),
+        lambda **kwargs: FakeAsyncClient(response, calls, **kwargs),
     )
 
     token = run(server.DjangoTokenVerifier().verify_token("token-123"))
@@ -440,6 +555,7 @@ def test_verify_token_uses_canonical_auth_me_path(monkeypatch):
             "Authorization": "Bearer token-123",
             "X-Forwarded-Proto": server.DJANGO_FORWARDED_PROTO,
         },
+        "timeout": 10.0,
     }]
 
 
@@ -1238,16 +1354,24 @@ def test_qjudge_coding_problems_retired_actions_not_exposed():
 # ---------------------------------------------------------------------------
 
 def test_qjudge_code_runner(monkeypatch):
-    captured = {}
+    calls = []
+    path = "/api/v1/management/problems/44444444-4444-4444-4444-444444444444/test_run/"
+    job_id = "a" * 32
 
     async def fake_django_api(method, path, ctx, *, json_body=None, timeout=30.0):
-        captured["method"] = method
-        captured["path"] = path
-        captured["json_body"] = json_body
-        captured["timeout"] = timeout
-        return {"results": [{"status": "AC"}]}
+        calls.append({"method": method, "path": path, "json_body": json_body})
+        if method == "POST":
+            return {"job_id": job_id, "status": "queued", "results": []}
+        if len(calls) == 2:
+            return {"job_id": job_id, "status": "running", "results": []}
+        return {
+            "job_id": job_id,
+            "status": "completed",
+            "result": {"results": [{"status": "AC"}]},
+        }
 
     monkeypatch.setattr(server, "django_api", fake_django_api)
+    monkeypatch.setattr(server, "_CODE_RUNNER_POLL_INTERVAL_SECONDS", 0)
 
     result = run(
         server.qjudge_code_runner(
@@ -1259,12 +1383,61 @@ def test_qjudge_code_runner(monkeypatch):
     )
 
     assert result == {"results": [{"status": "AC"}]}
-    assert captured == {
-        "method": "POST",
-        "path": "/api/v1/management/problems/44444444-4444-4444-4444-444444444444/test_run/",
-        "json_body": {"language": "python", "code": "print(1+2)"},
-        "timeout": 120.0,
-    }
+    assert calls == [
+        {
+            "method": "POST",
+            "path": path,
+            "json_body": {"language": "python", "code": "print(1+2)", "mode": "async"},
+        },
+        {"method": "GET", "path": f"{path}{job_id}/", "json_body": None},
+        {"method": "GET", "path": f"{path}{job_id}/", "json_body": None},
+    ]
+
+
+def test_qjudge_code_runner_passes_through_inline_result(monkeypatch):
+    async def fake_django_api(method, path, ctx, *, json_body=None, timeout=30.0):
+        return {"status": "AC", "results": [{"status": "AC"}]}
+
+    monkeypatch.setattr(server, "django_api", fake_django_api)
+
+    result = run(
+        server.qjudge_code_runner(
+            problem_id="44444444-4444-4444-4444-444444444444",
+            language="python",
+            code="print(1+2)",
+            ctx=DummyContext(),
+        )
+    )
+
+    assert result == {"status": "AC", "results": [{"status": "AC"}]}
+
+
+def test_qjudge_code_runner_reports_failed_and_timed_out_jobs(monkeypatch):
+    state = {"status": "failed"}
+
+    async def fake_django_api(method, path, ctx, *, json_body=None, timeout=30.0):
+        if method == "POST":
+            return {"job_id": "b" * 32, "status": "queued"}
+        return {"job_id": "b" * 32, "status": state["status"], "error": "Judge system error"}
+
+    monkeypatch.setattr(server, "django_api", fake_django_api)
+    monkeypatch.setattr(server, "_CODE_RUNNER_POLL_INTERVAL_SECONDS", 0)
+
+    kwargs = dict(
+        problem_id="44444444-4444-4444-4444-444444444444",
+        language="python",
+        code="print(1)",
+        ctx=DummyContext(),
+    )
+    failed = run(server.qjudge_code_runner(**kwargs))
+    assert failed["error"] is True
+    assert "Judge system error" in failed["detail"]
+
+    state["status"] = "running"
+    monkeypatch.setattr(server, "_CODE_RUNNER_DEADLINE_SECONDS", 0)
+    timed_out = run(server.qjudge_code_runner(**kwargs))
+    assert timed_out["status"] == 504
+    assert timed_out["job_id"] == "b" * 32
 
 
 def test_qjudge_code_runner_requires_fields():
@@ -1375,7 +1548,7 @@ def test_verify_token_returns_none_on_non_200(monkeypatch):
     response = FakeResponse(403)
     monkeypatch.setattr(
         server.httpx, "AsyncClient",
-        lambda timeout: FakeAsyncClient(response, calls, timeout=timeout),
+        lambda **kwargs: FakeAsyncClient(response, calls, **kwargs),
     )
     token = run(server.DjangoTokenVerifier().verify_token("bad-token"))
     assert token is None
@@ -1392,7 +1565,7 @@ def test_verify_token_returns_none_on_request_error(monkeypatch):
 
     monkeypatch.setattr(
         server.httpx, "AsyncClient",
-        lambda timeout: FailingClient(),
+        lambda **kwargs: FailingClient(),
     )
     token = run(server.DjangoTokenVerifier().verify_token("some-token"))
     assert token is None
@@ -1409,7 +1582,7 @@ def test_verify_token_returns_none_on_timeout(monkeypatch):
 
     monkeypatch.setattr(
         server.httpx, "AsyncClient",
-        lambda timeout: TimeoutClient(),
+        lambda **kwargs: TimeoutClient(),
     )
     token = run(server.DjangoTokenVerifier().verify_token("some-token"))
     assert token is None
@@ -1420,7 +1593,7 @@ def test_django_api_omits_auth_when_no_authorization_header(monkeypatch):
     response = FakeResponse(200, payload={"ok": True})
     monkeypatch.setattr(
         server.httpx, "AsyncClient",
-        lambda timeout: FakeAsyncClient(response, calls, timeout=timeout),
+        lambda **kwargs: FakeAsyncClient(response, calls, **kwargs),
     )
 
     ctx = DummyContext(headers={})  # no authorization header
@@ -1438,7 +1611,7 @@ def test_django_api_omits_auth_when_request_is_none(monkeypatch):
     response = FakeResponse(200, payload={"ok": True})
     monkeypatch.setattr(
         server.httpx, "AsyncClient",
-        lambda timeout: FakeAsyncClient(response, calls, timeout=timeout),
+        lambda **kwargs: FakeAsyncClient(response, calls, **kwargs),
     )
 
     ctx = DummyContext()